@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+
+"""Tests for the array-backed CompactTree representation."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import toytree
+from toytree.core.compact import CompactNode, CompactTree
+from toytree.utils import ToytreeError
+
+NEWICKS = [
+    "((a:1,b:2)0.9:1,c:3);",
+    "((a,b)X,(c,d)Y)R;",
+    "((a,b,c),(d,e));",
+    "(a,(b,(c,(d,e))));",
+    "(,(,));",
+    "a;",
+]
+
+
+def _assert_matches_toytree(ctree: CompactTree, tree: toytree.ToyTree) -> None:
+    """Arrays of a CompactTree should match Node attrs of a ToyTree."""
+    assert ctree.nnodes == tree.nnodes
+    assert ctree.ntips == tree.ntips
+    assert ctree.get_tip_labels() == tree.get_tip_labels()
+    parents = [-1 if i.up is None else i.up.idx for i in tree]
+    assert ctree.parent.tolist() == parents
+    assert np.allclose(ctree.dist, [i.dist for i in tree])
+    assert np.allclose(ctree.support, [i.support for i in tree], equal_nan=True)
+    assert np.allclose(ctree.height, [i.height for i in tree])
+    assert np.allclose(ctree.x, [i._x for i in tree])
+    for node in tree:
+        assert [i.idx for i in ctree[node.idx].children] == [
+            i.idx for i in node.children
+        ]
+
+
+@pytest.mark.parametrize("newick", NEWICKS)
+def test_from_newick_matches_toytree(newick) -> None:
+    """Parsing to arrays should reproduce the ToyTree idx order."""
+    _assert_matches_toytree(CompactTree.from_newick(newick), toytree.tree(newick))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_from_toytree_and_back_round_trip(seed) -> None:
+    """Converting to a CompactTree and back should not change the tree."""
+    tree = toytree.rtree.bdtree(ntips=20, seed=seed)
+    ctree = CompactTree.from_toytree(tree)
+    _assert_matches_toytree(ctree, tree)
+    assert ctree.to_toytree().write() == tree.write()
+
+
+@pytest.mark.parametrize(
+    "strategy", ["idxorder", "preorder", "postorder", "levelorder"]
+)
+def test_traversal_orders_match_toytree(strategy) -> None:
+    """Array traversal orders should match ToyTree.traverse."""
+    tree = toytree.rtree.rtree(ntips=15, seed=123)
+    ctree = CompactTree.from_newick(tree.write())
+    assert [i.idx for i in ctree.traverse(strategy)] == [
+        i.idx for i in tree.traverse(strategy)
+    ]
+
+
+def test_mrca_and_node_distance_match_toytree() -> None:
+    """MRCA and patristic distance queries run on the arrays."""
+    tree = toytree.rtree.bdtree(ntips=12, seed=7)
+    ctree = CompactTree.from_toytree(tree)
+    names = tree.get_tip_labels()
+    mrca = ctree.get_mrca_node(names[0], names[3], 5)
+    assert mrca.idx == tree.get_mrca_node(names[0], names[3], 5).idx
+    assert mrca.get_leaf_names() == tree[mrca.idx].get_leaf_names()
+    for idx0, idx1 in [(0, 1), (2, 20), (5, 11)]:
+        dist = tree.distance.get_node_distance(idx0, idx1)
+        assert ctree.get_node_distance(idx0, idx1) == pytest.approx(dist)
+        topo = tree.distance.get_node_distance(idx0, idx1, topology_only=True)
+        assert ctree.get_node_distance(idx0, idx1, topology_only=True) == topo
+
+
+def test_node_views_are_lightweight_and_comparable() -> None:
+    """Indexing returns cheap views that compare equal by idx."""
+    ctree = CompactTree.from_newick("((a:1,b:2)0.9:1,c:3);")
+    node = ctree[0]
+    assert isinstance(node, CompactNode)
+    assert not hasattr(node, "__dict__")
+    assert node == ctree[0]
+    assert node.up == ctree[3]
+    assert node.up.support == 0.9
+    assert ctree[-1].is_root()
+    assert [i.name for i in ctree[1:3]] == ["b", "c"]
+    with pytest.raises(ToytreeError):
+        _ = ctree[10]
+
+
+@pytest.mark.parametrize(
+    "newick", ["((a,b),c;", "(a,b));", "(a,b)(c);", "a,b;", "(a:1:2,b);"]
+)
+def test_from_newick_malformed_raises(newick) -> None:
+    """Malformed Newick strings should raise ToytreeError."""
+    with pytest.raises(ToytreeError):
+        CompactTree.from_newick(newick)
+
+
+def test_from_newick_rejects_metadata() -> None:
+    """Extended Newick should be parsed by toytree.tree instead."""
+    with pytest.raises(ToytreeError, match="from_toytree"):
+        CompactTree.from_newick("((a[&x=1],b),c);")
+
+
+def test_toytree_tree_loads_compact_trees(tmp_path) -> None:
+    """toytree.tree(compact=True) returns a CompactTree for any input."""
+    tree = toytree.rtree.bdtree(20, seed=123)
+    path = tmp_path / "tree.nwk"
+    tree.write(path)
+    ctree = toytree.tree(path, compact=True)
+    assert isinstance(ctree, CompactTree)
+    _assert_matches_toytree(ctree, toytree.tree(path))
+
+    ctree = toytree.tree("((a[&x=1]:1,b:2):1,c:3);", compact=True)
+    assert ctree.get_tip_labels() == ["a", "b", "c"]
+    assert ctree.dist.tolist() == [1.0, 2.0, 3.0, 1.0, 0.0]
+
+
+@pytest.mark.parametrize("topology_only", [False, True])
+def test_distance_functions_run_on_compact_trees(topology_only) -> None:
+    """Node distance functions give the same results on a CompactTree."""
+    tree = toytree.rtree.bdtree(20, seed=123)
+    ctree = CompactTree.from_toytree(tree)
+    for func in (
+        toytree.distance.get_node_distance_matrix,
+        toytree.distance.get_tip_distance_matrix,
+        toytree.distance.get_internal_node_distance_matrix,
+    ):
+        expected = func(tree, topology_only=topology_only, df=True)
+        result = func(ctree, topology_only=topology_only, df=True)
+        assert np.allclose(result.to_numpy(), expected.to_numpy())
+        assert result.index.tolist() == expected.index.tolist()
+    dist = toytree.distance.get_node_distance(ctree, "r0", 25, topology_only)
+    assert np.isclose(
+        dist, toytree.distance.get_node_distance(tree, "r0", 25, topology_only)
+    )
+    assert ctree.get_mrca_node("r0", "r1", "r5").idx == (
+        tree.get_mrca_node("r0", "r1", "r5").idx
+    )
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""Tests for lazy-parsed ``MultiTree`` objects."""
+
+from __future__ import annotations
+
+import pytest
+
+import toytree
+from toytree.core.multitree import _LazyTreeList
+from toytree.utils import ToytreeError
+
+NEWICKS = [
+    "((a:1,b:1):1,c:2);",
+    "((a:1,c:1):1,b:2);",
+    "((a:1,b:1):1,c:2);",
+    "((b:1,c:1):1,a:2);",
+    "((a:1,b:1):1,c:2);",
+]
+TEXT = "\n".join(NEWICKS)
+
+
+def test_lazy_mtree_parses_only_on_access() -> None:
+    """len() and slicing should not parse trees."""
+    mtree = toytree.mtree(TEXT, lazy=True, cache_size=2)
+    assert isinstance(mtree.treelist, _LazyTreeList)
+    assert len(mtree) == mtree.ntrees == 5
+    assert not mtree.treelist._cache and not mtree.treelist._pinned
+    sub = mtree[1:4]
+    assert isinstance(sub, _LazyTreeList) and len(sub) == 3
+    assert not mtree.treelist._pinned
+    assert sub[0].get_tip_labels() == ["a", "c", "b"]
+    assert sorted(mtree.treelist._pinned) == [1]
+    assert sub[0] is mtree[1] and sub[::-2][0] is mtree[3]
+    with pytest.raises(IndexError):
+        _ = sub[3]
+    assert mtree[-1].get_tip_labels() == ["a", "b", "c"]
+    with pytest.raises(IndexError):
+        _ = mtree[5]
+
+
+def test_lazy_mtree_pins_accessed_trees() -> None:
+    """Accessed trees are never evicted; read-only parses are LRU cached."""
+    mtree = toytree.mtree(TEXT, lazy=True, cache_size=2)
+    tree0 = mtree[0]
+    tree0.root("c", inplace=True)
+    mtree.all_tree_tips_aligned()
+    assert list(mtree.treelist._cache) == [3, 4]
+    assert list(mtree.treelist._pinned) == [0]
+    assert mtree[0] is tree0
+    assert mtree.write().split("\n")[0] == tree0.write()
+
+    # a tree cached by a read-only method is pinned when accessed.
+    tree4 = mtree[4]
+    assert 4 not in mtree.treelist._cache
+    assert mtree[4] is tree4
+
+
+def test_lazy_mtree_matches_eager() -> None:
+    """Lazy and eager MultiTrees should give the same results."""
+    lazy = toytree.mtree(TEXT, lazy=True, cache_size=1)
+    eager = toytree.mtree(TEXT)
+    assert [i.write() for i in lazy] == [i.write() for i in eager]
+    assert lazy.write(dist_formatter=None) == eager.write(dist_formatter=None)
+    assert lazy.get_tip_labels() == eager.get_tip_labels()
+    rooted = lazy.root("a")
+    assert isinstance(rooted.treelist, list)
+    assert rooted.write() == eager.root("a").write()
+    assert isinstance(lazy.treelist, _LazyTreeList)
+
+
+def test_lazy_mtree_write_does_not_parse_unaccessed_trees() -> None:
+    """write() returns stored Newicks of trees that were not accessed."""
+    text = TEXT.replace(":1,", ":1.000,")
+    mtree = toytree.mtree(text, lazy=True, cache_size=1)
+    assert mtree.write() == text
+    assert not mtree.treelist._cache and not mtree.treelist._pinned
+    mtree[1].root("b", inplace=True)
+    lines = mtree.write().split("\n")
+    assert lines[1] == mtree[1].write() and lines[0] == NEWICKS[0].replace(
+        ":1,", ":1.000,"
+    )
+    eager = toytree.mtree(text)
+    eager[1].root("b", inplace=True)
+    assert mtree.write(dist_formatter="%.2f") == eager.write(dist_formatter="%.2f")
+
+
+def test_lazy_mtree_treedist_matrix_does_not_pin_trees() -> None:
+    """get_treedist_matrix() reads trees without pinning them."""
+    mtree = toytree.mtree(TEXT, lazy=True, cache_size=1)
+    dists = mtree.get_treedist_matrix()
+    assert not mtree.treelist._pinned and len(mtree.treelist._cache) == 1
+    assert (dists == toytree.mtree(TEXT).get_treedist_matrix()).all()
+
+
+def test_get_unique_topologies_over_sampled_idxs() -> None:
+    """Only the sampled trees are counted (and parsed if lazy)."""
+    mtree = toytree.mtree(TEXT, lazy=True)
+    unique = mtree.get_unique_topologies(True, idxs=[0, 1, 2])
+    assert [i[1] for i in unique] == [2, 1]
+    assert set(mtree.treelist._cache) == {2}
+    assert unique[0][0] is mtree[0] and unique[1][0] is mtree[1]
+    assert [i[1] for i in mtree.get_unique_topologies(True)] == [3, 1, 1]
+
+
+def test_lazy_mtree_applies_nexus_translation() -> None:
+    """NEXUS translate tables are applied when lazy trees are parsed."""
+    nex = (
+        "#NEXUS\nbegin trees;\n translate\n 1 apple,\n 2 berry,\n 3 cherry\n ;\n"
+        " tree t0 = ((1,2),3);\n tree t1 = ((1,3),2);\nend;"
+    )
+    mtree = toytree.mtree(nex, lazy=True)
+    assert mtree[1].get_tip_labels() == ["apple", "cherry", "berry"]
+    assert mtree.write(dist_formatter=None).split("\n")[1] == "((apple,cherry),berry);"
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"workers": 2}, {"cache_size": -1}], ids=["workers", "cache_size"]
+)
+def test_lazy_mtree_invalid_args_raise(kwargs) -> None:
+    """Invalid lazy options raise ToytreeError."""
+    with pytest.raises(ToytreeError):
+        toytree.mtree(TEXT, lazy=True, **kwargs)
+    with pytest.raises(ToytreeError):
+        toytree.mtree([toytree.tree(NEWICKS[0])], lazy=True)
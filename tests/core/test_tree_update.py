@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+"""Tests for ToyTree idx/coordinate updates after modification."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import toytree
+
+
+def _node_state(tree: toytree.ToyTree) -> list[tuple]:
+    """Return the cached idx, name, x and height of every Node."""
+    return [(i.idx, i.name, i._x, i.height) for i in tree]
+
+
+def test_update_is_fast_for_unlabeled_internal_nodes() -> None:
+    """New Nodes share hashes until labeled; update should not rely on them."""
+    newick = "t0:1;"
+    for idx in range(1, 2000):
+        newick = f"({newick[:-1]},t{idx}:1):1;"
+    tree = toytree.tree(newick)
+    assert tree.ntips == 2000
+    assert tree.treenode.height == pytest.approx(1999.0)
+    assert tree[0].height == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rotate_subtree_update_matches_full_update(seed) -> None:
+    """The incremental subtree update should match a full `_update`."""
+    tree = toytree.rtree.bdtree(ntips=25, seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(5):
+        qidx = int(rng.integers(tree.ntips, tree.nnodes))
+        rotated = tree.mod.rotate_node(qidx)
+        expected = tree.copy()
+        node = expected[qidx]
+        node._children = node._children[::-1]
+        expected._update()
+        assert _node_state(rotated) == _node_state(expected)
+        assert rotated.write() == expected.write()
+        assert all(rotated[i].idx == i for i in range(rotated.nnodes))
+        tree = rotated
+
+
+def test_parent_idxs_cache_is_cleared_on_update() -> None:
+    """Cached parent idx arrays should follow topology changes."""
+    tree = toytree.tree("((a,b),(c,d));")
+    assert tree._get_parent_idxs().tolist() == [4, 4, 5, 5, 6, 6, -1]
+    tree.root("a", inplace=True)
+    parents = [-1 if i.up is None else i.up.idx for i in tree]
+    assert tree._get_parent_idxs().tolist() == parents
+
+
+def test_lca_index_cache_is_cleared_on_update() -> None:
+    """Cached LCA index should follow topology changes and rotations."""
+    tree = toytree.tree("((a,b),(c,d));")
+    assert tree.get_mrca_node("a", "c").is_root()
+    tree.root("a", inplace=True)
+    assert tree._lca_index is None
+    assert tree.get_mrca_node("c", "d") == tree.get_nodes("c")[0].up
+    rotated = tree.mod.rotate_node(tree.get_mrca_node("c", "d").idx)
+    assert rotated.get_mrca_node("b", "c") == rotated.get_nodes("c")[0].up.up
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_new_leaf_update_matches_full_update(seed) -> None:
+    """The incremental update after add_child_node should match `_update`."""
+    tree = toytree.rtree.bdtree(ntips=25, seed=seed)
+    rng = np.random.default_rng(seed)
+    for step in range(10):
+        qidx = int(rng.integers(0, tree.nnodes))
+        dist = float(rng.uniform(0, 0.5)) if step % 3 else None
+        added = tree.mod.add_child_node(qidx, name=f"new{step}", dist=dist)
+        expected = added.copy()
+        expected._update()
+        assert _node_state(added) == _node_state(expected)
+        assert added.write() == expected.write()
+        assert all(added[i].idx == i for i in range(added.nnodes))
+        assert added.ntips == tree.ntips + (not tree[qidx].is_leaf())
+        tree = added
+
+
+def test_new_leaf_update_first_child_and_deepest_leaf() -> None:
+    """New first children and new deepest leaves are labeled correctly."""
+    tree = toytree.tree("((a:1,b:1):1,(c:1,d:1):1);")
+    node = tree.get_mrca_node("c", "d")
+    leaf = toytree.Node(name="x", dist=5.0)
+    node._children = (leaf,) + node._children
+    leaf._up = node
+    tree._update_new_leaf(leaf)
+    assert tree.get_tip_labels() == ["a", "b", "x", "c", "d"]
+    expected = tree.copy()
+    expected._update()
+    assert _node_state(tree) == _node_state(expected)
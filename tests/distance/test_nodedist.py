@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-"""Test Node distance functions"""
+"""Test Node distance functions."""
 
 import numpy as np
 from conftest import PytestCompat
@@ -9,7 +9,10 @@ import toytree
 
 
 class TestRoot(PytestCompat):
+    """Test Node distances on rooted and unrooted trees."""
+
     def setUp(self):
+        """Build imbalanced, balanced, random and unrooted trees."""
         self.itree = toytree.rtree.imbtree(10, seed=123, treeheight=10)
         self.btree = toytree.rtree.baltree(10, seed=123, treeheight=10)
         self.ntree = toytree.rtree.unittree(10, seed=123, treeheight=10)
@@ -17,6 +20,7 @@ class TestRoot(PytestCompat):
         self.trees = [self.itree, self.btree, self.ntree, self.utree]
 
     def test_get_node_distance_matrix(self):
+        """Node distance matrices match pairwise Node distances."""
         for tree in self.trees:
             # check symmetry
             arr = tree.distance.get_node_distance_matrix()
@@ -25,6 +29,8 @@ class TestRoot(PytestCompat):
             # check pandas formatting
             f1 = tree.distance.get_node_distance_matrix(df=True)
             f2 = tree.distance.get_node_distance_matrix(df=True, topology_only=True)
+            topo = tree.distance.get_node_distance_matrix(topology_only=True)
+            self.assertTrue(np.array_equal(f2.values, topo))
 
             # check distances among tips by name
             for name1 in tree.get_tip_labels():
@@ -40,3 +46,39 @@ class TestRoot(PytestCompat):
                     dist = tree.distance.get_node_distance(idx1, idx2)
                     print(idx1, idx2, dist, arr[idx1, idx2])
                     self.assertAlmostEqual(dist, arr[idx1, idx2])
+
+    def test_get_node_distance_matrix_matches_path_sums(self):
+        """Node distances equal summed dists or edge counts on paths."""
+        for tree in self.trees + [toytree.rtree.bdtree(30, seed=7)]:
+            for topo in (False, True):
+                arr = tree.distance.get_node_distance_matrix(topology_only=topo)
+                self.assertEqual(arr.dtype, int if topo else float)
+                for idx1 in range(tree.nnodes):
+                    for idx2 in range(tree.nnodes):
+                        path = tree.distance.get_node_path(idx1, idx2)
+                        if topo:
+                            dist = len(path) - 1
+                        else:
+                            mrca = tree.get_mrca_node(idx1, idx2)
+                            dist = sum(i.dist for i in path if i != mrca)
+                        self.assertAlmostEqual(dist, arr[idx1, idx2])
+
+    def test_get_tip_distance_matrix(self):
+        """Tip distances are the tip block of the Node distance matrix."""
+        for tree in self.trees:
+            arr = tree.distance.get_node_distance_matrix()
+            tarr = tree.distance.get_tip_distance_matrix()
+            self.assertTrue(np.allclose(arr[: tree.ntips, : tree.ntips], tarr))
+            frame = tree.distance.get_tip_distance_matrix(df=True)
+            self.assertEqual(list(frame.index), tree.get_tip_labels())
+
+    def test_get_mrca_node(self):
+        """The MRCA is the lowest idx Node shared by all ancestries."""
+        tree = toytree.rtree.bdtree(30, seed=7)
+        rng = np.random.default_rng(7)
+        for _ in range(50):
+            query = rng.choice(tree.nnodes, size=3, replace=False).tolist()
+            nset = set.intersection(
+                *(set(tree[i].iter_ancestors(include_self=True)) for i in query)
+            )
+            self.assertEqual(tree.get_mrca_node(*query), min(nset))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+"""Tests for quartet counts computed without enumerating quartets."""
+
+import numpy as np
+from conftest import PytestCompat
+
+import toytree
+from toytree.distance import get_treedist_quartets
+from toytree.distance._src.quartet_dist import (
+    get_quartet_comparison,
+    get_quartet_resolutions_table,
+)
+
+
+def _enumerated_comparison(tree1, tree2) -> dict:
+    """Return quartet counts by enumerating every quartet."""
+    arr1 = get_quartet_resolutions_table(tree1)
+    arr2 = get_quartet_resolutions_table(tree2)
+    mask = (arr1 != 0) & (arr2 != 0)
+    return {
+        "Q": arr1.size,
+        "S": int(np.sum(arr1[mask] == arr2[mask])),
+        "D": int(np.sum(arr1[mask] != arr2[mask])),
+        "U": int(np.sum((arr1 == 0) & (arr2 == 0))),
+        "R1": int(np.sum((arr1 != 0) & (arr2 == 0))),
+        "R2": int(np.sum((arr1 == 0) & (arr2 != 0))),
+    }
+
+
+class TestQuartetDist(PytestCompat):
+    """Test quartet counts against enumeration of all quartets."""
+
+    def setUp(self):
+        """Seed a random generator used to collapse Nodes."""
+        self.rng = np.random.default_rng(123)
+
+    def _random_polytomies(self, tree):
+        """Return tree with a random subset of internal nodes collapsed."""
+        idxs = [i._idx for i in tree[tree.ntips : -1]]
+        size = int(self.rng.integers(0, len(idxs) + 1))
+        if not size:
+            return tree
+        idxs = self.rng.choice(idxs, size=size, replace=False)
+        return tree.mod.collapse_nodes(*[int(i) for i in idxs])
+
+    def test_counts_match_enumeration(self):
+        """Counts match enumeration on random trees with polytomies."""
+        for seed in range(30):
+            ntips = int(self.rng.integers(4, 12))
+            tree1 = self._random_polytomies(toytree.rtree.rtree(ntips, seed=seed))
+            tree2 = self._random_polytomies(toytree.rtree.rtree(ntips, seed=seed + 99))
+            if seed % 2:
+                tree2 = tree2.unroot()
+            data = get_quartet_comparison(tree1, tree2)
+            self.assertEqual(list(data), ["Q", "S", "D", "U", "R1", "R2", "N"])
+            for key, value in _enumerated_comparison(tree1, tree2).items():
+                self.assertEqual(data[key], value)
+            self.assertEqual(data["N"], data["Q"])
+
+    def test_identical_and_collapsed_trees(self):
+        """Collapsed Nodes turn same-resolved quartets into R1."""
+        tree1 = toytree.rtree.unittree(8, seed=123)
+        tree2 = tree1.mod.collapse_nodes(10, 11)
+        data = get_quartet_comparison(tree1, tree1)
+        self.assertEqual(data["S"], 70)
+        self.assertEqual(data["D"] + data["R1"] + data["R2"] + data["U"], 0)
+        data = get_treedist_quartets(tree1, tree2)
+        self.assertEqual(data["R1"] + data["S"], 70)
+        self.assertEqual(data["D"], 0)
+
+    def test_large_tree_counts_are_consistent(self):
+        """Counts on 200-tip binary trees sum to the number of quartets."""
+        tree1 = toytree.rtree.rtree(200, seed=1)
+        tree2 = toytree.rtree.rtree(200, seed=2)
+        data = get_quartet_comparison(tree1, tree2)
+        self.assertEqual(data["Q"], toytree.enum.get_num_quartets(200))
+        self.assertEqual(data["S"] + data["D"], data["Q"])
+        self.assertEqual(data["R1"] + data["R2"] + data["U"], 0)
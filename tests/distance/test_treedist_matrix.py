@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+"""Tests for all-pairs tree distance matrices."""
+
+import numpy as np
+from conftest import PytestCompat
+
+import toytree
+from toytree.distance import get_treedist_matrix, get_treedist_rf, get_treedist_rfi
+from toytree.utils import ToytreeError
+
+
+class TestTreedistMatrix(PytestCompat):
+    """Test all-pairs RF distance matrices among ToyTrees."""
+
+    def setUp(self):
+        """Build random trees plus re-rooted copies of two of them."""
+        trees = [toytree.rtree.rtree(12, seed=i) for i in range(12)]
+        trees.append(trees[0].unroot())
+        trees.append(trees[1].root("r3"))
+        self.trees = trees
+        self.mtree = toytree.mtree(trees)
+
+    def test_rf_matrix_matches_pairwise(self):
+        """RF matrix entries match pairwise `get_treedist_rf`."""
+        for normalize in (False, True):
+            dists = self.mtree.get_treedist_matrix("rf", normalize=normalize)
+            expected = [
+                [get_treedist_rf(i, j, normalize=normalize) for j in self.trees]
+                for i in self.trees
+            ]
+            self.assertTrue(np.allclose(dists, expected))
+
+    def test_rfi_matrix_matches_pairwise(self):
+        """RFI matrix entries match pairwise `get_treedist_rfi`."""
+        for normalize in (False, True):
+            dists = self.mtree.get_treedist_matrix("rfi", normalize=normalize)
+            expected = [
+                [get_treedist_rfi(i, j, normalize=normalize) for j in self.trees]
+                for i in self.trees
+            ]
+            self.assertTrue(np.allclose(dists, expected))
+
+    def test_rooting_does_not_affect_distance(self):
+        """Re-rooted or unrooted copies have zero distance."""
+        dists = self.mtree.get_treedist_matrix()
+        self.assertEqual(dists[0, 12], 0)
+        self.assertEqual(dists[1, 13], 0)
+
+    def test_condensed_and_workers(self):
+        """Condensed output with workers matches the upper triangle."""
+        dists = self.mtree.get_treedist_matrix()
+        cdists = get_treedist_matrix(self.trees, condensed=True, workers=2)
+        ntrees = len(self.trees)
+        self.assertEqual(cdists.size, ntrees * (ntrees - 1) // 2)
+        self.assertTrue(np.allclose(cdists, dists[np.triu_indices(ntrees, k=1)]))
+
+    def test_invalid_inputs_raise(self):
+        """Bad metric, workers, tip sets or empty input raise."""
+        with self.assertRaises(ToytreeError):
+            self.mtree.get_treedist_matrix(metric="qrt")
+        with self.assertRaises(ToytreeError):
+            self.mtree.get_treedist_matrix(workers=0)
+        with self.assertRaises(ToytreeError):
+            get_treedist_matrix([self.trees[0], toytree.rtree.rtree(11)])
+        with self.assertRaises(ToytreeError):
+            toytree.mtree([]).get_treedist_matrix()
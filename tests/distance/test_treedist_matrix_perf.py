@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""Speed of the all-pairs RF matrix vs a per-pair get_treedist_rf loop."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+import toytree
+
+
+@pytest.mark.skipif(
+    os.environ.get("TOYTREE_RUN_PERF_TESTS") != "1",
+    reason="set TOYTREE_RUN_PERF_TESTS=1 to run performance tests",
+)
+def test_treedist_matrix_vs_pairwise_loop() -> None:
+    """Report pairs/s and require a clear speedup over the pair loop."""
+    ntrees = int(os.environ.get("TOYTREE_PERF_NTREES", "100"))
+    ntips = int(os.environ.get("TOYTREE_PERF_NTIPS", "50"))
+    min_speedup = float(os.environ.get("TOYTREE_PERF_MIN_RF_SPEEDUP", "10"))
+
+    trees = [toytree.rtree.rtree(ntips, seed=i) for i in range(ntrees)]
+    npairs = ntrees * (ntrees - 1) // 2
+
+    # warm up lazy imports (scipy.sparse) so they are not timed.
+    toytree.distance.get_treedist_matrix(trees[:2])
+    start = time.perf_counter()
+    dists = toytree.distance.get_treedist_matrix(trees, metric="rf")
+    matrix_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop = np.zeros((ntrees, ntrees))
+    for i in range(ntrees):
+        for j in range(i + 1, ntrees):
+            loop[i, j] = loop[j, i] = toytree.distance.get_treedist_rf(
+                trees[i], trees[j]
+            )
+    loop_time = time.perf_counter() - start
+
+    print(
+        f"\nntrees={ntrees} ntips={ntips} "
+        f"matrix={npairs / matrix_time:.0f} pairs/s "
+        f"loop={npairs / loop_time:.0f} pairs/s "
+        f"speedup={loop_time / matrix_time:.1f}x"
+    )
+    assert np.allclose(dists, loop)
+    assert loop_time / matrix_time >= min_speedup
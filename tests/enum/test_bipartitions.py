@@ -10,9 +10,16 @@ from conftest import PytestCompat
 
 import toytree
 from toytree.enum import iter_bipartitions
+from toytree.enum.src.bipartitions import (
+    _get_mask_bits,
+    _get_split_masks,
+    _get_tip_bit_index,
+)
 
 
 class TestBipartitions(PytestCompat):
+    """Test bipartitions and bitmask splits across rootings."""
+
     def setUp(self):
         """Six tip tree three clades of two."""
         self.tree1 = toytree.tree("(a,b,((c,d)CD,(e,f)EF)X)AB;")
@@ -150,8 +157,31 @@ class TestBipartitions(PytestCompat):
         self.assertEqual(biparts, BIPARTS)
 
     def test_iter_bipartitions_root_equality(self):
+        """Bipartitions do not depend on how the tree is rooted."""
         b1 = set(self.tree1.iter_bipartitions(type=tuple))
         b2 = set(self.tree2.iter_bipartitions(type=tuple))
         b3 = set(self.tree3.iter_bipartitions(type=tuple))
         self.assertEqual(b1, b2)
         self.assertEqual(b2, b3)
+
+    def test_split_masks_match_canonical_bipartitions(self):
+        """Bitmask splits encode the same unrooted splits in any rooting."""
+        index = _get_tip_bit_index(self.tree1.get_tip_labels())
+        names = sorted(index)
+        expected = {frozenset("cd"), frozenset("ef"), frozenset("cdef")}
+        for tree in self.trees:
+            masks = _get_split_masks(tree, index)
+            self.assertEqual(len(masks), 3)
+            splits = {frozenset(names[i] for i in _get_mask_bits(m, 6)) for m in masks}
+            self.assertEqual(splits, expected)
+
+    def test_split_masks_rf_matches_bipartition_sets(self):
+        """RF from bitmask splits equals RF from sorted frozenset splits."""
+        for seed in range(5):
+            t1 = toytree.rtree.rtree(12, seed=seed)
+            t2 = toytree.rtree.rtree(12, seed=seed + 100).root("r0")
+            sets = [
+                set(i.iter_bipartitions(type=frozenset, sort=True)) for i in (t1, t2)
+            ]
+            rf = len(sets[0] ^ sets[1])
+            self.assertEqual(t1.distance.get_treedist_rf(t2), rf)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+"""Tests for vectorized nucleotide likelihoods."""
+
+import numpy as np
+import pytest
+from scipy.linalg import expm
+
+import toytree
+from toytree.infer.src.likelihood import (
+    BASE_ORDER,
+    IUPAC,
+    NucleotideLikelihoodEngine,
+    _compress_alignment,
+    _get_qmatrix,
+)
+from toytree.utils import ToytreeError
+
+
+def _random_alignment(tree, nsites, seed, chars="ACGT"):
+    """Return a dict of random sequences for the tips of a tree."""
+    rng = np.random.default_rng(seed)
+    return {
+        name: "".join(rng.choice(list(chars), nsites)) for name in tree.get_tip_labels()
+    }
+
+
+def _recursive_site_logliks(tree, alignment, qmatrix, freqs):
+    """Return per-site log-likelihoods by recursion with expm per edge."""
+    nsites = len(next(iter(alignment.values())))
+    logliks = []
+    for site in range(nsites):
+        liks = {}
+        for node in tree.traverse("postorder"):
+            if node.is_leaf():
+                bases = IUPAC[alignment[node.name][site]]
+                lik = np.array([i in bases for i in BASE_ORDER], dtype=float)
+            else:
+                lik = np.ones(4)
+                for child in node.children:
+                    lik *= expm(qmatrix * child.dist) @ liks[child]
+            liks[node] = lik
+        logliks.append(np.log(liks[tree.treenode] @ freqs))
+    return np.array(logliks)
+
+
+@pytest.mark.parametrize(
+    "model, kappa, freqs",
+    [
+        ("JC69", 1.0, None),
+        ("K80", 3.0, None),
+        ("TN93", (2.0, 5.0), (0.1, 0.2, 0.3, 0.4)),
+    ],
+)
+def test_log_likelihood_matches_recursive_pruning(model, kappa, freqs):
+    """Vectorized pruning matches per-site recursion for each model."""
+    tree = toytree.rtree.unittree(ntips=7, treeheight=0.3, seed=4)
+    alignment = _random_alignment(tree, 40, seed=4, chars="ACGT-RN")
+    total, sites = toytree.infer.get_tree_log_likelihood(
+        tree, alignment, model=model, kappa=kappa, freqs=freqs
+    )
+    qmatrix, pi = _get_qmatrix(model, kappa, freqs)
+    expected = _recursive_site_logliks(tree, alignment, qmatrix, pi)
+    np.testing.assert_allclose(sites, expected, rtol=1e-10)
+    assert total == pytest.approx(expected.sum())
+
+
+def test_qmatrix_is_normalized_and_stationary():
+    """Rate matrices have unit mean rate and stationary base frequencies."""
+    qmatrix, freqs = _get_qmatrix("TN93", (2.0, 4.0), (0.1, 0.2, 0.3, 0.4))
+    np.testing.assert_allclose(freqs @ qmatrix, 0.0, atol=1e-14)
+    assert -(freqs @ np.diag(qmatrix)) == pytest.approx(1.0)
+
+
+def test_site_patterns_are_compressed():
+    """Identical alignment columns are counted as one weighted pattern."""
+    patterns = _compress_alignment({"a": "AACA-", "b": "GGTG-", "c": "AAtAN"})
+    assert sorted(patterns.weights.tolist()) == [1, 1, 3]
+    assert patterns.partials.shape == (3, 3, 4)
+    index = patterns.index
+    assert index[0] == index[1] == index[3] != index[2] != index[4]
+    assert patterns.weights[index[0]] == 3
+
+
+def test_rooting_does_not_change_log_likelihood():
+    """Reversible models give the same likelihood on unrooted trees."""
+    tree = toytree.rtree.unittree(ntips=8, treeheight=0.2, seed=5)
+    alignment = _random_alignment(tree, 100, seed=5)
+    rooted = toytree.infer.get_tree_log_likelihood(tree, alignment, "K80")[0]
+    unrooted = toytree.infer.get_tree_log_likelihood(tree.unroot(), alignment, "K80")
+    assert unrooted[0] == pytest.approx(rooted)
+
+
+def test_large_polytomy_does_not_underflow():
+    """Per-node scaling keeps site likelihoods finite far below 1e-300."""
+    tree = toytree.tree("(" + ",".join(f"t{i}:0.5" for i in range(2000)) + ");")
+    alignment = _random_alignment(tree, 3, seed=6)
+    engine = NucleotideLikelihoodEngine(tree, alignment, "JC69")
+    _, sites = engine.log_likelihood()
+    qmatrix, freqs = _get_qmatrix("JC69")
+    probs = expm(qmatrix * 0.5)
+    for site, value in enumerate(sites):
+        logs = sum(
+            np.log(probs[:, BASE_ORDER.index(alignment[i][site])])
+            for i in tree.get_tip_labels()
+        )
+        shift = logs.max()
+        expected = shift + np.log(freqs @ np.exp(logs - shift))
+        assert value == pytest.approx(expected)
+
+
+def test_invalid_alignments_raise():
+    """Alignments with bad characters, lengths, or missing tips raise."""
+    tree = toytree.rtree.unittree(ntips=3, seed=1)
+    with pytest.raises(ToytreeError):
+        toytree.infer.get_tree_log_likelihood(tree, {"r0": "AC", "r1": "AC"})
+    with pytest.raises(ToytreeError):
+        toytree.infer.get_tree_log_likelihood(tree, {"r0": "AC", "r1": "AC", "r2": "A"})
+    with pytest.raises(ToytreeError):
+        toytree.infer.get_tree_log_likelihood(
+            tree, {"r0": "AC", "r1": "AC", "r2": "AX"}
+        )
+    with pytest.raises(ToytreeError):
+        toytree.infer.get_tree_log_likelihood(
+            tree, {"r0": "A", "r1": "A", "r2": "A"}, model="GTR"
+        )
+
+
+def test_non_ascii_alignment_characters_raise():
+    """Non-ASCII characters are reported, not read as unknown bases."""
+    tree = toytree.rtree.unittree(ntips=3, seed=1)
+    with pytest.raises(ToytreeError, match="Ñ"):
+        toytree.infer.get_tree_log_likelihood(
+            tree, {"r0": "AC", "r1": "AC", "r2": "AÑ"}
+        )
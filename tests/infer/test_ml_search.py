@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""Tests for maximum likelihood tree search by NNI."""
+
+import numpy as np
+import pytest
+
+import toytree
+from toytree.infer.src.likelihood import get_tree_log_likelihood
+from toytree.infer.src.ml_search import ml_search
+from toytree.utils import ToytreeError
+
+
+def _simulate_alignment(tree, nsites, seed):
+    """Return a dict of JC69 sequences simulated on a tree."""
+    rng = np.random.default_rng(seed)
+    states = {tree.treenode.idx: rng.integers(0, 4, nsites)}
+    for node in tree[-2::-1]:
+        prob = 0.75 * (1 - np.exp(-4 / 3 * node.dist))
+        seq = states[node.up.idx].copy()
+        mask = rng.random(nsites) < prob
+        seq[mask] = rng.integers(0, 4, mask.sum())
+        states[node.idx] = seq
+    return {
+        tree[i].name: "".join("TCAG"[j] for j in states[i]) for i in range(tree.ntips)
+    }
+
+
+def _is_same_unrooted_topology(tree0, tree1):
+    """Return True if two trees have an RF distance of zero."""
+    return toytree.distance.get_treedist_rf(tree0, tree1) == 0
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Return a 12-tip tree and an alignment simulated on it."""
+    tree = toytree.rtree.unittree(12, treeheight=0.3, seed=3)
+    return tree, _simulate_alignment(tree, 600, seed=1)
+
+
+@pytest.mark.parametrize("model", ["JC69", "K80", "TN93"])
+def test_log_likelihood_matches_pruning(data, model):
+    """Reported likelihood matches pruning on the returned tree."""
+    tree, aln = data
+    result = ml_search(aln, tree, model=model, kappa=(2.0, 3.0))
+    expected, _ = get_tree_log_likelihood(result.tree, aln, model, (2.0, 3.0))
+    assert np.isclose(result.log_likelihood, expected)
+    assert result.log_likelihood >= get_tree_log_likelihood(tree, aln, model)[0]
+
+
+def test_recovers_topology_from_random_start(data):
+    """NNI moves from a random tree recover the true topology."""
+    tree, aln = data
+    start = toytree.rtree.unittree(12, seed=9)
+    result = ml_search(aln, start, model="K80")
+    assert result.nmoves > 0
+    assert _is_same_unrooted_topology(result.tree, tree)
+    assert result.log_likelihood > get_tree_log_likelihood(start, aln, "K80")[0]
+    assert result.nevals > 0 and result.evals_per_second > 0
+
+
+def test_default_start_tree(data):
+    """The default starting tree also recovers the true topology."""
+    tree, aln = data
+    result = ml_search(aln, model="JC69")
+    assert _is_same_unrooted_topology(result.tree, tree)
+    assert sorted(result.tree.get_tip_labels()) == sorted(aln)
+
+
+def test_invalid_inputs(data):
+    """Unknown models and mismatched tip names raise ToytreeError."""
+    tree, aln = data
+    with pytest.raises(ToytreeError):
+        ml_search(aln, tree, model="HKY")
+    with pytest.raises(ToytreeError):
+        ml_search({i: aln[i] for i in list(aln)[:5]}, tree)
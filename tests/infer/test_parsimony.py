@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+"""Tests for vectorized Fitch parsimony scores and CI/RI."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import toytree
+from toytree.infer.src.parsimony import (
+    consistency_and_retention_indices,
+    fitch_parsimony_score,
+    fitch_parsimony_scores,
+)
+from toytree.utils import ToytreeError
+
+
+@pytest.fixture(scope="module")
+def tree():
+    """Return a random binary tree shared by tests."""
+    return toytree.rtree.rtree(30, seed=7)
+
+
+def test_scores_match_single_character(tree):
+    """Vectorized scores match the scalar Fitch score of each column."""
+    rng = np.random.default_rng(1)
+    data = rng.integers(0, 4, (tree.ntips, 50))
+    data[:, :10] = rng.integers(0, 2, (tree.ntips, 10))
+    expected = [
+        fitch_parsimony_score(tree, dict(enumerate(data[:, i]))) for i in range(50)
+    ]
+    assert fitch_parsimony_scores(tree, data).tolist() == expected
+
+
+def _brute_force_score(tree, states, nstates):
+    """Return the min number of changes by trying every internal state."""
+    internal = range(tree.ntips, tree.nnodes)
+    best = np.inf
+    for assign in itertools.product(range(nstates), repeat=len(internal)):
+        full = dict(enumerate(states))
+        full.update(zip(internal, assign))
+        changes = sum(full[i.idx] != full[i.up.idx] for i in tree[:-1])
+        best = min(best, changes)
+    return best
+
+
+def test_scores_with_polytomies():
+    """Vectorized and scalar scores agree on a tree with polytomies."""
+    tree = toytree.tree("((a,b,c),(d,(e,f,g)));")
+    data = pd.DataFrame({"x": [0, 1, 2, 0, 1, 1, 0]}, index=list("abcdefg"))
+    trait = dict(zip(list("abcdefg"), data.x))
+    trait = {tree.get_nodes(i)[0].idx: j for i, j in trait.items()}
+    expected = fitch_parsimony_score(tree, trait)
+    assert fitch_parsimony_scores(tree, data).tolist() == [expected]
+    assert expected == 4
+
+
+@pytest.mark.parametrize("newick", ["(a,b,c);", "((a,b),c,d);", "((a,b,c,d),e,f);"])
+def test_scores_with_polytomies_match_brute_force(newick):
+    """Scores on multifurcations match the min changes over all states."""
+    tree = toytree.tree(newick)
+    data = np.array(list(itertools.product(range(3), repeat=tree.ntips))).T
+    expected = [_brute_force_score(tree, col, 3) for col in data.T]
+    assert fitch_parsimony_scores(tree, data).tolist() == expected
+    scores = [fitch_parsimony_score(tree, dict(enumerate(col))) for col in data.T]
+    assert scores == expected
+
+
+def test_scores_dna_ambiguity_and_missing():
+    """IUPAC codes and missing bases are scored as sets of states."""
+    tree = toytree.tree("((a,b),(c,d));")
+    seqs = {"a": "AAGR-", "b": "ACGAT", "c": "CCTGT", "d": "CCTGN"}
+    # col 3: R={A,G} is compatible with A and G, so one change.
+    assert fitch_parsimony_scores(tree, seqs).tolist() == [1, 1, 1, 1, 0]
+
+
+def test_scores_invalid_data(tree):
+    """Invalid shapes, characters and too many states raise."""
+    with pytest.raises(ToytreeError):
+        fitch_parsimony_scores(tree, np.zeros((tree.ntips - 1, 3)))
+    with pytest.raises(ToytreeError):
+        fitch_parsimony_scores(tree, {i: "AXG" for i in tree.get_tip_labels()})
+    with pytest.raises(ToytreeError, match="É"):
+        fitch_parsimony_scores(tree, {i: "AÉG" for i in tree.get_tip_labels()})
+    with pytest.raises(ToytreeError):
+        fitch_parsimony_scores(tree, np.arange(tree.ntips * 100).reshape(-1, 100))
+
+
+def test_indices_matrix_matches_single_traits(tree):
+    """CI/RI of a matrix match those of each trait alone."""
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame(
+        rng.integers(0, 3, (tree.ntips, 4)),
+        index=tree.get_tip_labels(),
+        columns=list("wxyz"),
+    )
+    stats = consistency_and_retention_indices(tree, frame, npermutations=50, rng=1)
+    assert list(stats.index) == list("wxyz")
+    for col in frame.columns:
+        single = consistency_and_retention_indices(
+            tree, frame[col], npermutations=50, rng=1
+        )
+        for key in ("CI", "RI", "RCI", "fitch_parsimony_score"):
+            assert np.isclose(stats.loc[col, key], single[key])
+    assert stats["CI_p-value"].between(0, 1).all()
+
+
+def test_indices_no_homoplasy():
+    """A trait without homoplasy has CI and RI of 1."""
+    tree = toytree.tree("((a,b),(c,d));")
+    stats = consistency_and_retention_indices(
+        tree, {"a": 0, "b": 0, "c": 1, "d": 1}, npermutations=20, rng=1
+    )
+    assert stats["CI"] == 1.0
+    assert stats["RI"] == 1.0
+    assert stats["fitch_parsimony_score"] == 1
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""Tests for maximum parsimony tree search."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import toytree
+from toytree.infer.src.parsimony import Parsimony, fitch_parsimony_scores
+from toytree.infer.src.parsimony_search import parsimony_search
+from toytree.utils import ToytreeError
+
+
+def _simulate_alignment(tree, nsites, seed):
+    """Return a dict of JC69 sequences simulated on a tree."""
+    rng = np.random.default_rng(seed)
+    states = {tree.treenode.idx: rng.integers(0, 4, nsites)}
+    for node in tree[-2::-1]:
+        prob = 0.75 * (1 - np.exp(-4 / 3 * node.dist))
+        seq = states[node.up.idx].copy()
+        mask = rng.random(nsites) < prob
+        seq[mask] = rng.integers(0, 4, mask.sum())
+        states[node.idx] = seq
+    return {
+        tree[i].name: "".join("TCAG"[j] for j in states[i]) for i in range(tree.ntips)
+    }
+
+
+def _iter_unrooted_newicks(names):
+    """Yield every unrooted binary topology by stepwise addition."""
+    if len(names) == 3:
+        yield "({},{},{})".format(*names)
+        return
+    for newick in _iter_unrooted_newicks(names[:-1]):
+        # attach the last name above each tip or clade of the newick.
+        for start, end in _iter_subtree_spans(newick):
+            sub = newick[start:end]
+            yield newick[:start] + f"({sub},{names[-1]})" + newick[end:]
+
+
+def _iter_subtree_spans(newick):
+    """Yield (start, end) of every tip and non-root clade in a newick."""
+    stack = []
+    for idx, char in enumerate(newick):
+        if char == "(":
+            stack.append(idx)
+        elif char == ")":
+            start = stack.pop()
+            if stack:
+                yield start, idx + 1
+        elif char.isalpha():
+            yield idx, idx + 1
+
+
+def _score(tree, data):
+    """Return the total Fitch score of a tree."""
+    return int(fitch_parsimony_scores(tree, data).sum())
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Return a tree and an alignment simulated on it."""
+    tree = toytree.rtree.unittree(16, treeheight=0.4, seed=3)
+    return tree, _simulate_alignment(tree, 300, seed=1)
+
+
+@pytest.mark.parametrize("moves", ["spr", "nni"])
+def test_score_matches_fitch(data, moves):
+    """Returned scores match public Fitch scores of the unrooted trees."""
+    tree, aln = data
+    result = parsimony_search(aln, nstarts=3, moves=moves, seed=1)
+    assert result.score == _score(result.tree, aln)
+    assert result.score == result.scores.min()
+    for score, found in zip(result.scores, result.trees):
+        assert score == _score(found, aln)
+    assert result.score <= _score(tree, aln)
+    assert sorted(result.tree.get_tip_labels()) == sorted(aln)
+
+
+def test_finds_optimum_of_small_dataset():
+    """SPR search finds the best of all 945 unrooted 7-tip trees."""
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame(rng.integers(0, 3, (7, 30)), index=list("abcdefg"))
+    newicks = list(_iter_unrooted_newicks(list("abcdefg")))
+    assert len(newicks) == 945
+    best = min(_score(toytree.tree(f"{i};"), frame) for i in newicks)
+    result = parsimony_search(frame, nstarts=5, seed=2)
+    assert result.score == best
+
+
+def test_seed_is_reproducible_across_workers(data):
+    """Results depend on the seed and not on the number of workers."""
+    _, aln = data
+    result0 = parsimony_search(aln, nstarts=3, seed=5, workers=1)
+    result1 = parsimony_search(aln, nstarts=3, seed=5, workers=2)
+    assert result0.scores.tolist() == result1.scores.tolist()
+    assert toytree.distance.get_treedist_rf(result0.tree, result1.tree) == 0
+
+
+def test_parsimony_class(data):
+    """The Parsimony class scores the tree found by its search."""
+    _, aln = data
+    tool = Parsimony(aln)
+    result = tool.search(nstarts=2, seed=1)
+    assert tool.get_score(result.tree) == result.score
+
+
+def test_invalid_inputs(data):
+    """Invalid moves, workers and too few tips raise."""
+    _, aln = data
+    with pytest.raises(ToytreeError):
+        parsimony_search(aln, moves="tbr")
+    with pytest.raises(ToytreeError):
+        parsimony_search(aln, workers=0)
+    with pytest.raises(ToytreeError):
+        parsimony_search({i: aln[i] for i in list(aln)[:3]})
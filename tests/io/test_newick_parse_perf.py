@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""Throughput of the plain Newick fast path vs the full metadata parser."""
+
+from __future__ import annotations
+
+import os
+import time
+from functools import partial
+
+import numpy as np
+import pytest
+
+import toytree
+from toytree.io.src.newick import meta_parser, parse_newick_string_custom
+
+
+def _throughput(parser, newicks: list[str]) -> tuple[float, float]:
+    """Return (trees/s, MB/s) for parsing every Newick string once."""
+    nbytes = sum(len(i.encode("utf-8")) for i in newicks)
+    start = time.perf_counter()
+    for newick in newicks:
+        parser(newick)
+    elapsed = time.perf_counter() - start
+    return len(newicks) / elapsed, nbytes / 1e6 / elapsed
+
+
+@pytest.mark.skipif(
+    os.environ.get("TOYTREE_RUN_PERF_TESTS") != "1",
+    reason="set TOYTREE_RUN_PERF_TESTS=1 to run performance tests",
+)
+def test_plain_newick_fast_path_throughput() -> None:
+    """Report trees/s and MB/s and require a clear fast-path speedup."""
+    ntrees = int(os.environ.get("TOYTREE_PERF_NTREES", "200"))
+    ntips = int(os.environ.get("TOYTREE_PERF_NTIPS", "200"))
+    min_speedup = float(os.environ.get("TOYTREE_PERF_MIN_PARSE_SPEEDUP", "1.5"))
+
+    rng = np.random.default_rng(123)
+    tree = toytree.rtree.rtree(ntips, seed=123)
+    newicks = []
+    for _ in range(ntrees):
+        tree = tree.set_node_data("dist", rng.exponential(size=tree.nnodes))
+        tree = tree.set_node_data("support", rng.uniform(size=tree.nnodes))
+        newicks.append(tree.write())
+
+    # the full parser with default hooks, as used before the fast path.
+    full = partial(
+        parse_newick_string_custom,
+        feat_formatter=partial(meta_parser, prefix="&"),
+    )
+    full_trees, full_mb = _throughput(full, newicks)
+    fast_trees, fast_mb = _throughput(toytree.io.parse_newick_string, newicks)
+    print(
+        f"\nntrees={ntrees} ntips={ntips} "
+        f"full={full_trees:.1f} trees/s {full_mb:.3f} MB/s "
+        f"fast={fast_trees:.1f} trees/s {fast_mb:.3f} MB/s "
+        f"speedup={fast_trees / full_trees:.2f}x"
+    )
+    assert fast_trees / full_trees >= min_speedup
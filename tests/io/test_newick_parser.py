@@ -153,3 +153,28 @@ def test_invalid_newick_inputs_raise_toytree_error(newick: str, match: str) -> N
         kwargs["feature_prefix"] = "&&NXH:"
     with pytest.raises(ToytreeError, match=match):
         toytree.tree(newick, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "newick",
+    [
+        "((a:1,b:2)0.9:1,c:3);",
+        "((a,b)X,(c,d)Y)R:2;",
+        "((a,b)90,(c,d)80)100;",
+        "((a,b)1,(c,d)2,(e,f)x)3;",
+        "(((a)),(,));",
+        "(a:1e-3, b:2E2);",
+    ],
+)
+@pytest.mark.parametrize("internal_labels", [None, "support", "name", "label"])
+def test_plain_newick_fast_path_matches_custom_parser(
+    newick: str, internal_labels: str | None, capsys
+) -> None:
+    """Plain Newick parsed on the fast path matches the full parser."""
+    fast = toytree.io.parse_newick_string(newick, internal_labels=internal_labels)
+    fast_err = capsys.readouterr().err
+    full = parse_newick_string_custom(newick, internal_labels=internal_labels)
+    assert capsys.readouterr().err == fast_err
+    assert fast.features == full.features
+    assert fast.edge_features == full.edge_features
+    assert fast.get_node_data().equals(full.get_node_data())
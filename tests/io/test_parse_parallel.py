@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""Tests for parallel multi-tree parsing with `toytree.mtree(workers=N)`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import toytree
+from toytree.io.src.parse_parallel import (
+    _decode_tree,
+    _encode_tree,
+    parse_newicks_parallel,
+)
+from toytree.utils import ToytreeError
+
+NEXUS = """\
+#NEXUS
+begin trees;
+    translate
+        1 apple,
+        2 berry,
+        3 cherry
+    ;
+    tree t0 = ((1:1,2:1):1,3:2);
+    tree t1 = ((1:1,3:1):1,2:2);
+    tree t2 = ((2:1,3:1):1,1:2);
+end;
+"""
+
+
+def test_encode_decode_round_trip_preserves_features() -> None:
+    """The compact transport format should preserve data and order."""
+    tree = toytree.tree("((a[&x=1]:1,b:2)0.9:1,((c,d)[&y=red]:3,e));")
+    tree[2].z = [1, 2]
+    new = _decode_tree(_encode_tree(tree))
+    assert new.write(features=None) == tree.write(features=None)
+    assert new.features == tree.features
+    assert new.edge_features == tree.edge_features
+    assert new.get_node_data().equals(tree.get_node_data())
+
+
+def test_mtree_workers_matches_serial(tmp_path: Path) -> None:
+    """Trees parsed in a process pool are returned in input order."""
+    trees = [toytree.rtree.bdtree(10, seed=i) for i in range(12)]
+    path = tmp_path / "trees.nwk"
+    path.write_text("\n".join(i.write() for i in trees), encoding="utf-8")
+    serial = toytree.mtree(path)
+    parallel = toytree.mtree(path, workers=2)
+    assert [i.write() for i in parallel] == [i.write() for i in serial]
+    for tre0, tre1 in zip(serial, parallel):
+        assert tre0.get_node_data().equals(tre1.get_node_data())
+
+
+def test_mtree_workers_applies_nexus_translation() -> None:
+    """NEXUS translate blocks are applied to trees parsed in workers."""
+    mtre = toytree.mtree(NEXUS, workers=2)
+    assert [i.get_tip_labels() for i in mtre] == [
+        i.get_tip_labels() for i in toytree.mtree(NEXUS)
+    ]
+    assert mtre[1].get_tip_labels() == ["apple", "cherry", "berry"]
+
+
+def test_parse_newicks_parallel_forwards_kwargs() -> None:
+    """Parser kwargs are forwarded to each worker."""
+    newicks = ["((a[&&NHX:S=x]:1,b:1):1,c:1);"] * 3
+    trees = parse_newicks_parallel(
+        newicks, workers=2, feature_prefix="&&NHX:", feature_delim=":"
+    )
+    assert [i[0].S for i in trees] == ["x"] * 3
+
+
+@pytest.mark.parametrize("workers", [0, -1, 1.5])
+def test_parse_newicks_parallel_invalid_workers_raises(workers) -> None:
+    """The number of workers must be a positive int or None."""
+    with pytest.raises(ToytreeError):
+        parse_newicks_parallel(["((a,b),c);", "((a,c),b);"], workers=workers)
+
+
+@pytest.mark.parametrize("workers", [0, -1, 1.5])
+def test_mtree_invalid_workers_raises_for_single_tree(workers) -> None:
+    """Invalid workers raise even if there is only one tree to parse."""
+    with pytest.raises(ToytreeError):
+        toytree.mtree("((a,b),c);", workers=workers)
+
+
+def test_mtree_workers_malformed_tree_raises() -> None:
+    """Errors raised in worker processes propagate to the caller."""
+    with pytest.raises(ToytreeError):
+        toytree.mtree("((a,b),c);\n((a,c),b;\n", workers=2)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""Tests for streaming multi-tree readers in `toytree.io`."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+from textwrap import dedent
+
+import pytest
+
+import toytree
+from toytree.utils import ToytreeError
+
+NEXUS = dedent(
+    """\
+    #NEXUS
+    begin taxa;
+        dimensions ntax=3;
+    end;
+    begin trees;
+        translate
+            1 apple,
+            2 berry,
+            3 cherry
+        ;
+        tree STATE_0 = [&R] ((1:1,2:1):1,3:2);
+        tree STATE_1 = [&R] ((1:1,3:1):1,
+            2:2);
+        tree STATE_2 = [&R] ((2:1,3:1):1,1:2);
+        tree STATE_3 = [&R] ((1:1,2:1):1,3:2);
+    end;
+    """
+)
+
+
+def _labels(trees) -> list[list[str]]:
+    return [tree.get_tip_labels() for tree in trees]
+
+
+def test_iter_trees_matches_mtree_for_newick_file(tmp_path: Path) -> None:
+    """Streamed trees should match those parsed by toytree.mtree."""
+    trees = [toytree.rtree.unittree(6, seed=i) for i in range(5)]
+    path = tmp_path / "trees.nwk"
+    path.write_text("\n".join(i.write() for i in trees) + "\n", encoding="utf-8")
+    streamed = list(toytree.io.iter_trees(path))
+    assert [i.write() for i in streamed] == [i.write() for i in toytree.mtree(path)]
+
+
+def test_iter_trees_applies_nexus_translation(tmp_path: Path) -> None:
+    """NEXUS translate blocks should be applied to streamed trees."""
+    path = tmp_path / "trees.nex"
+    path.write_text(NEXUS, encoding="utf-8")
+    assert _labels(toytree.io.iter_trees(path)) == _labels(toytree.mtree(path))
+    assert _labels(toytree.io.iter_trees(str(path)))[1] == ["apple", "cherry", "berry"]
+
+
+def test_iter_trees_burnin_and_thin() -> None:
+    """Burnin skips leading trees and thin keeps every n-th tree."""
+    newicks = [f"((a{i},b),c);" for i in range(10)]
+    text = "\n".join(newicks)
+    trees = list(toytree.io.iter_trees(text, burnin=3, thin=3))
+    assert [i.get_tip_labels()[0] for i in trees] == ["a3", "a6", "a9"]
+    trees = list(toytree.io.iter_trees(text, burnin=0.5))
+    assert [i.get_tip_labels()[0] for i in trees] == [f"a{i}" for i in range(5, 10)]
+
+
+def test_iter_newicks_handles_multiline_and_shared_lines() -> None:
+    """Trees are split on ';' regardless of line breaks."""
+    text = "((a,b),\nc);((a,c),b);\n\n((b, c),a);\n"
+    newicks = [i for i, _ in toytree.io.iter_newicks(text)]
+    assert newicks == ["((a,b),c);", "((a,c),b);", "((b,c),a);"]
+
+
+def test_iter_trees_reads_gzipped_files(tmp_path: Path) -> None:
+    """Gzip-compressed files are decompressed while streaming."""
+    path = tmp_path / "trees.nex.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as out:
+        out.write(NEXUS)
+    assert len(list(toytree.io.iter_trees(path, thin=2))) == 2
+
+
+def test_iter_trees_is_lazy() -> None:
+    """Trees are parsed only as they are consumed."""
+    gen = toytree.io.iter_trees("((a,b),c);\n((a,c),b;\n")
+    assert next(gen).ntips == 3
+    with pytest.raises(ToytreeError):
+        next(gen)
+
+
+@pytest.mark.parametrize("kwargs", [{"burnin": -1}, {"thin": 0}, {"burnin": 1.5}])
+def test_iter_trees_invalid_args_raise(kwargs) -> None:
+    """Invalid burnin or thin values raise ToytreeError."""
+    with pytest.raises(ToytreeError):
+        list(toytree.io.iter_trees("((a,b),c);", **kwargs))
+
+
+def test_iter_trees_unterminated_newick_raises() -> None:
+    """A final tree without ';' raises ToytreeError."""
+    with pytest.raises(ToytreeError, match="end with"):
+        list(toytree.io.iter_newicks("((a,b),c);\n((a,c),b)\n"))
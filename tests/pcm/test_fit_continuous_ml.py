@@ -114,3 +114,60 @@ def test_fit_accepts_new_bounds_arg_names(tree_with_x):
         bounds_r=(-5.0, 5.0),
     )
     assert isinstance(out2, PCMContinuousMLFitResult)
+
+
+def test_pruning_fit_matches_dense_gaussian_likelihood(tree_with_x):
+    """Pruning-based BM/OU/EB fits should match dense GLS likelihoods."""
+    tree = tree_with_x
+    y = tree.get_node_data("X").iloc[: tree.ntips].to_numpy(dtype=float)
+    shared = tree.pcm.get_vcv_matrix_from_tree()
+    times = np.diag(shared)
+    alpha, rate = 0.8, -1.2
+    kernels = {
+        "BM": shared,
+        "OU": np.exp(-alpha * (times[:, None] + times[None, :] - 2 * shared))
+        * (1 - np.exp(-2 * alpha * shared))
+        / (2 * alpha),
+        "EB": np.expm1(rate * shared) / rate,
+    }
+    for model, kern in kernels.items():
+        ones = np.ones(y.size)
+        mu = (ones @ np.linalg.solve(kern, y)) / (ones @ np.linalg.solve(kern, ones))
+        res = y - mu
+        sigma2 = res @ np.linalg.solve(kern, res) / y.size
+        loglik = -0.5 * (
+            y.size * np.log(2 * np.pi * sigma2) + np.linalg.slogdet(kern)[1] + y.size
+        )
+        out = toytree.pcm.fit_continuous_ml(
+            tree,
+            "X",
+            model=model,
+            bounds_alpha=(alpha, alpha + 1e-9),
+            bounds_r=(rate, rate + 1e-9),
+        )
+        assert out.mu == pytest.approx(mu, rel=1e-6)
+        assert out.sigma2 == pytest.approx(sigma2, rel=1e-6)
+        assert out.log_likelihood == pytest.approx(loglik, rel=1e-6)
+
+
+def test_infer_states_matches_dense_conditioning(tree_with_x):
+    """Two-pass pruning node states should match dense Gaussian conditioning."""
+    tree = tree_with_x
+    out = tree.pcm.infer_ancestral_states_continuous_ml("X", model="BM")
+    fit = out["model_fit"]
+    data = out["data"]
+
+    ntips = tree.ntips
+    shared = np.zeros((tree.nnodes, tree.nnodes))
+    for i in range(tree.nnodes):
+        for j in range(tree.nnodes):
+            mrca = tree.get_mrca_node(i, j)
+            shared[i, j] = tree.distance.get_node_distance(mrca, tree.treenode)
+    cov = fit.sigma2 * shared
+    y = tree.get_node_data("X").iloc[:ntips].to_numpy(dtype=float)
+    c_tt = cov[:ntips, :ntips]
+    c_it = cov[ntips:, :ntips]
+    mean = fit.mu + c_it @ np.linalg.solve(c_tt, y - fit.mu)
+    var = np.diag(cov[ntips:, ntips:] - c_it @ np.linalg.solve(c_tt, c_it.T))
+    assert np.allclose(data["X_anc"].iloc[ntips:], mean)
+    assert np.allclose(data["X_anc_var"].iloc[ntips:], var)
@@ -12,6 +12,7 @@ from toytree.pcm.src.sim.sim_discrete import MarkovModel
 from toytree.pcm.src.traits.fit_discrete_ctmc import (
     DiscreteMarkovModelFit,
     fit_discrete_ctmc,
+    fit_discrete_ctmc_multi,
     infer_ancestral_states_discrete_ctmc,
 )
 from toytree.utils import ToytreeError
@@ -335,6 +336,9 @@ class TestDiscreteMarkovModelFit(PytestCompat):
             fixed_rates=fixed_rates,
         )
         self.assertTrue(np.isfinite(fit.log_likelihood))
+        # impossible data are penalized on the scale of log(1e-300) per edge.
+        floor = (tree.nnodes - 1) * np.log(1e-300)
+        self.assertAlmostEqual(fit.log_likelihood, floor)
 
         err = io.StringIO()
         with warnings.catch_warnings(record=True) as caught:
@@ -408,3 +412,126 @@ class TestDiscreteMarkovModelFit(PytestCompat):
             model="SYM",
         )
         self.assertTrue(np.isfinite(result.log_likelihood))
+
+    def test_log_likelihood_matches_expm_pruning(self):
+        """Batched pruning should match per-edge expm pruning."""
+        from scipy.linalg import expm
+
+        tree = toytree.rtree.bdtree(ntips=12, seed=5)
+        tree = tree.mod.collapse_nodes(14, 16)
+        rng = np.random.default_rng(5)
+        data = pd.Series(rng.integers(0, 3, tree.ntips), index=range(tree.ntips))
+        data[3] = np.nan
+        fitter = DiscreteMarkovModelFit(tree, data, nstates=3, model="ARD")
+        params = rng.normal(size=fitter._parameter_count())
+        qmatrix, _, freqs = fitter._build_qmatrix(params)
+
+        liks = {}
+        for node in tree.traverse("postorder"):
+            lik = np.ones(3)
+            for child in node.children:
+                lik *= expm(qmatrix * child.dist) @ liks[child]
+            if node.is_leaf() and not np.isnan(data[node.idx]):
+                lik *= np.eye(3)[int(data[node.idx])]
+            liks[node] = lik
+        expected = np.log(liks[tree.treenode] @ freqs)
+        self.assertAlmostEqual(-fitter._neg_log_likelihood(params), expected, places=10)
+
+    def test_posteriors_condition_on_internal_observations(self):
+        """Posteriors should match enumeration over all unobserved states."""
+        import itertools
+
+        from scipy.linalg import expm
+
+        tree = toytree.rtree.bdtree(ntips=5, seed=3)
+        data = pd.Series([0, 1, 2, np.nan, 1] + [np.nan] * (tree.nnodes - 5))
+        data[tree.nnodes - 2] = 2
+        fitter = DiscreteMarkovModelFit(tree, data, nstates=3, model="ARD")
+        params = np.random.default_rng(0).normal(size=fitter._parameter_count())
+        qmatrix, _, freqs = fitter._build_qmatrix(params)
+        post, _ = fitter._compute_node_posteriors(qmatrix, freqs)
+
+        parents = tree._get_parent_idxs()
+        probs = [expm(qmatrix * tree[i].dist) for i in range(tree.nnodes)]
+        unobs = np.flatnonzero(data.isna())
+        expected = np.zeros((tree.nnodes, 3))
+        for combo in itertools.product(range(3), repeat=unobs.size):
+            states = data.to_numpy().copy()
+            states[unobs] = combo
+            states = states.astype(int)
+            prob = freqs[states[-1]]
+            for idx in range(tree.nnodes - 1):
+                prob *= probs[idx][states[parents[idx]], states[idx]]
+            expected[np.arange(tree.nnodes), states] += prob
+        expected /= expected.sum(axis=1, keepdims=True)
+        np.testing.assert_allclose(post.to_numpy(), expected, atol=1e-12)
+
+    def test_log_likelihood_does_not_underflow_on_large_tree(self):
+        """Scaled pruning keeps likelihoods finite below 1e-300."""
+        tree = toytree.rtree.bdtree(ntips=2000, seed=1)
+        data = toytree.pcm.simulate_discrete_trait(
+            tree=tree, nstates=3, model="ER", tips_only=True, seed=1
+        )
+        fitter = DiscreteMarkovModelFit(tree, data, nstates=3, model="ER")
+        loglik = -fitter._neg_log_likelihood(np.zeros(1))
+        self.assertTrue(np.isfinite(loglik))
+        self.assertLess(loglik, np.log(1e-300))
+        post, _ = fitter._compute_node_posteriors(*fitter._build_qmatrix([0.0])[::2])
+        np.testing.assert_allclose(post.to_numpy().sum(axis=1), 1.0)
+
+    def _character_matrix(self, tree, ncols=12):
+        """Return a tips x characters DataFrame with repeated columns."""
+        cols = {}
+        for idx in range(ncols):
+            data = toytree.pcm.simulate_discrete_trait(
+                tree=tree, nstates=3, model="ER", tips_only=True, seed=idx % 5
+            )
+            cols[f"c{idx}"] = data.to_numpy()
+        frame = pd.DataFrame(cols, index=tree.get_tip_labels())
+        frame.iloc[2, 1] = np.nan
+        return frame
+
+    def test_multi_character_likelihood_sums_site_patterns(self):
+        """Shared-model likelihood is the sum over characters.
+
+        ER is used so that the result does not depend on how each
+        single character's observed states are mapped to indices.
+        """
+        tree = toytree.rtree.bdtree(ntips=15, seed=8)
+        frame = self._character_matrix(tree)
+        fitter = DiscreteMarkovModelFit(tree, frame, nstates=3, model="ER")
+        self.assertEqual(fitter.partials.shape[:2], (tree.nnodes, 6))
+        self.assertEqual(fitter.pattern_weights.sum(), frame.shape[1])
+
+        params = np.random.default_rng(8).normal(size=fitter._parameter_count())
+        qmatrix, _, freqs = fitter._build_qmatrix(params)
+        expected = sum(
+            DiscreteMarkovModelFit(tree, frame[i], 3, "ER")._log_likelihood(
+                qmatrix, freqs
+            )
+            for i in frame.columns
+        )
+        self.assertAlmostEqual(fitter._log_likelihood(qmatrix, freqs), expected)
+        result = fit_discrete_ctmc_multi(tree, frame, nstates=3, model="ER")
+        self.assertTrue(np.isfinite(result.log_likelihood))
+
+    def test_multi_character_independent_fits(self):
+        """Independent fits match single-trait fits in serial or parallel."""
+        tree = toytree.rtree.bdtree(ntips=10, seed=9)
+        frame = self._character_matrix(tree, ncols=6)
+        serial = fit_discrete_ctmc_multi(tree, frame, 3, "ER", independent=True)
+        parallel = fit_discrete_ctmc_multi(
+            tree, frame, 3, "ER", independent=True, workers=2
+        )
+        self.assertEqual(list(serial), list(frame.columns))
+        for name in frame.columns:
+            single = fit_discrete_ctmc(tree, frame[name], nstates=3, model="ER")
+            self.assertAlmostEqual(serial[name].log_likelihood, single.log_likelihood)
+            self.assertAlmostEqual(parallel[name].log_likelihood, single.log_likelihood)
+
+    def test_multi_character_rejects_series(self):
+        """Multi-character fitting requires a DataFrame."""
+        tree = toytree.rtree.unittree(ntips=4, treeheight=1.0, seed=3)
+        data = pd.Series([0, 1, 0, 1], index=tree.get_tip_labels())
+        with self.assertRaises(ToytreeError):
+            fit_discrete_ctmc_multi(tree, data, nstates=2, model="ER")
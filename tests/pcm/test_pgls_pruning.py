@@ -409,3 +409,106 @@ def test_infer_output_source_labels_for_exact_and_noisy_observed(tree, data):
     assert res.loc[0, "source"] == "observed_exact"
     assert res.loc[1, "source"] == "observed_noisy"
     assert float(res.loc[0, "variance"]) == pytest.approx(0.0, abs=1e-12)
+
+
+def test_three_point_matches_dense_ou_covariance():
+    """Edge-wise pruning should match dense solves for an OU-type process."""
+    from toytree.pcm.src.phylolinalg.pgls import PhyloPruningEngine
+
+    tree = toytree.rtree.rtree(12, seed=3).mod.collapse_nodes(13)
+    rng = np.random.default_rng(3)
+    tree = tree.set_node_data("dist", rng.uniform(0.1, 1.0, tree.nnodes))
+    engine = PhyloPruningEngine(tree)
+    alpha = 0.7
+    dists = np.array([i.dist for i in tree])
+    dists[-1] = 0.0
+    lengths = -np.expm1(-2 * alpha * dists) / (2 * alpha)
+    scales = np.exp(-alpha * dists)
+
+    # dense covariance: Cov(x_i, x_j) = sum over shared edges e of
+    # lengths[e] * prod(scales on the paths from e down to i and j)
+    paths = [[tree[i]] + list(tree[i].iter_ancestors())[:-1] for i in range(12)]
+    cov = np.zeros((12, 12))
+    for i in range(12):
+        for j in range(12):
+            for node in set(paths[i]) & set(paths[j]):
+                below_i = paths[i][: paths[i].index(node)]
+                below_j = paths[j][: paths[j].index(node)]
+                cov[i, j] += lengths[node.idx] * np.prod(
+                    [scales[n.idx] for n in below_i + below_j]
+                )
+
+    X = rng.normal(size=(12, 2))
+    quad, logdet = engine.three_point(X, lengths, scales)
+    assert np.allclose(quad, X.T @ np.linalg.solve(cov, X))
+    assert logdet == pytest.approx(np.linalg.slogdet(cov)[1])
+
+    mean, var = engine.conditional_node_states(X[:, 0], lengths, scales)
+    assert np.allclose(mean[:12], X[:, 0])
+    assert np.all(var[:12] == 0)
+    assert np.all(var[12:] >= 0)
+
+
+def test_cross_products_match_bilinear_recursion():
+    """Matrix pruning should match pairwise bilinear forms on a polytomy."""
+    from toytree.pcm.src.phylolinalg.pgls import PhyloPruningEngine
+
+    tree = toytree.rtree.rtree(12, seed=3).mod.collapse_nodes(13)
+    engine = PhyloPruningEngine(tree.mod.edges_scale_to_root_height(1.0))
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(12, 2))
+    Y = rng.normal(size=(12, 3))
+    obs_var = rng.uniform(0, 0.1, 12)
+    xtx, xty, yty, logdet = engine.cross_products(X, Y, 0.7, obs_var)
+    for i in range(2):
+        for j in range(2):
+            quad, ldet = engine.bilinear_and_logdet(X[:, i], X[:, j], 0.7, obs_var)
+            assert xtx[i, j] == pytest.approx(quad)
+            assert logdet == pytest.approx(ldet)
+        for j in range(3):
+            quad, _ = engine.bilinear_and_logdet(X[:, i], Y[:, j], 0.7, obs_var)
+            assert xty[i, j] == pytest.approx(quad)
+    for j in range(3):
+        quad, _ = engine.bilinear_and_logdet(Y[:, j], Y[:, j], 0.7, obs_var)
+        assert yty[j] == pytest.approx(quad)
+
+
+def test_pgls_many_matches_pgls(tree, data):
+    """Batched fits should match single fits at fixed and grid lambdas."""
+    data = data.assign(t2=data.t0 * 2 + 1, t3=data.t1 - data.t0)
+    responses = ["t0", "t2", "t3"]
+    fit = tree.pcm.pgls_many(data, responses=responses, predictors="t1", lambda_=0.5)
+    assert fit.params.index.tolist() == responses
+    assert fit.params.columns.tolist() == ["Intercept", "t1"]
+    for name in responses[:2]:
+        one = toytree.pcm.pgls(tree, f"{name} ~ t1", data=data, lambda_=0.5)
+        assert np.allclose(fit.params.loc[name], one.params)
+        assert np.allclose(fit.bse.loc[name], one.bse)
+        assert fit.log_likelihood[name] == pytest.approx(one.log_likelihood)
+        assert fit.sigma2[name] == pytest.approx(one.sigma2)
+
+    grid = np.linspace(0, 1, 11)
+    fit = toytree.pcm.pgls_many(tree, data, responses, "t1", lambda_grid=grid)
+    assert fit.lambda_optimized
+    assert fit.lambda_profile.shape == (3, 11)
+    for name in responses:
+        lam = fit.lambda_[name]
+        assert lam in grid
+        one = toytree.pcm.pgls(tree, f"{name} ~ t1", data=data, lambda_=lam)
+        assert fit.log_likelihood[name] == pytest.approx(one.log_likelihood)
+        assert fit.log_likelihood[name] == fit.lambda_profile.loc[name].max()
+
+
+def test_pgls_many_drops_missing_predictors_and_validates(tree, data):
+    """Rows missing predictors are dropped; missing responses raise."""
+    data = data.copy()
+    data.iloc[0, data.columns.get_loc("t1")] = np.nan
+    fit = toytree.pcm.pgls_many(tree, data, ["t0"], "t1", lambda_=0.5)
+    assert fit.nobs == tree.ntips - 1
+    data.iloc[1, data.columns.get_loc("t0")] = np.nan
+    with pytest.raises(ToytreeError):
+        toytree.pcm.pgls_many(tree, data, ["t0"], "t1")
+    with pytest.raises(ToytreeError):
+        toytree.pcm.pgls_many(tree, data, ["xyz"], "t1")
+    with pytest.raises(ToytreeError):
+        toytree.pcm.pgls_many(tree, data, ["t1"], "t0", lambda_=-1)
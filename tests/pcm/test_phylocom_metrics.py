@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+"""Tests for phylogenetic community metrics and null models."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+import toytree
+from toytree.pcm.src import phylocom
+from toytree.utils import ToytreeError
+
+
+@pytest.fixture
+def tree_matrix():
+    """Return a tree and abundance matrix with empty and singleton sites."""
+    tree = toytree.rtree.bdtree(25, seed=3)
+    rng = np.random.default_rng(1)
+    arr = (rng.random((12, 25)) < 0.3) * rng.integers(1, 5, (12, 25))
+    arr[0] = 0
+    arr[1] = 0
+    arr[1, 3] = 2
+    return tree, arr
+
+
+def _get_pd(tree, tips):
+    """Return Faith's PD by walking from each tip to the root."""
+    idxs = set()
+    for tip in tips:
+        node = tree[int(tip)]
+        while not node.is_root():
+            idxs.add(node.idx)
+            node = node.up
+    return sum(tree[i].dist for i in idxs)
+
+
+def test_alpha_metrics_match_distance_matrix(tree_matrix):
+    """PD, MPD and MNTD match values computed from tip distances."""
+    tree, arr = tree_matrix
+    dists = toytree.distance.get_tip_distance_matrix(tree)
+    pdiv = phylocom.get_faith_pd(tree, arr)
+    mpd = phylocom.get_mean_pairwise_distance(tree, arr)
+    mpd_w = phylocom.get_mean_pairwise_distance(tree, arr, abundance_weighted=True)
+    mntd = phylocom.get_mean_nearest_neighbor_distance(tree, arr)
+    mntd_w = phylocom.get_mean_nearest_neighbor_distance(tree, arr, True)
+    for site in range(arr.shape[0]):
+        tips = np.flatnonzero(arr[site])
+        assert np.isclose(pdiv[site], _get_pd(tree, tips))
+        if tips.size < 2:
+            assert np.isnan(mpd[site]) and np.isnan(mntd[site])
+            continue
+        sub = dists[np.ix_(tips, tips)]
+        weights = np.outer(arr[site, tips], arr[site, tips])
+        np.fill_diagonal(weights, 0)
+        assert np.isclose(mpd[site], sub[np.triu_indices(tips.size, 1)].mean())
+        assert np.isclose(mpd_w[site], (sub * weights).sum() / weights.sum())
+        np.fill_diagonal(sub, np.inf)
+        nearest = sub.min(axis=1)
+        assert np.isclose(mntd[site], nearest.mean())
+        assert np.isclose(mntd_w[site], np.average(nearest, weights=arr[site, tips]))
+
+
+def test_faith_pd_without_root(tree_matrix):
+    """PD without the root excludes edges above the sample MRCA."""
+    tree, arr = tree_matrix
+    pdiv = phylocom.get_faith_pd(tree, arr, include_root=False)
+    for site in range(2, arr.shape[0]):
+        tips = np.flatnonzero(arr[site])
+        mrca = tree.get_mrca_node(*tips.tolist())
+        above = _get_pd(tree, [mrca.idx]) if not mrca.is_root() else 0
+        assert np.isclose(pdiv[site], _get_pd(tree, tips) - above)
+    assert pdiv[1] == 0
+
+
+def test_dataframe_input_matched_by_name(tree_matrix):
+    """DataFrame columns are matched to tips by name in any order."""
+    tree, arr = tree_matrix
+    frame = pd.DataFrame(arr, columns=tree.get_tip_labels()).iloc[:, ::-1]
+    frame = frame.loc[:, frame.sum() > 0]
+    expect = phylocom.get_faith_pd(tree, sparse.csr_matrix(arr))
+    result = phylocom.get_faith_pd(tree, frame)
+    assert np.allclose(result, expect)
+    richness = phylocom.get_species_richness(tree, frame)
+    assert richness.tolist() == (arr > 0).sum(axis=1).tolist()
+    frame["xyz"] = 1
+    with pytest.raises(ToytreeError):
+        phylocom.get_faith_pd(tree, frame)
+
+
+def test_beta_metrics_match_pairwise_pd(tree_matrix):
+    """UniFrac and PhyloSor match shared PD from pairs of sites."""
+    tree, arr = tree_matrix
+    unifrac = phylocom.get_unifrac(tree, arr).to_numpy()
+    phylosor = phylocom.get_phylogenetic_sorensen_index(tree, arr).to_numpy()
+    for i in range(2, arr.shape[0]):
+        for j in range(2, arr.shape[0]):
+            tips_i = np.flatnonzero(arr[i])
+            tips_j = np.flatnonzero(arr[j])
+            union = _get_pd(tree, np.union1d(tips_i, tips_j))
+            pd_i = _get_pd(tree, tips_i)
+            pd_j = _get_pd(tree, tips_j)
+            shared = pd_i + pd_j - union
+            assert np.isclose(unifrac[i, j], 1 - shared / union)
+            assert np.isclose(phylosor[i, j], 2 * shared / (pd_i + pd_j))
+
+
+@pytest.mark.parametrize("name", list(phylocom.metrics._NULL_MODELS))
+def test_null_models_preserve_margins(tree_matrix, name):
+    """Randomized matrices keep the margins of each null model."""
+    tree, arr = tree_matrix
+    model = phylocom.metrics._NULL_MODELS[name](tree, arr, "mpd", size=20, seed=1)
+    null = model._randomize(4, np.random.default_rng(0))
+    assert null.shape == (4 * arr.shape[0], arr.shape[1])
+    richness = np.diff(null.indptr).reshape(4, -1)
+    freqs = np.asarray((null != 0).sum(axis=0)).ravel()
+    if name != "frequency":
+        assert (richness == (arr > 0).sum(axis=1)).all()
+    if name in ("frequency", "independent_swap", "trial_swap"):
+        assert (freqs == 4 * (arr > 0).sum(axis=0)).all()
+    zscores = model.get_standard_effect_size()
+    assert zscores[:2].isna().all()
+    assert np.isfinite(zscores[2:]).all()
+
+
+def test_null_model_reproducible_and_metric_callable(tree_matrix):
+    """Seeded null models are reproducible for names or functions."""
+    tree, arr = tree_matrix
+    model0 = phylocom.ShuffleTips(tree, arr, "mntd", size=50, seed=7)
+    model1 = phylocom.ShuffleTips(
+        tree, arr, phylocom.get_mean_nearest_neighbor_distance, size=50, seed=7
+    )
+    assert np.allclose(model0._mean, model1._mean, equal_nan=True)
+    nti = phylocom.get_nearest_taxon_index(tree, arr, size=50, seed=7)
+    assert np.allclose(nti, -model0.get_standard_effect_size(), equal_nan=True)
+    summary = phylocom.get_community_metric(
+        tree, arr, "mntd", null="shuffle_tips", size=50, seed=7
+    )
+    assert np.allclose(summary.effect_size, -nti, equal_nan=True)
+    with pytest.raises(ToytreeError):
+        phylocom.get_community_metric(tree, arr, "xyz")
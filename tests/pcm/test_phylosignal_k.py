@@ -92,3 +92,31 @@ def test_phylogenetic_signal_k_api_exposure(tree, trait):
     res = tree.pcm.phylogenetic_signal_k(data=trait, nsims=0)
     assert "K" in res
     assert np.isfinite(float(res["K"]))
+
+
+def test_phylogenetic_signal_k_batched_matches_columns(tree, trait):
+    """K of a block of permuted columns matches K of each column."""
+    vcv = psk.get_vcv_matrix_from_tree(tree)
+    cho = psk.cho_factor(vcv, lower=True)
+    x = np.asarray(trait, dtype=float)
+    orders = np.random.default_rng(1).permuted(
+        np.tile(np.arange(x.size), (5, 1)), axis=1
+    )
+    batch = psk._calculate_k(x[orders].T, cho, vcv.trace())
+    for i, order in enumerate(orders):
+        single = psk._calculate_k(x[order][:, None], cho, vcv.trace())[0]
+        assert batch[i] == pytest.approx(single)
+
+
+def test_phylogenetic_signal_k_seeded_permutations(tree, trait):
+    """Seeded p-values are reproducible for any number of workers."""
+    res1 = psk.phylogenetic_signal_k(tree, trait, nsims=200, seed=7, chunksize=50)
+    res2 = psk.phylogenetic_signal_k(
+        tree, trait, nsims=200, seed=7, chunksize=50, workers=2
+    )
+    assert res1["P-value"] == res2["P-value"]
+    err = np.full(tree.ntips, 0.05, dtype=float)
+    res3 = psk.phylogenetic_signal_k(tree, trait, error=err, nsims=10, seed=7)
+    res4 = psk.phylogenetic_signal_k(tree, trait, error=err, nsims=10, seed=7)
+    assert res3["P-value"] == res4["P-value"]
+    assert res3["permutations"] == 10
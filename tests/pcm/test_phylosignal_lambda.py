@@ -75,3 +75,40 @@ def test_near_zero_branch_lengths_remain_stable():
     assert np.isfinite(float(res["lambda"]))
     assert np.isfinite(float(res["log-likelihood_λ"]))
     assert np.isfinite(float(res["log-likelihood_λ0"]))
+
+
+def test_lambda_grid_lr_matches_optimized_lr(make_unittree):
+    """Batched grid LR statistic is close to the optimized LR statistic."""
+    tree = make_unittree(ntips=30, treeheight=1.0, seed=123)
+    values = np.asarray(
+        _as_series_or_array(
+            tree.pcm.simulate_continuous_trait(
+                "bm", params=1.0, seed=321, tips_only=True
+            )
+        ),
+        dtype=float,
+    )
+    res = psl.phylogenetic_signal_lambda(tree, values)
+    vcv = psl.get_vcv_matrix_from_tree(tree)
+    grid = np.linspace(0, psl.max_λ(tree), psl._PERMUTATION_GRID)
+    lr_stat = psl._get_lr_grid(values[:, None], vcv, grid)[0]
+    assert lr_stat <= res["LR_test"] + 1e-8
+    assert lr_stat == pytest.approx(res["LR_test"], rel=1e-2)
+
+
+def test_lambda_permutation_pvalue_is_seeded(make_unittree):
+    """Permutation p-values are bounded and reproducible with a seed."""
+    tree = make_unittree(ntips=20, treeheight=1.0, seed=3)
+    values = _as_series_or_array(
+        tree.pcm.simulate_continuous_trait("bm", params=1.0, seed=4, tips_only=True)
+    )
+    res1 = psl.phylogenetic_signal_lambda(tree, values, nsims=100, seed=5)
+    res2 = psl.phylogenetic_signal_lambda(
+        tree, values, nsims=100, seed=5, workers=2, chunksize=30
+    )
+    res3 = psl.phylogenetic_signal_lambda(tree, values, nsims=100, seed=5, chunksize=30)
+    assert 0.0 <= res1["P-value_permutation"] <= 1.0
+    assert res1["permutations"] == 100
+    assert res2["P-value_permutation"] == res3["P-value_permutation"]
+    assert "permutations" not in psl.phylogenetic_signal_lambda(tree, values)
+    assert "P-value_permutation" not in psl.phylogenetic_signal_lambda(tree, values)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+
+"""Tests for relative evolutionary divergence (RED)."""
+
+import numpy as np
+import pytest
+
+import toytree
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_red_matches_mean_leaf_distances(seed):
+    """RED matches interpolation by mean distances to leaves."""
+    tree = toytree.rtree.bdtree(30, seed=seed)
+    red = toytree.pcm.get_relative_evolutionary_divergence(tree)
+    dists = tree.distance.get_node_distance_matrix()
+    assert sorted(red) == list(range(tree.nnodes))
+    assert red[tree.nnodes - 1] == 0
+    assert all(red[i] == 1 for i in range(tree.ntips))
+    for node in tree[tree.nnodes - 2 : tree.ntips - 1 : -1]:
+        parent = red[node.up.idx]
+        a = dists[node.idx, node.up.idx]
+        b = np.mean([dists[node.idx, leaf.idx] for leaf in node.iter_leaves()])
+        assert red[node.idx] == pytest.approx(parent + a / (a + b) * (1 - parent))
+
+
+def test_red_ultrametric_and_inplace():
+    """RED on an ultrametric tree equals relative depth of each node."""
+    tree = toytree.rtree.unittree(20, treeheight=2.0, seed=123)
+    tree = toytree.pcm.get_relative_evolutionary_divergence(tree, inplace=True)
+    red = tree.get_node_data("RED").to_numpy()
+    heights = tree.get_node_data("height").to_numpy()
+    assert np.allclose(red, 1 - heights / 2.0)
@@ -282,12 +282,6 @@ class TestContinuousBMSim:
         """Removed legacy kwargs should raise TypeError."""
         with pytest.raises(TypeError):
             self.tree.pcm.simulate_continuous_trait("bm", sigma2=1.0)  # type: ignore[arg-type]
-        with pytest.raises(TypeError):
-            self.tree.pcm.simulate_continuous_trait(  # type: ignore[call-arg]
-                "bm",
-                params=1.0,
-                nreplicates=2,
-            )
 
 
 # Additional source-driven tests.
@@ -322,3 +316,84 @@ def test_eb_nonfinite_r_rejected(make_unittree):
     tree = make_unittree(ntips=8, treeheight=1.0, seed=123)
     with pytest.raises(ToytreeError, match="finite r"):
         tree.pcm.simulate_continuous_trait("eb", params=(1.0, np.inf))
+
+
+def _make_simulator(tree, model_type, alpha=0.0, r=0.0, seed=1):
+    """Return a one-trait regime simulator with constant parameters."""
+    from toytree.pcm.src.sim.sim_continuous import ContinuousTraitRegimeSimulator
+
+    nnodes = tree.nnodes
+    return ContinuousTraitRegimeSimulator(
+        tree=tree,
+        model_type=model_type,
+        sigma2_by_node=np.full((nnodes, 1), 2.0),
+        alpha_by_node=np.full((nnodes, 1), alpha),
+        r_by_node=np.full((nnodes, 1), r),
+        optimum_by_node=np.full((nnodes, 1), 1.0),
+        root_state=np.array([0.5]),
+        seed=seed,
+    )
+
+
+def test_replicates_match_bm_covariance(make_unittree):
+    """Vectorized BM replicates have the expected tip covariance."""
+    from toytree.pcm.src.sim.sim_continuous import ContinuousModelType
+
+    tree = make_unittree(ntips=8, treeheight=1.0, seed=123)
+    sim = _make_simulator(tree, ContinuousModelType.BM)
+    tips = sim.run(40_000, tips_only=True)[:, 0, :]
+    vcv = 2.0 * np.asarray(tree.pcm.get_vcv_matrix_from_tree())
+    assert np.allclose(tips.mean(axis=1), 0.5, atol=0.05)
+    assert np.allclose(np.cov(tips), vcv, atol=0.08)
+
+
+def test_replicates_match_ou_moments(make_unittree):
+    """Vectorized OU replicates have the expected tip mean and variance."""
+    from toytree.pcm.src.sim.sim_continuous import ContinuousModelType
+
+    tree = make_unittree(ntips=8, treeheight=1.0, seed=123)
+    sim = _make_simulator(tree, ContinuousModelType.OU, alpha=0.8)
+    tips = sim.run(40_000, tips_only=True)[:, 0, :]
+    decay = np.exp(-0.8)
+    var = 2.0 * (1 - np.exp(-1.6)) / 1.6
+    assert np.allclose(tips.mean(axis=1), 1.0 + (0.5 - 1.0) * decay, atol=0.03)
+    assert np.allclose(tips.var(axis=1), var, rtol=0.05)
+
+
+def test_replicates_tips_only_and_blocks_match_full(make_unittree, monkeypatch):
+    """Replicate blocks and tips_only do not change seeded values."""
+    from toytree.pcm.src.sim import sim_continuous
+    from toytree.pcm.src.sim.sim_continuous import ContinuousModelType
+
+    tree = make_unittree(ntips=8, treeheight=1.0, seed=123)
+    full = _make_simulator(tree, ContinuousModelType.EB, r=-0.5).run(50)
+    tips = _make_simulator(tree, ContinuousModelType.EB, r=-0.5).run(50, True)
+    assert full.shape == (tree.nnodes, 1, 50)
+    assert np.array_equal(full[: tree.ntips], tips)
+    assert np.all(full[-1] == 0.5)
+
+    blocks = _make_simulator(tree, ContinuousModelType.EB, r=-0.5).run(50, False, 7)
+    assert np.array_equal(blocks, full)
+    monkeypatch.setattr(sim_continuous, "_MAX_BLOCK_VALUES", tree.nnodes * 3)
+    blocks = _make_simulator(tree, ContinuousModelType.EB, r=-0.5).run(50, True)
+    assert np.array_equal(blocks, tips)
+
+
+def test_public_replicates_match_blocks_and_single(make_unittree):
+    """Public nreplicates returns a DataFrame independent of block size."""
+    tree = make_unittree(ntips=8, treeheight=1.0, seed=123)
+    kwargs = dict(model="ou", params=(1.0, 0.5), root_state=1.0, seed=3)
+    reps = tree.pcm.simulate_continuous_trait(nreplicates=20, **kwargs)
+    assert reps.shape == (tree.nnodes, 20)
+    blocks = tree.pcm.simulate_continuous_trait(
+        nreplicates=20, block_size=3, tips_only=True, **kwargs
+    )
+    assert np.array_equal(blocks.to_numpy(), reps.to_numpy()[: tree.ntips])
+    single = tree.pcm.simulate_continuous_trait(**kwargs)
+    assert np.array_equal(single.to_numpy(), reps[0].to_numpy())
+    with pytest.raises(ToytreeError):
+        tree.pcm.simulate_continuous_trait(nreplicates=0)
+    with pytest.raises(ToytreeError):
+        tree.pcm.simulate_continuous_trait(nreplicates=2, inplace=True)
+    with pytest.raises(ToytreeError):
+        tree.pcm.simulate_continuous_trait(nreplicates=2, block_size=0)
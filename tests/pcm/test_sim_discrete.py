@@ -161,15 +161,53 @@ def test_seed_accepts_numpy_generator(tree6):
     assert isinstance(data, pd.Series)
 
 
-def test_removed_nreplicates_kwarg_raises(tree6):
-    """Multi-replicate output is no longer part of the public API."""
-    with pytest.raises(TypeError):
-        simulate_discrete_trait(  # type: ignore[call-arg]
-            tree=tree6,
-            nstates=2,
-            model="ER",
-            nreplicates=2,
-        )
+def test_nreplicates_returns_node_by_replicate_frame(tree6):
+    """Multiple replicates are returned as a (nnodes, nreplicates) frame."""
+    data = simulate_discrete_trait(
+        tree=tree6, nstates=3, model="ER", nreplicates=25, seed=1
+    )
+    assert isinstance(data, pd.DataFrame)
+    assert data.shape == (tree6.nnodes, 25)
+    assert set(np.unique(data.to_numpy())) <= {"A", "B", "C"}
+    tips = simulate_discrete_trait(
+        tree=tree6, nstates=3, model="ER", nreplicates=25, tips_only=True, seed=1
+    )
+    assert tips.shape == (tree6.ntips, 25)
+
+
+def test_nreplicates_invalid_raises(tree6):
+    """Invalid nreplicates values and inplace storage are rejected."""
+    with pytest.raises(ToytreeError):
+        simulate_discrete_trait(tree=tree6, nstates=2, nreplicates=0)
+    with pytest.raises(ToytreeError):
+        simulate_discrete_trait(tree=tree6, nstates=2, nreplicates=2, inplace=True)
+
+
+def test_replicate_transition_frequencies_match_ptime():
+    """Batched replicates sample child states from rows of P(t)."""
+    from scipy.linalg import expm
+
+    import toytree
+    from toytree.pcm.src.sim.sim_discrete import DiscreteMarkovSimulator
+
+    tree = toytree.tree("((a:0.3,b:1.2):0.5,c:0.8);")
+    model = MarkovModel(
+        mtype="ARD",
+        nstates=3,
+        relative_rates=np.array([[0, 1.0, 0.2], [0.5, 0, 1.5], [0.3, 0.8, 0]]),
+        seed=1,
+    )
+    sim = DiscreteMarkovSimulator(tree=tree, model=model, root_state=1, seed=2)
+    states = sim.run(100_000)
+    assert np.all(states[-1] == 1)
+    probs = expm(model.qmatrix * 0.5)[1]
+    freqs = np.bincount(states[tree.get_mrca_node("a", "b").idx], minlength=3)
+    assert np.allclose(freqs / states.shape[1], probs, atol=0.01)
+    probs = expm(model.qmatrix * 0.3)
+    for parent in range(3):
+        mask = states[tree.get_mrca_node("a", "b").idx] == parent
+        freqs = np.bincount(states[0][mask], minlength=3) / mask.sum()
+        assert np.allclose(freqs, probs[parent], atol=0.02)
 
 
 def test_blank_name_raises_toytree_error(tree6):
@@ -192,3 +230,28 @@ def test_state_names_must_match_nstates(tree6):
             model="ER",
             state_names=["A", "B"],
         )
+
+
+@pytest.mark.parametrize(
+    "qmatrix, freqs",
+    [
+        (MarkovModel(nstates=4, mtype="SYM", seed=1).qmatrix, None),
+        (
+            MarkovModel(nstates=4, mtype="SYM", seed=1).qmatrix,
+            MarkovModel(nstates=4, mtype="SYM", seed=1).state_frequencies,
+        ),
+        (MarkovModel(nstates=3, mtype="ARD", seed=2).qmatrix, None),
+        # a defective Q (repeated eigenvalue) falls back to expm.
+        (np.array([[-1.0, 1.0, 0.0], [0.0, -1.0, 1.0], [0.0, 0.0, 0.0]]), None),
+    ],
+)
+def test_transition_matrices_match_expm(qmatrix, freqs):
+    """Batched P(t) matrices should match expm of Q at each time."""
+    from scipy.linalg import expm
+
+    from toytree.pcm.src.sim.sim_discrete import _get_transition_matrices
+
+    times = np.array([0.0, 0.01, 0.5, 3.0, 50.0])
+    probs = _get_transition_matrices(qmatrix, times, freqs)
+    expected = np.stack([expm(qmatrix * t) for t in times])
+    np.testing.assert_allclose(probs, expected, rtol=1e-8, atol=1e-10)
@@ -342,3 +342,100 @@ def test_rejects_invalid_posterior_vectors(tree_data_fit):
     )
     with pytest.raises(ToytreeError):
         tree.pcm.simulate_stochastic_map(data=bad_neg, model_fit=fit)
+
+
+def test_summary_arrays_match_segments(tree_data_fit):
+    """Return replicate x edge x state arrays consistent with segments."""
+    tree, _, fit = tree_data_fit
+    out = tree.pcm.simulate_stochastic_map(
+        data="X",
+        model_fit=fit,
+        nreplicates=20,
+        seed=5,
+    )
+    nedges = tree.nnodes - 1
+    assert out.edge_dwell_array.shape == (20, nedges, 2)
+    assert out.edge_transition_array.shape == (20, nedges, 2, 2)
+    assert out.node_state_array.shape == (20, tree.nnodes)
+
+    seg = out.segments
+    keys = [seg["map_id"], seg["edge_id"], seg["state_idx"]]
+    expected = seg.groupby(keys)["duration"].sum()
+    dwell = out.edge_dwell_array[tuple(np.array(expected.index.tolist()).T)]
+    assert np.allclose(dwell, expected.to_numpy())
+    assert np.allclose(out.dwell_array, out.edge_dwell_array.sum(axis=1))
+    assert np.allclose(out.dwell_array.sum(axis=1), out.edge_table["length"].sum())
+    assert out.transition_array.sum() == out.events.shape[0]
+    assert np.array_equal(out.transition_array, out.edge_transition_array.sum(axis=1))
+
+    # the first and last segments of each edge match sampled node states.
+    ends = seg.groupby(["map_id", "edge_id"])["state_idx"]
+    children = out.edge_table["child"].to_numpy()
+    parents = out.edge_table["parent"].to_numpy()
+    assert np.array_equal(
+        ends.first().to_numpy(), out.node_state_array[:, children].ravel()
+    )
+    assert np.array_equal(
+        ends.last().to_numpy(), out.node_state_array[:, parents].ravel()
+    )
+
+
+def test_result_from_tables_matches_arrays(tree_data_fit):
+    """Build identical summaries from segment and node-state tables."""
+    tree, _, fit = tree_data_fit
+    out = tree.pcm.simulate_stochastic_map(
+        data="X",
+        model_fit=fit,
+        nreplicates=10,
+        seed=6,
+    )
+    copy = toytree.pcm.PCMStochasticMapResult(
+        segments=out.segments,
+        node_states=out.node_states,
+        edge_table=out.edge_table,
+        state_labels=out.state_labels,
+        model=out.model,
+        engine=out.engine,
+        nreplicates=out.nreplicates,
+    )
+    assert np.allclose(copy.edge_dwell_array, out.edge_dwell_array)
+    assert np.array_equal(copy.edge_transition_array, out.edge_transition_array)
+    pd.testing.assert_frame_equal(copy.events, out.events)
+    pd.testing.assert_frame_equal(copy.edge_dwell_stats, out.edge_dwell_stats)
+
+
+def test_workers_reproducibility(tree_data_fit, monkeypatch):
+    """Return identical maps for a seed regardless of worker processes."""
+    from toytree.pcm.src.sim import sim_stochastic_mapping
+
+    tree, _, fit = tree_data_fit
+    monkeypatch.setattr(sim_stochastic_mapping, "_MAX_BLOCK_ITEMS", 120)
+    kwargs = dict(data="X", model_fit=fit, nreplicates=50, seed=9)
+    a = tree.pcm.simulate_stochastic_map(workers=1, **kwargs)
+    b = tree.pcm.simulate_stochastic_map(workers=2, **kwargs)
+    pd.testing.assert_frame_equal(a.segments, b.segments)
+    assert sorted(a.segments["map_id"].unique()) == list(range(50))
+    with pytest.raises(ToytreeError):
+        tree.pcm.simulate_stochastic_map(workers=0, **kwargs)
+
+
+def test_uniformization_matches_rejection(tree_data_fit):
+    """Sample maps with the same expected summaries under both engines."""
+    tree, _, fit = tree_data_fit
+    means, variances = [], []
+    for engine in ("uniformization", "rejection"):
+        out = tree.pcm.simulate_stochastic_map(
+            data="X",
+            model_fit=fit,
+            nreplicates=1000,
+            seed=10,
+            engine=engine,
+        )
+        values = np.column_stack(
+            [out.dwell_array, out.transition_array.reshape(1000, -1)]
+        )
+        means.append(values.mean(axis=0))
+        variances.append(values.var(axis=0) / 1000)
+    se = np.sqrt(variances[0] + variances[1])
+    mask = se > 0
+    assert np.all(np.abs(means[0] - means[1])[mask] < 4.5 * se[mask])
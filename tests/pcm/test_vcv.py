@@ -101,3 +101,29 @@ def test_get_vcv_matrix_from_tree_package_and_object_api_parity(tree):
     pkg_vcv = toytree.pcm.get_vcv_matrix_from_tree(tree, df=False)
     obj_vcv = tree.pcm.get_vcv_matrix_from_tree(df=False)
     assert np.allclose(pkg_vcv, obj_vcv)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_get_vcv_matrix_from_tree_matches_mrca_root_distances(seed):
+    """Shared path lengths should equal root distances of tip-pair MRCAs."""
+    tree = toytree.rtree.bdtree(ntips=20, seed=seed)
+    if seed:
+        tree = tree.unroot()
+    vcv = tree.pcm.get_vcv_matrix_from_tree()
+    for i in range(tree.ntips):
+        for j in range(tree.ntips):
+            mrca = tree.get_mrca_node(i, j)
+            expected = sum(n.dist for n in mrca.iter_ancestors(include_self=True))
+            expected -= tree.treenode.dist
+            assert vcv[i, j] == pytest.approx(expected)
+
+
+def test_get_vcv_matrix_from_tree_float32_and_memmap(tree, vcv_np, tmp_path):
+    """Optional float32 and disk-backed outputs should match the default."""
+    vcv32 = tree.pcm.get_vcv_matrix_from_tree(dtype="float32")
+    assert vcv32.dtype == np.float32
+    assert np.allclose(vcv32, vcv_np, atol=1e-5)
+
+    vcvmm = tree.pcm.get_vcv_matrix_from_tree(memmap=tmp_path / "vcv.dat")
+    assert isinstance(vcvmm, np.memmap)
+    assert np.allclose(vcvmm, vcv_np)
@@ -40,6 +40,7 @@ _LAZY_ATTRS = {
     "Node": ("toytree.core.node", "Node"),
     "ToyTree": ("toytree.core.tree", "ToyTree"),
     "MultiTree": ("toytree.core.multitree", "MultiTree"),
+    "CompactTree": ("toytree.core.compact", "CompactTree"),
     "AdmixtureEvent": ("toytree.network", "AdmixtureEvent"),
     "tree": ("toytree.io.src.treeio", "tree"),
     "mtree": ("toytree.io.src.mtreeio", "mtree"),
@@ -26,11 +26,19 @@ from __future__ import annotations
 
 import importlib
 
-__all__ = ["ToyTree", "Node", "TreeStyle", "SubStyle", "get_base_tree_style_by_name"]
+__all__ = [
+    "ToyTree",
+    "Node",
+    "CompactTree",
+    "TreeStyle",
+    "SubStyle",
+    "get_base_tree_style_by_name",
+]
 
 _LAZY_ATTRS = {
     "ToyTree": ("toytree.core.tree", "ToyTree"),
     "Node": ("toytree.core.node", "Node"),
+    "CompactTree": ("toytree.core.compact", "CompactTree"),
     "TreeStyle": ("toytree.core.style_base", "TreeStyle"),
     "SubStyle": ("toytree.core.style_base", "SubStyle"),
     "get_base_tree_style_by_name": (
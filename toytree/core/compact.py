@@ -0,0 +1,652 @@
+#!/usr/bin/env python
+
+"""Array-backed compact tree representation.
+
+A CompactTree stores a tree as a struct-of-arrays (parent index,
+CSR child offsets, dist, support, height, x) plus a table of name
+strings, instead of as a graph of connected `Node` objects. This uses
+a small fraction of the memory of a ToyTree, which is useful when
+loading very large trees (e.g., >100K tips) for read-only analyses.
+
+Nodes are stored in the same idx order as in a ToyTree: tips are
+numbered 0..ntips-1 from left to right, followed by internal Nodes in
+postorder, with the root last. Thus, every child has a lower idx than
+its parent, and a loop over the idx order is a postorder traversal.
+Lightweight `CompactNode` views are created only when a Node is
+accessed by indexing.
+
+Examples
+--------
+>>> ctree = toytree.core.CompactTree.from_newick("((a:1,b:2)0.9:1,c:3);")
+>>> ctree.get_tip_labels()
+['a', 'b', 'c']
+>>> ctree.get_mrca_node("a", "b")
+<CompactNode(idx=3)>
+>>> tree = ctree.to_toytree()
+
+CompactTrees are loaded from files or strings with
+`toytree.tree(data, compact=True)`, and the node distance functions
+of `toytree.distance` (e.g., `get_tip_distance_matrix`) run directly
+on their arrays.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from toytree.core.lca import LCAIndex
+from toytree.utils.src.exceptions import NODE_INDEXING_ERROR, ToytreeError
+
+if TYPE_CHECKING:
+    from toytree.core.tree import ToyTree
+
+__all__ = ["CompactTree", "CompactNode"]
+
+
+class CompactNode:
+    """Lightweight read-only view of one Node in a CompactTree.
+
+    CompactNode objects store only a reference to their CompactTree
+    and an idx label. All attributes are looked up from the tree
+    arrays when accessed, so views are cheap to create and discard.
+    """
+
+    __slots__ = ("_tree", "_idx")
+
+    def __init__(self, tree: CompactTree, idx: int):
+        self._tree = tree
+        self._idx = idx
+
+    def __repr__(self) -> str:
+        """Return string showing Node idx and name only if present."""
+        name = self.name
+        _name = f", name='{name}'" if name else ""
+        return f"<CompactNode(idx={self._idx}{_name})>"
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if views point to the same Node of the same tree."""
+        if not isinstance(other, CompactNode):
+            return NotImplemented
+        return (self._tree is other._tree) and (self._idx == other._idx)
+
+    def __hash__(self) -> int:
+        """Return a hash of the tree identity and Node idx."""
+        return hash((id(self._tree), self._idx))
+
+    @property
+    def idx(self) -> int:
+        """Return the unique integer idx label of this Node."""
+        return self._idx
+
+    @property
+    def name(self) -> str:
+        """Name string assigned to Node."""
+        return self._tree.names[self._idx]
+
+    @property
+    def dist(self) -> float:
+        """Edge length associated to the edge above this Node."""
+        return float(self._tree.dist[self._idx])
+
+    @property
+    def support(self) -> float:
+        """Return the support value for the edge above this Node."""
+        return float(self._tree.support[self._idx])
+
+    @property
+    def height(self) -> float:
+        """Return the height of this Node above the farthest tip."""
+        return float(self._tree.height[self._idx])
+
+    @property
+    def up(self) -> Optional[CompactNode]:
+        """The parent node (next node towards root) from this node."""
+        pidx = int(self._tree.parent[self._idx])
+        if pidx < 0:
+            return None
+        return CompactNode(self._tree, pidx)
+
+    @property
+    def children(self) -> tuple[CompactNode, ...]:
+        """Return a tuple of child Nodes of this Node."""
+        return tuple(
+            CompactNode(self._tree, int(i))
+            for i in self._tree.get_children_idxs(self._idx)
+        )
+
+    def is_leaf(self) -> bool:
+        """Return True if Node is a leaf (terminal)."""
+        return self._idx < self._tree.ntips
+
+    def is_root(self) -> bool:
+        """Return True if Node has no parent."""
+        return self._tree.parent[self._idx] < 0
+
+    def iter_leaves(self) -> Iterator[CompactNode]:
+        """Return a Generator of leaves descended from this node in idxorder."""
+        for idx in self._tree.get_leaf_idxs(self._idx):
+            yield CompactNode(self._tree, int(idx))
+
+    def get_leaf_names(self) -> List[str]:
+        """Return a list of names of leaves descended from this node."""
+        names = self._tree.names
+        return [names[i] for i in self._tree.get_leaf_idxs(self._idx)]
+
+
+class CompactTree:
+    """Struct-of-arrays tree representation for very large trees.
+
+    CompactTrees should generally be created with the constructors
+    `CompactTree.from_newick` or `CompactTree.from_toytree`. Arrays
+    are indexed by Node idx labels, which match those of the ToyTree
+    that would be parsed from the same data.
+
+    Parameters
+    ----------
+    parent: np.ndarray
+        int array of parent idx labels for each Node (root=-1).
+    child_offsets: np.ndarray
+        int array of size nnodes + 1 with the start and end of each
+        Node's children in `child_idxs` (CSR format).
+    child_idxs: np.ndarray
+        int array of child idx labels ordered left to right.
+    dist: np.ndarray
+        float array of edge lengths above each Node.
+    support: np.ndarray
+        float array of support values for edges above each Node.
+    names: Sequence[str]
+        Name strings of each Node.
+
+    Attributes
+    ----------
+    nnodes: int
+        Number of Nodes in the tree.
+    ntips: int
+        Number of leaf Nodes (tips) in the tree.
+    height: np.ndarray
+        float array of Node heights above the farthest tip.
+    x: np.ndarray
+        float array of Node x-coordinates (tip spacing units).
+    """
+
+    def __init__(
+        self,
+        parent: np.ndarray,
+        child_offsets: np.ndarray,
+        child_idxs: np.ndarray,
+        dist: np.ndarray,
+        support: np.ndarray,
+        names: Sequence[str],
+    ):
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.child_offsets = np.asarray(child_offsets, dtype=np.int64)
+        self.child_idxs = np.asarray(child_idxs, dtype=np.int64)
+        self.dist = np.asarray(dist, dtype=np.float64)
+        self.support = np.asarray(support, dtype=np.float64)
+        self.names: List[str] = list(names)
+        self.nnodes: int = self.parent.size
+        self.ntips: int = int(np.count_nonzero(np.diff(self.child_offsets) == 0))
+        self._level: Optional[np.ndarray] = None
+        self._name_dict: Optional[dict] = None
+        self._lca_index: Optional[LCAIndex] = None
+
+        if self.parent.size != self.dist.size or self.dist.size != len(self.names):
+            raise ToytreeError("CompactTree arrays must all be of size nnodes.")
+        if self.nnodes and self.parent[-1] != -1:
+            raise ToytreeError("CompactTree root must be the last Node (idx=nnodes-1)")
+
+        # cache root distances, heights, and x coordinates.
+        self.root_dist = self._get_root_distances()
+        self.height = self.root_dist.max() - self.root_dist
+        self.x = self._get_x_coordinates()
+
+    #####################################################
+    # CONSTRUCTORS
+    #####################################################
+
+    @classmethod
+    def from_newick(
+        cls,
+        newick: str,
+        internal_labels: Optional[str] = None,
+    ) -> CompactTree:
+        """Return a CompactTree parsed from a plain Newick string.
+
+        Only topology, node labels and branch lengths are supported.
+        Newick strings with square-bracket metadata should instead be
+        parsed with `toytree.tree` and converted using `from_toytree`.
+        No Node objects are created during parsing.
+
+        Parameters
+        ----------
+        newick: str
+            A Newick string ending in ';'.
+        internal_labels: str or None
+            Either "name", "support", or None, in which case the type
+            of internal labels is inferred similar to `toytree.tree`.
+
+        Examples
+        --------
+        >>> ctree = CompactTree.from_newick("((a,b)90,(c,d)80);")
+        >>> ctree.support[ctree.ntips:]
+        array([90., 80., nan])
+        """
+        from toytree.io.src.newick import _is_plain_newick, _scan_plain_newick
+
+        newick = newick.strip()
+        if not newick.endswith(";"):
+            raise ToytreeError("Newick string must end with ';'")
+        newick = newick[:-1]
+        if not _is_plain_newick(newick):
+            raise ToytreeError(
+                "CompactTree.from_newick only supports Newick strings without "
+                "metadata or quoted labels. Use toytree.tree() and then "
+                "CompactTree.from_toytree() for extended Newick formats."
+            )
+        parents, labels, dists = _scan_plain_newick(newick)
+        dists = [1.0 if i is None else i for i in dists]
+        dists[0] = 0.0
+        return cls._from_preorder(parents, labels, dists, internal_labels)
+
+    @classmethod
+    def from_toytree(cls, tree: ToyTree) -> CompactTree:
+        """Return a CompactTree with the same idx order as a ToyTree.
+
+        Only the default Node features (name, dist, support) are
+        stored. Other data features are not copied.
+
+        Examples
+        --------
+        >>> tree = toytree.rtree.unittree(10, seed=123)
+        >>> ctree = CompactTree.from_toytree(tree)
+        >>> ctree.get_tip_labels() == tree.get_tip_labels()
+        True
+        """
+        nnodes = tree.nnodes
+        parent = np.full(nnodes, -1, dtype=np.int64)
+        offsets = np.zeros(nnodes + 1, dtype=np.int64)
+        dist = np.zeros(nnodes)
+        support = np.zeros(nnodes)
+        names = [""] * nnodes
+        child_idxs = []
+        for node in tree:
+            idx = node._idx
+            names[idx] = node._name
+            dist[idx] = node._dist
+            support[idx] = node._support
+            if node._up is not None:
+                parent[idx] = node._up._idx
+            child_idxs.extend(i._idx for i in node._children)
+            offsets[idx + 1] = len(child_idxs)
+        return cls(parent, offsets, child_idxs, dist, support, names)
+
+    @classmethod
+    def _from_preorder(
+        cls,
+        parents: Sequence[int],
+        labels: Sequence[str],
+        dists: Sequence[float],
+        internal_labels: Optional[str] = None,
+    ) -> CompactTree:
+        """Return a CompactTree from Node data listed in preorder.
+
+        Preorder input (parents before children, left subtrees before
+        right) is what is produced by scanning a Newick string. It is
+        reordered here into the ToyTree idx order.
+        """
+        nnodes = len(parents)
+        ppre = np.asarray(parents, dtype=np.int64)
+
+        # count subtree sizes from tips to root.
+        sizes = [1] * nnodes
+        nchildren = [0] * nnodes
+        for pidx, par in zip(range(nnodes - 1, 0, -1), parents[:0:-1]):
+            sizes[par] += sizes[pidx]
+            nchildren[par] += 1
+        sizes = np.asarray(sizes, dtype=np.int64)
+        is_tip = np.asarray(nchildren, dtype=np.int64) == 0
+
+        # tips are numbered left to right, internal Nodes by postorder,
+        # which is ordered by the end of their subtree span, and then by
+        # descending preorder position (descendants before ancestors).
+        pre = np.arange(nnodes, dtype=np.int64)
+        tips = pre[is_tip]
+        inner = pre[~is_tip]
+        inner = inner[np.lexsort((-inner, inner + sizes[inner]))]
+        order = np.concatenate([tips, inner])
+        idx_of_pre = np.empty(nnodes, dtype=np.int64)
+        idx_of_pre[order] = np.arange(nnodes, dtype=np.int64)
+
+        # parent idx labels, and children left to right in CSR format.
+        parent = np.full(nnodes, -1, dtype=np.int64)
+        parent[idx_of_pre[1:]] = idx_of_pre[ppre[1:]]
+        corder = np.argsort(idx_of_pre[ppre[1:]], kind="stable") + 1
+        child_idxs = idx_of_pre[corder]
+        counts = np.bincount(parent[parent >= 0], minlength=nnodes)
+        offsets = np.zeros(nnodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # reorder Node data.
+        dist = np.asarray(dists, dtype=np.float64)[order]
+        names = [labels[i] for i in order]
+        support = np.full(nnodes, np.nan)
+        ntips = tips.size
+        _set_internal_labels(names, support, ntips, internal_labels)
+        return cls(parent, offsets, child_idxs, dist, support, names)
+
+    def to_toytree(self) -> ToyTree:
+        """Return a ToyTree built by materializing Node objects.
+
+        Examples
+        --------
+        >>> ctree = CompactTree.from_newick("((a,b),c);")
+        >>> tree = ctree.to_toytree()
+        """
+        from toytree.core.node import Node
+        from toytree.core.tree import ToyTree
+
+        nodes = [
+            Node(name=name, dist=dist, support=support)
+            for name, dist, support in zip(
+                self.names, self.dist.tolist(), self.support.tolist()
+            )
+        ]
+        offsets = self.child_offsets.tolist()
+        child_idxs = self.child_idxs.tolist()
+        for idx in range(self.ntips, self.nnodes):
+            node = nodes[idx]
+            for cidx in child_idxs[offsets[idx] : offsets[idx + 1]]:
+                node._add_child(nodes[cidx])
+        return ToyTree(nodes[-1])
+
+    #####################################################
+    # DUNDERS
+    #####################################################
+
+    def __repr__(self) -> str:
+        """Short object representation for toytree.core.compact.CompactTree."""
+        return f"<toytree.CompactTree ntips={self.ntips} at {hex(id(self))}>"
+
+    def __iter__(self) -> Iterator[CompactNode]:
+        """CompactTree is iterable, returning Node views in idx order."""
+        return (CompactNode(self, i) for i in range(self.nnodes))
+
+    def __getitem__(
+        self, idx: Union[int, slice]
+    ) -> Union[CompactNode, List[CompactNode]]:
+        """Node views can be accessed by indexing or slicing by idx label."""
+        try:
+            if isinstance(idx, slice):
+                return [CompactNode(self, i) for i in range(*idx.indices(self.nnodes))]
+            sidx = int(idx)
+            if sidx < 0:
+                sidx += self.nnodes
+            if not 0 <= sidx < self.nnodes:
+                raise IndexError(idx)
+            return CompactNode(self, sidx)
+        except Exception as exc:
+            raise ToytreeError(NODE_INDEXING_ERROR) from exc
+
+    @property
+    def treenode(self) -> CompactNode:
+        """Return a view of the root Node."""
+        return CompactNode(self, self.nnodes - 1)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the approximate memory used by the arrays and names."""
+        arrays = (
+            self.parent,
+            self.child_offsets,
+            self.child_idxs,
+            self.dist,
+            self.support,
+            self.root_dist,
+            self.height,
+            self.x,
+        )
+        return sum(i.nbytes for i in arrays) + sum(len(i) + 49 for i in self.names)
+
+    #####################################################
+    # CACHED ARRAYS
+    #####################################################
+
+    def _get_root_distances(self) -> np.ndarray:
+        """Return the sum of edge lengths from the root to each Node."""
+        rdist = [0.0] * self.nnodes
+        dist = self.dist.tolist()
+        parent = self.parent.tolist()
+        # parents always have higher idx than children
+        for idx in range(self.nnodes - 2, -1, -1):
+            rdist[idx] = rdist[parent[idx]] + dist[idx]
+        return np.asarray(rdist, dtype=np.float64)
+
+    def _get_x_coordinates(self) -> np.ndarray:
+        """Return tip spacing coordinates, internal Nodes centered."""
+        xpos = list(range(self.ntips)) + [0.0] * (self.nnodes - self.ntips)
+        offsets = self.child_offsets.tolist()
+        child_idxs = self.child_idxs.tolist()
+        for idx in range(self.ntips, self.nnodes):
+            start, end = offsets[idx], offsets[idx + 1]
+            xpos[idx] = sum(xpos[i] for i in child_idxs[start:end]) / (end - start)
+        return np.asarray(xpos, dtype=np.float64)
+
+    def _get_parent_idxs(self) -> np.ndarray:
+        """Return int array of parent idx labels (root=-1).
+
+        This matches `ToyTree._get_parent_idxs`, such that functions
+        written on the parent idx array accept either tree type.
+        """
+        return self.parent
+
+    def _get_lca_index(self) -> LCAIndex:
+        """Return cached index for O(1) lowest common ancestor queries."""
+        if self._lca_index is None:
+            self._lca_index = LCAIndex(self.parent)
+        return self._lca_index
+
+    def get_node_levels(self) -> np.ndarray:
+        """Return the number of edges between each Node and the root."""
+        if self._level is None:
+            level = [0] * self.nnodes
+            parent = self.parent.tolist()
+            for idx in range(self.nnodes - 2, -1, -1):
+                level[idx] = level[parent[idx]] + 1
+            self._level = np.asarray(level, dtype=np.int64)
+        return self._level
+
+    #####################################################
+    # TRAVERSAL
+    #####################################################
+
+    def get_children_idxs(self, idx: int) -> np.ndarray:
+        """Return idx labels of the children of a Node, left to right."""
+        return self.child_idxs[self.child_offsets[idx] : self.child_offsets[idx + 1]]
+
+    def get_traversal_order(self, strategy: str = "idxorder") -> np.ndarray:
+        """Return an array of Node idx labels in a traversal order.
+
+        Parameters
+        ----------
+        strategy: str
+            'idxorder', 'preorder', 'postorder', or 'levelorder'. The
+            orders are the same as in `ToyTree.traverse`.
+        """
+        if strategy == "idxorder":
+            return np.arange(self.nnodes, dtype=np.int64)
+        offsets = self.child_offsets.tolist()
+        child_idxs = self.child_idxs.tolist()
+        root = self.nnodes - 1
+        if strategy == "levelorder":
+            order = [root]
+            for idx in order:
+                order.extend(child_idxs[offsets[idx] : offsets[idx + 1]])
+            return np.asarray(order, dtype=np.int64)
+        if strategy == "preorder":
+            order = []
+            queue = [root]
+            while queue:
+                idx = queue.pop()
+                order.append(idx)
+                queue.extend(child_idxs[offsets[idx] : offsets[idx + 1]][::-1])
+            return np.asarray(order, dtype=np.int64)
+        if strategy == "postorder":
+            order = []
+            queue = [root]
+            while queue:
+                idx = queue.pop()
+                order.append(idx)
+                queue.extend(child_idxs[offsets[idx] : offsets[idx + 1]])
+            return np.asarray(order[::-1], dtype=np.int64)
+        raise ToytreeError(
+            "supported strategies are ['idxorder', 'preorder', "
+            "'postorder', 'levelorder']"
+        )
+
+    def traverse(self, strategy: str = "levelorder") -> Iterator[CompactNode]:
+        """Return an iterator over Node views in a traversal order."""
+        for idx in self.get_traversal_order(strategy).tolist():
+            yield CompactNode(self, idx)
+
+    def get_leaf_idxs(self, idx: int) -> np.ndarray:
+        """Return idx labels of leaves descended from a Node in idxorder."""
+        if idx < self.ntips:
+            return np.array([idx], dtype=np.int64)
+        offsets = self.child_offsets
+        child_idxs = self.child_idxs
+        # left-most and right-most tips bound a contiguous tip range.
+        left = right = idx
+        while left >= self.ntips:
+            left = child_idxs[offsets[left]]
+        while right >= self.ntips:
+            right = child_idxs[offsets[right + 1] - 1]
+        return np.arange(left, right + 1, dtype=np.int64)
+
+    #####################################################
+    # QUERIES
+    #####################################################
+
+    def iter_tip_labels(self) -> Iterator[str]:
+        """Return generator of tip labels in idx order."""
+        return iter(self.names[: self.ntips])
+
+    def get_tip_labels(self) -> List[str]:
+        """Return a list of tip labels in Node idx order."""
+        return self.names[: self.ntips]
+
+    def get_node_idxs(self, *query: Union[int, str, CompactNode]) -> List[int]:
+        """Return idx labels of Nodes selected by int idx, name, or view.
+
+        Unlike `ToyTree.get_nodes` str queries are matched exactly to
+        Node names (regular expressions are not supported).
+        """
+        idxs = []
+        for que in query:
+            if isinstance(que, CompactNode):
+                if que._tree is not self:
+                    raise ToytreeError("query Node belongs to a different tree")
+                idxs.append(que._idx)
+            elif isinstance(que, str):
+                if self._name_dict is None:
+                    self._name_dict = {}
+                    for idx, name in enumerate(self.names):
+                        self._name_dict.setdefault(name, idx)
+                try:
+                    idxs.append(self._name_dict[que])
+                except KeyError as exc:
+                    raise ValueError(f"No Node names match query: {que}") from exc
+            else:
+                idx = int(que)
+                if idx < 0:
+                    idx += self.nnodes
+                if not 0 <= idx < self.nnodes:
+                    raise ToytreeError(NODE_INDEXING_ERROR)
+                idxs.append(idx)
+        return idxs
+
+    def _get_mrca_idx(self, idx0: int, idx1: int) -> int:
+        """Return the idx label of the MRCA of two Nodes."""
+        return int(self._get_lca_index().query(idx0, idx1))
+
+    def get_mrca_node(self, *query: Union[int, str, CompactNode]) -> CompactNode:
+        """Return a view of the MRCA Node of one or more queried Nodes.
+
+        Examples
+        --------
+        >>> ctree = CompactTree.from_newick("((a,b),c);")
+        >>> ctree.get_mrca_node("a", "b").idx
+        3
+        """
+        idxs = self.get_node_idxs(*query)
+        if not idxs:
+            raise ToytreeError("get_mrca_node requires at least one query.")
+        if len(idxs) == 1:
+            return CompactNode(self, idxs[0])
+        return CompactNode(self, int(self._get_lca_index().query_all(*idxs)))
+
+    def get_node_distance(
+        self,
+        node0: Union[int, str, CompactNode],
+        node1: Union[int, str, CompactNode],
+        topology_only: bool = False,
+    ) -> float:
+        """Return patristic distance between two Nodes."""
+        idx0, idx1 = self.get_node_idxs(node0, node1)
+        mrca = self._get_mrca_idx(idx0, idx1)
+        dists = self.get_node_levels() if topology_only else self.root_dist
+        return dists[idx0] + dists[idx1] - 2 * dists[mrca]
+
+
+def _set_internal_labels(
+    names: List[str],
+    support: np.ndarray,
+    ntips: int,
+    internal_labels: Optional[str],
+) -> None:
+    """Assign internal labels to names or support in place.
+
+    This follows the same rules as `toytree.tree()`: internal labels
+    are inferred as support values if they are (mostly) numeric.
+    """
+    nnodes = len(names)
+    if internal_labels == "support":
+        for idx in range(ntips, nnodes):
+            try:
+                support[idx] = float(names[idx])
+            except ValueError:
+                support[idx] = math.nan
+            names[idx] = ""
+        return
+    if internal_labels == "name":
+        return
+    if internal_labels is not None:
+        raise ToytreeError("internal_labels must be 'name', 'support', or None.")
+
+    # infer support if non-root internal labels are numeric
+    inner = range(ntips, nnodes - 1)
+    values = {}
+    n_non_numeric = 0
+    for idx in inner:
+        sval = names[idx].strip()
+        if not sval:
+            continue
+        try:
+            values[idx] = float(sval)
+        except ValueError:
+            n_non_numeric += 1
+    threshold = max(1, len(inner) - 2)
+    if n_non_numeric == 0 and values and len(values) >= threshold:
+        for idx in inner:
+            support[idx] = values.get(idx, math.nan)
+            names[idx] = ""
+
+    # the root label is support if numeric, else a name.
+    if nnodes > ntips and names[-1]:
+        try:
+            support[-1] = float(names[-1])
+            names[-1] = ""
+        except ValueError:
+            pass
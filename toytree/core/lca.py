@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+"""Constant-time lowest common ancestor queries on a ToyTree.
+
+An `LCAIndex` is built once from the parent idx array of a tree by
+recording an Euler tour of the topology and a sparse table of range
+maxima over it. Because Node idx labels are assigned in postorder,
+every ancestor has a higher idx label than its descendants, and so
+the LCA of two Nodes is the max idx label visited in the Euler tour
+between their first occurrences. Each query is then two lookups in
+the sparse table, and many queries can be answered at once as numpy
+arrays.
+
+The index depends only on the topology of a tree, not on its edge
+lengths, and is cached on a ToyTree by `ToyTree._get_lca_index`
+until the tree is next updated.
+
+Examples
+--------
+>>> tree = toytree.rtree.unittree(10, seed=123)
+>>> lca = tree._get_lca_index()
+>>> lca.query(0, 1)
+11
+>>> lca.query_many([0, 1, 2], [3, 4, 5])
+array([18, 18, 18])
+
+References
+----------
+- Bender, M. A., & Farach-Colton, M. (2000). The LCA problem
+  revisited. *LATIN 2000*, LNCS 1776, 88-94.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+__all__ = ["LCAIndex"]
+
+
+class LCAIndex:
+    """Euler tour and sparse table for O(1) LCA queries.
+
+    Parameters
+    ----------
+    parents: np.ndarray
+        Int array of parent idx labels in idx order, where the root is
+        the last Node and has parent -1 (see `ToyTree._get_parent_idxs`).
+    """
+
+    def __init__(self, parents: np.ndarray):
+        nnodes = len(parents)
+        plist = parents.tolist()
+        children = [[] for _ in range(nnodes)]
+        for idx in range(nnodes - 1):
+            children[plist[idx]].append(idx)
+
+        # Euler tour: record each Node on entry and after each child.
+        root = nnodes - 1
+        euler = [root]
+        first = [0] * nnodes
+        nvisited = [0] * nnodes
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if nvisited[node] < len(children[node]):
+                child = children[node][nvisited[node]]
+                nvisited[node] += 1
+                first[child] = len(euler)
+                euler.append(child)
+                stack.append(child)
+            else:
+                stack.pop()
+                if stack:
+                    euler.append(stack[-1])
+
+        # sparse table where row k stores the max over windows of 2**k.
+        dtype = np.int32 if nnodes < 2**31 else np.int64
+        size = len(euler)
+        nlevels = max(1, size.bit_length())
+        table = np.empty((nlevels, size), dtype=dtype)
+        table[0] = euler
+        for k in range(1, nlevels):
+            half = 1 << (k - 1)
+            table[k, : size - half] = np.maximum(
+                table[k - 1, : size - half], table[k - 1, half:]
+            )
+            table[k, size - half :] = table[k - 1, size - half :]
+
+        self.nnodes: int = nnodes
+        """Number of Nodes in the indexed tree."""
+        self._first = np.asarray(first, dtype=dtype)
+        self._table = table
+        self._log2 = np.zeros(size + 1, dtype=dtype)
+        self._log2[2:] = np.floor(np.log2(np.arange(2, size + 1)))
+
+    def query(self, idx0: int, idx1: int) -> int:
+        """Return the idx label of the LCA of two Nodes."""
+        lo = self._first[idx0]
+        hi = self._first[idx1]
+        if lo > hi:
+            lo, hi = hi, lo
+        k = self._log2[hi - lo + 1]
+        row = self._table[k]
+        return int(max(row[lo], row[hi - (1 << k) + 1]))
+
+    def query_many(self, idxs0: np.ndarray, idxs1: np.ndarray) -> np.ndarray:
+        """Return an array of LCA idx labels for broadcast arrays of idxs.
+
+        The two inputs can be any shapes that broadcast together, e.g.,
+        `query_many(idxs[:, None], idxs[None, :])` returns a matrix of
+        the LCA of every pair of Nodes in `idxs`.
+        """
+        f0 = self._first[np.asarray(idxs0, dtype=np.int64)]
+        f1 = self._first[np.asarray(idxs1, dtype=np.int64)]
+        lo = np.minimum(f0, f1)
+        hi = np.maximum(f0, f1)
+        k = self._log2[hi - lo + 1]
+        # index the flattened table to avoid slower 2-d fancy indexing
+        offset = k.astype(np.int64) * self._table.shape[1]
+        flat = self._table.ravel()
+        left = flat[offset + lo]
+        right = flat[offset + hi - (1 << k) + 1]
+        return np.maximum(left, right).astype(np.int64)
+
+    def query_all(self, *idxs: int) -> int:
+        """Return the idx label of the LCA of one or more Nodes."""
+        mrca = idxs[0]
+        for idx in idxs[1:]:
+            mrca = self.query(mrca, idx)
+        return mrca
@@ -5,7 +5,8 @@
 from __future__ import annotations
 
 import sys
-from collections.abc import Iterator, Sequence
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
 from copy import deepcopy
 from numbers import Integral
 from typing import TYPE_CHECKING, TypeVar
@@ -13,6 +14,7 @@ from typing import TYPE_CHECKING, TypeVar
 from toytree.utils import ToytreeError
 
 if TYPE_CHECKING:
+    import numpy as np
     from toyplot.canvas import Canvas
     from toyplot.coordinates import Cartesian
     from toyplot.mark import Mark
@@ -80,6 +82,130 @@ def _normalize_tree_indices(
     return indices
 
 
+# default format arguments of `MultiTree.write`.
+_WRITE_DEFAULTS = dict(
+    dist_formatter="%.12g",
+    internal_labels="support",
+    internal_labels_formatter="%.12g",
+    features=None,
+    features_prefix="&",
+    features_delim=",",
+    features_assignment="=",
+)
+
+
+class _LazyTreeList(Sequence):
+    """Sequence of trees parsed from Newick strings on access.
+
+    Trees are parsed only when first accessed. A tree returned by
+    indexing or iteration may be edited in place by the caller, so it
+    is pinned: kept for the life of the sequence and returned again on
+    later access. Trees parsed only for read-only methods (e.g.,
+    `MultiTree.get_treedist_matrix`) are never handed out and are kept
+    in a bounded LRU cache, where eviction loses nothing because
+    re-parsing the Newick gives the same tree. Memory is thus bounded
+    by `cache_size` plus the number of trees accessed by the caller.
+
+    Slicing returns a lazy view that shares the Newick strings, cache
+    and pinned trees of this sequence, such that no tree is parsed
+    until it is accessed from the view.
+    """
+
+    def __init__(
+        self,
+        newicks: Sequence[str],
+        tdict: Mapping[str, str] | None = None,
+        kwargs: Mapping[str, object] | None = None,
+        cache_size: int | None = 128,
+    ):
+        if cache_size is not None and cache_size < 0:
+            raise ToytreeError("cache_size must be an int >= 0 or None.")
+        self._newicks: tuple[str, ...] = tuple(newicks)
+        self._tdict: dict[str, str] = dict(tdict) if tdict else {}
+        self._kwargs: dict[str, object] = dict(kwargs) if kwargs else {}
+        self._cache_size = cache_size
+        self._cache: OrderedDict[int, ToyTree] = OrderedDict()
+        self._pinned: dict[int, ToyTree] = {}
+        self._indices: range = range(len(self._newicks))
+
+    def __len__(self) -> int:
+        """Return the number of trees."""
+        return len(self._indices)
+
+    def __iter__(self) -> Iterator[ToyTree]:
+        """Iterate over trees, parsing and pinning each on access."""
+        for idx in range(len(self._indices)):
+            yield self[idx]
+
+    def __getitem__(self, idx: int | slice) -> ToyTree | _LazyTreeList:
+        """Return one pinned tree, or a lazy view of a slice of trees."""
+        if isinstance(idx, slice):
+            view = object.__new__(_LazyTreeList)
+            view.__dict__.update(self.__dict__)
+            view._indices = self._indices[idx]
+            return view
+        idx = self._normalize_index(idx)
+        if idx not in self._pinned:
+            tree = self._cache.pop(idx, None)
+            self._pinned[idx] = tree if tree is not None else self._parse(idx)
+        return self._pinned[idx]
+
+    def __repr__(self) -> str:
+        """Return a concise representation of the lazy sequence."""
+        return (
+            f"<_LazyTreeList ntrees={len(self)} pinned={len(self._pinned)} "
+            f"cached={len(self._cache)}>"
+        )
+
+    def _normalize_index(self, idx: int) -> int:
+        """Return the index of a tree in the stored Newicks or raise IndexError."""
+        ntrees = len(self._indices)
+        idx = int(idx)
+        if not -ntrees <= idx < ntrees:
+            raise IndexError("tree index out of range")
+        return self._indices[idx]
+
+    def _parse(self, idx: int) -> ToyTree:
+        """Return a newly parsed tree at idx without caching it."""
+        from toytree.io.src.newick import parse_newick_string
+        from toytree.io.src.parse import translate_node_names
+
+        tree = parse_newick_string(self._newicks[idx], **self._kwargs)
+        return translate_node_names(tree, self._tdict)
+
+    def _get_newick(self, idx: int) -> str | None:
+        """Return the stored Newick at idx if its tree is unmodified.
+
+        A tree that was never pinned cannot have been edited, so its
+        stored Newick can be written without parsing it. None is
+        returned if the tree is pinned, or if its Newick has tip names
+        that must first be translated from a NEXUS table.
+        """
+        idx = self._normalize_index(idx)
+        if idx in self._pinned or self._tdict:
+            return None
+        return self._newicks[idx].strip()
+
+    def _get_readonly(self, idx: int) -> ToyTree:
+        """Return the tree at idx for reading, without pinning it.
+
+        The returned tree must not be modified or returned to the
+        caller, since it may be evicted and re-parsed later.
+        """
+        idx = self._normalize_index(idx)
+        if idx in self._pinned:
+            return self._pinned[idx]
+        if idx in self._cache:
+            self._cache.move_to_end(idx)
+            return self._cache[idx]
+        tree = self._parse(idx)
+        if self._cache_size is None or self._cache_size > 0:
+            self._cache[idx] = tree
+            if self._cache_size is not None and len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return tree
+
+
 class MultiTree:
     """Represent an ordered collection of trees.
 
@@ -90,7 +216,14 @@ class MultiTree:
     Notes
     -----
     Use :func:`toytree.mtree` to parse supported multitree inputs into a
-    MultiTree instance.
+    MultiTree instance. With `toytree.mtree(..., lazy=True)` the trees
+    are stored as Newick strings and each is only parsed when accessed.
+    Trees returned by indexing or iteration are then kept, such that
+    in-place edits persist, while read-only methods (e.g., `write`,
+    `get_unique_topologies`, `get_treedist_matrix`) parse trees into a
+    bounded LRU cache. This makes `len()` cheap and bounds the memory
+    of read-only passes over large tree sets. Methods that modify
+    trees in place (e.g., `root`) first parse all trees.
 
     Examples
     --------
@@ -99,8 +232,8 @@ class MultiTree:
     >>> mtree.draw()
     """
 
-    def __init__(self, treelist: list[ToyTree]):
-        self.treelist: list[ToyTree] = treelist
+    def __init__(self, treelist: list[ToyTree] | _LazyTreeList):
+        self.treelist: list[ToyTree] | _LazyTreeList = treelist
         """Trees stored in the order they were provided."""
         self._draw_fixed_order_cache: dict[tuple, list[str]] = {}
         """Cached inferred tip orders used by repeated ``draw()`` calls."""
@@ -117,6 +250,11 @@ class MultiTree:
         """Return one tree or a tree slice from the collection."""
         return self.treelist[idx]
 
+    def _materialize(self) -> None:
+        """Parse all trees of a lazy MultiTree into a list in place."""
+        if isinstance(self.treelist, _LazyTreeList):
+            self.treelist = list(self.treelist)
+
     def __repr__(self) -> str:
         """Return a concise representation of the MultiTree."""
         return f"<toytree.MultiTree ntrees={len(self)}>"
@@ -131,7 +269,7 @@ class MultiTree:
             If the MultiTree is empty.
         """
         _require_non_empty_treelist(self.treelist, "get ntips")
-        return self.treelist[0].ntips
+        return self._get_tree_readonly(0).ntips
 
     @property
     def ntrees(self) -> int:
@@ -153,8 +291,10 @@ class MultiTree:
             If the MultiTree is empty.
         """
         _require_non_empty_treelist(self.treelist, "compare tip labels")
-        first = set(self.treelist[0].get_tip_labels())
-        return all(set(tree.get_tip_labels()) == first for tree in self.treelist[1:])
+        first = set(self._get_tree_readonly(0).get_tip_labels())
+        return all(
+            set(tree.get_tip_labels()) == first for tree in self._iter_trees_readonly()
+        )
 
     def all_tree_topologies_same(self, include_root: bool = False) -> bool:
         """Return True if every tree has the same topology.
@@ -177,10 +317,10 @@ class MultiTree:
             If the MultiTree is empty.
         """
         _require_non_empty_treelist(self.treelist, "compare topologies")
-        first = self.treelist[0].get_topology_id(include_root=include_root)
+        first = self._get_tree_readonly(0).get_topology_id(include_root=include_root)
         return all(
             tree.get_topology_id(include_root=include_root) == first
-            for tree in self.treelist[1:]
+            for tree in self._iter_trees_readonly()
         )
 
     def all_tree_tips_aligned(self, rtol: float = 1e-5, atol: float = 1e-5) -> bool:
@@ -207,12 +347,13 @@ class MultiTree:
         import numpy as np
 
         _require_non_empty_treelist(self.treelist, "check tip alignment")
-        heights = [node.height for tree in self.treelist for node in tree]
+        heights = [node.height for tree in self._iter_trees_readonly() for node in tree]
         return bool(np.allclose(heights, 0.0, rtol=rtol, atol=atol))
 
     def get_unique_topologies(
         self,
         include_root: bool = False,
+        idxs: int | Sequence[int] | None = None,
     ) -> list[tuple[ToyTree, int]]:
         """Return one representative tree and count for each unique topology.
 
@@ -221,6 +362,10 @@ class MultiTree:
         include_root : bool, default=False
             If True, count rooted topologies separately. Otherwise count
             trees by unrooted topology.
+        idxs : int, Sequence[int], or None, default=None
+            Optional tree indices to count, e.g., a subsample of a
+            posterior. If None, all trees are counted. For a lazy
+            MultiTree only the selected trees are parsed.
 
         Returns
         -------
@@ -236,15 +381,35 @@ class MultiTree:
         ... )
         >>> mtree.get_unique_topologies()
         """
-        trees_dict: dict[object, tuple[ToyTree, int]] = {}
-        for tree in self.treelist:
+        if idxs is None:
+            indices = range(len(self.treelist))
+        else:
+            indices = _normalize_tree_indices(
+                idxs, len(self.treelist), caller="get_unique_topologies()"
+            )
+        trees_dict: dict[object, tuple[int, int]] = {}
+        for idx in indices:
+            tree = self._get_tree_readonly(idx)
             hashed = tree.get_topology_id(include_root=include_root)
             if hashed in trees_dict:
-                first_tree, count = trees_dict[hashed]
-                trees_dict[hashed] = (first_tree, count + 1)
+                first_idx, count = trees_dict[hashed]
+                trees_dict[hashed] = (first_idx, count + 1)
             else:
-                trees_dict[hashed] = (tree, 1)
-        return sorted(trees_dict.values(), key=lambda item: item[1], reverse=True)
+                trees_dict[hashed] = (idx, 1)
+        # the returned trees are those of the collection (pinned if lazy).
+        counts = [(self.treelist[i], j) for i, j in trees_dict.values()]
+        return sorted(counts, key=lambda item: item[1], reverse=True)
+
+    def _get_tree_readonly(self, idx: int) -> ToyTree:
+        """Return a tree for reading without pinning it in a lazy MultiTree."""
+        if isinstance(self.treelist, _LazyTreeList):
+            return self.treelist._get_readonly(idx)
+        return self.treelist[idx]
+
+    def _iter_trees_readonly(self) -> Iterator[ToyTree]:
+        """Iterate over trees for reading without pinning them."""
+        for idx in range(len(self.treelist)):
+            yield self._get_tree_readonly(idx)
 
     def copy(self) -> MultiTree:
         """Return a deep copy of the MultiTree."""
@@ -294,21 +459,35 @@ class MultiTree:
         str or None
             Newline-joined serialized tree text if ``path`` is None.
             Otherwise writes to ``path`` and returns None.
+
+        Notes
+        -----
+        With the default format arguments, trees of a lazy MultiTree
+        that were never accessed (and thus cannot have been edited)
+        are written as their stored Newick strings without parsing.
+        Accessed trees, and all trees when any format argument is
+        changed, are serialized by `ToyTree.write`.
         """
         _warn_deprecated_kwargs("write", kwargs)
-        newicks = [
-            tree.write(
-                path=None,
-                dist_formatter=dist_formatter,
-                internal_labels=internal_labels,
-                internal_labels_formatter=internal_labels_formatter,
-                features=features,
-                features_prefix=features_prefix,
-                features_delim=features_delim,
-                features_assignment=features_assignment,
-            )
-            for tree in self.treelist
-        ]
+        write_kwargs = dict(
+            path=None,
+            dist_formatter=dist_formatter,
+            internal_labels=internal_labels,
+            internal_labels_formatter=internal_labels_formatter,
+            features=features,
+            features_prefix=features_prefix,
+            features_delim=features_delim,
+            features_assignment=features_assignment,
+        )
+        # unaccessed lazy trees are written as stored if format is default.
+        lazy = isinstance(self.treelist, _LazyTreeList)
+        stored = lazy and write_kwargs == dict(_WRITE_DEFAULTS, path=None)
+        newicks = []
+        for idx in range(len(self.treelist)):
+            newick = self.treelist._get_newick(idx) if stored else None
+            if newick is None:
+                newick = self._get_tree_readonly(idx).write(**write_kwargs)
+            newicks.append(newick)
         text = "\n".join(newicks)
         if path is None:
             return text
@@ -316,6 +495,63 @@ class MultiTree:
             out.write(text)
         return None
 
+    def get_treedist_matrix(
+        self,
+        metric: str = "rf",
+        normalize: bool = False,
+        condensed: bool = False,
+        workers: int | None = 1,
+    ) -> np.ndarray:
+        r"""Return a matrix of pairwise split distances among trees.
+
+        Splits of each tree are extracted once and hashed into a
+        global table, and the splits shared by all pairs of trees are
+        counted by a single sparse matrix product. This is much faster
+        than comparing each pair of trees separately.
+
+        Parameters
+        ----------
+        metric : str, default="rf"
+            Distance metric: "rf" (Robinson-Foulds) or "rfi"
+            (information-corrected Robinson-Foulds).
+        normalize : bool, default=False
+            If True, normalize each distance by the total splits (or
+            split information) of both trees.
+        condensed : bool, default=False
+            If True, return a condensed upper-triangle vector.
+        workers : int or None, default=1
+            Number of processes used to extract splits. If None, use
+            the number of CPUs.
+
+        Returns
+        -------
+        np.ndarray
+            A (ntrees, ntrees) distance matrix or condensed vector.
+
+        Raises
+        ------
+        ToytreeError
+            If the MultiTree is empty, trees do not share identical tip
+            labels, or arguments are invalid.
+
+        Examples
+        --------
+        >>> mtree = toytree.mtree("((a,b),(c,d));\n((a,c),(b,d));")
+        >>> mtree.get_treedist_matrix()
+        array([[0., 2.],
+               [2., 0.]])
+        """
+        from toytree.distance import get_treedist_matrix
+
+        _require_non_empty_treelist(self.treelist, "compute tree distances")
+        return get_treedist_matrix(
+            self,
+            metric=metric,
+            normalize=normalize,
+            condensed=condensed,
+            workers=workers,
+        )
+
     def get_consensus_tree(self, min_freq: float = 0.0, **kwargs) -> ToyTree:
         """Return the consensus tree inferred from the collection.
 
@@ -437,6 +673,7 @@ class MultiTree:
             selection.
         """
         mtree = self if inplace else self.copy()
+        mtree._materialize()
         for tree in mtree:
             tree.root(
                 *query,
@@ -461,6 +698,7 @@ class MultiTree:
             Unrooted collection.
         """
         mtree = self if inplace else self.copy()
+        mtree._materialize()
         for tree in mtree:
             tree.unroot(inplace=True)
         return mtree
@@ -668,4 +906,4 @@ class MultiTree:
             raise ToytreeError(
                 "All trees in treelist do not share the same set of tip labels."
             )
-        return self.treelist[0].get_tip_labels()
+        return self._get_tree_readonly(0).get_tip_labels()
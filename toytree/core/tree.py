@@ -56,6 +56,7 @@ if TYPE_CHECKING:
     from toyplot.coordinates import Cartesian
 
     from toytree.color.src.colorkit import ColorType
+    from toytree.core.lca import LCAIndex
     from toytree.drawing import ToyTreeMark
     from toytree.network.src.parse_network import AdmixtureEvent
 else:
@@ -208,6 +209,10 @@ class ToyTree(metaclass=ToyTreeMeta):
         self.edge_features: Set = set(("dist", "support"))
         self._idx_dict: Dict[int, Node] = {}
         """Private dict mapping Node idx labels to Node instances."""
+        self._parent_idxs: np.ndarray | None = None
+        """Private cached array of parent idx labels, see _update."""
+        self._lca_index: LCAIndex | None = None
+        """Private cached index for LCA queries, see _get_lca_index."""
 
         # toytree subpackage library API (mod, pcm, distance, ...)"""
         self.mod = TreeModAPI(self)
@@ -229,7 +234,8 @@ class ToyTree(metaclass=ToyTreeMeta):
 
     def __iter__(self) -> Iterator[Node]:
         """ToyTree is iterable, returning Nodes in idx order."""
-        return (self[i] for i in range(self.nnodes))
+        idx_dict = self._idx_dict
+        return (idx_dict[i] for i in range(self.nnodes))
 
     def __getitem__(self, idx: int) -> Node:
         """Nodes can be accessed by indexing or slicing by idx label."""
@@ -483,64 +489,213 @@ class ToyTree(metaclass=ToyTreeMeta):
         rotate, etc) but not if users modify Nodes adhoc. This is why
         Node objects are immutable.
         """
-        # clear depth counters used to get heights during traversal
-        depths = {self.treenode: 0.0}
-
-        # queue starts with root children, and stack starts with root.
-        queue = list(self.treenode._children)
-
-        # start w/ root on stack, as either an inner or a tip.
-        if queue:
-            inner_stack = [self.treenode]
-            outer_stack = []
-        else:
-            inner_stack = []
-            outer_stack = [self.treenode]
-
-        # traverse left then right subtrees to fill and pull from queue
+        # Depths from the root are stored temporarily in Node._height
+        # since parents are visited before children. This avoids a dict
+        # keyed by Nodes, whose hashes are not unique until idx labels
+        # are assigned, which made this quadratic for new trees.
+        root = self.treenode
+        root._height = 0.0
+        max_depth = 0.0
+
+        # traverse right then left subtrees (preorder) filling stacks of
+        # internal Nodes and leaves. Root is first on its stack.
+        inner_stack = []
+        outer_stack = []
+        queue = [root]
         while queue:
-            # get node from start of queue to proceed levelorder
             node = queue.pop()
-
-            # set depth of this node from the root
-            depths[node] = depths[node._up] + node._dist
-
-            # if leaf add to output stack and update farthest depth
-            if node.is_leaf():
-                outer_stack.append(node)
-            else:
+            children = node._children
+            if children:
                 inner_stack.append(node)
-
-            # add node's children to the queue (left child on end)
-            queue.extend(node._children)
-
-        # get max_depth from root, height is measured relative to this.
-        max_depth = max(depths.values())
+                depth = node._height
+                for child in children:
+                    child._height = cdepth = depth + child._dist
+                    if cdepth > max_depth:
+                        max_depth = cdepth
+                queue.extend(children)
+            else:
+                outer_stack.append(node)
 
         # clear idx cache and counter to be filled next
         idx = 0
-        self._idx_dict.clear()
+        idx_dict = self._idx_dict
+        idx_dict.clear()
+        self._parent_idxs = None
+        self._lca_index = None
 
         # return nodes in reverse order they were added to stack
-        while outer_stack:
-            node = outer_stack.pop()
-            node._height = max_depth - depths[node]
+        for node in reversed(outer_stack):
+            node._height = max_depth - node._height
             node._x = idx
             node._idx = idx
-            self._idx_dict[idx] = node
+            idx_dict[idx] = node
             idx += 1
         self.ntips = idx
 
         # return internal nodes, or just root if only a single Node.
-        while inner_stack:
-            node = inner_stack.pop()
-            node._height = max_depth - depths[node]
-            node._x = sum(i._x for i in node._children) / len(node._children)
+        for node in reversed(inner_stack):
+            node._height = max_depth - node._height
+            children = node._children
+            node._x = sum(i._x for i in children) / len(children)
             node._idx = idx
-            self._idx_dict[idx] = node
+            idx_dict[idx] = node
             idx += 1
         self.nnodes = idx
 
+    def _update_subtree(self, node: Node) -> None:
+        """Update idx labels and coordinates after rotating a subtree.
+
+        This is a faster alternative to `_update` for modifications
+        that reorder the children of Nodes within a subtree, but do
+        not change which Nodes are in it, nor any edge lengths (e.g.,
+        `rotate_node`). In idx order the leaves of a subtree occupy a
+        contiguous range, as do its internal Nodes (postorder), and
+        so only these ranges are relabeled, followed by the x-coords
+        of ancestors on the path to the root.
+        """
+        if not node._children:
+            return
+
+        # get leaves and internal Nodes of the subtree in idx order
+        inner_stack = []
+        outer_stack = []
+        queue = [node]
+        while queue:
+            desc = queue.pop()
+            if desc._children:
+                inner_stack.append(desc)
+                queue.extend(desc._children)
+            else:
+                outer_stack.append(desc)
+
+        # start of the ranges occupied by subtree leaves and internals
+        idx_dict = self._idx_dict
+        self._parent_idxs = None
+        self._lca_index = None
+        tidx = min(i._idx for i in outer_stack)
+        iidx = node._idx - len(inner_stack) + 1
+
+        for desc in reversed(outer_stack):
+            desc._x = tidx
+            desc._idx = tidx
+            idx_dict[tidx] = desc
+            tidx += 1
+        for desc in reversed(inner_stack):
+            children = desc._children
+            desc._x = sum(i._x for i in children) / len(children)
+            desc._idx = iidx
+            idx_dict[iidx] = desc
+            iidx += 1
+
+        # ancestors keep their idx labels but may shift in x.
+        anc = node._up
+        while anc is not None:
+            anc._x = sum(i._x for i in anc._children) / len(anc._children)
+            anc = anc._up
+
+    def _update_new_leaf(self, leaf: Node) -> None:
+        """Update idx labels and coordinates after adding a leaf Node.
+
+        This is a faster alternative to `_update` after a new leaf is
+        attached as a child of an existing internal Node (e.g.,
+        `add_child_node`). The leaf is inserted into the tip range
+        between its neighbours in idx order, which shifts the idx and
+        x of later tips by one, and of all internal Nodes by one in
+        idx while postorder is unchanged. Only Nodes right of the new
+        leaf and its ancestors are re-centered in x, and heights are
+        unchanged unless the new leaf is deeper than all others, in
+        which case the full `_update` is used.
+        """
+        parent = leaf._up
+        siblings = parent._children if parent is not None else ()
+        if len(siblings) < 2:
+            self._update()
+            return
+
+        # depth of the new leaf summed from the root, as in `_update`
+        path = []
+        anc = leaf
+        while anc._up is not None:
+            path.append(anc)
+            anc = anc._up
+        depth = 0.0
+        for node in reversed(path):
+            depth += node._dist
+        max_depth = self.treenode._height
+        if depth > max_depth:
+            self._update()
+            return
+        leaf._height = max_depth - depth
+
+        # tip idx of the new leaf from its neighbour in the old order
+        pos = next(i for i, child in enumerate(siblings) if child is leaf)
+        if pos:
+            nbr = siblings[pos - 1]
+            while nbr._children:
+                nbr = nbr._children[-1]
+            tidx = nbr._idx + 1
+        else:
+            nbr = siblings[1]
+            while nbr._children:
+                nbr = nbr._children[0]
+            tidx = nbr._idx
+
+        idx_dict = self._idx_dict
+        self._parent_idxs = None
+        self._lca_index = None
+        nodes = [idx_dict[i] for i in range(tidx, self.nnodes)]
+        leaf._x = tidx
+        leaf._idx = tidx
+        idx_dict[tidx] = leaf
+        idx = tidx + 1
+        for node in nodes[: self.ntips - tidx]:
+            node._x = idx
+            node._idx = idx
+            idx_dict[idx] = node
+            idx += 1
+        self.ntips += 1
+
+        # re-center ancestors and internal Nodes right of the new leaf
+        ancestors = {id(i) for i in path[1:]} | {id(self.treenode)}
+        for node in nodes[self.ntips - 1 - tidx :]:
+            if id(node) in ancestors or node._x >= tidx:
+                children = node._children
+                node._x = sum(i._x for i in children) / len(children)
+            node._idx = idx
+            idx_dict[idx] = node
+            idx += 1
+        self.nnodes = idx
+
+    def _get_parent_idxs(self) -> "np.ndarray":
+        """Return cached int array of parent idx labels in idx order.
+
+        The root has parent -1. Because children always have lower idx
+        labels than their parents, iterating over this array in idx
+        order is a postorder traversal, and in reverse is a preorder
+        traversal. The cache is cleared when the tree is updated.
+        """
+        if self._parent_idxs is None:
+            import numpy as np
+
+            parents = np.full(self.nnodes, -1, dtype=np.int64)
+            parents[:-1] = [self._idx_dict[i]._up._idx for i in range(self.nnodes - 1)]
+            self._parent_idxs = parents
+        return self._parent_idxs
+
+    def _get_lca_index(self) -> LCAIndex:
+        """Return cached index for O(1) lowest common ancestor queries.
+
+        The index stores an Euler tour and sparse table built from the
+        parent idx array (see :class:`toytree.core.lca.LCAIndex`). It
+        depends only on the topology and is cleared when the tree is
+        updated.
+        """
+        if self._lca_index is None:
+            from toytree.core.lca import LCAIndex
+
+            self._lca_index = LCAIndex(self._get_parent_idxs())
+        return self._lca_index
+
     #####################################################
     # TREE MODIFICATION FUNCTIONS (See ToyTree.mod)
     # - root, unroot, rotate_node, ladderize,
@@ -650,8 +805,9 @@ class ToyTree(metaclass=ToyTreeMeta):
 
         # match Node names as a group so we only need to perform one
         # tree traversal. Each query can return multiple regex hits.
-        matched = set(self._iter_nodes_by_name_match(*names))
-        nodes.update(matched)
+        if names:
+            matched = set(self._iter_nodes_by_name_match(*names))
+            nodes.update(matched)
 
         # if not query then return all Nodes
         if not nodes:
@@ -698,11 +854,9 @@ class ToyTree(metaclass=ToyTreeMeta):
         nodes = self.get_nodes(*query)
         if len(nodes) == 1:
             return nodes[0]
-        # include_self necessary to find ancestor between tip ^ parent
-        nset = set.intersection(
-            *(set(i.iter_ancestors(include_self=True)) for i in nodes)
-        )
-        return min(nset)
+        # fold pairwise O(1) queries of the cached LCA index
+        mrca = self._get_lca_index().query_all(*(i._idx for i in nodes))
+        return self._idx_dict[mrca]
 
     def get_ancestors(
         self,
@@ -963,11 +1117,43 @@ class ToyTree(metaclass=ToyTreeMeta):
         --------
         - iter_bipartitions
         """
+        import numpy as np
+
+        from toytree.enum.src.bipartitions import (
+            _get_mask_bits,
+            _get_split_masks,
+            _get_tip_bit_index,
+        )
+
         # bipartitions are ordered by edge idx order, and names within
         # bipartitions are consistently ordered by alphanumeric names.
         # so we sort so that trees with the same topology but rotated
-        # nodes will have the same bipartitions.
-        biparts = sorted(self.iter_bipartitions(feature=feature, sort=True, type=tuple))
+        # nodes will have the same bipartitions. Splits are built as
+        # bitmasks over tips in name order, which yields the same sorted
+        # tuples as iter_bipartitions(sort=True, type=tuple).
+        tips = self[: self.ntips]
+        index = _get_tip_bit_index([i.name for i in tips])
+        if len(index) == self.ntips:
+            labels = np.empty(self.ntips, dtype=object)
+            for node in tips:
+                labels[index[node.name]] = getattr(node, feature)
+            full = (1 << self.ntips) - 1
+            biparts = []
+            for mask in _get_split_masks(self, index):
+                # canonical mask excludes bit 0, so 'other' holds the
+                # first name and is ordered first when sizes are tied.
+                below = tuple(labels[_get_mask_bits(mask, self.ntips)])
+                other = tuple(labels[_get_mask_bits(full ^ mask, self.ntips)])
+                if len(below) < len(other):
+                    biparts.append((below, other))
+                else:
+                    biparts.append((other, below))
+            biparts.sort()
+        # duplicate tip names cannot be indexed as bits
+        else:
+            biparts = sorted(
+                self.iter_bipartitions(feature=feature, sort=True, type=tuple)
+            )
 
         # optional: duplicate last bipart to indicate rooting
         if include_root and self.is_rooted():
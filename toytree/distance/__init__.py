@@ -26,6 +26,9 @@ Examples
 >>> dist_t01 = toytree.distance.get_tree_distance_qrt(tree1, tree2)
 >>> dist_t01 = toytree.distance.get_tree_distance_rf(tree1, tree2)
 
+>>> # get pairwise distances among many ToyTrees
+>>> dists = toytree.distance.get_treedist_matrix([tree1, tree2], metric="rf")
+
 >>> # tree API usage (funcs accessible from trees for convenience)
 >>> tree.distance.get_node_distance
 >>> tree.distance.get_node_distance_matrix
@@ -36,3 +39,4 @@ Examples
 from ._src.nodedist import *
 from ._src.quartet_dist import *
 from ._src.treedist import *
+from ._src.treedist_matrix import get_treedist_matrix as get_treedist_matrix
@@ -6,7 +6,6 @@ These functions take a tree as input and use Node int idx labels
 to select Nodes.
 """
 
-import itertools
 from typing import Dict, Iterator, Tuple, TypeVar, Union
 
 import numpy as np
@@ -14,6 +13,7 @@ import pandas as pd
 
 from toytree import Node, ToyTree
 from toytree.core.apis import TreeDistanceAPI, add_subpackage_method
+from toytree.core.compact import CompactTree
 
 # from toytree.utils import ToytreeError
 
@@ -90,7 +90,7 @@ def iter_node_path(tree: ToyTree, node0: Query, node1: Query) -> Iterator[Node]:
 # doubling the distance to mrca...
 @add_subpackage_method(TreeDistanceAPI)
 def get_node_distance(
-    tree: ToyTree,
+    tree: Union[ToyTree, CompactTree],
     node0: Query,
     node1: Query,
     topology_only: bool = False,
@@ -99,8 +99,9 @@ def get_node_distance(
 
     Parameters
     ----------
-    tree: toytree.ToyTree
-        A ToyTree instance.
+    tree: toytree.ToyTree or toytree.CompactTree
+        A ToyTree instance, or a CompactTree, in which case distances
+        are computed on its arrays.
     node0: int, str, or Node
         A Node in the tree.
     node1: int, str, or Node
@@ -121,6 +122,9 @@ def get_node_distance(
     >>> tree = toytree.rtree.unittree(10, seed=123)
     >>> toytree.distance.get_node_distance(tree, 0, 1)
     """
+    if isinstance(tree, CompactTree):
+        return tree.get_node_distance(node0, node1, topology_only)
+
     # get query as Nodes (order not maintained, but not needed)
     nodes = tree.get_nodes(node0, node1)
     if len(nodes) == 1:
@@ -131,8 +135,8 @@ def get_node_distance(
         raise ValueError(f"Bad Node queries: node0 matched {q0}; node1 matched {q1}")
     node0, node1 = nodes
 
-    # get mrca of the query
-    mrca = tree.get_mrca_node(node0, node1)
+    # get mrca of the query from the cached LCA index
+    mrca = tree[tree._get_lca_index().query(node0._idx, node1._idx)]
 
     # store total distance
     dist = 0
@@ -149,16 +153,54 @@ def get_node_distance(
     return dist
 
 
+def _get_root_distances(
+    tree: Union[ToyTree, CompactTree], topology_only: bool = False
+) -> np.ndarray:
+    """Return an array of distances from the root to each Node.
+
+    Edge lengths are read from Nodes on each call, rather than cached,
+    since they can be modified without updating the tree. A CompactTree
+    is read-only, and so its cached arrays are used.
+    """
+    if isinstance(tree, CompactTree):
+        if topology_only:
+            return tree.get_node_levels()
+        return tree.root_dist
+    parents = tree._get_parent_idxs().tolist()
+    rdist = [0] * tree.nnodes
+    # parents always have higher idx than children (reverse=preorder)
+    for idx in range(tree.nnodes - 2, -1, -1):
+        edge = 1 if topology_only else tree._idx_dict[idx]._dist
+        rdist[idx] = rdist[parents[idx]] + edge
+    return np.array(rdist, dtype=int if topology_only else float)
+
+
+def _get_distance_matrix(
+    tree: Union[ToyTree, CompactTree], nrows: int, topology_only: bool
+) -> np.ndarray:
+    """Return distances among the first `nrows` Nodes in idx order.
+
+    The distance between Nodes i and j is computed from their distances
+    to the root as r(i) + r(j) - 2 * r(lca(i, j)), where the LCA of all
+    pairs is found by vectorized queries of the cached LCA index.
+    """
+    rdist = _get_root_distances(tree, topology_only)
+    idxs = np.arange(nrows)
+    lca = tree._get_lca_index().query_many(idxs[:, None], idxs[None, :])
+    rows = rdist[:nrows]
+    return rows[:, None] + rows[None, :] - 2 * rdist[lca]
+
+
 @add_subpackage_method(TreeDistanceAPI)
 def get_node_distance_matrix(
-    tree: ToyTree, topology_only: bool = False, df: bool = False
+    tree: Union[ToyTree, CompactTree], topology_only: bool = False, df: bool = False
 ) -> Union[np.array, pd.DataFrame]:
     """Return pairwise distances between all Nodes in a ToyTree.
 
     Parameters
     ----------
-    tree: toytree.ToyTree
-        A ToyTree.
+    tree: toytree.ToyTree or toytree.CompactTree
+        A ToyTree, or a CompactTree.
     topology_only: bool
         If True distances represent the number of edges between Nodes.
     df: bool
@@ -177,59 +219,18 @@ def get_node_distance_matrix(
     >>> tree = toytree.rtree.unittree(10, seed=123)
     >>> toytree.distance.get_node_distance_matrix(tree)
     """
-    dtype = int if topology_only else float
-
-    # postorder ordered
-    arr = np.zeros((tree.nnodes, tree.nnodes), dtype=dtype)
-
-    # store list of descendants indices for each node
-    clade_map = {}
-
-    # reorder
-    reorder = []
-
-    # traverse tree in postorder, but first visit all tips (idxorder).
-    for idx, node in enumerate(tree.traverse("postorder")):
-        # init clade list to store descendants of this node
-        clade_map[node] = [idx]
-
-        # store idxorder index for re-sorting later.
-        reorder.append(node.idx)
-
-        # build desc list from children desc lists
-        for child in node._children:
-            # store child's clade list to parent's clade list
-            clade = clade_map[child]
-            clade_map[node].extend(clade)
-
-            # set dist from child's clade members to parent
-            arr[clade, idx] = arr[clade, max(clade)] + (
-                1 if topology_only else child._dist
-            )
-
-        # set children clade's dists to each other
-        for ch0, ch1 in itertools.combinations(node._children, 2):
-            ch0 = clade_map[ch0]
-            ch1 = clade_map[ch1]
-            for c in ch0:
-                arr[c, ch1] = arr[c, idx] + arr[ch1, idx]
-
-    # mirror fill
-    arr[np.tril_indices_from(arr)] = arr.T[np.tril_indices_from(arr)]
-
-    # reorder into idx order
-    idxorder = [reorder.index(i) for i in range(tree.nnodes)]
+    arr = _get_distance_matrix(tree, tree.nnodes, topology_only)
 
     # optionally format as dataframe
     if not df:
-        return arr[idxorder][:, idxorder]
+        return arr
     index = tree.get_tip_labels() + [str(i.idx) for i in tree[tree.ntips :]]
-    return pd.DataFrame(arr[idxorder][:, idxorder], columns=index, index=index)
+    return pd.DataFrame(arr, columns=index, index=index)
 
 
 @add_subpackage_method(TreeDistanceAPI)
 def get_internal_node_distance_matrix(
-    tree: ToyTree,
+    tree: Union[ToyTree, CompactTree],
     topology_only: bool = False,
     df: bool = False,
 ) -> Union[np.array, pd.DataFrame]:
@@ -237,8 +238,8 @@ def get_internal_node_distance_matrix(
 
     Parameters
     ----------
-    tree: toytree.ToyTree
-        A ToyTree.
+    tree: toytree.ToyTree or toytree.CompactTree
+        A ToyTree, or a CompactTree.
     topology_only: bool
         If True distances represent the number of edges between Nodes.
     df: bool
@@ -263,14 +264,14 @@ def get_internal_node_distance_matrix(
 
 @add_subpackage_method(TreeDistanceAPI)
 def get_tip_distance_matrix(
-    tree: ToyTree, topology_only: bool = False, df: bool = False
+    tree: Union[ToyTree, CompactTree], topology_only: bool = False, df: bool = False
 ) -> Union[np.array, pd.DataFrame]:
     """Return pairwise distances between tip Nodes in a ToyTree.
 
     Parameters
     ----------
-    tree: toytree.ToyTree
-        The input ToyTree instance.
+    tree: toytree.ToyTree or toytree.CompactTree
+        The input ToyTree instance, or a CompactTree.
     topology_only: bool
         If True then all edges lengths are set to 1.
     df: bool
@@ -289,10 +290,12 @@ def get_tip_distance_matrix(
     >>> tree = toytree.rtree.unittree(10, seed=123)
     >>> toytree.distance.get_tip_distance_matrix(tree)
     """
-    arr = get_node_distance_matrix(tree, topology_only=topology_only, df=df)
+    # only the LCAs among tips are needed
+    arr = _get_distance_matrix(tree, tree.ntips, topology_only)
     if not df:
-        return arr[: tree.ntips, : tree.ntips]
-    return arr.iloc[: tree.ntips, : tree.ntips]
+        return arr
+    names = tree.get_tip_labels()
+    return pd.DataFrame(arr, columns=names, index=names)
 
 
 @add_subpackage_method(TreeDistanceAPI)
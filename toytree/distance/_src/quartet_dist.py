@@ -21,11 +21,20 @@ Note
 ----
 distance = 1 - similarity
 
+Quartet counts are computed without enumerating quartets, by counting
+the tips shared between the subtrees around each pair of internal
+nodes in the two trees (see `_get_quartet_counts`). This takes
+O(n^2) time and memory, versus O(n^4) when enumerating all quartets
+(`get_quartet_resolutions_table`).
+
 References
 ----------
 - Estabrook GF, McMorris FR, Meacham CA (1985). “Comparison of undirected
   phylogenetic trees based on subtrees of four evolutionary units.”
   Systematic Zoology, 34(2), 193--200. doi:10.2307/2413326 .
+- Christiansen C, Mailund T, Pedersen CNS, Randers M, Stissing MS (2006).
+  "Fast calculation of the quartet distance between trees of arbitrary
+  degrees." Algorithms for Molecular Biology, 1, 16.
 - ...
 """
 
@@ -34,6 +43,7 @@ from typing import Mapping
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
 import toytree
 from toytree.core import ToyTree
@@ -43,6 +53,9 @@ __all__ = [
     "get_treedist_quartets",
 ]
 
+# Max number of subtree intersection cells computed in one block.
+_MAX_BLOCK_CELLS = 2_000_000
+
 
 def get_quartet_resolutions_table(tree: ToyTree, df: bool = False) -> np.ndarray:
     """Return an array of quartet resolutions.
@@ -76,41 +89,255 @@ def get_quartet_resolutions_table(tree: ToyTree, df: bool = False) -> np.ndarray
     return arr
 
 
+def _choose2(x: np.ndarray) -> np.ndarray:
+    """Return the number of pairs among x items."""
+    return x * (x - 1) // 2
+
+
+def _get_clade_members(tree: ToyTree, columns: np.ndarray, dtype) -> sparse.csr_matrix:
+    """Return an (nnodes, ntips) sparse incidence matrix of clade tips.
+
+    Tips below each Node form a contiguous range of tip idxs, from the
+    smallest tip idx below the Node to that plus its clade size. Entry
+    [u, columns[i]] is 1 if tip i is below Node u.
+    """
+    sizes = _get_clade_sizes(tree)
+    first = np.arange(tree.nnodes)
+    parents = tree._get_parent_idxs()
+    for idx in range(tree.nnodes - 1):
+        first[parents[idx]] = min(first[parents[idx]], first[idx])
+    indptr = np.zeros(tree.nnodes + 1, dtype=np.int64)
+    np.cumsum(sizes, out=indptr[1:])
+    tips = np.arange(indptr[-1]) - np.repeat(indptr[:-1] - first, sizes)
+    data = np.ones(tips.size, dtype=dtype)
+    shape = (tree.nnodes, tree.ntips)
+    return sparse.csr_matrix((data, columns[tips], indptr), shape=shape)
+
+
+def _get_clade_intersections(tree1: ToyTree, tree2: ToyTree) -> np.ndarray:
+    """Return an (nnodes1, nnodes2) array of tips shared by two clades.
+
+    Entry [u, v] is the number of tips below Node u in tree1 that are
+    also below Node v in tree2, computed as the product of the sparse
+    clade incidence matrices of the two trees. The result is stored in
+    the smallest unsigned int type that can hold ntips.
+    """
+    dtype = np.uint16 if tree1.ntips < 2**16 else np.uint32
+    tips2 = {tree2[i].name: i for i in range(tree2.ntips)}
+    order = np.array([tips2[tree1[i].name] for i in range(tree1.ntips)])
+    members1 = _get_clade_members(tree1, order, dtype)
+    members2 = _get_clade_members(tree2, np.arange(tree2.ntips), dtype)
+    return (members1 @ members2.T).toarray()
+
+
+def _get_node_parts(tree: ToyTree) -> list[tuple[int, tuple[int, ...], bool]]:
+    """Return (idx, child idxs, has_up) for Nodes with >= 3 subtrees.
+
+    The subtrees around a Node are the clades of its children and, if
+    it is not the root, the rest of the tree above it. Nodes with
+    fewer than 3 subtrees cannot separate quartets.
+    """
+    parts = []
+    for node in tree[tree.ntips :]:
+        children = tuple(i._idx for i in node._children)
+        has_up = not node.is_root()
+        if len(children) + has_up >= 3:
+            parts.append((node._idx, children, has_up))
+    return parts
+
+
+def _get_clade_sizes(tree: ToyTree) -> np.ndarray:
+    """Return the number of tips below each Node in idx order."""
+    sizes = np.ones(tree.nnodes, dtype=np.int64)
+    parents = tree._get_parent_idxs()
+    sizes[tree.ntips :] = 0
+    for idx in range(tree.nnodes - 1):
+        sizes[parents[idx]] += sizes[idx]
+    return sizes
+
+
+def _get_num_resolved_quartets(tree: ToyTree) -> int:
+    """Return the number of quartets resolved in a tree.
+
+    A resolved quartet ab|cd is counted once from the Node where a and
+    b diverge and once from the Node where c and d diverge, where in
+    each case the other pair lies together in a single subtree.
+    """
+    ntips = tree.ntips
+    sizes = _get_clade_sizes(tree)
+    total = 0
+    for idx, children, has_up in _get_node_parts(tree):
+        psizes = sizes[list(children)]
+        if has_up:
+            psizes = np.append(psizes, ntips - sizes[idx])
+        pairs = _choose2(psizes)
+        total += int((pairs * (_choose2(ntips - psizes) - (pairs.sum() - pairs))).sum())
+    return total // 2
+
+
+def _group_node_parts(tree: ToyTree) -> list[tuple[np.ndarray, np.ndarray, bool]]:
+    """Return (idxs, child idxs, has_up) arrays for groups of Nodes.
+
+    Nodes from `_get_node_parts` are grouped by their number of
+    children and whether they have an up subtree.
+    """
+    groups = {}
+    for idx, children, has_up in _get_node_parts(tree):
+        groups.setdefault((len(children), has_up), []).append((idx, children))
+    return [
+        (np.array([i[0] for i in nodes]), np.array([i[1] for i in nodes]), has_up)
+        for (_, has_up), nodes in groups.items()
+    ]
+
+
+def _get_quartet_counts(tree1: ToyTree, tree2: ToyTree) -> tuple[int, int]:
+    """Return the number of quartets resolved the same and differently.
+
+    For every pair of internal Nodes (p1, p2) the subtrees around each
+    are intersected to get a matrix H[i, j] of shared tips. A quartet
+    resolved as ab|cd in both trees is counted from each (p1, p2) at
+    which a and b diverge in both trees while c and d lie in a single
+    subtree of each (H[k1, k2]), which is twice per quartet. A quartet
+    resolved as ab|cd in tree1 and ac|bd in tree2 is counted from each
+    of its four combinations of such Nodes. All counts are computed as
+    array operations on H, with Nodes grouped by degree.
+    """
+    ntips = tree1.ntips
+    inter = _get_clade_intersections(tree1, tree2)
+    sizes1 = _get_clade_sizes(tree1)
+    sizes2 = _get_clade_sizes(tree2)
+
+    # group Nodes by number of children and whether they have an up
+    # subtree, so that H can be built as an (m1, m2, d1, d2) array.
+    groups1 = _group_node_parts(tree1)
+    groups2 = _group_node_parts(tree2)
+
+    same2 = 0
+    diff4 = 0
+    for p1s, ch1s, has_up1 in groups1:
+        nc1 = ch1s.shape[1]
+        for p2s, ch2s, has_up2 in groups2:
+            nc2 = ch2s.shape[1]
+            # process blocks of tree1 Nodes to bound memory use.
+            ncells = p2s.size * (nc1 + has_up1) * (nc2 + has_up2)
+            bsize = max(1, _MAX_BLOCK_CELLS // ncells)
+            for bstart in range(0, p1s.size, bsize):
+                bp1s = p1s[bstart : bstart + bsize, None]
+                bch1s = ch1s[bstart : bstart + bsize, None, :]
+                shape = (bp1s.shape[0], p2s.size, nc1 + has_up1, nc2 + has_up2)
+                hmat = np.empty(shape, dtype=np.int64)
+                hmat[:, :, :nc1, :nc2] = inter[bch1s[..., None], ch2s[None, :, None, :]]
+                if has_up2:
+                    hmat[:, :, :nc1, nc2] = (
+                        sizes1[bch1s] - inter[bch1s, p2s[None, :, None]]
+                    )
+                if has_up1:
+                    hmat[:, :, nc1, :nc2] = sizes2[ch2s] - inter[bp1s[..., None], ch2s]
+                if has_up1 and has_up2:
+                    hmat[:, :, nc1, nc2] = (
+                        ntips - sizes1[bp1s] - sizes2[p2s] + inter[bp1s, p2s]
+                    )
+                same, diff = _get_quartet_counts_from_intersections(
+                    hmat.reshape(-1, shape[2], shape[3]), ntips
+                )
+                same2 += same
+                diff4 += diff
+    return same2 // 2, diff4 // 4
+
+
+def _get_quartet_counts_from_intersections(
+    hmat: np.ndarray, ntips: int
+) -> tuple[int, int]:
+    """Return summed (same, diff) quartet claims for a stack of H arrays.
+
+    hmat has shape (m, d1, d2) where hmat[:, i, j] is the number of
+    tips in subtree i of Node p1 and subtree j of each Node p2. Each
+    (k1, k2) is used as the pair of subtrees holding c and d.
+    """
+    rows = hmat.sum(axis=2)[:, :, None]
+    cols = hmat.sum(axis=1)[:, None, :]
+    # tips outside of subtree k1 and subtree k2
+    near = ntips - rows - cols + hmat
+    # tips in subtree k2 of p2 but not subtree k1 of p1, and vice versa
+    near1far2 = cols - hmat
+    far1near2 = rows - hmat
+
+    # pairs {a, b} near both that diverge at both p1 and p2 (same).
+    pairs = _choose2(hmat)
+    xpairs = _choose2(far1near2)
+    ypairs = _choose2(near1far2)
+    rpairs = pairs.sum(axis=2)[:, :, None]
+    cpairs = pairs.sum(axis=1)[:, None, :]
+    allpairs = pairs.sum(axis=(1, 2))[:, None, None]
+    sep = (
+        _choose2(near)
+        - (xpairs.sum(axis=1)[:, None, :] - xpairs)
+        - (ypairs.sum(axis=2)[:, :, None] - ypairs)
+        + (allpairs - rpairs - cpairs + pairs)
+    )
+    same = int((pairs * sep).sum())
+
+    # a near both, b near p1 only, c near p2 only, each separated from
+    # a at p1 and p2, respectively, and d far from both (diff).
+    u1 = (near1far2 * hmat).sum(axis=2)[:, :, None]
+    v1 = (far1near2 * hmat).sum(axis=1)[:, None, :]
+    hsq = hmat * hmat
+    sq_rows = hsq.sum(axis=2)[:, :, None]
+    sq_cols = hsq.sum(axis=1)[:, None, :]
+    triple = (
+        (hmat @ hmat.transpose(0, 2, 1)) @ hmat
+        - hmat * sq_rows
+        - hmat * sq_cols
+        + hsq * hmat
+    )
+    inner = (
+        near1far2 * far1near2 * near
+        - near1far2 * (u1 - near1far2 * hmat)
+        - far1near2 * (v1 - far1near2 * hmat)
+        + triple
+    )
+    diff = int((hmat * inner).sum())
+    return same, diff
+
+
 def get_quartet_comparison(tree1: ToyTree, tree2: ToyTree) -> Mapping[str, int]:
     """Return dict of quartet similarity/resolution data for two trees.
 
     This is used internally. Users should call `get_quartet_metrics`.
+    Quartets are counted from the tips shared among subtrees of the
+    two trees rather than enumerated, so this scales to trees with
+    thousands of tips.
     """
     # require trees to share the same tips
     assert set(tree1.get_tip_labels()) == set(tree2.get_tip_labels())
+    snames = tree1.get_tip_labels()
+    assert len(snames) == len(set(snames)), "duplicate tip names are not allowed"
 
-    # get each quartet resolution array
-    arr1 = get_quartet_resolutions_table(tree1)
-    arr2 = get_quartet_resolutions_table(tree2)
+    # count quartets resolved in each tree, and same or diff in both.
+    res1 = _get_num_resolved_quartets(tree1)
+    res2 = _get_num_resolved_quartets(tree2)
+    same, diff = _get_quartet_counts(tree1, tree2)
 
     # stats dict
     data = {}
 
-    # mask to select only quartes resolved in both trees
-    mask = (arr1 != 0) & (arr2 != 0)
-
     # compute Q = total possible number of quartets
-    data["Q"] = arr1.shape[0]
+    data["Q"] = toytree.enum.get_num_quartets(tree1.ntips)
 
     # S = total number of quartets resolved in the same way in both trees
-    data["S"] = sum(arr1[mask] == arr2[mask])
+    data["S"] = same
 
     # D = symmetric diff of resolved quartets
-    data["D"] = sum(arr1[mask] != arr2[mask])
+    data["D"] = diff
 
     # U = number of quartets unresolved in both trees
-    data["U"] = sum((arr1 == 0) & (arr2 == 0))
+    data["U"] = data["Q"] - res1 - res2 + same + diff
 
     # R1 = number of quartets resolved in tree1, but unresolved in tree2
-    data["R1"] = sum((arr1 != 0) & (arr2 == 0))
+    data["R1"] = res1 - same - diff
 
     # R2 = number of quartets resolved in tree2, but unresolved in tree1
-    data["R2"] = sum((arr1 == 0) & (arr2 != 0))
+    data["R2"] = res2 - same - diff
 
     # N = S + D + R1 + R2 + U
     data["N"] = data["S"] + data["D"] + data["R1"] + data["R2"] + data["U"]
@@ -237,8 +464,9 @@ def get_treedist_quartets(
     """Return a pd.Series with all quartet metrics for two trees.
 
     This returns all quartet metrics computed between two trees, since
-    once quartets are enumerated and compared calculating the metrics
-    is fast and simple.
+    once quartets are counted and compared calculating the metrics is
+    fast and simple. Quartets are counted in O(n^2) time without being
+    enumerated, so this can be used on trees with thousands of tips.
 
     Parameters
     ----------
@@ -295,7 +523,7 @@ def get_treedist_quartets(
     | SSJA: Semi-Strict ''    | S / (S + D + U)       | Estabrook et al. (1985) |
     | dQ: Steel and Penny     | (S + U) / N           | Steel and Penny (1993)  |
     | SD: Symmetric diff      | (2d + r1 + r2) / (2d + 2s + r1 + r2) | Day (1986) |
-    | MS: Marczewski-Steinhaus| (2d + r1 + r2) / (2d + s + r1 + r2)| Marczewski and Steinhaus (1958) |
+    | MS: Marczewski-Steinhaus| (2d + r1 + r2) / (2d + s + r1 + r2)| M. and S. (1958) |
     | SV: Symmetric Divergence| (2d + r1 + r2) / N   | Smith 2019 |
     | S2R: Similarity to Ref  | (s + (r1 + r2 + u) / 3) / Q | Asher and Smith (2022) |
     --------------------------------------------------------------------------
@@ -58,6 +58,7 @@ import pandas as pd
 from toytree import ToyTree, ToytreeError
 from toytree.core.apis import TreeDistanceAPI, add_subpackage_method
 from toytree.distance._src.treedist_utils import (
+    _get_phylo_info,
     _get_split_phylo_info,
     get_trees_matching_split_dist,
     get_trees_matching_split_info_dist,
@@ -66,6 +67,7 @@ from toytree.distance._src.treedist_utils import (
     get_trees_shared_phylo_info_dist,
     get_trees_shared_phylo_info_dist_from_biparts,
 )
+from toytree.enum.src.bipartitions import _get_split_masks, _get_tip_bit_index
 
 TIPS_IDENTICAL = "Treedist methods require that trees share identical tip names."
 
@@ -168,6 +170,44 @@ def _get_rf_distance_information_corrected(
     return total_info - shared_info
 
 
+def _get_split_mask_sets(tree1: ToyTree, tree2: ToyTree) -> Tuple[Set[int], Set[int]]:
+    """Return sets of canonical split bitmasks for two trees.
+
+    Both trees are encoded over the same index of tip labels so that
+    shared splits are equal ints.
+    """
+    index = _get_tip_bit_index(tree1.get_tip_labels())
+    set1 = set(_get_split_masks(tree1, index))
+    set2 = set(_get_split_masks(tree2, index))
+    return set1, set2
+
+
+def _get_rf_distance_information_corrected_from_masks(
+    set1: Set[int],
+    set2: Set[int],
+    ntips: int,
+    normalize: bool = True,
+) -> float:
+    """Return the rfi distance between two sets of split bitmasks.
+
+    Equivalent to `_get_rf_distance_information_corrected` but gets the
+    size of each split side from bit counts of its mask.
+    """
+
+    def info(mask: int) -> float:
+        size = mask.bit_count()
+        return _get_phylo_info(size, ntips - size)
+
+    total_info = sum(info(s) for s in set1 | set2)
+    shared_info = sum(info(s) for s in set1 & set2)
+    if normalize:
+        norm1 = sum(info(s) for s in set1)
+        norm2 = sum(info(s) for s in set2)
+        if normalize in ["sum", True]:
+            return (total_info - shared_info) / sum((norm1, norm2))
+    return total_info - shared_info
+
+
 def _get_unrooted_bipartition_length_map(tree: ToyTree) -> dict:
     """Return branch lengths keyed by canonical unrooted bipartitions."""
     utree = tree if not tree.is_rooted() else tree.unroot()
@@ -204,9 +244,9 @@ def get_treedist_rf(
     difference between the sets of internal bipartitions (splits) induced by
     two trees. Larger values indicate greater topological difference.
 
-    This implementation compares canonical split sets generated with
-    ``iter_bipartitions(type=frozenset, sort=True)`` and requires the two trees
-    to share identical tip labels.
+    This implementation compares sets of canonical split bitmasks encoded
+    over a shared index of tip labels, and requires the two trees to share
+    identical tip labels.
 
     Parameters
     ----------
@@ -246,8 +286,7 @@ def get_treedist_rf(
     https://doi.org/10.1016/0025-5564(81)90043-2
     """
     assert set(tree1.get_tip_labels()) == set(tree2.get_tip_labels()), TIPS_IDENTICAL
-    set1 = set(tree1.iter_bipartitions(type=frozenset, sort=True))
-    set2 = set(tree2.iter_bipartitions(type=frozenset, sort=True))
+    set1, set2 = _get_split_mask_sets(tree1, tree2)
     return _get_rf_distance(set1, set2, normalize=normalize)
 
 
@@ -265,9 +304,8 @@ def get_treedist_rfi(
     more informative splits.
 
     This implementation computes information-weighted disagreement from the
-    union and intersection of canonical split sets generated with
-    ``iter_bipartitions(type=frozenset, sort=True)`` and requires the two trees
-    to share identical tip labels.
+    union and intersection of sets of canonical split bitmasks, and requires
+    the two trees to share identical tip labels.
 
     Parameters
     ----------
@@ -310,9 +348,10 @@ def get_treedist_rfi(
     https://cran.r-project.org/web/packages/TreeDist/vignettes/information.html
     """
     assert set(tree1.get_tip_labels()) == set(tree2.get_tip_labels()), TIPS_IDENTICAL
-    set1 = set(tree1.iter_bipartitions(type=frozenset, sort=True))
-    set2 = set(tree2.iter_bipartitions(type=frozenset, sort=True))
-    return _get_rf_distance_information_corrected(set1, set2, normalize)
+    set1, set2 = _get_split_mask_sets(tree1, tree2)
+    return _get_rf_distance_information_corrected_from_masks(
+        set1, set2, tree1.ntips, normalize
+    )
 
 
 @add_subpackage_method(TreeDistanceAPI)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+
+"""All-pairs split distances among a collection of trees.
+
+Computing RF distances among thousands of trees by calling
+`get_treedist_rf` on every pair repeats the same split extraction for
+each tree many times. Here the splits of each tree are extracted once
+as canonical bitmasks (see :mod:`toytree.enum.src.bipartitions`),
+hashed into a global table of unique splits, and stored as a sparse
+(ntrees x nsplits) incidence matrix. The number of splits shared by
+every pair of trees is then a single sparse matrix product, from which
+the full pairwise distance matrix follows directly (similar in spirit
+to Day's (1985) linear-time hashing of clusters).
+
+Examples
+--------
+>>> trees = [toytree.rtree.rtree(10, seed=i) for i in range(100)]
+>>> dists = toytree.distance.get_treedist_matrix(trees, metric="rf")
+>>> dists.shape
+(100, 100)
+
+References
+----------
+- Day, W. H. E. (1985). Optimal algorithms for comparing trees with
+  labeled leaves. *Journal of Classification*, 2, 7-28.
+- Pattengale, N. D., Gottlieb, E. J., & Moret, B. M. E. (2007).
+  Efficiently computing the Robinson-Foulds metric. *Journal of
+  Computational Biology*, 14(6), 724-735.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+import numpy as np
+
+from toytree.enum.src.bipartitions import (
+    _get_canonical_split_mask,
+    _get_tip_bit_index,
+)
+from toytree.utils import ToytreeError
+from toytree.utils.src.parallel import get_workers, map_chunks
+
+if TYPE_CHECKING:
+    from toytree.core.tree import ToyTree
+
+__all__ = ["get_treedist_matrix"]
+
+METRICS = ("rf", "rfi")
+
+
+def _get_tree_payload(tree: ToyTree, index: dict[str, int]) -> tuple:
+    """Return (parent idxs, tip bit positions) used to encode splits.
+
+    This small array representation is cheap to pickle when splits are
+    extracted in worker processes.
+    """
+    bits = np.fromiter(
+        (index[tree[i].name] for i in range(tree.ntips)),
+        dtype=np.int64,
+        count=tree.ntips,
+    )
+    return tree._get_parent_idxs(), bits
+
+
+def _get_split_masks_from_parents(parents: np.ndarray, bits: np.ndarray) -> list[int]:
+    """Return canonical unrooted split masks from a parent idx array.
+
+    Node idx order is a postorder traversal, so each Node's clade mask
+    is complete before it is added to its parent. Masks are returned
+    for internal non-root Nodes, skipping the last child of a
+    bifurcating root whose split is the same as its sibling.
+    """
+    nnodes = parents.size
+    ntips = bits.size
+    masks = [1 << int(i) for i in bits.tolist()] + [0] * (nnodes - ntips)
+    plist = parents.tolist()
+    for idx in range(nnodes - 1):
+        masks[plist[idx]] |= masks[idx]
+    full = masks[-1]
+    nroot_children = plist.count(nnodes - 1)
+    topnode = nnodes - 2 if nroot_children <= 2 else nnodes - 1
+    return [_get_canonical_split_mask(i, full) for i in masks[ntips:topnode]]
+
+
+def _get_split_masks_chunk(payloads: Sequence[tuple]) -> list[list[int]]:
+    """Return split masks for a chunk of tree payloads."""
+    return [_get_split_masks_from_parents(*i) for i in payloads]
+
+
+def _get_split_masks_parallel(
+    payloads: list[tuple],
+    workers: int,
+) -> list[list[int]]:
+    """Return split masks for each tree, optionally in worker processes."""
+    chunks = map_chunks(
+        _get_split_masks_chunk, payloads, workers, desc="extracting splits"
+    )
+    return [masks for chunk in chunks for masks in chunk]
+
+
+def _get_split_incidence_matrix(tree_masks: Sequence[Sequence[int]]):
+    """Return a sparse (ntrees, nsplits) incidence matrix and split masks.
+
+    Each unique split is assigned a column in a global hash table in
+    the order it is first observed.
+    """
+    from scipy import sparse
+
+    table: dict[int, int] = {}
+    indices = []
+    indptr = [0]
+    for masks in tree_masks:
+        for mask in set(masks):
+            indices.append(table.setdefault(mask, len(table)))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int64)
+    mat = sparse.csr_matrix(
+        (data, np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(tree_masks), len(table)),
+    )
+    return mat, list(table)
+
+
+def get_treedist_matrix(
+    trees: Iterable[ToyTree],
+    metric: str = "rf",
+    normalize: bool = False,
+    condensed: bool = False,
+    workers: int | None = 1,
+) -> np.ndarray:
+    """Return a matrix of pairwise split distances among trees.
+
+    Splits of each tree are extracted once and encoded as sparse rows
+    of a (ntrees x nsplits) incidence matrix, such that the splits
+    shared by all pairs of trees are computed by one sparse matrix
+    product. This is much faster than calling `get_treedist_rf` on
+    every pair of trees in a large collection. Trees are compared as
+    unrooted topologies and must share identical tip labels.
+
+    Parameters
+    ----------
+    trees : Iterable[ToyTree]
+        A MultiTree or collection of ToyTrees.
+    metric : str, default="rf"
+        Distance metric. "rf" is the Robinson-Foulds distance (see
+        `get_treedist_rf`) and "rfi" the information-corrected RF
+        distance (see `get_treedist_rfi`).
+    normalize : bool, default=False
+        If True, divide each distance by the sum of the split counts
+        (rf) or split phylogenetic information (rfi) of both trees.
+    condensed : bool, default=False
+        If True, return the upper triangle of the matrix as a condensed
+        distance vector in the order used by `scipy.spatial.distance`.
+    workers : int or None, default=1
+        Number of processes used to extract splits from trees. If
+        None, use the number of CPUs.
+
+    Returns
+    -------
+    np.ndarray
+        A (ntrees, ntrees) symmetric distance matrix, or a condensed
+        vector of length ntrees * (ntrees - 1) / 2.
+
+    Raises
+    ------
+    ToytreeError
+        If metric or workers is invalid, or if trees do not share
+        identical tip labels.
+
+    Examples
+    --------
+    >>> mtree = toytree.mtree([toytree.rtree.rtree(8, seed=i) for i in range(5)])
+    >>> mtree.get_treedist_matrix(metric="rf")
+    >>> toytree.distance.get_treedist_matrix(mtree, normalize=True, condensed=True)
+
+    See Also
+    --------
+    get_treedist_rf
+    get_treedist_rfi
+    """
+    if metric not in METRICS:
+        raise ToytreeError(f"metric must be one of {METRICS}, not {metric!r}.")
+    workers = get_workers(workers)
+
+    # stream trees (read-only for a MultiTree, such that a lazy one is
+    # not fully parsed) and keep only their splits or small payloads.
+    if hasattr(trees, "_iter_trees_readonly"):
+        trees = trees._iter_trees_readonly()
+    labels = None
+    items = []
+    for tree in trees:
+        if labels is None:
+            labels = tree.get_tip_labels()
+            tips = set(labels)
+            if len(tips) != len(labels):
+                raise ToytreeError("Tip labels must be unique within each tree.")
+            index = _get_tip_bit_index(labels)
+        elif tree.ntips != len(labels) or set(tree.get_tip_labels()) != tips:
+            raise ToytreeError(
+                "Treedist methods require that trees share identical tip names."
+            )
+        payload = _get_tree_payload(tree, index)
+        items.append(
+            payload if workers > 1 else _get_split_masks_from_parents(*payload)
+        )
+    if labels is None:
+        raise ToytreeError("Cannot compute distances among zero trees.")
+
+    # extract splits of each tree once and hash them in a global table.
+    tree_masks = _get_split_masks_parallel(items, workers) if workers > 1 else items
+    mat, splits = _get_split_incidence_matrix(tree_masks)
+
+    # weight of each split: a count (rf) or its phylogenetic info (rfi).
+    if metric == "rf":
+        weights = np.ones(len(splits))
+    else:
+        from toytree.distance._src.treedist_utils import _get_phylo_info
+
+        ntips = len(labels)
+        weights = np.array(
+            [_get_phylo_info(i.bit_count(), ntips - i.bit_count()) for i in splits],
+            dtype=float,
+        )
+
+    # distance = (total in tree i) + (total in tree j) - 2 * (shared)
+    totals = mat @ weights
+    wmat = mat.multiply(weights[None, :]).tocsr() if metric == "rfi" else mat
+    shared = (wmat @ mat.T).toarray().astype(float)
+    denom = totals[:, None] + totals[None, :]
+    dists = denom - 2 * shared
+    if normalize:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dists = np.where(denom > 0, dists / denom, 0.0)
+    np.fill_diagonal(dists, 0.0)
+    dists[np.abs(dists) < 1e-12] = 0.0
+
+    if condensed:
+        return dists[np.triu_indices(len(tree_masks), k=1)]
+    return dists
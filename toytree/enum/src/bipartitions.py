@@ -11,9 +11,30 @@ Examples
 >>> tree = toytree.tree("(a,b,((c,d),(e,f)));")
 >>> next(tree.iter_bipartitions())
 ({'c', 'd'}, {'a', 'b', 'e', 'f'})
+
+Notes
+-----
+Internally, splits are encoded as integer bitmasks over an index of
+tip labels (or node idx labels) computed in a single postorder pass.
+Comparisons among trees (e.g., RF distances, topology IDs, consensus
+clade counting) use these masks directly, and only convert them to
+sets of names or Nodes when returned to the user.
 """
 
-from typing import Callable, Iterator, Optional, Sequence, Set, Tuple, TypeVar
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
 
 from toytree import Node, ToyTree
 from toytree.core.apis import TreeEnumAPI, add_subpackage_method, add_toytree_method
@@ -26,6 +47,83 @@ __all__ = [
 ]
 
 
+###################################################################
+# Bitmask split engine shared by enum, distance, and consensus
+###################################################################
+
+
+def _get_tip_bit_index(labels: Sequence[str]) -> Dict[str, int]:
+    """Return a dict mapping tip labels to bit positions.
+
+    Bits are assigned in sorted label order so that the same set of
+    labels always produces the same index, and the lowest bit is the
+    alphanumerically first label.
+    """
+    return {label: bit for bit, label in enumerate(sorted(labels))}
+
+
+def _get_clade_masks(
+    tree: ToyTree,
+    index: Optional[Mapping[str, int]] = None,
+) -> List[int]:
+    """Return a bitmask of the tips below each Node in idx order.
+
+    Masks are built in a single postorder pass, where each tip sets
+    one bit and each internal Node is the union of its children. If
+    `index` is None tips are encoded by their idx label, otherwise by
+    the bit position mapped to their name.
+    """
+    masks = [0] * tree.nnodes
+    for node in tree:
+        if node.is_leaf():
+            bit = node._idx if index is None else index[node.name]
+            masks[node._idx] = 1 << bit
+        else:
+            mask = 0
+            for child in node._children:
+                mask |= masks[child._idx]
+            masks[node._idx] = mask
+    return masks
+
+
+def _get_canonical_split_mask(mask: int, full: int) -> int:
+    """Return the side of a split that does not contain bit 0.
+
+    Both sides of an unrooted split map to the same mask. A mask of
+    0 is returned for the trivial split of the full set.
+    """
+    return full ^ mask if mask & 1 else mask
+
+
+def _get_split_masks(
+    tree: ToyTree,
+    index: Optional[Mapping[str, int]] = None,
+    include_singleton_partitions: bool = False,
+) -> List[int]:
+    """Return canonical split masks for each unrooted edge of a tree.
+
+    One mask is returned per edge of the unrooted tree, in Node idx
+    order, such that a rooted tree and its unrooted version return
+    the same masks. Splits are canonicalized with
+    `_get_canonical_split_mask` so that masks from different trees
+    encoded with the same `index` can be compared directly.
+    """
+    masks = _get_clade_masks(tree, index)
+    full = masks[-1]
+    # the last child of a bifurcating root is the same split as its
+    # sibling, so skip it as in _iter_bipartition_sets.
+    topnode = tree.nnodes - 2 if tree.is_rooted() else tree.nnodes - 1
+    if include_singleton_partitions:
+        return [_get_canonical_split_mask(i, full) for i in masks[:topnode]]
+    return [_get_canonical_split_mask(i, full) for i in masks[tree.ntips : topnode]]
+
+
+def _get_mask_bits(mask: int, nbits: int) -> np.ndarray:
+    """Return an array of the positions of set bits in a mask."""
+    data = np.frombuffer(mask.to_bytes((nbits + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(data, bitorder="little"))
+
+
 @add_subpackage_method(TreeEnumAPI)
 def _iter_bipartition_sets(
     tree: ToyTree,
@@ -69,39 +167,43 @@ def _iter_bipartition_sets(
     >>> list(tree.enum._iter_bipartition_sets("idx", include_internal_nodes=True))
     [({2, 3, 5}, {0, 1, 4, 6, 7}), ({2, 3, 4, 5, 6}, {0, 1, 7})]
     """
-    # store cache of desc below each node to reduce traversals
-    cache = {}
+    # bitmask of the Node idxs (or tip idxs) below each Node, built
+    # in a single postorder pass.
+    masks = [0] * tree.nnodes
+    for node in tree:
+        if node.is_leaf():
+            masks[node._idx] = 1 << node._idx
+        else:
+            mask = 1 << node._idx if include_internal_nodes else 0
+            for child in node._children:
+                mask |= masks[child._idx]
+            masks[node._idx] = mask
 
-    # nodes set to iterate over. Do not include the root.
-    node_set = set(tree)
+    # all Nodes on either side of a split. Do not include the root
+    # node if tree is rooted, nor internal Nodes unless requested.
     topnode = tree.nnodes - 1
-
-    # do not include root node in node_set if tree is rooted.
+    if include_internal_nodes:
+        nbits = tree.nnodes
+        full = (1 << tree.nnodes) - 1
+        if tree.is_rooted():
+            full ^= 1 << tree.treenode._idx
+    else:
+        nbits = tree.ntips
+        full = (1 << tree.ntips) - 1
     if tree.is_rooted():
-        node_set -= {tree.treenode}
         topnode -= 1
 
-    # iterate over all nodes in idx order building cache as it goes.
-    for node in tree[:topnode]:
-        if node.is_leaf():
-            below = cache[node] = {node}
-            if not include_singleton_partitions:
-                continue
-        else:
-            below = set.union(*([{node}] + [cache[i] for i in node.children]))
-            cache[node] = below
-
-        # get all nodes not under this split
-        other = node_set - cache[node]
-
-        # if excluding internal Nodes
-        if not include_internal_nodes:
-            below = set(i for i in below if i._idx < tree.ntips)
-            other = set(i for i in other if i._idx < tree.ntips)
+    # iterate over all nodes in idx order, skipping the root.
+    start = 0 if include_singleton_partitions else tree.ntips
+    for node in tree[start:topnode]:
+        below = masks[node._idx]
+        other = full & ~below
+        below = [tree[i] for i in _get_mask_bits(below, nbits)]
+        other = [tree[i] for i in _get_mask_bits(other, nbits)]
 
         # yield biparts except at root in unrooted trees: ({}, {all})
         if feature is None:
-            yield below, other
+            yield set(below), set(other)
         else:
             yield (
                 set(getattr(i, feature) for i in below),
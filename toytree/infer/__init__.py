@@ -5,11 +5,15 @@
 
 # methods here will be available at submodule-level (toytree.infer.[method])
 from .src.consensus import *  # consensus_tree, consensus_features
+from .src.likelihood import *  # get_tree_log_likelihood
+from .src.ml_search import *  # ml_search
 from .src.neighbor_joining import *  # neighbor_joining_tree
-from .src.parsimony import *  # consistency_and_retention_indices
+from .src.parsimony import *  # fitch_parsimony_scores, consistency_and_retention_indices
+from .src.parsimony_search import *  # parsimony_search
 from .src.upgma import *  # upgma_tree
 
 # requires sympy which is not yet in conda recipe, so for now
-# you need to call the following to access the likelihood code:
+# you need to call the following to access the didactic likelihood code
+# (fast numerical likelihoods are in `get_tree_log_likelihood` above):
 # >>> from toytree.infer.src import maximum_likelihood
 # >>> from toytree.infer.src.maximum_likelihood import JC69, K80, TN93, get_tree_likelihood, get_tree_likelihood_plot_gen
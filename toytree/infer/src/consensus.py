@@ -11,6 +11,11 @@ from typing import Iterable, Optional
 import numpy as np
 
 from toytree.core import Node, ToyTree
+from toytree.enum.src.bipartitions import (
+    _get_clade_masks,
+    _get_mask_bits,
+    _get_tip_bit_index,
+)
 
 __all__ = [
     "consensus_tree",
@@ -60,6 +65,25 @@ def _canonical_split(clade: frozenset[str], all_tips: frozenset[str]) -> frozens
     return clade if tuple(sorted(clade)) <= tuple(sorted(other)) else other
 
 
+def _canonical_split_mask(mask: int, full: int) -> int:
+    """Return the canonical side of a split encoded as a bitmask.
+
+    Same rules as `_canonical_split` when bits are assigned to tips
+    in sorted name order: the smaller side, or on ties the side that
+    contains the first name (bit 0).
+    """
+    if (not mask) or (mask == full):
+        return full
+    other = full ^ mask
+    msize = mask.bit_count()
+    osize = other.bit_count()
+    if msize < osize:
+        return mask
+    if osize < msize:
+        return other
+    return mask if mask & 1 else other
+
+
 def _numeric_or_none(value) -> Optional[float]:
     """Return float(value) for finite numeric values else None."""
     if value is None:
@@ -121,7 +145,8 @@ def _set_summary_attrs(node: Node, feature: str, values: list[float]) -> None:
 def check_trees_set_for_ultrametric(trees: list[ToyTree]) -> None:
     """Raise if trees are not rooted+ultrametric."""
     for tidx, tre in enumerate(trees):
-        # Rootedness is required because node heights are only meaningful on rooted trees.
+        # Rootedness is required because node heights are only meaningful
+        # on rooted trees.
         if not tre.is_rooted():
             raise ValueError(
                 "input trees are not rooted. Cannot use option ultrametric=True "
@@ -148,27 +173,31 @@ def get_clade_frequencies(
     all_tips = _validate_shared_tips(treelist)
     ntrees = len(treelist)
 
+    # Encode clades as bitmasks over a shared index of tip labels, and
+    # convert canonical masks back to sets of names only at the end.
+    index = _get_tip_bit_index(all_tips)
+    names = sorted(all_tips)
+    full = (1 << len(names)) - 1
+
     # Seed with the full clade so root-level metadata stays available.
-    clades: dict[frozenset[str], dict[str, object]] = {
-        all_tips: {"count": ntrees, "dist": []},
+    mclades: dict[int, dict[str, object]] = {
+        full: {"count": ntrees, "dist": []},
     }
     for tre in treelist:
-        # Track split keys already seen in this source tree so each split counts once per tree.
-        seen: set[frozenset[str]] = set()
+        # Track split keys already seen in this source tree so each split
+        # counts once per tree.
+        seen: set[int] = set()
         rooted = tre.is_rooted()
+        masks = _get_clade_masks(tre, index)
         for node in tre[:-1]:
             # Canonicalize each node clade into a root-invariant split key.
-            clade = (
-                frozenset(node.get_leaf_names())
-                if not node.is_leaf()
-                else frozenset((node.name,))
-            )
-            key = _canonical_split(clade, all_tips)
+            key = _canonical_split_mask(masks[node._idx], full)
             if key in seen:
                 continue
             seen.add(key)
 
-            # For rooted trees, the root-adjacent edge becomes a merged edge if unrooted.
+            # For rooted trees, the root-adjacent edge becomes a merged edge
+            # if unrooted.
             if rooted and node._up is not None and node._up.is_root():
                 # In rooted trees this split becomes the merged edge on unrooting.
                 dist = sum(i._dist for i in node._up.children)
@@ -176,12 +205,17 @@ def get_clade_frequencies(
                 dist = node._dist
             dist = _numeric_or_none(dist)
             # Store split count and optional dist sample for downstream summaries.
-            if key not in clades:
-                clades[key] = {"count": 1, "dist": [] if dist is None else [dist]}
+            if key not in mclades:
+                mclades[key] = {"count": 1, "dist": [] if dist is None else [dist]}
             else:
-                clades[key]["count"] = int(clades[key]["count"]) + 1
+                mclades[key]["count"] = int(mclades[key]["count"]) + 1
                 if dist is not None:
-                    clades[key]["dist"].append(dist)
+                    mclades[key]["dist"].append(dist)
+
+    clades: dict[frozenset[str], dict[str, object]] = {
+        frozenset(names[i] for i in _get_mask_bits(mask, len(names))): data
+        for mask, data in mclades.items()
+    }
 
     # Deterministic ordering: frequency desc, clade-size desc, lexical key.
     ordered = sorted(
@@ -309,7 +343,8 @@ def map_features_from_unrooted_trees_to_unrooted_tree(
     # Operate on an unrooted copy so split matching is root-invariant.
     out = tree.unroot()
 
-    # Build lookup tables on target tree: internal split key -> node and tip name -> node.
+    # Build lookup tables on target tree: internal split key -> node and
+    # tip name -> node.
     target_internal: dict[frozenset[str], Node] = {}
     for node in out[out.ntips :]:
         clade = frozenset(node.get_leaf_names())
@@ -520,7 +555,8 @@ def consensus_features(
         edge_feat_list.append("dist")
     if "support" in feat_list:
         print(
-            "warning: 'support' was provided in features; treating it as edge_features.",
+            "warning: 'support' was provided in features; "
+            "treating it as edge_features.",
             file=sys.stderr,
         )
         feat_list.remove("support")
@@ -549,7 +585,8 @@ def consensus_features(
     ]
     if missing_edge_features:
         raise ValueError(
-            f"requested edge feature(s) not found in input trees: {missing_edge_features}"
+            "requested edge feature(s) not found in input trees: "
+            f"{missing_edge_features}"
         )
 
     if ultrametric:
@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+
+"""Fast nucleotide likelihoods on a fixed tree by Felsenstein pruning.
+
+This is the numerical counterpart to the didactic sympy code in
+:mod:`toytree.infer.src.maximum_likelihood`. An alignment is compressed
+into unique site patterns once, transition probability matrices for all
+edges are computed in one batched call from an eigendecomposition of
+the rate matrix, and conditional likelihoods of every pattern are
+pruned together as a (nnodes, npatterns, 4) array with per-node log
+scaling (see :class:`DiscretePruningEngine`).
+
+Substitution models are JC69, K80 and TN93 (Yang 2014, ch. 1), with
+rate matrices normalized to one expected substitution per unit of
+edge length. Bases are ordered TCAG as in the didactic module.
+
+Examples
+--------
+>>> tree = toytree.rtree.unittree(4, treeheight=0.2, seed=1)
+>>> seqs = {"r0": "ACGTT", "r1": "ACGTA", "r2": "ATGTA", "r3": "ATGCA"}
+>>> loglik, sites = toytree.infer.get_tree_log_likelihood(tree, seqs, "K80")
+
+References
+----------
+- Felsenstein, J. (1981). Evolutionary trees from DNA sequences: a
+  maximum likelihood approach. *J. Mol. Evol.*, 17, 368-376.
+- Yang, Z. (2014). *Molecular Evolution: A Statistical Approach*.
+  Oxford University Press.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import numpy as np
+
+from toytree.pcm.src.sim.sim_discrete import _get_transition_matrices
+from toytree.pcm.src.traits.fit_discrete_ctmc import DiscretePruningEngine
+from toytree.utils import ToytreeError
+
+if TYPE_CHECKING:
+    from toytree import ToyTree
+
+__all__ = ["get_tree_log_likelihood"]
+
+BASE_ORDER = list("TCAG")
+MODELS = ("JC69", "K80", "TN93")
+
+# IUPAC codes and the bases (in TCAG order) each allows.
+IUPAC = {
+    "T": "T",
+    "U": "T",
+    "C": "C",
+    "A": "A",
+    "G": "G",
+    "R": "AG",
+    "Y": "CT",
+    "S": "CG",
+    "W": "AT",
+    "K": "GT",
+    "M": "AC",
+    "B": "CGT",
+    "D": "AGT",
+    "H": "ACT",
+    "V": "ACG",
+    "N": "TCAG",
+    "-": "TCAG",
+    "?": "TCAG",
+    ".": "TCAG",
+}
+
+
+@dataclass
+class SitePatterns:
+    """Unique site patterns of an alignment and their counts."""
+
+    names: list[str]
+    """: Sequence names in the order of rows of `partials`."""
+    partials: np.ndarray
+    """: (nseqs, npatterns, 4) array with 1 for bases allowed by each code."""
+    weights: np.ndarray
+    """: Number of sites with each pattern."""
+    index: np.ndarray
+    """: Pattern index of each site in the alignment."""
+
+
+def _compress_alignment(alignment: Mapping[str, str | Sequence[str]]) -> SitePatterns:
+    """Return the unique site patterns of an alignment.
+
+    Parameters
+    ----------
+    alignment: Mapping[str, str | Sequence[str]]
+        Mapping of sequence names to aligned sequences of IUPAC codes.
+        Gaps and unknown bases ("-", "?", "N") allow all four bases.
+    """
+    if not alignment:
+        raise ToytreeError("alignment must contain at least one sequence.")
+    names = [str(i) for i in alignment]
+    seqs = ["".join(i).upper() for i in alignment.values()]
+    nsites = len(seqs[0])
+    if nsites == 0 or any(len(i) != nsites for i in seqs):
+        raise ToytreeError("aligned sequences must be non-empty and equal length.")
+
+    # encode bytes as indices into the table of IUPAC masks.
+    lookup = np.full(256, -1, dtype=np.int16)
+    table = np.zeros((len(IUPAC), 4), dtype=float)
+    for code, (char, bases) in enumerate(IUPAC.items()):
+        lookup[ord(char)] = code
+        table[code, [BASE_ORDER.index(i) for i in bases]] = 1.0
+    try:
+        raw = np.frombuffer("".join(seqs).encode("ascii"), dtype=np.uint8)
+    except UnicodeEncodeError as exc:
+        bad = exc.object[exc.start]
+        raise ToytreeError(f"alignment contains invalid characters: {[bad]}") from exc
+    codes = lookup[raw].reshape(len(seqs), nsites)
+    if np.any(codes < 0):
+        bad = sorted({chr(i) for i in raw[lookup[raw] < 0]})
+        raise ToytreeError(f"alignment contains invalid characters: {bad}")
+
+    patterns, index, weights = np.unique(
+        codes, axis=1, return_inverse=True, return_counts=True
+    )
+    return SitePatterns(
+        names=names,
+        partials=table[patterns],
+        weights=weights.astype(float),
+        index=index.ravel(),
+    )
+
+
+def _get_qmatrix(
+    model: str,
+    kappa: float | tuple[float, float] = 2.0,
+    freqs: Sequence[float] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return a normalized rate matrix (TCAG order) and base frequencies.
+
+    JC69 and K80 have equal base frequencies. K80 and TN93 scale
+    transitions relative to transversions by `kappa`, which for TN93
+    can be a tuple of (pyrimidine T<->C, purine A<->G) ratios.
+    """
+    if model == "JC69":
+        kappa = 1.0
+    if model in ("JC69", "K80"):
+        freqs = np.repeat(0.25, 4)
+    kappa1, kappa2 = np.broadcast_to(np.asarray(kappa, dtype=float), (2,))
+    if not (kappa1 > 0 and kappa2 > 0):
+        raise ToytreeError("kappa must be > 0.")
+    freqs = np.asarray(freqs, dtype=float)
+    if freqs.shape != (4,) or np.any(freqs <= 0) or not np.isclose(freqs.sum(), 1):
+        raise ToytreeError("freqs must be 4 positive values summing to 1.")
+
+    rates = np.ones((4, 4))
+    rates[0, 1] = rates[1, 0] = kappa1
+    rates[2, 3] = rates[3, 2] = kappa2
+    qmatrix = rates * freqs[None, :]
+    np.fill_diagonal(qmatrix, 0.0)
+    np.fill_diagonal(qmatrix, -qmatrix.sum(axis=1))
+    return qmatrix / -(freqs @ np.diag(qmatrix)), freqs
+
+
+class NucleotideLikelihoodEngine:
+    """Vectorized Felsenstein pruning of an alignment on a tree.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        Tree with edge lengths in expected substitutions per site.
+    alignment: Mapping[str, str] or SitePatterns
+        Mapping of tip names to aligned sequences, or patterns already
+        compressed by `_compress_alignment`. Sequences for names that
+        are not tips in the tree are ignored.
+    model: str
+        One of "JC69", "K80", or "TN93".
+    kappa: float or tuple[float, float]
+        Transition / transversion rate ratio for K80, or a tuple of
+        (T<->C, A<->G) ratios for TN93. Ignored for JC69.
+    freqs: Sequence[float] or None
+        Base frequencies in TCAG order for TN93. If None, empirical
+        frequencies of the alignment are used.
+    """
+
+    def __init__(
+        self,
+        tree: ToyTree,
+        alignment: Mapping[str, str] | SitePatterns,
+        model: str = "JC69",
+        kappa: float | tuple[float, float] = 2.0,
+        freqs: Sequence[float] | None = None,
+    ):
+        self.model = str(model).upper()
+        if self.model not in MODELS:
+            raise ToytreeError(f"model must be one of {MODELS}, not {model!r}.")
+        if not isinstance(alignment, SitePatterns):
+            alignment = _compress_alignment(alignment)
+        self.patterns = alignment
+        self.pruner = DiscretePruningEngine(tree)
+
+        # observation partials for tips, and ones for internal nodes.
+        rows = {name: i for i, name in enumerate(alignment.names)}
+        missing = [i for i in tree.get_tip_labels() if i not in rows]
+        if missing:
+            raise ToytreeError(f"alignment is missing tips in the tree: {missing}")
+        npatterns = alignment.weights.size
+        self.partials = np.ones((tree.nnodes, npatterns, 4))
+        order = [rows[i] for i in tree.get_tip_labels()]
+        self.partials[: tree.ntips] = alignment.partials[order]
+
+        if freqs is None and self.model == "TN93":
+            freqs = self.get_empirical_freqs()
+        self.kappa = kappa
+        self.qmatrix, self.freqs = _get_qmatrix(self.model, kappa, freqs)
+
+    @property
+    def dists(self) -> np.ndarray:
+        """Edge lengths above each node in idx order (root is 0)."""
+        return self.pruner.dists
+
+    def get_empirical_freqs(self) -> np.ndarray:
+        """Return base frequencies of the tip sequences.
+
+        Ambiguous codes contribute equally to each base they allow.
+        """
+        tips = self.partials[: self.pruner.ntips]
+        counts = (tips / tips.sum(axis=-1, keepdims=True)).sum(axis=0)
+        freqs = self.patterns.weights @ counts
+        return freqs / freqs.sum()
+
+    def get_transition_matrices(self, dists: np.ndarray | None = None) -> np.ndarray:
+        """Return the (nnodes, 4, 4) P(t) matrix of the edge above each node."""
+        dists = self.dists if dists is None else dists
+        return _get_transition_matrices(self.qmatrix, dists, self.freqs)
+
+    def get_pattern_log_likelihoods(
+        self, dists: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Return the log-likelihood of each unique site pattern."""
+        probs = self.get_transition_matrices(dists)
+        return self.pruner.log_likelihood(probs, self.partials, self.freqs)
+
+    def log_likelihood(
+        self, dists: np.ndarray | None = None
+    ) -> tuple[float, np.ndarray]:
+        """Return the total log-likelihood and the log-likelihood per site.
+
+        Parameters
+        ----------
+        dists: np.ndarray or None
+            Optional edge lengths above each node in idx order to use in
+            place of the edge lengths of the tree.
+        """
+        patterns = self.get_pattern_log_likelihoods(dists)
+        total = float(self.patterns.weights @ patterns)
+        return total, patterns[self.patterns.index]
+
+
+def get_tree_log_likelihood(
+    tree: ToyTree,
+    alignment: Mapping[str, str],
+    model: str = "JC69",
+    kappa: float | tuple[float, float] = 2.0,
+    freqs: Sequence[float] | None = None,
+) -> tuple[float, np.ndarray]:
+    """Return the log-likelihood of an alignment given a tree and model.
+
+    Identical alignment columns are compressed into weighted site
+    patterns, transition probability matrices for all edges are built
+    at once, and all patterns are pruned together as numpy arrays with
+    rescaling at every node, such that large alignments and trees do
+    not underflow. Edge lengths are in expected substitutions per site.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        Tree with edge lengths. Unrooted trees are evaluated at their
+        basal polytomy, which under these reversible models gives the
+        same likelihood as any rooting.
+    alignment: Mapping[str, str]
+        Mapping of tip names to aligned DNA sequences of IUPAC codes.
+        Gaps and unknown bases ("-", "?", "N") are treated as missing.
+    model: str
+        One of "JC69", "K80", or "TN93".
+    kappa: float or tuple[float, float]
+        Transition / transversion rate ratio for K80, or a tuple of
+        (T<->C, A<->G) ratios for TN93. Ignored for JC69.
+    freqs: Sequence[float] or None
+        Base frequencies in TCAG order for TN93. If None, empirical
+        frequencies of the alignment are used.
+
+    Returns
+    -------
+    tuple[float, np.ndarray]
+        The total log-likelihood and an array of per-site
+        log-likelihoods in alignment column order.
+
+    Raises
+    ------
+    ToytreeError
+        If the model or parameters are invalid, if sequences are not
+        aligned, contain invalid characters, or do not include a
+        sequence for every tip in the tree.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(4, treeheight=0.2, seed=1)
+    >>> seqs = {"r0": "ACGTT", "r1": "ACGTA", "r2": "ATGTA", "r3": "ATGCA"}
+    >>> total, sites = toytree.infer.get_tree_log_likelihood(tree, seqs, "JC69")
+    """
+    engine = NucleotideLikelihoodEngine(tree, alignment, model, kappa, freqs)
+    return engine.log_likelihood()
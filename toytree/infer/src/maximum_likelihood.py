@@ -3,7 +3,8 @@
 """Maximum likelihood tree inference.
 
 A didactic version with visualizations for learning ML. Not
-optimized for speed.
+optimized for speed. See :mod:`toytree.infer.src.likelihood` for a
+vectorized implementation of the same models for full alignments.
 """
 
 from abc import ABC, abstractmethod
@@ -0,0 +1,523 @@
+#!/usr/bin/env python
+
+"""Maximum likelihood tree search by NNI hill-climbing.
+
+A tree is searched by alternating rounds of branch-length optimization
+and nearest-neighbor interchange (NNI) moves, as in PhyML (Guindon and
+Gascuel 2003). Rather than building a new ToyTree for each neighbor
+(see :mod:`toytree.mod._src.tree_move`), the search works on an
+adjacency list of the unrooted tree and caches a directional partial
+likelihood for each side of each edge. Changing an edge length or
+swapping subtrees across an edge only removes the cached partials
+whose subtree contains that edge, which are then recomputed lazily
+along the path back to the next edge being evaluated, such that each
+move is scored in time proportional to the number of site patterns.
+
+Edge lengths are optimized by Newton steps on the log-likelihood of
+one edge at a time. With P(t) = V exp(L t) V^-1 from a single
+eigendecomposition of Q, the likelihood of each site pattern across
+an edge is a sum of exponentials in t, so its first and second
+derivatives are computed exactly at the same cost as the likelihood.
+
+Examples
+--------
+>>> tree = toytree.rtree.unittree(10, treeheight=0.3, seed=1)
+>>> aln = {i: "ACGT" * 50 for i in tree.get_tip_labels()}
+>>> result = toytree.infer.ml_search(aln, tree, model="K80")
+>>> result.tree, result.log_likelihood, result.evals_per_second
+
+References
+----------
+- Guindon, S., & Gascuel, O. (2003). A simple, fast, and accurate
+  algorithm to estimate large phylogenies by maximum likelihood.
+  *Systematic Biology*, 52(5), 696-704.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import numpy as np
+
+from toytree.infer.src.likelihood import (
+    MODELS,
+    NucleotideLikelihoodEngine,
+    SitePatterns,
+    _compress_alignment,
+)
+from toytree.utils import ToytreeError
+
+if TYPE_CHECKING:
+    from toytree import ToyTree
+
+__all__ = ["ml_search", "MLSearchResult"]
+
+_MIN_BLEN = 1e-8
+_MAX_BLEN = 10.0
+_MAX_NEWTON_STEPS = 20
+
+
+@dataclass
+class MLSearchResult:
+    """Result of a maximum likelihood tree search."""
+
+    tree: ToyTree
+    """: Unrooted ToyTree with optimized edge lengths."""
+    log_likelihood: float
+    """: Log-likelihood of the alignment given the returned tree."""
+    nmoves: int
+    """: Number of NNI moves accepted during the search."""
+    nrounds: int
+    """: Number of rounds of NNI moves and edge-length optimization."""
+    nevals: int
+    """: Number of full-tree log-likelihood evaluations."""
+    seconds: float
+    """: Wall time of the search in seconds."""
+
+    @property
+    def evals_per_second(self) -> float:
+        """Return the number of likelihood evaluations per second."""
+        return self.nevals / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _rescale(vec: np.ndarray, scale: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return partials rescaled to a max of 1 and their log scalers."""
+    top = vec.max(axis=-1)
+    top[~(top > 0)] = 1.0
+    return vec / top[:, None], scale + np.log(top)
+
+
+class _UnrootedLikelihood:
+    """Directional partial likelihoods on an unrooted tree.
+
+    Nodes are integers, where tips are 0..ntips-1 and match the rows
+    of `tips`. A cached partial `cl[(u, v)]` is the likelihood of the
+    data on v's side of edge (u, v), conditional on the state at v,
+    stored with per-pattern log scalers.
+    """
+
+    def __init__(
+        self,
+        nbrs: list[list[int]],
+        blens: dict[tuple[int, int], float],
+        tips: np.ndarray,
+        weights: np.ndarray,
+        qmatrix: np.ndarray,
+        freqs: np.ndarray,
+    ):
+        self.nbrs = nbrs
+        self.blens = blens
+        self.tips = tips
+        self.weights = weights
+        self.freqs = freqs
+        self.cl: dict[tuple[int, int], tuple[np.ndarray, np.ndarray]] = {}
+        self.nevals = 0
+
+        # P(t) = left @ diag(exp(evals * t)) @ right for reversible Q.
+        root = np.sqrt(freqs)
+        sym = root[:, None] * qmatrix / root[None, :]
+        self.evals, evecs = np.linalg.eigh(0.5 * (sym + sym.T))
+        self.left = evecs / root[:, None]
+        self.right = evecs.T * root[None, :]
+
+    @staticmethod
+    def _key(u: int, v: int) -> tuple[int, int]:
+        return (u, v) if u < v else (v, u)
+
+    def get_pmatrix(self, dist: float) -> np.ndarray:
+        """Return the transition probability matrix for an edge length."""
+        return (self.left * np.exp(self.evals * dist)) @ self.right
+
+    def get_message(self, u: int, v: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the partial of v's side of edge (u, v) moved to u."""
+        vec, scale = self.get_partial(u, v)
+        probs = self.get_pmatrix(self.blens[self._key(u, v)])
+        return vec @ probs.T, scale
+
+    def get_partial(self, u: int, v: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the cached partial of v's side of edge (u, v)."""
+        ntips = self.tips.shape[0]
+        stack = [(u, v)]
+        while stack:
+            edge = stack[-1]
+            if edge in self.cl:
+                stack.pop()
+                continue
+            src, dst = edge
+            if dst < ntips:
+                self.cl[edge] = (self.tips[dst], np.zeros(self.tips.shape[1]))
+                stack.pop()
+                continue
+            missing = [(dst, w) for w in self.nbrs[dst] if w != src]
+            missing = [i for i in missing if i not in self.cl]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            vec = None
+            scale = np.zeros(self.tips.shape[1])
+            for w in self.nbrs[dst]:
+                if w != src:
+                    msg, msg_scale = self.get_message(dst, w)
+                    vec = msg if vec is None else vec * msg
+                    scale = scale + msg_scale
+            self.cl[edge] = _rescale(vec, scale)
+        return self.cl[(u, v)]
+
+    def invalidate(self, a: int, b: int) -> None:
+        """Remove cached partials whose subtree contains edge (a, b).
+
+        A partial is only cached if all partials it was computed from
+        are cached, so a walk outward from the edge can stop at the
+        first partial that is not cached.
+        """
+        stack = [(a, b), (b, a)]
+        while stack:
+            node, skip = stack.pop()
+            for other in self.nbrs[node]:
+                if other != skip and self.cl.pop((other, node), None) is not None:
+                    stack.append((other, node))
+
+    def _edge_terms(
+        self,
+        side_a: tuple[np.ndarray, np.ndarray],
+        side_b: tuple[np.ndarray, np.ndarray],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return per-pattern eigen coefficients and log scalers of an edge.
+
+        The likelihood of each pattern across an edge of length t is
+        `sum(coef * exp(evals * t), axis=1) * exp(scale)`.
+        """
+        vec_a, scale_a = _rescale(*side_a)
+        vec_b, scale_b = _rescale(*side_b)
+        coef = ((vec_a * self.freqs) @ self.left) * (vec_b @ self.right.T)
+        return coef, scale_a + scale_b
+
+    def _evaluate(
+        self, coef: np.ndarray, scale: np.ndarray, dist: float
+    ) -> tuple[float, float, float]:
+        """Return the log-likelihood and its first two derivatives in t."""
+        self.nevals += 1
+        terms = coef * np.exp(self.evals * dist)
+        lik = np.maximum(terms.sum(axis=1), 1e-300)
+        d1 = (terms @ self.evals) / lik
+        d2 = (terms @ self.evals**2) / lik - d1**2
+        loglik = float(self.weights @ (np.log(lik) + scale))
+        return loglik, float(self.weights @ d1), float(self.weights @ d2)
+
+    def _optimize_dist(
+        self, coef: np.ndarray, scale: np.ndarray, dist: float
+    ) -> tuple[float, float]:
+        """Return the edge length maximizing the likelihood by Newton steps."""
+        dist = min(max(dist, _MIN_BLEN), _MAX_BLEN)
+        loglik, d1, d2 = self._evaluate(coef, scale, dist)
+        for _ in range(_MAX_NEWTON_STEPS):
+            if d2 < 0:
+                target = dist - d1 / d2
+            else:
+                # not concave here: move uphill by a multiple of dist.
+                target = 2 * dist if d1 > 0 else 0.5 * dist
+            target = min(max(target, _MIN_BLEN), _MAX_BLEN)
+            # halve the step until the likelihood does not decrease.
+            for _ in range(10):
+                new = self._evaluate(coef, scale, target)
+                if new[0] >= loglik:
+                    break
+                target = 0.5 * (dist + target)
+            else:
+                break
+            done = abs(target - dist) <= 1e-6 * (1 + dist)
+            dist = target
+            loglik, d1, d2 = new
+            if done:
+                break
+        return dist, loglik
+
+    def get_log_likelihood(self) -> float:
+        """Return the log-likelihood of the tree evaluated at one edge."""
+        a = next(i for i in range(len(self.nbrs)) if self.nbrs[i])
+        b = self.nbrs[a][0]
+        coef, scale = self._edge_terms(self.get_partial(b, a), self.get_partial(a, b))
+        return self._evaluate(coef, scale, self.blens[self._key(a, b)])[0]
+
+    def get_edges(self, start: int) -> list[tuple[int, int]]:
+        """Return edges in preorder from a start node.
+
+        Each edge shares a node with an earlier edge, such that edges
+        optimized in this order only invalidate a few cached partials.
+        """
+        edges = []
+        stack = [(start, -1)]
+        while stack:
+            node, parent = stack.pop()
+            for other in self.nbrs[node]:
+                if other != parent:
+                    edges.append((node, other))
+                    stack.append((other, node))
+        return edges
+
+    def optimize_edge(self, a: int, b: int) -> float:
+        """Optimize the length of edge (a, b) and return the log-likelihood."""
+        key = self._key(a, b)
+        coef, scale = self._edge_terms(self.get_partial(b, a), self.get_partial(a, b))
+        dist, loglik = self._optimize_dist(coef, scale, self.blens[key])
+        if dist != self.blens[key]:
+            self.blens[key] = dist
+            self.invalidate(a, b)
+        return loglik
+
+    def optimize_edges(self, start: int, tol: float, max_passes: int = 3) -> float:
+        """Optimize every edge length in passes until the gain < tol."""
+        loglik = -np.inf
+        for _ in range(max_passes):
+            for a, b in self.get_edges(start):
+                new = self.optimize_edge(a, b)
+            if new - loglik < tol:
+                return new
+            loglik = new
+        return loglik
+
+    def try_nni(self, a: int, b: int, tol: float) -> bool:
+        """Apply the best NNI around internal edge (a, b) if it improves.
+
+        The central edge length is optimized for the current topology
+        and for both alternatives, which swap one subtree of `a` with
+        either subtree of `b`. Returns True if the topology changed.
+        """
+        xs = [i for i in self.nbrs[a] if i != b]
+        ys = [i for i in self.nbrs[b] if i != a]
+        if len(xs) != 2 or len(ys) != 2:
+            return False
+        mx = [self.get_message(a, i) for i in xs]
+        my = [self.get_message(b, i) for i in ys]
+
+        def _join(m0, m1):
+            return m0[0] * m1[0], m0[1] + m1[1]
+
+        key = self._key(a, b)
+        best = None
+        for swap in (None, 0, 1):
+            if swap is None:
+                side_a, side_b = _join(*mx), _join(*my)
+            else:
+                side_a = _join(mx[0], my[swap])
+                side_b = _join(mx[1], my[1 - swap])
+            coef, scale = self._edge_terms(side_a, side_b)
+            dist, loglik = self._optimize_dist(coef, scale, self.blens[key])
+            if swap is None:
+                current = (loglik, swap, dist)
+            if best is None or loglik > best[0]:
+                best = (loglik, swap, dist)
+
+        # keep the current topology unless a swap improves by >= tol.
+        if best[0] - current[0] < tol:
+            best = current
+        _, swap, dist = best
+        if swap is None:
+            if dist != self.blens[key]:
+                self.blens[key] = dist
+                self.invalidate(a, b)
+            return False
+
+        # swap subtree x1 of `a` with subtree y of `b`, keeping the
+        # cached partials and lengths of the moved subtrees.
+        x1, y = xs[1], ys[swap]
+        self.invalidate(a, b)
+        self.cl.pop((a, b), None)
+        self.cl.pop((b, a), None)
+        if (a, x1) in self.cl:
+            self.cl[(b, x1)] = self.cl.pop((a, x1))
+        if (b, y) in self.cl:
+            self.cl[(a, y)] = self.cl.pop((b, y))
+        self.blens[self._key(b, x1)] = self.blens.pop(self._key(a, x1))
+        self.blens[self._key(a, y)] = self.blens.pop(self._key(b, y))
+        self.blens[key] = dist
+        self.nbrs[a][self.nbrs[a].index(x1)] = y
+        self.nbrs[b][self.nbrs[b].index(y)] = x1
+        self.nbrs[x1][self.nbrs[x1].index(a)] = b
+        self.nbrs[y][self.nbrs[y].index(b)] = a
+        return True
+
+    def nni_round(self, start: int, tol: float) -> int:
+        """Try an NNI on every internal edge and return the number applied."""
+        ntips = self.tips.shape[0]
+        nmoves = 0
+        for a, b in self.get_edges(start):
+            if a >= ntips and b >= ntips and b in self.nbrs[a]:
+                nmoves += self.try_nni(a, b, tol)
+        return nmoves
+
+
+def _get_jc_distance_matrix(patterns: SitePatterns) -> np.ndarray:
+    """Return JC69 distances among sequences from unambiguous sites."""
+    onehot = patterns.partials * (patterns.partials.sum(axis=-1) == 1)[..., None]
+    weighted = onehot * patterns.weights[None, :, None]
+    same = np.einsum("imk,jmk->ij", weighted, onehot)
+    valid = onehot.sum(axis=-1)
+    ncomp = (valid * patterns.weights) @ valid.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pdist = np.where(ncomp > 0, 1 - same / ncomp, 0.75)
+        dist = -0.75 * np.log(1 - 4 / 3 * np.minimum(pdist, 0.7499))
+    np.fill_diagonal(dist, 0.0)
+    return np.minimum(dist, _MAX_BLEN)
+
+
+def _tree_to_arrays(
+    tree: ToyTree,
+) -> tuple[list[list[int]], dict[tuple[int, int], float]]:
+    """Return neighbor lists and edge lengths of an unrooted tree."""
+    nbrs = [[] for _ in range(tree.nnodes)]
+    blens = {}
+    for node in tree[:-1]:
+        pidx = node.up.idx
+        nbrs[node.idx].append(pidx)
+        nbrs[pidx].append(node.idx)
+        blens[(node.idx, pidx)] = min(max(node.dist, _MIN_BLEN), _MAX_BLEN)
+    return nbrs, blens
+
+
+def _arrays_to_tree(
+    nbrs: list[list[int]],
+    blens: dict[tuple[int, int], float] | None,
+    names: Sequence[str],
+) -> ToyTree:
+    """Return an unrooted ToyTree from neighbor lists and edge lengths.
+
+    Tips are nodes 0..len(names)-1 and the tree is rooted on the last
+    node, which must be internal. If `blens` is None all edges have
+    length 1.
+    """
+    import toytree
+
+    root = len(nbrs) - 1
+    nodes = {root: toytree.Node()}
+    stack = [(root, -1)]
+    while stack:
+        idx, parent = stack.pop()
+        for other in nbrs[idx]:
+            if other != parent:
+                key = (idx, other) if idx < other else (other, idx)
+                name = names[other] if other < len(names) else ""
+                dist = 1.0 if blens is None else blens[key]
+                nodes[other] = toytree.Node(name=name, dist=dist)
+                nodes[idx]._add_child(nodes[other])
+                stack.append((other, idx))
+    return toytree.ToyTree(nodes[root])
+
+
+def ml_search(
+    alignment: Mapping[str, str],
+    start_tree: ToyTree | None = None,
+    model: str = "K80",
+    kappa: float | tuple[float, float] = 2.0,
+    freqs: Sequence[float] | None = None,
+    max_rounds: int = 50,
+    tol: float = 1e-4,
+) -> MLSearchResult:
+    """Return a maximum likelihood tree found by NNI hill-climbing.
+
+    Starting from `start_tree`, or from a neighbor-joining tree of
+    JC69 distances, each round tries an NNI move on every internal
+    edge, scoring the current and both alternative topologies with
+    an optimized central edge length, and applies any move that
+    improves the likelihood. All edge lengths are then optimized by
+    Newton steps. Rounds repeat until no move is accepted and the
+    likelihood improves by less than `tol`. Partial likelihoods are
+    cached for both sides of every edge and only recomputed where a
+    move or edge change invalidates them.
+
+    Parameters
+    ----------
+    alignment: Mapping[str, str]
+        Mapping of tip names to aligned DNA sequences of IUPAC codes.
+    start_tree: ToyTree or None
+        Starting tree whose tip names match the alignment. Edge
+        lengths are used as starting values. If None, a neighbor-
+        joining tree of JC69 distances is used.
+    model: str
+        One of "JC69", "K80", or "TN93".
+    kappa: float or tuple[float, float]
+        Fixed transition / transversion rate ratio for K80, or a tuple
+        of (T<->C, A<->G) ratios for TN93. Ignored for JC69.
+    freqs: Sequence[float] or None
+        Fixed base frequencies in TCAG order for TN93. If None, the
+        empirical frequencies of the alignment are used.
+    max_rounds: int
+        Max number of rounds of NNI moves and edge optimization.
+    tol: float
+        Min log-likelihood improvement to accept a move or continue.
+
+    Returns
+    -------
+    MLSearchResult
+        The unrooted tree with optimized edge lengths, its
+        log-likelihood, the number of moves, rounds and likelihood
+        evaluations, and wall time. `evals_per_second` reports the
+        likelihood evaluation throughput.
+
+    Raises
+    ------
+    ToytreeError
+        If the model or alignment are invalid, or the alignment does
+        not include a sequence for every tip of the start tree.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(10, treeheight=0.3, seed=1)
+    >>> aln = {i: "ACGT" * 50 for i in tree.get_tip_labels()}
+    >>> result = toytree.infer.ml_search(aln, tree, model="K80")
+    >>> print(result.log_likelihood, result.evals_per_second)
+    """
+    if str(model).upper() not in MODELS:
+        raise ToytreeError(f"model must be one of {MODELS}, not {model!r}.")
+    if int(max_rounds) < 0:
+        raise ToytreeError("max_rounds must be >= 0.")
+    patterns = _compress_alignment(alignment)
+    if start_tree is None:
+        if len(patterns.names) < 3:
+            raise ToytreeError("ml_search requires at least 3 sequences.")
+        import pandas as pd
+
+        from toytree.infer.src.neighbor_joining import neighbor_joining_tree
+
+        dists = _get_jc_distance_matrix(patterns)
+        start_tree = neighbor_joining_tree(
+            pd.DataFrame(dists, index=patterns.names, columns=patterns.names)
+        )
+
+    # the engine validates tips and computes the model parameters.
+    if start_tree.is_rooted():
+        start_tree = start_tree.unroot()
+    engine = NucleotideLikelihoodEngine(start_tree, patterns, model, kappa, freqs)
+    names = start_tree.get_tip_labels()
+    tips = engine.partials[: start_tree.ntips]
+    nbrs, blens = _tree_to_arrays(start_tree)
+    lik = _UnrootedLikelihood(
+        nbrs, blens, tips, patterns.weights, engine.qmatrix, engine.freqs
+    )
+
+    start = time.perf_counter()
+    root = len(nbrs) - 1
+    loglik = lik.optimize_edges(root, tol)
+    nmoves = 0
+    nrounds = 0
+    for nrounds in range(1, int(max_rounds) + 1):
+        moved = lik.nni_round(root, tol)
+        nmoves += moved
+        new = lik.optimize_edges(root, tol)
+        improved = new - loglik
+        loglik = max(loglik, new)
+        if not moved and improved < tol:
+            break
+    seconds = time.perf_counter() - start
+
+    return MLSearchResult(
+        tree=_arrays_to_tree(lik.nbrs, lik.blens, names),
+        log_likelihood=lik.get_log_likelihood(),
+        nmoves=nmoves,
+        nrounds=nrounds,
+        nevals=lik.nevals,
+        seconds=seconds,
+    )
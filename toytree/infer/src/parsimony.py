@@ -4,11 +4,13 @@
 
 TODO
 ----
-- support DNA IUPAC models where ambiguous states are automatically
-expanded.
-- support non DNA (arbitrary multistate including binary) data.
-- vectorize to be faster.
-- vectorize RI/CI to apply over trait matrix
+- Sankoff parsimony with a weighted cost matrix.
+
+Fitch scores for many characters are computed at once by encoding the
+states of each tip as bitmasks in a (nnodes, ncharacters) unsigned int
+array, such that the set intersection and union of the Fitch down-pass
+are bitwise AND and OR over all characters of the children of every
+Node at the same height above the tips.
 
 References
 ----------
@@ -20,6 +22,8 @@ References
 - Fitch, Walter M. 1971. “Toward Defining the Course of Evolution:
   Minimum Change for a Specific Tree Topology.” Systematic Biology 20
   (4): 406–16. https://doi.org/10.1093/sysbio/20.4.406.
+- Hartigan, J. A. 1973. “Minimum Mutation Fits to a Given Tree.”
+  Biometrics 29 (1): 53–65. https://doi.org/10.2307/2529676.
 
 - Sankoff (1975)
 - Felsenstein (2004)
@@ -28,17 +32,29 @@ References
 - https://telliott99.blogspot.com/2010/03/fitch-and-sankoff-algorithms-for.html
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
 from toytree.core import ToyTree
+from toytree.infer.src.likelihood import BASE_ORDER, IUPAC
+from toytree.pcm.src.traits.fit_discrete_ctmc import (
+    DiscretePruningEngine,
+    _reduce_slots,
+)
+from toytree.utils import ToytreeError
 
 __all__ = [
+    "fitch_parsimony_scores",
     "consistency_and_retention_indices",
 ]
 
+# max bytes of Node masks per block of columns in a Fitch pass, and
+# max number of tip masks per batch of permutations.
+_FITCH_BLOCK_SIZE = 2**23
+_PERMUTATION_BATCH_SIZE = 2**24
+
 
 # def get_parsimony_score(
 #     tree: ToyTree,
@@ -110,23 +126,30 @@ __all__ = [
 class Parsimony:
     """Return a phylogenetic tree inferred by Maximum Parsimony.
 
+    Parameters
+    ----------
+    data: Mapping[str, str] | pd.DataFrame
+        A Mapping of tip names to aligned DNA sequences, or a DataFrame
+        indexed by tip names with discrete states in each column.
+
     Examples
     --------
-    >>> toytree.set_log_level("DEBUG")  # print verbose information
-    >>> data = ...
-    >>> starting_tree = ... distance tree.
-    >>> tool = Parsimony(data)
-    >>> tool.get_score(tree=tree, )
+    >>> seqs = {"a": "AAGT", "b": "AAGA", "c": "CCTA", "d": "CCTT", "e": "CAGT"}
+    >>> tool = Parsimony(seqs)
+    >>> result = tool.search(nstarts=4, seed=123)
+    >>> tool.get_score(tree=result.tree)
     """
 
-    def __init__(self, data: ...):
+    def __init__(self, data: Union[Mapping[str, str], pd.DataFrame]):
         self.data = data
 
-    def get_score(self, tree):
-        """Return parsimony score."""
+    def get_score(self, tree: ToyTree) -> int:
+        """Return the Fitch parsimony score of all characters on a tree."""
+        return int(self._fitch_algorithm(tree).sum())
 
-    def _fitch_algorithm(self):
-        """Implement the fitch algorithm."""
+    def _fitch_algorithm(self, tree: ToyTree) -> np.ndarray:
+        """Return the Fitch score of each character on a tree."""
+        return fitch_parsimony_scores(tree, self.data)
 
     def _sankoff_algorithm(self):
         """Implement the Sankoff algorithm.
@@ -139,12 +162,21 @@ class Parsimony:
 
         """
 
-    def _tree_move(self, method: str):
-        """Return a ToyTree that is one 'move' from the current tree.
-
-        >>> NNITreeSearcher(scorer)
+    def search(
+        self,
+        nstarts: int = 10,
+        moves: str = "spr",
+        max_rounds: int = 100,
+        seed: int = None,
+        workers: int = 1,
+    ):
+        """Return the best tree found by SPR or NNI hill-climbing.
+
+        See `toytree.infer.parsimony_search` for details.
         """
-        pass
+        from toytree.infer.src.parsimony_search import parsimony_search
+
+        return parsimony_search(self.data, nstarts, moves, max_rounds, seed, workers)
 
 
 # class Fitch:
@@ -169,7 +201,7 @@ def convert_trait_to_idx_dict(tree: ToyTree, trait: Dict[str, Any]) -> Dict[int,
 
     # if dict names are str cast to int idx labels
     if any(isinstance(i, str) for i in trait):
-        trait = {tree[i].idx: j for (i, j) in trait.items()}
+        trait = {tree.get_nodes(i)[0].idx: j for (i, j) in trait.items()}
     return trait
 
 
@@ -202,27 +234,273 @@ def fitch_parsimony_score(tree: ToyTree, trait: Dict[int, Any]) -> int:
 
         # internal Nodes examine the sets of their children's states
         else:
-            # check for shared (intersecting) states
-            shared = set.intersection(*(i.fitch for i in node.children))
+            # count the children that allow each state (Hartigan 1973).
+            # On bifurcations this is the Fitch rule: shared states are
+            # inherited, else the union is stored with one change.
+            counts = {}
+            for child in node.children:
+                for state in child.fitch:
+                    counts[state] = counts.get(state, 0) + 1
+            most = max(counts.values())
+            node.fitch = {i for i, j in counts.items() if j == most}
+            nchanges += len(node.children) - most
+    return nchanges
 
-            # if any states are shared then ancestor inherits this state
-            if shared:
-                node.fitch = shared
 
-            # if none shared, then store the union and increment counter
-            else:
-                node.fitch = set.union(*(i.fitch for i in node.children))
-                nchanges += 1
-    return nchanges
+def _get_mask_dtype(nstates: int) -> np.dtype:
+    """Return the smallest unsigned int dtype with a bit for each state."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if nstates <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    raise ToytreeError(f"Fitch parsimony supports <= 64 states, not {nstates}.")
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Return the number of set bits in each value of an unsigned array."""
+    counts = np.zeros(masks.shape, dtype=np.int64)
+    one = masks.dtype.type(1)
+    for bit in range(masks.dtype.itemsize * 8):
+        counts += (masks >> masks.dtype.type(bit)) & one
+    return counts
+
+
+def _encode_sequence_masks(seqs: Sequence[str]) -> np.ndarray:
+    """Return a (nseqs, nsites) array of DNA IUPAC bitmasks in TCAG order.
+
+    Ambiguous bases set the bits of each base they allow, and gaps and
+    unknown bases (-, ?, N) set all bits.
+    """
+    seqs = [(i if isinstance(i, str) else "".join(i)).upper() for i in seqs]
+    nsites = len(seqs[0])
+    if any(len(i) != nsites for i in seqs):
+        raise ToytreeError("aligned sequences must be equal length.")
+    lookup = np.zeros(256, dtype=np.uint8)
+    for char, bases in IUPAC.items():
+        for base in bases:
+            lookup[ord(char)] |= 1 << BASE_ORDER.index(base)
+    try:
+        raw = np.frombuffer("".join(seqs).encode("ascii"), np.uint8)
+    except UnicodeEncodeError as exc:
+        bad = exc.object[exc.start]
+        raise ToytreeError(f"data contains invalid characters: {[bad]}") from exc
+    masks = lookup[raw].reshape(len(seqs), nsites)
+    if not masks.all():
+        bad = sorted({chr(i) for i in raw[lookup[raw] == 0]})
+        raise ToytreeError(f"data contains invalid characters: {bad}")
+    return masks
+
+
+def _encode_value_masks(values: np.ndarray) -> np.ndarray:
+    """Return bitmasks of a 2-D array of discrete values.
+
+    Each unique value is assigned a bit and missing values (NaN, None)
+    set all bits.
+    """
+    codes, uniques = pd.factorize(values.ravel(), use_na_sentinel=True)
+    dtype = _get_mask_dtype(len(uniques))
+    masks = np.left_shift(dtype.type(1), codes.astype(dtype))
+    masks[codes < 0] = np.iinfo(dtype).max
+    return masks.reshape(values.shape)
+
+
+def _encode_state_masks(
+    tree: ToyTree,
+    data: Union[pd.DataFrame, np.ndarray, Mapping[str, str]],
+) -> np.ndarray:
+    """Return a (ntips, ncharacters) array of tip state bitmasks.
+
+    A DataFrame is indexed by tip names or idx labels with a column for
+    each character, an array has a row for each tip in idx order, and
+    a Mapping of tip names to DNA sequences is encoded by IUPAC codes.
+    """
+    if isinstance(data, Mapping):
+        missing = set(tree.get_tip_labels()) - set(data)
+        if missing:
+            raise ToytreeError(f"data is missing tips in the tree: {missing}")
+        return _encode_sequence_masks([data[i] for i in tree.get_tip_labels()])
+
+    # tabular data is ordered by tip idx.
+    if isinstance(data, pd.DataFrame):
+        frame = data.rename(index=lambda x: tree.get_nodes(x)[0].idx)
+        missing = set(range(tree.ntips)) - set(frame.index)
+        if missing:
+            raise ToytreeError(f"data is missing tip idxs: {sorted(missing)}")
+        values = frame.loc[range(tree.ntips)].to_numpy()
+    else:
+        values = np.asarray(data)
+        if values.ndim == 1:
+            values = values[:, None]
+        if values.ndim != 2 or values.shape[0] != tree.ntips:
+            raise ToytreeError("data array must have shape (ntips, ncharacters).")
+    return _encode_value_masks(values)
+
+
+def _get_polytomy_slots(
+    pruner: DiscretePruningEngine,
+) -> List[Optional[Tuple[np.ndarray, np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]]]:
+    """Return the children of multifurcating parents at each level.
+
+    Each entry is None for a level of bifurcating parents, or a tuple
+    of (positions of parents with > 2 children in the level, their
+    number of children, and (rows, child idxs) slots into them).
+    """
+    polys = []
+    for slots in pruner.slots:
+        if len(slots) < 3:
+            polys.append(None)
+            continue
+        pos = slots[2][0]
+        rows = np.full(slots[0][0].size, -1)
+        rows[pos] = np.arange(pos.size)
+        nchildren = np.zeros(pos.size, dtype=np.int64)
+        pslots = []
+        for spos, cidxs in slots:
+            keep = rows[spos] >= 0
+            pslots.append((rows[spos[keep]], cidxs[keep]))
+            nchildren[rows[spos[keep]]] += 1
+        polys.append((pos, nchildren, pslots))
+    return polys
+
+
+def _hartigan_sets(
+    view: np.ndarray,
+    nchildren: np.ndarray,
+    pslots: List[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return state sets and changes of multifurcating parents.
+
+    Hartigan's (1973) rule counts the children that allow each state,
+    assigns a parent the states allowed by the most (K) children, and
+    counts nchildren - K changes, which reduces to the Fitch rule on
+    bifurcations.
+    """
+    nbits = view.dtype.itemsize * 8
+    one = view.dtype.type(1)
+    counts = np.zeros((nbits, nchildren.size, view.shape[1]), dtype=np.int32)
+    for rows, cidxs in pslots:
+        child = view[cidxs]
+        for bit in range(nbits):
+            counts[bit, rows] += (child >> view.dtype.type(bit)) & one
+    most = counts.max(axis=0)
+    sets = np.zeros(most.shape, dtype=view.dtype)
+    for bit in range(nbits):
+        sets |= (counts[bit] == most).astype(view.dtype) << view.dtype.type(bit)
+    return sets, nchildren[:, None] - most
+
+
+def _fitch_down_pass(pruner: DiscretePruningEngine, tips: np.ndarray) -> np.ndarray:
+    """Return the Fitch score of each column of an array of tip masks.
+
+    Columns are scored in blocks sized such that the masks of all
+    Nodes for a block stay in cache during the pass over the tree.
+    Parents with more than two children are scored by Hartigan's rule.
+    """
+    ncols = tips.shape[1]
+    block = max(64, _FITCH_BLOCK_SIZE // (pruner.nnodes * tips.itemsize))
+    masks = np.empty((pruner.nnodes, min(block, ncols)), dtype=tips.dtype)
+    scores = np.zeros(ncols, dtype=np.int64)
+    polys = _get_polytomy_slots(pruner)
+    for start in range(0, ncols, block):
+        end = min(start + block, ncols)
+        width = end - start
+        view = masks[:, :width]
+        view[: pruner.ntips] = tips[:, start:end]
+        for (parents, _, _), slots, poly in zip(pruner.levels, pruner.slots, polys):
+            shared = _reduce_slots(view, slots, np.bitwise_and)
+            empty = shared == 0
+            union = _reduce_slots(view, slots, np.bitwise_or)
+            # multiply is much faster than a masked copy or np.where.
+            shared |= union * empty
+            if poly is not None:
+                pos, nchildren, pslots = poly
+                shared[pos], changes = _hartigan_sets(view, nchildren, pslots)
+                empty[pos] = False
+                scores[start:end] += changes.sum(axis=0)
+            view[parents] = shared
+            scores[start:end] += empty.view(np.uint8).sum(axis=0, dtype=np.int32)
+    return scores
+
+
+def fitch_parsimony_scores(
+    tree: ToyTree,
+    data: Union[pd.DataFrame, np.ndarray, Mapping[str, str]],
+) -> np.ndarray:
+    """Return Fitch parsimony scores for every character in a matrix.
+
+    Tip states are encoded as bitmasks and scored for all characters
+    at once by vectorized bitwise AND/OR over groups of Nodes at the
+    same height, which is much faster than `fitch_parsimony_score`
+    for many characters. Multifurcations are scored by Hartigan's
+    (1973) generalization of the Fitch rule, such that the score of
+    an unrooted tree does not depend on where it is rooted.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A tree on which to count state changes. Rooting does not
+        affect the score of bifurcating trees.
+    data: pd.DataFrame | np.ndarray | Mapping[str, str]
+        A DataFrame indexed by tip names or idx labels with discrete
+        states in each column, an array of shape (ntips, ncharacters)
+        with rows in idx order, or a Mapping of tip names to aligned
+        DNA sequences where IUPAC ambiguity codes, gaps and N are
+        expanded to the set of bases they allow. Missing values (NaN)
+        in tabular data are treated as any state.
+
+    Returns
+    -------
+    np.ndarray
+        The min number of changes of each character on this tree.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(10, seed=123)
+    >>> seqs = {i: "ACGTA" for i in tree.get_tip_labels()}
+    >>> toytree.infer.fitch_parsimony_scores(tree, seqs)
+    array([0, 0, 0, 0, 0])
+    """
+    tips = _encode_state_masks(tree, data)
+    return _fitch_down_pass(DiscretePruningEngine(tree), tips)
+
+
+def _get_ci_ri(
+    scores: np.ndarray, min_changes: np.ndarray, max_changes: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return CI, RI and RCI arrays from Fitch scores."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ci = np.where(scores > 0, min_changes / scores, 1.0)
+        ri = np.where(
+            min_changes == max_changes,
+            1.0,
+            (max_changes - scores) / (max_changes - min_changes),
+        )
+    ri = np.clip(ri, 0.0, 1.0)
+    return ci, ri, ci * ri
+
+
+def _permute_scores(
+    pruner: DiscretePruningEngine,
+    tips: np.ndarray,
+    npermutations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return Fitch scores of one character with tips randomly permuted."""
+    batch = max(1, _PERMUTATION_BATCH_SIZE // tips.size)
+    scores = []
+    for start in range(0, npermutations, batch):
+        size = min(batch, npermutations - start)
+        perms = rng.permuted(np.repeat(tips[:, None], size, axis=1), axis=0)
+        scores.append(_fitch_down_pass(pruner, perms))
+    return np.concatenate(scores) if scores else np.zeros(0, dtype=np.int64)
 
 
 def consistency_and_retention_indices(
     tree: ToyTree,
-    trait: Dict[str, Any],
+    trait: Union[str, Dict[str, Any], pd.Series, pd.DataFrame],
     npermutations: int = 10_000,
     left_tailed: bool = False,
     rng: int = None,
-) -> pd.Series:
+) -> Union[pd.Series, pd.DataFrame]:
     """Return CI, RI, and RCI indices for a discrete trait.
 
     Computes the consistency (CI), retention (RI), and rescaled
@@ -240,13 +518,20 @@ def consistency_and_retention_indices(
     0.0 it is as homoplasious as possible. The RCI rescales the CI
     for comparing characters on trees of different sizes or shapes.
 
+    If `trait` is a DataFrame then indices are computed for each of
+    its columns, with parsimony scores of all characters, and of all
+    permutations of each character, computed at once by bitwise Fitch
+    parsimony (see `fitch_parsimony_scores`).
+
     Parameters
     ----------
     tree:
         A ToyTree (only topology is used, rooting doesn't matter.)
-    trait: str | Dict[str|int, Any] | pd.Series
+    trait: str | Dict[str|int, Any] | pd.Series | pd.DataFrame
         A feature name or trait values as a dict or Series mapping
-        tip names or idx labels to discrete trait values.
+        tip names or idx labels to discrete trait values, or a
+        DataFrame indexed by tip names or idx labels with a column
+        for each trait.
     npermutations: int
         The number of permutations to test significance.
     left_tailed: bool
@@ -256,6 +541,12 @@ def consistency_and_retention_indices(
     rng: None | int | np.random.RandomState
         Random seed for permutations.
 
+    Returns
+    -------
+    pd.Series | pd.DataFrame
+        Statistics of one trait, or a DataFrame of statistics with a
+        row for each column of a DataFrame of traits.
+
     Example
     -------
     >>> # generate random tree, simulate 4-state traits, calculate CI
@@ -268,79 +559,70 @@ def consistency_and_retention_indices(
     - Fitch, Walter M. (1971) Systematic Biology 20 (4)
     - Klingenberg and Gidaszewski (2010) Systematic Biology 59 (3)
     """
-    # get parsimony score
-    trait = convert_trait_to_idx_dict(tree, trait)
-    score = fitch_parsimony_score(tree, trait)
-
-    # get CI and RI for trait
-    nstates = len(set(trait.values()))
-    min_changes = max(0, nstates - 1)
+    # encode tip states of one trait, or of each column of a matrix.
+    if isinstance(trait, pd.DataFrame):
+        tips = _encode_state_masks(tree, trait)
+    else:
+        trait = convert_trait_to_idx_dict(tree, trait)
+        missing = [i for i in range(tree.ntips) if i not in trait]
+        if missing:
+            raise ToytreeError(f"trait is missing tip idxs: {missing}")
+        values = pd.Series([trait[i] for i in range(tree.ntips)])
+        tips = _encode_state_masks(tree, values.to_frame())
+
+    # get parsimony scores and CI and RI for each trait
+    pruner = DiscretePruningEngine(tree)
+    scores = _fitch_down_pass(pruner, tips)
+    single = _popcount(tips) == 1
+    observed = np.bitwise_or.reduce(np.where(single, tips, 0), axis=0)
+    min_changes = np.maximum(0, _popcount(observed) - 1)
     max_changes = tree.ntips - 1
-    ci = min_changes / score if score > 0 else 1.0
-    ri = (
-        1.0
-        if min_changes == max_changes
-        else (max_changes - score) / (max_changes - min_changes)
-    )
-    ri = max(0.0, min(1.0, ri))
-    rci = ci * ri
-
-    # get CI and RI for permutated traits
+    ci, ri, rci = _get_ci_ri(scores, min_changes, max_changes)
+
+    # get CI and RI for permuted traits
     rng = np.random.default_rng(rng)
-    permuted_cis = np.zeros(npermutations)
-    permuted_ris = np.zeros(npermutations)
-    permuted_rcis = np.zeros(npermutations)
-    permuted_score = np.zeros(npermutations)
-    nsamp = len(trait)
-    keys = list(trait)
-    values = list(trait.values())
-    for i in range(npermutations):
-        ptrait = dict(zip(keys, rng.choice(values, size=nsamp, replace=False)))
-        score_ = fitch_parsimony_score(tree, ptrait)
-        ci_ = min_changes / score_ if score_ > 0 else 1.0
-        ri_ = (
-            1.0
-            if min_changes == max_changes
-            else (max_changes - score_) / (max_changes - min_changes)
-        )
-        ri_ = max(0.0, min(1.0, ri_))
-        rci_ = ci_ * ri_
-        permuted_cis[i] = ci_
-        permuted_ris[i] = ri_
-        permuted_rcis[i] = rci_
-        permuted_score[i] = score_
+    ntraits = tips.shape[1]
+    permuted = {i: np.zeros((ntraits, npermutations)) for i in range(4)}
+    for col in range(ntraits):
+        pscores = _permute_scores(pruner, tips[:, col], npermutations, rng)
+        pci, pri, prci = _get_ci_ri(pscores, min_changes[col], max_changes)
+        for key, arr in enumerate((pci, pri, prci, pscores)):
+            permuted[key][col] = arr
+    pcis, pris, prcis, pscores = permuted.values()
 
     # number of tests <= or >= the observed statistic
     if left_tailed:
-        count_ci = np.sum(permuted_cis <= ci)
-        count_ri = np.sum(permuted_ris <= ri)
-        count_rci = np.sum(permuted_rcis <= rci)
+        count_ci = np.sum(pcis <= ci[:, None], axis=1)
+        count_ri = np.sum(pris <= ri[:, None], axis=1)
+        count_rci = np.sum(prcis <= rci[:, None], axis=1)
     else:
-        count_ci = np.sum(permuted_cis >= ci)
-        count_ri = np.sum(permuted_ris >= ri)
-        count_rci = np.sum(permuted_rcis >= rci)
-
-    ci_pvalue = (count_ci + 1) / (npermutations + 1)
-    ri_pvalue = (count_ri + 1) / (npermutations + 1)
-    rci_pvalue = (count_rci + 1) / (npermutations + 1)
-
-    # return as series
-    return pd.Series(
-        {
-            "CI": ci,
-            "CI_permuted_mean": permuted_cis.mean(),
-            "CI_p-value": ci_pvalue,
-            "RI": ri,
-            "RI_permuted_mean": permuted_ris.mean(),
-            "RI_p-value": ri_pvalue,
-            "RCI": rci,
-            "RCI_permuted_mean": permuted_rcis.mean(),
-            "RCI_p-value": rci_pvalue,
-            "fitch_parsimony_score": score,
-            "fitch_parsimony_score_permuted_mean": permuted_score.mean(),
-            "npermutations": npermutations,
-        }
-    )
+        count_ci = np.sum(pcis >= ci[:, None], axis=1)
+        count_ri = np.sum(pris >= ri[:, None], axis=1)
+        count_rci = np.sum(prcis >= rci[:, None], axis=1)
+
+    with np.errstate(invalid="ignore"):
+        stats = pd.DataFrame(
+            {
+                "CI": ci,
+                "CI_permuted_mean": pcis.mean(axis=1),
+                "CI_p-value": (count_ci + 1) / (npermutations + 1),
+                "RI": ri,
+                "RI_permuted_mean": pris.mean(axis=1),
+                "RI_p-value": (count_ri + 1) / (npermutations + 1),
+                "RCI": rci,
+                "RCI_permuted_mean": prcis.mean(axis=1),
+                "RCI_p-value": (count_rci + 1) / (npermutations + 1),
+                "fitch_parsimony_score": scores,
+                "fitch_parsimony_score_permuted_mean": pscores.mean(axis=1),
+                "npermutations": npermutations,
+            }
+        )
+
+    # return as a series for one trait, or a frame for a matrix
+    if isinstance(trait, pd.DataFrame):
+        stats.index = trait.columns
+        return stats
+    return stats.iloc[0].rename(None)
 
 
 if __name__ == "__main__":
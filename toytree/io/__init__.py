@@ -11,6 +11,8 @@ __all__ = [
     "parse_newick_string_custom",
     "tree",
     "mtree",
+    "iter_trees",
+    "iter_newicks",
     "write",
 ]
 
@@ -22,6 +24,8 @@ _LAZY_ATTRS = {
     ),
     "tree": ("toytree.io.src.treeio", "tree"),
     "mtree": ("toytree.io.src.mtreeio", "mtree"),
+    "iter_trees": ("toytree.io.src.streamio", "iter_trees"),
+    "iter_newicks": ("toytree.io.src.streamio", "iter_newicks"),
     "write": ("toytree.io.src.writer", "write"),
 }
 
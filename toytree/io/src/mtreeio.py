@@ -86,6 +86,9 @@ def _parse_collection_input(items: list[Any], **kwargs) -> MultiTree:
 
 def mtree(
     data: str | bytes | PathLike[str] | Iterable[ToyTree | str | bytes | PathLike[str]],
+    workers: int | None = 1,
+    lazy: bool = False,
+    cache_size: int | None = 128,
     **kwargs,
 ) -> MultiTree:
     r"""Return a `MultiTree` parsed from supported multitree input.
@@ -98,6 +101,23 @@ def mtree(
         of `ToyTree` objects and/or serialized single-tree inputs.
         Ordered serialized collections may mix `str`, `bytes`, and path-like
         objects, but they cannot mix `ToyTree` objects with serialized inputs.
+    workers : int or None, default=1
+        Number of processes used to parse serialized multi-tree input.
+        Trees are split into ordered chunks that are parsed in a process
+        pool and returned in their original order. If None, use the
+        number of CPUs. This is faster for files with many trees, but
+        adds process startup overhead for small inputs.
+    lazy : bool, default=False
+        If True, serialized multi-tree input is stored as Newick strings
+        and each tree is only parsed when it is accessed. Accessed
+        trees are kept, such that in-place edits persist. This makes
+        `len()` and read-only passes over large tree sets cheap in
+        memory. Cannot be combined with `workers`.
+    cache_size : int or None, default=128
+        Max number of trees parsed by read-only methods of a lazy
+        MultiTree (e.g., `write`) kept in an LRU cache. If None the
+        cache is unbounded. Trees returned by indexing or iteration
+        are not counted and are never evicted.
     **kwargs
         Additional keyword arguments forwarded to
         :func:`toytree.io.parse_newick_string` when serialized tree text is
@@ -122,6 +142,8 @@ def mtree(
     1
     >>> toytree.mtree([b"((a,b),c);", "((a,c),b);"]).ntrees
     2
+    >>> toytree.mtree("((a,b),c);\\n((a,c),b);", lazy=True)[1].get_tip_labels()
+    ['a', 'c', 'b']
 
     See Also
     --------
@@ -134,14 +156,28 @@ def mtree(
     if isinstance(data, str):
         if not data.strip():
             raise ToytreeError("Cannot parse empty input for toytree.mtree().")
-        return parse_multitree(data, **kwargs)
+        return parse_multitree(
+            data, workers=workers, lazy=lazy, cache_size=cache_size, **kwargs
+        )
 
     if isinstance(data, bytes):
         if not data.strip():
             raise ToytreeError("Cannot parse empty input for toytree.mtree().")
-        return parse_multitree(data, **kwargs)
+        return parse_multitree(
+            data, workers=workers, lazy=lazy, cache_size=cache_size, **kwargs
+        )
 
     if isinstance(data, PathLike):
-        return parse_multitree(_normalize_serialized_tree_input(data), **kwargs)
+        return parse_multitree(
+            _normalize_serialized_tree_input(data),
+            workers=workers,
+            lazy=lazy,
+            cache_size=cache_size,
+            **kwargs,
+        )
 
+    if lazy:
+        raise ToytreeError(
+            "lazy=True requires serialized multi-tree text, bytes, or a path."
+        )
     return _parse_collection_input(_iter_collection_items(data), **kwargs)
@@ -9,7 +9,9 @@ or edges. Metadata can use simple ``&key=value`` comments or more
 specialized NHX-like prefixes such as ``&&NHX:``.
 
 The parser is iterative rather than recursive so deeply nested trees
-can be parsed without hitting Python's recursion limit.
+can be parsed without hitting Python's recursion limit. Plain Newick
+strings (no metadata, quotes, or curly traits) are detected and parsed
+on a faster path that builds Nodes from a single linear scan.
 """
 
 from __future__ import annotations
@@ -36,6 +38,8 @@ BLOCK_ERRORS = {
     "}": "Newick string curly trait blocks are imbalanced",
 }
 CURLY_TRAIT_PATTERN = re.compile(r"^(.*)\{([^{}]*)\}$")
+PLAIN_NEWICK_TOKEN = re.compile(r"[(),]|[^(),]+")
+PLAIN_NEWICK_EXCLUDED = frozenset("[]{}'\"")
 RESERVED_FEATURE_NAMES = ["idx", "height", "dist"]
 STANDARD_SCALAR_FEATURE_NAMES = frozenset({"idx", "name", "height", "dist", "support"})
 NHX_ERROR = (
@@ -174,6 +178,105 @@ def _node_str_to_data(
     return label, dist, node_meta, edge_meta
 
 
+def _is_plain_newick(newick: str) -> bool:
+    """Return True if a Newick string has no metadata, quotes, or traits."""
+    return PLAIN_NEWICK_EXCLUDED.isdisjoint(newick)
+
+
+def _scan_plain_newick(
+    newick: str,
+) -> Tuple[List[int], List[str], List[Optional[float]]]:
+    """Return `(parents, labels, dists)` for nodes in preorder.
+
+    This is a single linear scan over a Newick string (without its
+    terminal semicolon) that contains only topology, labels, and
+    branch lengths. Nodes are numbered in the order they open in the
+    string (preorder, left to right), and the root has parent -1.
+    Missing branch lengths are returned as None.
+    """
+    parents: List[int] = []
+    labels: List[str] = []
+    dists: List[Optional[float]] = []
+    stack: List[int] = []
+    prev = ""
+    closed = -1
+
+    for token in PLAIN_NEWICK_TOKEN.findall(newick):
+        if token == "(":
+            if prev == ")" or (prev and prev not in "(,"):
+                raise ToytreeError("Unexpected '(' inside Newick node data")
+            parents.append(stack[-1] if stack else -1)
+            labels.append("")
+            dists.append(None)
+            stack.append(len(parents) - 1)
+        elif token in ",)":
+            if not stack:
+                if token == ",":
+                    raise ToytreeError(
+                        "Newick string commas must occur inside parentheses"
+                    )
+                raise ToytreeError(BLOCK_ERRORS[token])
+            # an empty leaf, e.g., the first child in '(,a)'.
+            if prev in ("(", ","):
+                parents.append(stack[-1])
+                labels.append("")
+                dists.append(None)
+            if token == ")":
+                closed = stack.pop()
+        else:
+            # payload belongs to the subtree that was just closed, or
+            # is a new leaf if it follows '(' or ','.
+            if prev == ")":
+                nidx = closed
+            elif prev and prev not in "(,":
+                raise ToytreeError("Newick node data contains unexpected tokens")
+            else:
+                parents.append(stack[-1] if stack else -1)
+                labels.append("")
+                dists.append(None)
+                nidx = len(parents) - 1
+            label, sep, dist = token.partition(":")
+            if ":" in dist:
+                raise ToytreeError("Newick node data contains multiple ':' separators")
+            labels[nidx] = label
+            if sep:
+                dists[nidx] = distance_parser(dist)
+        prev = token
+
+    if stack:
+        raise ToytreeError(BLOCK_ERRORS["("])
+    if not parents:
+        parents.append(-1)
+        labels.append("")
+        dists.append(None)
+    return parents, labels, dists
+
+
+def _parse_plain_newick(newick: str, internal_labels: Optional[str]) -> ToyTree:
+    """Return a `ToyTree` parsed from plain Newick on a fast path.
+
+    Nodes are built directly from the arrays of a single linear scan
+    over the string, skipping the payload splitting and metadata hooks
+    of `parse_newick_string_custom`. The result is identical for Newick
+    strings without metadata, quotes, or curly-brace traits.
+    """
+    parents, labels, dists = _scan_plain_newick(newick)
+    nodes = [Node(name=label) for label in labels]
+    children: List[List[Node]] = [[] for _ in nodes]
+    for node, pidx, dist in zip(nodes, parents, dists):
+        node._dist = 1.0 if dist is None else dist
+        if pidx >= 0:
+            node._up = nodes[pidx]
+            children[pidx].append(node)
+    for node, childs in zip(nodes, children):
+        if childs:
+            node._children = tuple(childs)
+
+    treenode = nodes[0]
+    treenode._dist = 0.0
+    return _infer_internal_label_type(ToyTree(treenode), internal_labels)
+
+
 def distance_parser(dist: str) -> Optional[float]:
     """Parse one Newick branch-length token.
 
@@ -842,6 +945,11 @@ def parse_newick_string(
     meta_parser
     toytree.tree
     """
+    # plain Newick has no metadata to format, so skip the custom hooks.
+    newick = newick.strip()
+    if newick.endswith(";") and _is_plain_newick(newick):
+        return _parse_plain_newick(newick[:-1], internal_labels)
+
     feat_formatter = partial(
         meta_parser,
         prefix=feature_prefix,
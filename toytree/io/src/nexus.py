@@ -5,9 +5,12 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 
-__all__ = ["get_newicks_and_translation_from_nexus"]
+__all__ = [
+    "get_newicks_and_translation_from_nexus",
+    "iter_newicks_and_translation_from_nexus_lines",
+]
 
 _TREES_BLOCK = re.compile(
     r"(?<=begin trees;).*?(?=end;)",
@@ -15,6 +18,9 @@ _TREES_BLOCK = re.compile(
 )
 _TRANSLATE_BLOCK = re.compile(r"translate\s*([\s\S]*?);", flags=re.IGNORECASE)
 _TREE_RECORD = re.compile(r"\s*TREE\s", flags=re.IGNORECASE)
+_BEGIN_TREES = re.compile(r"\s*begin\s+trees\s*;", flags=re.IGNORECASE)
+_END_BLOCK = re.compile(r"\s*(end|endblock)\s*;", flags=re.IGNORECASE)
+_TRANSLATE = re.compile(r"\s*translate(\s|$)", flags=re.IGNORECASE)
 
 
 def _extract_trees_block(data: str) -> str:
@@ -101,3 +107,81 @@ def get_newicks_and_translation_from_nexus(
     """
     trees_block = _extract_trees_block(data)
     return list(_iter_newick_strings(trees_block)), _extract_translate_map(trees_block)
+
+
+def iter_newicks_and_translation_from_nexus_lines(
+    lines: Iterable[str],
+) -> Iterator[tuple[str, dict[str, str]]]:
+    r"""Yield serialized Newick strings and translation labels line by line.
+
+    This is a streaming alternative to
+    :func:`get_newicks_and_translation_from_nexus` that reads NEXUS
+    text one line at a time, such that only one tree record is held in
+    memory. The translation table is parsed before any tree records
+    and the same dict is yielded with every Newick string.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Lines of NEXUS text, such as an open file handle.
+
+    Yields
+    ------
+    tuple[str, dict[str, str]]
+        A serialized Newick string and the translation mapping from
+        tip tokens to labels (empty if no `translate` block).
+
+    Raises
+    ------
+    IOError
+        Raised if the NEXUS text does not contain a `begin trees;`
+        block.
+
+    Examples
+    --------
+    >>> text = "#NEXUS\\nbegin trees;\\n tree t0 = ((1,2),3);\\nend;"
+    >>> next(iter_newicks_and_translation_from_nexus_lines(text.splitlines()))
+    ('((1,2),3);', {})
+
+    See Also
+    --------
+    get_newicks_and_translation_from_nexus
+    toytree.io.iter_trees
+    """
+    iter_lines = iter(lines)
+    for line in iter_lines:
+        if _BEGIN_TREES.match(line):
+            break
+    else:
+        raise IOError("NEXUS file must contain a 'begin trees' block.")
+
+    translated: dict[str, str] = {}
+    for line in iter_lines:
+        if _END_BLOCK.match(line):
+            return
+
+        if _TRANSLATE.match(line):
+            block = [line]
+            while ";" not in line:
+                line = _next_line(iter_lines)
+                block.append(line)
+            translated.update(_extract_translate_map("\n".join(block)))
+            continue
+
+        if _TREE_RECORD.match(line):
+            tree_lines = [line.strip()]
+            while not line.strip().endswith(";"):
+                line = _next_line(iter_lines)
+                tree_lines.append(line.strip())
+            tree_record = "".join(tree_lines)
+            _, data_parts = tree_record.split("=", 1)
+            start = data_parts.find("(")
+            yield data_parts[start:], translated
+
+
+def _next_line(iter_lines: Iterator[str]) -> str:
+    """Return the next line of a NEXUS record or raise if truncated."""
+    line = next(iter_lines, None)
+    if line is None:
+        raise IOError("NEXUS trees block ended inside an unterminated record.")
+    return line
@@ -12,6 +12,7 @@ from typing import TYPE_CHECKING, Mapping
 from toytree.utils.src.exceptions import ToytreeError
 
 if TYPE_CHECKING:
+    from toytree.core.compact import CompactTree
     from toytree.core.multitree import MultiTree
     from toytree.core.tree import ToyTree
 
@@ -40,12 +41,20 @@ def _warn_multiple_trees(count: int) -> None:
     print(msg, file=sys.stderr)
 
 
-def _parse_trees(data: str | Path | bytes, **kwargs) -> list[ToyTree]:
+def _parse_trees(
+    data: str | Path | bytes, workers: int | None = 1, **kwargs
+) -> list[ToyTree]:
     """Return parsed trees with any NEXUS tip translation applied."""
     from toytree.io.src.newick import parse_newick_string
+    from toytree.utils.src.parallel import get_workers
 
+    workers = get_workers(workers)
     strdata = parse_generic_to_str(data)
     nwks, tdict = parse_data_from_str(strdata)
+    if workers > 1 and len(nwks) > 1:
+        from toytree.io.src.parse_parallel import parse_newicks_parallel
+
+        return parse_newicks_parallel(nwks, tdict, workers=workers, **kwargs)
     trees = [parse_newick_string(nwk, **kwargs) for nwk in nwks]
     return [translate_node_names(tree, tdict) for tree in trees]
 
@@ -295,7 +304,58 @@ def parse_tree(data: str | Path | bytes, **kwargs) -> ToyTree:
     return trees[0]
 
 
-def parse_multitree(data: str | Path | bytes, **kwargs) -> MultiTree:
+def parse_compact_tree(
+    data: str | Path | bytes, internal_labels: str | None = None, **kwargs
+) -> CompactTree:
+    """Return one `CompactTree` parsed from flexible input types.
+
+    Plain Newick input (no metadata, quotes, or NEXUS translation) is
+    scanned directly into arrays without creating any Node objects.
+    Other input is parsed to a `ToyTree` and then converted, keeping
+    only the default Node features (name, dist, support).
+
+    Parameters
+    ----------
+    data : str, Path, or bytes
+        Tree input provided as serialized Newick/NEXUS text, a local
+        file path, a public HTTP(S) URL, or UTF-8 encoded bytes.
+    internal_labels : str or None, default=None
+        Either ``"name"``, ``"support"``, or None to infer the type.
+    **kwargs
+        Additional keyword arguments forwarded to
+        :func:`toytree.io.parse_newick_string` for non-plain input.
+
+    Examples
+    --------
+    >>> parse_compact_tree("((a,b),c);").ntips
+    3
+
+    See Also
+    --------
+    parse_tree
+    toytree.core.compact.CompactTree
+    """
+    from toytree.core.compact import CompactTree
+    from toytree.io.src.newick import _is_plain_newick
+
+    strdata = parse_generic_to_str(data)
+    nwks, tdict = parse_data_from_str(strdata)
+    if len(nwks) > 1:
+        _warn_multiple_trees(len(nwks))
+    nwk = nwks[0].strip()
+    if not tdict and nwk.endswith(";") and _is_plain_newick(nwk):
+        return CompactTree.from_newick(nwk, internal_labels=internal_labels)
+    tree = parse_tree(nwk, internal_labels=internal_labels, **kwargs)
+    return CompactTree.from_toytree(translate_node_names(tree, tdict))
+
+
+def parse_multitree(
+    data: str | Path | bytes,
+    workers: int | None = 1,
+    lazy: bool = False,
+    cache_size: int | None = 128,
+    **kwargs,
+) -> MultiTree:
     r"""Return a `MultiTree` parsed from flexible input types.
 
     Parameters
@@ -303,6 +363,17 @@ def parse_multitree(data: str | Path | bytes, **kwargs) -> MultiTree:
     data : str, Path, or bytes
         Tree input provided as serialized Newick/NEXUS text, a local
         file path, a public HTTP(S) URL, or UTF-8 encoded bytes.
+    workers : int or None, default=1
+        Number of processes used to parse trees. If None, use the
+        number of CPUs. See
+        :func:`toytree.io.src.parse_parallel.parse_newicks_parallel`.
+    lazy : bool, default=False
+        If True, store Newick strings and parse each tree only when it
+        is accessed. Cannot be combined with `workers`.
+    cache_size : int or None, default=128
+        Max number of trees parsed by read-only methods that are cached
+        by a lazy MultiTree. If None the cache is unbounded. Ignored if
+        `lazy=False`.
     **kwargs
         Additional keyword arguments forwarded to
         :func:`toytree.io.parse_newick_string`.
@@ -323,6 +394,8 @@ def parse_multitree(data: str | Path | bytes, **kwargs) -> MultiTree:
     --------
     >>> parse_multitree("((a,b),c);\\n((a,c),b);").ntrees
     2
+    >>> parse_multitree("((a,b),c);\\n((a,c),b);", lazy=True)[1].ntips
+    3
 
     See Also
     --------
@@ -330,9 +403,14 @@ def parse_multitree(data: str | Path | bytes, **kwargs) -> MultiTree:
     parse_tree_object
     toytree.mtree
     """
-    from toytree.core.multitree import MultiTree
-
-    return MultiTree(_parse_trees(data, **kwargs))
+    from toytree.core.multitree import MultiTree, _LazyTreeList
+
+    if lazy:
+        if workers != 1:
+            raise ToytreeError("lazy=True cannot be combined with workers.")
+        nwks, tdict = parse_data_from_str(parse_generic_to_str(data))
+        return MultiTree(_LazyTreeList(nwks, tdict, kwargs, cache_size))
+    return MultiTree(_parse_trees(data, workers=workers, **kwargs))
 
 
 def parse_tree_object(data: str | Path | bytes, **kwargs) -> ToyTree | MultiTree:
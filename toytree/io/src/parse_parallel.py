@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""Parse many Newick strings in parallel across worker processes.
+
+Newick parsing is pure-Python and single-threaded, so large multi-tree
+files (e.g., posterior samples) are parsed faster by splitting the
+trees into ordered chunks and parsing each chunk in a separate process.
+
+Returning parsed `ToyTree` objects from a worker requires pickling the
+full linked `Node` graph, which is nearly as slow as parsing the tree
+again (and hits the recursion limit for very deep trees). Instead each
+worker encodes its trees in a compact columnar format (parent idxs,
+names, dists, supports, and any extra features) that is cheap to
+pickle, and the trees are rebuilt from these arrays in the parent.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+if TYPE_CHECKING:
+    from toytree.core.tree import ToyTree
+
+__all__ = ["parse_newicks_parallel"]
+
+# Node attrs that are stored in columns or rebuilt from topology.
+_COLUMNAR_ATTRS = frozenset(
+    ("_name", "_dist", "_support", "_up", "_children", "_idx", "_height", "_x")
+)
+
+
+def _encode_tree(tree: ToyTree) -> tuple:
+    """Return a compact columnar representation of a `ToyTree`.
+
+    Nodes are stored in preorder, such that the root is first and
+    children follow their parent in left-to-right order. Extra
+    (non-default) features are stored sparsely as {pos: {attr: value}}
+    for the Nodes that have them.
+    """
+    import numpy as np
+
+    nodes = list(tree.traverse("preorder"))
+    order = np.zeros(tree.nnodes, dtype=np.int64)
+    order[[node._idx for node in nodes]] = np.arange(tree.nnodes)
+    parents = np.full(tree.nnodes, -1, dtype=np.int64)
+    pidxs = tree._get_parent_idxs()[[node._idx for node in nodes[1:]]]
+    parents[1:] = order[pidxs]
+    names = [node._name for node in nodes]
+    dists = np.fromiter((node._dist for node in nodes), dtype=float, count=len(nodes))
+    supports = np.fromiter(
+        (node._support for node in nodes), dtype=float, count=len(nodes)
+    )
+    extras = {}
+    for pos, node in enumerate(nodes):
+        if len(node.__dict__) > len(_COLUMNAR_ATTRS):
+            extras[pos] = {
+                key: value
+                for key, value in node.__dict__.items()
+                if key not in _COLUMNAR_ATTRS
+            }
+    return parents, names, dists, supports, extras, tuple(tree.edge_features)
+
+
+def _decode_tree(payload: tuple) -> ToyTree:
+    """Return a `ToyTree` rebuilt from `_encode_tree` output."""
+    from toytree.core.node import Node
+    from toytree.core.tree import ToyTree
+
+    parents, names, dists, supports, extras, edge_features = payload
+    nodes = [
+        Node(name, dist, support)
+        for name, dist, support in zip(names, dists.tolist(), supports.tolist())
+    ]
+    # in preorder each child follows its parent and its left siblings,
+    # so appending in order restores the left-to-right child order.
+    children = [[] for _ in nodes]
+    for node, pos in zip(nodes, parents.tolist()):
+        if pos >= 0:
+            node._up = nodes[pos]
+            children[pos].append(node)
+    for node, childs in zip(nodes, children):
+        node._children = tuple(childs)
+    for pos, feats in extras.items():
+        nodes[pos].__dict__.update(feats)
+
+    tree = ToyTree(nodes[0])
+    tree.edge_features.update(edge_features)
+    return tree
+
+
+def _parse_newick_chunk(
+    tdict: Mapping[str, str],
+    kwargs: Mapping[str, Any],
+    newicks: Sequence[str],
+) -> list[tuple]:
+    """Return encoded trees parsed from a chunk of Newick strings."""
+    from toytree.io.src.newick import parse_newick_string
+    from toytree.io.src.parse import translate_node_names
+
+    return [
+        _encode_tree(translate_node_names(parse_newick_string(nwk, **kwargs), tdict))
+        for nwk in newicks
+    ]
+
+
+def _parse_serial(
+    newicks: Sequence[str],
+    tdict: Mapping[str, str],
+    kwargs: Mapping[str, Any],
+) -> list[ToyTree]:
+    """Return `ToyTree` objects parsed serially in this process."""
+    from toytree.io.src.newick import parse_newick_string
+    from toytree.io.src.parse import translate_node_names
+
+    return [
+        translate_node_names(parse_newick_string(nwk, **kwargs), tdict)
+        for nwk in newicks
+    ]
+
+
+def parse_newicks_parallel(
+    newicks: Sequence[str],
+    tdict: Mapping[str, str] | None = None,
+    workers: int | None = None,
+    **kwargs,
+) -> list[ToyTree]:
+    """Return `ToyTree` objects parsed from Newick strings in parallel.
+
+    Parameters
+    ----------
+    newicks : Sequence[str]
+        Serialized Newick strings, one per tree.
+    tdict : Mapping[str, str] or None, default=None
+        Optional NEXUS translation mapping applied to tip labels.
+    workers : int or None, default=None
+        Number of worker processes. If None, use the number of CPUs.
+        If 1, or if there are too few trees to split, the trees are
+        parsed serially in this process.
+    **kwargs
+        Additional keyword arguments forwarded to
+        :func:`toytree.io.parse_newick_string`.
+
+    Returns
+    -------
+    list[ToyTree]
+        Parsed trees in the same order as `newicks`.
+
+    Raises
+    ------
+    ToytreeError
+        Raised if `workers` is < 1 or any Newick string is malformed.
+
+    Examples
+    --------
+    >>> trees = parse_newicks_parallel(["((a,b),c);", "((a,c),b);"], workers=2)
+    >>> [i.get_tip_labels() for i in trees]
+    [['a', 'b', 'c'], ['a', 'c', 'b']]
+
+    See Also
+    --------
+    toytree.mtree
+    toytree.io.iter_trees
+    """
+    from toytree.utils.src.parallel import get_workers, map_chunks
+
+    tdict = tdict if tdict else {}
+    workers = min(get_workers(workers), len(newicks))
+    if workers <= 1:
+        return _parse_serial(newicks, tdict, kwargs)
+    chunks = map_chunks(
+        _parse_newick_chunk,
+        list(newicks),
+        workers,
+        args=(tdict, kwargs),
+        desc="parsing trees",
+    )
+    return [_decode_tree(i) for chunk in chunks for i in chunk]
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+
+"""Stream trees one at a time from large Newick or NEXUS files.
+
+Posterior samples from Bayesian programs (e.g., BEAST, MrBayes) can
+contain tens of thousands of trees and be many GB in size. Rather than
+reading the entire file into memory and parsing every tree into a
+`MultiTree`, the generator functions here read the file line by line
+and parse one tree at a time, such that memory use is constant.
+Trees skipped by `burnin` or `thin` are never parsed.
+
+Examples
+--------
+>>> for tree in toytree.io.iter_trees("posterior.trees", burnin=1000, thin=10):
+...     print(tree.get_topology_id())
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+from contextlib import contextmanager
+from os import PathLike
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Mapping, TextIO
+
+from toytree.utils.src.exceptions import ToytreeError
+
+if TYPE_CHECKING:
+    from toytree.core.tree import ToyTree
+
+__all__ = ["iter_trees", "iter_newicks"]
+
+
+def _is_file_input(data: str | bytes | PathLike) -> bool:
+    """Return True if data should be streamed from a local file."""
+    if isinstance(data, PathLike):
+        return True
+    if isinstance(data, str):
+        sdata = data.strip()
+        if not sdata or sdata[0] in "(#" or sdata.endswith(";"):
+            return False
+        if sdata.startswith(("http://", "https://")):
+            return False
+        return Path(sdata).expanduser().exists()
+    return False
+
+
+@contextmanager
+def _open_tree_lines(data: str | bytes | PathLike) -> Iterator[TextIO]:
+    """Yield an open text handle over lines of tree data.
+
+    Local files are opened for streaming (gzip-compressed if the name
+    ends in '.gz'). Serialized text, bytes, or URLs are loaded using
+    the same rules as `toytree.tree` and wrapped in a StringIO.
+    """
+    if _is_file_input(data):
+        path = Path(data).expanduser()
+        try:
+            if path.suffix == ".gz":
+                handle = gzip.open(path, "rt", encoding="utf-8")
+            else:
+                handle = open(path, "r", encoding="utf-8")
+        except OSError as exc:
+            raise ToytreeError(f"Could not read tree file: '{path}'") from exc
+        with handle:
+            yield handle
+    else:
+        from toytree.io.src.parse import parse_generic_to_str
+
+        yield io.StringIO(parse_generic_to_str(data))
+
+
+def _iter_newicks_from_lines(lines: Iterator[str]) -> Iterator[str]:
+    """Yield Newick strings from lines of a multi-tree Newick file.
+
+    Whitespace within trees is removed, and trees can span multiple
+    lines or share a line, as each is terminated by ';'.
+    """
+    buffer = []
+    for line in lines:
+        line = "".join(line.split())
+        while line:
+            end = line.find(";")
+            if end == -1:
+                buffer.append(line)
+                break
+            buffer.append(line[: end + 1])
+            yield "".join(buffer)
+            buffer = []
+            line = line[end + 1 :]
+    if "".join(buffer):
+        raise ToytreeError("Newick string must end with ';'")
+
+
+def _iter_newick_records(
+    data: str | bytes | PathLike,
+) -> Iterator[tuple[str, Mapping[str, str]]]:
+    """Yield (newick, translation dict) for every tree in the input."""
+    with _open_tree_lines(data) as handle:
+        # peek at first non-empty line to detect NEXUS format.
+        first = ""
+        for first in handle:
+            if first.strip():
+                break
+        if not first.strip():
+            raise ToytreeError("No trees were found in the input data.")
+
+        lines = _chain_first_line(first, handle)
+        if first.strip()[:6].upper() == "#NEXUS":
+            from toytree.io.src.nexus import (
+                iter_newicks_and_translation_from_nexus_lines,
+            )
+
+            yield from iter_newicks_and_translation_from_nexus_lines(lines)
+        else:
+            tdict: Mapping[str, str] = {}
+            for nwk in _iter_newicks_from_lines(lines):
+                yield nwk, tdict
+
+
+def _chain_first_line(first: str, handle: TextIO) -> Iterator[str]:
+    """Yield a peeked first line followed by the rest of a handle."""
+    yield first
+    yield from handle
+
+
+def _check_burnin_and_thin(burnin: int | float, thin: int) -> None:
+    """Raise ToytreeError if burnin or thin args are invalid."""
+    if isinstance(burnin, float) and not 0 <= burnin < 1:
+        raise ToytreeError("A float burnin must be a proportion in [0, 1).")
+    if burnin < 0:
+        raise ToytreeError("burnin must be >= 0.")
+    if int(thin) != thin or thin < 1:
+        raise ToytreeError("thin must be an int >= 1.")
+
+
+def iter_newicks(
+    data: str | bytes | PathLike,
+    burnin: int | float = 0,
+    thin: int = 1,
+) -> Iterator[tuple[str, Mapping[str, str]]]:
+    r"""Yield serialized Newick strings one at a time from tree data.
+
+    This reads trees line by line from a file without parsing them,
+    which is much faster than `iter_trees` when you only need the
+    Newick strings (e.g., to filter or count them).
+
+    Parameters
+    ----------
+    data : str, bytes, or os.PathLike
+        A path to a Newick or NEXUS file (optionally gzipped), or
+        serialized tree text, bytes, or an HTTP(S) URL.
+    burnin : int or float, default=0
+        Number of trees to skip from the start of the file. If a
+        float in [0, 1) it is the proportion of trees to skip, which
+        requires first counting the trees in an extra pass.
+    thin : int, default=1
+        Yield only every `thin`-th tree after the burnin.
+
+    Yields
+    ------
+    tuple[str, Mapping[str, str]]
+        A Newick string and the NEXUS translation dict (empty if the
+        input is not NEXUS or has no translate block).
+
+    Examples
+    --------
+    >>> list(iter_newicks("((a,b),c);\n((a,c),b);", burnin=1))
+    [('((a,c),b);', {})]
+
+    See Also
+    --------
+    iter_trees
+    """
+    _check_burnin_and_thin(burnin, thin)
+    if isinstance(burnin, float):
+        ntrees = sum(1 for _ in _iter_newick_records(data))
+        burnin = int(burnin * ntrees)
+    for idx, record in enumerate(_iter_newick_records(data)):
+        if idx < burnin:
+            continue
+        if (idx - burnin) % thin:
+            continue
+        yield record
+
+
+def iter_trees(
+    data: str | bytes | PathLike,
+    burnin: int | float = 0,
+    thin: int = 1,
+    **kwargs,
+) -> Iterator[ToyTree]:
+    r"""Yield `ToyTree` objects parsed one at a time from tree data.
+
+    This is a memory-efficient alternative to `toytree.mtree` for
+    large multi-tree files, such as posterior samples from BEAST or
+    MrBayes. The file is streamed line by line, only one tree is held
+    in memory at a time, and trees skipped by `burnin` or `thin` are
+    not parsed. NEXUS translate blocks are applied to tip labels.
+
+    Parameters
+    ----------
+    data : str, bytes, or os.PathLike
+        A path to a Newick or NEXUS file (optionally gzipped), or
+        serialized tree text, bytes, or an HTTP(S) URL.
+    burnin : int or float, default=0
+        Number of trees to skip from the start of the file. If a
+        float in [0, 1) it is the proportion of trees to skip, which
+        requires first counting the trees in an extra pass.
+    thin : int, default=1
+        Yield only every `thin`-th tree after the burnin.
+    **kwargs
+        Additional keyword arguments forwarded to
+        :func:`toytree.io.parse_newick_string`.
+
+    Yields
+    ------
+    ToyTree
+        Parsed trees in the order they occur in the input.
+
+    Raises
+    ------
+    ToytreeError
+        Raised if the input cannot be read, a tree is malformed, or
+        `burnin` or `thin` are invalid.
+
+    Examples
+    --------
+    >>> trees = toytree.io.iter_trees("((a,b),c);\n((a,c),b);\n((b,c),a);", thin=2)
+    >>> [i.get_tip_labels() for i in trees]
+    [['a', 'b', 'c'], ['b', 'c', 'a']]
+
+    See Also
+    --------
+    iter_newicks
+    toytree.mtree
+    """
+    from toytree.io.src.newick import parse_newick_string
+    from toytree.io.src.parse import translate_node_names
+
+    for nwk, tdict in iter_newicks(data, burnin=burnin, thin=thin):
+        tree = parse_newick_string(nwk, **kwargs)
+        yield translate_node_names(tree, tdict)
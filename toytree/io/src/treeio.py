@@ -5,12 +5,15 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from toytree.core.node import Node
 from toytree.core.tree import ToyTree
 from toytree.utils.src.exceptions import ToytreeError
 
+if TYPE_CHECKING:
+    from toytree.core.compact import CompactTree
+
 
 def tree(
     data: Node | str | Path,
@@ -19,7 +22,8 @@ def tree(
     feature_assignment: str = "=",
     feature_unpack: str = "|",
     internal_labels: Optional[str] = None,
-) -> ToyTree:
+    compact: bool = False,
+) -> ToyTree | CompactTree:
     """Return a `ToyTree` parsed from one supported tree input.
 
     Parameters
@@ -42,10 +46,15 @@ def tree(
         Controls how internal labels are interpreted after parsing.
         Use ``"name"``, ``"support"``, or another feature name to
         force the assignment.
+    compact : bool, default=False
+        If True a read-only array-backed `CompactTree` is returned
+        instead of a ToyTree. Plain Newick input is then parsed
+        without creating Node objects, which uses much less memory
+        for very large trees. Only name, dist and support are kept.
 
     Returns
     -------
-    ToyTree
+    ToyTree or CompactTree
         Parsed tree object.
 
     Raises
@@ -61,6 +70,8 @@ def tree(
     >>> root = Node(name="root")
     >>> tree(root).ntips
     1
+    >>> tree("((a,b),c);", compact=True).get_tip_labels()
+    ['a', 'b', 'c']
 
     See Also
     --------
@@ -69,6 +80,24 @@ def tree(
     toytree.io.parse_newick_string_custom
     toytree.io.src.parse.parse_tree
     """
+    if compact:
+        from toytree.core.compact import CompactTree
+
+        if isinstance(data, Node):
+            return CompactTree.from_toytree(ToyTree(data.copy(detach=True)))
+        if isinstance(data, (str, Path)):
+            from toytree.io.src.parse import parse_compact_tree
+
+            return parse_compact_tree(
+                data,
+                feature_prefix=feature_prefix,
+                feature_delim=feature_delim,
+                feature_assignment=feature_assignment,
+                feature_unpack=feature_unpack,
+                internal_labels=internal_labels,
+            )
+        raise ToytreeError(f"Cannot parse input tree data: {data!r}")
+
     if isinstance(data, Node):
         return ToyTree(data.copy(detach=True))
 
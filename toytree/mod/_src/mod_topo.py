@@ -431,7 +431,8 @@ def rotate_node(tree: ToyTree, *query: Query, inplace: bool = False) -> ToyTree:
         tree = tree.copy()
         node = tree[node.idx]
     node._children = tuple(node.children[::-1])
-    tree._update()
+    # only the rotated subtree (and ancestor x-coords) need updating
+    tree._update_subtree(node)
     return tree
 
 
@@ -1196,7 +1197,7 @@ def add_child_node(
 
     # add as a new child to end of parent's children
     node._add_child(new_node)
-    tree._update()
+    tree._update_new_leaf(new_node)
     return tree
 
 
@@ -36,8 +36,10 @@ _MODULE_EXPORTS = {
     ],
     "toytree.pcm.src.phylolinalg.pgls": [
         "PCMPGLSResult",
+        "PCMPGLSManyResult",
         "PCMPGLSPruningModel",
         "pgls",
+        "pgls_many",
     ],
     "toytree.pcm.src.phylolinalg.pgls_infer": [
         "infer_node_states_pgls",
@@ -69,6 +71,7 @@ _MODULE_EXPORTS = {
     "toytree.pcm.src.traits.fit_discrete_ctmc": [
         "PCMDiscreteCTMCFitResult",
         "fit_discrete_ctmc",
+        "fit_discrete_ctmc_multi",
         "infer_ancestral_states_discrete_ctmc",
     ],
     "toytree.pcm.src.traits.fit_continuous_ml": [
@@ -6,8 +6,6 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-import numpy as np
-
 if TYPE_CHECKING:
     from toytree.core import ToyTree
 
@@ -22,6 +20,11 @@ def get_relative_evolutionary_divergence(tree: ToyTree, inplace: bool = False):
     the average distance to the node's leafs, such that the root has a RED of
     0 and the leafs have a RED of 1.
 
+    Average distances to leaves are computed from sums of leaf depths
+    and leaf counts accumulated in one postorder traversal, and RED is
+    propagated from the root in one preorder traversal, such that the
+    run time and memory are linear in the number of nodes.
+
     Parameters
     ----------
     tree: ToyTree
@@ -39,28 +42,42 @@ def get_relative_evolutionary_divergence(tree: ToyTree, inplace: bool = False):
     if not tree.is_rooted():
         raise Exception("RED requires a rooted tree.")
 
-    # store root to 0, tips to 1
-    red = {tree.treenode.idx: 0}
-    red.update({i: 1 for i in range(tree.ntips)})
-
-    # get all-by-all node distance matrix
-    mat = tree.distance.get_node_distance_matrix(topology_only=False)
-
-    # preorder (parent then child) excluding root and tips
-    for node in tree[-2 : tree.ntips : -1]:
+    # edge lengths and depths from the root in idx order. Children
+    # have lower idx labels than their parents, so iterating in idx
+    # order is a postorder traversal and in reverse is a preorder.
+    nnodes = tree.nnodes
+    ntips = tree.ntips
+    parents = tree._get_parent_idxs().tolist()
+    dists = [tree._idx_dict[i]._dist for i in range(nnodes)]
+    depths = [0.0] * nnodes
+    for idx in range(nnodes - 2, -1, -1):
+        depths[idx] = depths[parents[idx]] + dists[idx]
+
+    # postorder: sum of leaf depths and number of leaves below each node
+    leaf_depths = depths[:ntips] + [0.0] * (nnodes - ntips)
+    nleaves = [1] * ntips + [0] * (nnodes - ntips)
+    for idx in range(nnodes - 1):
+        leaf_depths[parents[idx]] += leaf_depths[idx]
+        nleaves[parents[idx]] += nleaves[idx]
+
+    # preorder (parent then child): store root to 0, tips to 1
+    red = [1.0] * nnodes
+    red[-1] = 0.0
+    for idx in range(nnodes - 2, ntips - 1, -1):
         # get parent's red value (P), and dist to parent (a)
-        P = red[node.up.idx]
-        a = mat[node.idx, node.up.idx]
+        P = red[parents[idx]]
+        a = dists[idx]
 
         # get avg dist from this node to each of its leaves (b)
-        b = np.mean([mat[node.idx, leaf.idx] for leaf in node.iter_leaves()])
+        b = leaf_depths[idx] / nleaves[idx] - depths[idx]
 
         # integrety check in case of invalid branch lengths
         if a + b == 0:
-            raise ValueError(f"node {node}: a == b == {a}")
+            raise ValueError(f"node {tree._idx_dict[idx]}: a == b == {a}")
 
         # store this nodes red value
-        red[node.idx] = P + (a / (a + b)) * (1 - P)
+        red[idx] = P + (a / (a + b)) * (1 - P)
+    red = dict(enumerate(red))
 
     # return a tree with data set to nodes, or return the data in a dict
     if inplace:
@@ -1,5 +1,44 @@
-#!/usr/bin/env pythonn
+#!/usr/bin/env python
 
 """Phylogenetic ecology subpackage."""
 
-from .phylocom import simulate_community_data
+from .metrics import (
+    Frequency,
+    IndependentSwap,
+    NullModel,
+    PhyloPool,
+    Richness,
+    SamplePool,
+    ShuffleTips,
+    TrialSwap,
+    get_faith_pd,
+    get_mean_nearest_neighbor_distance,
+    get_mean_pairwise_distance,
+    get_nearest_taxon_index,
+    get_net_relatedness_index,
+    get_phylogenetic_sorensen_index,
+    get_species_richness,
+    get_unifrac,
+)
+from .phylocom import get_community_metric, simulate_community_data
+
+__all__ = [
+    "NullModel",
+    "ShuffleTips",
+    "Richness",
+    "Frequency",
+    "SamplePool",
+    "PhyloPool",
+    "IndependentSwap",
+    "TrialSwap",
+    "get_faith_pd",
+    "get_mean_pairwise_distance",
+    "get_mean_nearest_neighbor_distance",
+    "get_net_relatedness_index",
+    "get_nearest_taxon_index",
+    "get_species_richness",
+    "get_phylogenetic_sorensen_index",
+    "get_unifrac",
+    "get_community_metric",
+    "simulate_community_data",
+]
@@ -1,134 +1,962 @@
 #!/usr/bin/env python
 
-"""Outline of ideas for more phylocom metrics..."""
-
-from dataclasses import dataclass
-from typing import Callable, TypeVar
-
+"""Phylogenetic community metrics and null models.
+
+Community data are stored as a sparse (nsites, ntips) CSR matrix with
+columns in tip idx order. A sparse (ntips, nedges) incidence matrix
+records the edges on the path from each tip to the root, such that
+the product of the two is a (nsites, nedges) matrix counting the
+species (or summing the abundances) below each edge in each site.
+Faith's PD, MPD, and the phylobetadiversity metrics (UniFrac and
+PhyloSor) are computed for all sites from this single product. MNTD
+uses a cached tip distance matrix.
+
+Null models randomize the community matrix many times at once by
+stacking replicate matrices into one tall sparse matrix, such that a
+metric is computed for all sites of many replicates in one call.
+
+References
+----------
+- Faith, D.P. (1992) Conservation evaluation and phylogenetic
+  diversity. Biological Conservation, 61, 1-10.
+- Webb, C.O., Ackerly, D.D., McPeek, M.A. & Donoghue, M.J. (2002)
+  Phylogenies and community ecology. Annu. Rev. Ecol. Syst., 33,
+  475-505.
+- Gotelli, N.J. (2000) Null model analysis of species co-occurrence
+  patterns. Ecology, 81, 2606-2621.
+- Miklos, I. & Podani, J. (2004) Randomization of presence-absence
+  matrices: comments and new algorithms. Ecology, 85, 86-92.
+- Bryant, J.A. et al. (2008) Microbes on mountainsides: contrasting
+  elevational patterns of bacterial and plant diversity. PNAS, 105,
+  11505-11511.
+- Lozupone, C. & Knight, R. (2005) UniFrac: a new phylogenetic method
+  for comparing microbial communities. Appl. Environ. Microbiol., 71,
+  8228-8235.
+- Kembel, S.W. et al. (2010) Picante: R tools for integrating
+  phylogenies and ecology. Bioinformatics, 26, 1463-1464.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
 from numpy.typing import ArrayLike
+from scipy import sparse
+
+from toytree.core import ToyTree
+from toytree.utils.src.exceptions import ToytreeError
+
+__all__ = [
+    "NullModel",
+    "ShuffleTips",
+    "Richness",
+    "Frequency",
+    "SamplePool",
+    "PhyloPool",
+    "IndependentSwap",
+    "TrialSwap",
+    "get_faith_pd",
+    "get_mean_pairwise_distance",
+    "get_mean_nearest_neighbor_distance",
+    "get_net_relatedness_index",
+    "get_nearest_taxon_index",
+    "get_species_richness",
+    "get_phylogenetic_sorensen_index",
+    "get_unifrac",
+]
+
+_MAX_BLOCK_ITEMS = 2**22
+"""Approximate max number of values held in a block of sites or replicates."""
+
+
+def _get_community_matrix(
+    tree: ToyTree,
+    matrix: ArrayLike,
+) -> Tuple[sparse.csr_matrix, pd.Index, np.ndarray]:
+    """Return a CSR community matrix with columns in tip idx order.
+
+    A DataFrame is matched to the tree by its column names, and tips
+    absent from it are included as empty columns. An array or scipy
+    sparse matrix must have one column per tip in idx order. Also
+    returns the site names and a bool mask of tips that were columns
+    of the input matrix.
+    """
+    ntips = tree.ntips
+    if isinstance(matrix, pd.DataFrame):
+        names = tree.get_tip_labels()
+        tip_idxs = {name: idx for idx, name in enumerate(names)}
+        missing = [i for i in matrix.columns if i not in tip_idxs]
+        if missing:
+            raise ToytreeError(
+                f"{len(missing)} species in matrix are not in tree, e.g., "
+                f"{missing[:5]}."
+            )
+        if matrix.columns.duplicated().any():
+            raise ToytreeError("matrix columns (species names) must be unique.")
+        columns = np.array([tip_idxs[i] for i in matrix.columns], dtype=np.int64)
+        sites = matrix.index
+        if len(columns) and all(isinstance(i, pd.SparseDtype) for i in matrix.dtypes):
+            arr = matrix.sparse.to_coo().tocsr().astype(np.float64)
+        else:
+            arr = sparse.csr_matrix(matrix.to_numpy(dtype=np.float64))
+        arr = sparse.csr_matrix(
+            (arr.data, columns[arr.indices], arr.indptr),
+            shape=(arr.shape[0], ntips),
+        )
+    else:
+        if sparse.issparse(matrix):
+            arr = sparse.csr_matrix(matrix, dtype=np.float64)
+        else:
+            arr = sparse.csr_matrix(
+                np.asarray(matrix, dtype=np.float64).reshape(-1, ntips)
+            )
+        if arr.shape[1] != ntips:
+            raise ToytreeError(
+                f"matrix must have ntips={ntips} columns in tip idx order, "
+                "or be a DataFrame with tip names as columns."
+            )
+        columns = np.arange(ntips)
+        sites = pd.RangeIndex(arr.shape[0])
+
+    if np.any(arr.data < 0) or not np.all(np.isfinite(arr.data)):
+        raise ToytreeError("matrix values must be finite and >= 0.")
+    arr.eliminate_zeros()
+    arr.sort_indices()
+    in_matrix = np.zeros(ntips, dtype=bool)
+    in_matrix[columns] = True
+    return arr, sites, in_matrix
+
+
+def _get_tip_edge_incidence(tree: ToyTree) -> sparse.csr_matrix:
+    """Return a sparse (ntips, nnodes - 1) matrix of tip-to-root paths.
+
+    Edges are indexed by the idx label of their child Node. Entry
+    (i, j) is 1 if edge j is on the path from tip i to the root.
+    """
+    parents = tree._get_parent_idxs()
+    tips = np.arange(tree.ntips)
+    nodes = tips.copy()
+    rows = []
+    cols = []
+    while nodes.size:
+        keep = parents[nodes] != -1
+        tips = tips[keep]
+        nodes = nodes[keep]
+        rows.append(tips)
+        cols.append(nodes)
+        nodes = parents[nodes]
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    return sparse.csr_matrix(
+        (np.ones(rows.size), (rows, cols)),
+        shape=(tree.ntips, max(tree.nnodes - 1, 0)),
+    )
+
+
+def _get_presence(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Return a copy of a CSR community matrix with values set to 1."""
+    return sparse.csr_matrix(
+        (np.ones(matrix.nnz), matrix.indices, matrix.indptr),
+        shape=matrix.shape,
+    )
+
+
+def _sample_without_replacement(
+    rng: np.random.Generator,
+    counts: np.ndarray,
+    npool: int,
+) -> np.ndarray:
+    """Return distinct ints in [0, npool) for each group of counts.
+
+    The returned values are grouped consecutively, `counts[i]` values
+    per group. Groups that fill a small part of the pool are drawn
+    with replacement and duplicates redrawn until none remain, while
+    groups that fill a large part of it take the first values of a
+    random permutation of the pool.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if np.any(counts > npool):
+        raise ToytreeError("cannot sample more values than in the pool.")
+    groups = np.repeat(np.arange(counts.size), counts)
+    values = np.empty(groups.size, dtype=np.int64)
+
+    # sparse groups: redraw duplicated values within each group
+    sparse_mask = counts * 4 <= npool
+    mask = sparse_mask[groups]
+    pos = np.flatnonzero(mask)
+    values[pos] = rng.integers(npool, size=pos.size)
+    keys_base = groups[pos] * npool
+    redraw = pos
+    while redraw.size:
+        keys = keys_base + values[pos]
+        order = np.argsort(keys, kind="stable")
+        dups = order[1:][keys[order[1:]] == keys[order[:-1]]]
+        redraw = pos[dups]
+        values[redraw] = rng.integers(npool, size=redraw.size)
+
+    # dense groups: first values of a random permutation of the pool
+    dense = np.flatnonzero(~sparse_mask & (counts > 0))
+    pos = np.flatnonzero(~mask)
+    ends = np.cumsum(counts[dense])
+    nblock = max(1, _MAX_BLOCK_ITEMS // max(npool, 1))
+    for start in range(0, dense.size, nblock):
+        block = dense[start : start + nblock]
+        perms = rng.permuted(np.tile(np.arange(npool), (block.size, 1)), axis=1)
+        keep = np.arange(npool) < counts[block][:, None]
+        first = ends[start - 1] if start else 0
+        values[pos[first : ends[start + block.size - 1]]] = perms[keep]
+    return values
+
+
+def _stack_rows(
+    nrows: int,
+    ncols: int,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    data: np.ndarray,
+) -> sparse.csr_matrix:
+    """Return a CSR matrix from unsorted (row, col, data) triplets."""
+    arr = sparse.csr_matrix((data, (rows, cols)), shape=(nrows, ncols))
+    arr.sort_indices()
+    return arr
+
+
+class _CommunityEngine:
+    """Tree arrays used to compute community metrics for many sites.
+
+    The incidence matrix and edge lengths are computed once when the
+    engine is created, and the tip distance matrix is computed the
+    first time MNTD is requested. Methods take a CSR matrix with one
+    column per tip in idx order and return one value per row.
+    """
 
-ToyTree = TypeVar("ToyTree")
+    def __init__(self, tree: ToyTree):
+        self.tree = tree
+        self.incidence = _get_tip_edge_incidence(tree)
+        """: Sparse (ntips, nedges) matrix of edges on tip-to-root paths."""
+        self.lengths = np.array(
+            [tree[i]._dist for i in range(tree.nnodes - 1)], dtype=np.float64
+        )
+        """: Edge lengths indexed by child Node idx."""
+        self._distances: Optional[np.ndarray] = None
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Cached (ntips, ntips) tip distance matrix."""
+        if self._distances is None:
+            from toytree.distance import get_tip_distance_matrix
+
+            self._distances = get_tip_distance_matrix(self.tree)
+        return self._distances
+
+    def _get_edge_sums(self, matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Return (nrows, nedges) sums of values below each edge."""
+        sums = (matrix @ self.incidence).tocsr()
+        sums.eliminate_zeros()
+        return sums
+
+    def get_richness(self, matrix: sparse.csr_matrix) -> np.ndarray:
+        """Return the number of species present in each row."""
+        return np.diff(matrix.indptr).astype(np.float64)
+
+    def get_faith_pd(
+        self,
+        matrix: sparse.csr_matrix,
+        include_root: bool = True,
+    ) -> np.ndarray:
+        """Return the total length of edges spanned by each row."""
+        counts = self._get_edge_sums(_get_presence(matrix))
+        weights = self.lengths[counts.indices]
+        if not include_root:
+            rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+            richness = self.get_richness(matrix)
+            weights = weights * (counts.data < richness[rows])
+        return np.bincount(
+            np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr)),
+            weights=weights,
+            minlength=counts.shape[0],
+        )
+
+    def get_mpd(
+        self,
+        matrix: sparse.csr_matrix,
+        abundance_weighted: bool = False,
+    ) -> np.ndarray:
+        """Return the mean pairwise distance among species in each row.
+
+        Each edge is on the path between w * (W - w) weighted pairs,
+        where w is the weight below the edge and W is the total weight
+        in the row, so the sum of distances over all pairs is a sum
+        over edges that does not require the tip distance matrix.
+        """
+        if not abundance_weighted:
+            matrix = _get_presence(matrix)
+        sums = self._get_edge_sums(matrix)
+        rows = np.repeat(np.arange(sums.shape[0]), np.diff(sums.indptr))
+        total = np.asarray(matrix.sum(axis=1)).ravel()
+        numer = 2 * np.bincount(
+            rows,
+            weights=self.lengths[sums.indices] * sums.data * (total[rows] - sums.data),
+            minlength=sums.shape[0],
+        )
+        squares = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+        denom = total**2 - squares
+        mpd = np.full(sums.shape[0], np.nan)
+        mask = np.diff(matrix.indptr) > 1
+        mpd[mask] = numer[mask] / denom[mask]
+        return mpd
+
+    def get_mntd(
+        self,
+        matrix: sparse.csr_matrix,
+        abundance_weighted: bool = False,
+    ) -> np.ndarray:
+        """Return the mean nearest taxon distance of species in each row.
+
+        Rows are grouped by richness so the (n, n) tip distance blocks
+        of many rows are gathered and reduced in one operation.
+        """
+        dists = self.distances
+        counts = np.diff(matrix.indptr)
+        mntd = np.full(matrix.shape[0], np.nan)
+        for size in np.unique(counts[counts > 1]):
+            size = int(size)
+            rows = np.flatnonzero(counts == size)
+            nblock = max(1, _MAX_BLOCK_ITEMS // size**2)
+            diag = np.arange(size)
+            for start in range(0, rows.size, nblock):
+                block = rows[start : start + nblock]
+                pos = matrix.indptr[block][:, None] + diag
+                cols = matrix.indices[pos]
+                sub = dists[cols[:, :, None], cols[:, None, :]]
+                sub[:, diag, diag] = np.inf
+                nearest = sub.min(axis=2)
+                if abundance_weighted:
+                    weights = matrix.data[pos]
+                    mntd[block] = (nearest * weights).sum(1) / weights.sum(1)
+                else:
+                    mntd[block] = nearest.mean(axis=1)
+        return mntd
+
+    def get_shared_lengths(
+        self, matrix: sparse.csr_matrix
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the PD of each row and the (nrows, nrows) shared PD.
+
+        Shared PD is the total length of edges spanned by both rows
+        of a pair, computed for all pairs as the product of the
+        edge-presence matrix with its length-weighted transpose. The
+        cost of a sparse product grows with the square of the number
+        of rows spanning each edge, so edges spanned by many rows
+        (near the root) are multiplied as dense arrays instead.
+        """
+        spans = _get_presence(self._get_edge_sums(_get_presence(matrix)))
+        nrows, nedges = spans.shape
+        pdiv = spans @ self.lengths
+        counts = np.bincount(spans.indices, minlength=nedges)
+        dense_edges = np.flatnonzero(counts * 8 > nrows)
+        sparse_edges = np.flatnonzero(counts * 8 <= nrows)
+        dense = spans[:, dense_edges].toarray()
+        weighted_dense = dense * self.lengths[dense_edges]
+        spans = spans[:, sparse_edges].tocsr()
+        weighted = spans.multiply(self.lengths[sparse_edges][None, :]).tocsr()
+        shared = np.empty((nrows, nrows))
+        nblock = max(1, _MAX_BLOCK_ITEMS // max(nrows, 1))
+        for start in range(0, nrows, nblock):
+            block = slice(start, start + nblock)
+            shared[block] = weighted_dense[block] @ dense.T
+            shared[block] += (weighted[block] @ spans.T).toarray()
+        return pdiv, shared
+
+
+_ENGINE_METRICS = {
+    "pd": "get_faith_pd",
+    "mpd": "get_mpd",
+    "mntd": "get_mntd",
+    "richness": "get_richness",
+}
+
+
+#####################################################################
+# NULL MODELS
+#####################################################################
 
 
 @dataclass
 class NullModel:
+    """Base class for null models of community assembly.
+
+    Child classes implement `_randomize` to return many randomized
+    community matrices stacked into one tall sparse matrix. The
+    observed statistic is computed for every site and compared to
+    its distribution across `size` null replicates.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
+    method: str or Callable
+        A metric name ("pd", "mpd", "mntd", or "richness"), one of
+        the metric functions of this module, or a function called as
+        `method(tree, matrix)` returning one value per site.
+    size: int
+        N replicate null communities for calculating effect sizes.
+    seed: int or None
+        Seed for the numpy random number generator.
+    abundance_weighted: bool
+        If True, MPD and MNTD weight species by their abundances.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(50, seed=123)
+    >>> matrix = phylocom.simulate_community_data(tree, 3, size=20, seed=1)
+    >>> null = phylocom.ShuffleTips(tree, matrix, "mpd", size=999, seed=1)
+    >>> null.get_standard_effect_size()
+    """
+
     tree: ToyTree
     """: Phylogenetic tree containing the complete species pool."""
     matrix: ArrayLike
     """: Community matrix shape=(nsites, nspecies), dtype=bool or int."""
-    method: Callable
-    """: A function to compute on the tree x matrix data."""
-    size: int
+    method: Union[str, Callable]
+    """: A metric name, or function to compute on the tree x matrix data."""
+    size: int = 999
     """: N replicate null community samples for calculating effect sizes."""
-    _statistic: ArrayLike
-    """: Statistic to be computed for each community."""
-    _mean: float
-    """: Mean statistic computed across null communities."""
-    _std: float
-    """: Standard deviation of statistic computed across null communities."""
+    seed: Optional[int] = None
+    """: Seed for the numpy random number generator."""
+    abundance_weighted: bool = False
+    """: Weight MPD and MNTD by species abundances."""
+    _statistic: np.ndarray = field(init=False, repr=False)
+    """: Statistic computed for each community."""
+    _mean: np.ndarray = field(init=False, repr=False)
+    """: Mean statistic computed across null communities for each site."""
+    _std: np.ndarray = field(init=False, repr=False)
+    """: Standard deviation of statistic across null communities for each site."""
+    _rank: np.ndarray = field(init=False, repr=False)
+    """: N null communities with a statistic lower than observed for each site."""
 
     def __post_init__(self):
-        """Sample null communities and return computed Z scores."""
+        """Sample null communities and compute summary statistics."""
         self._check_data()
+        self._statistic = self._compute(self._matrix)
         self._sample_from_null()
-        self.get_standard_effect_size()
 
     def _check_data(self):
         """Verify that names match between tree and matrix.
 
-        Names present in the matrix (DataFrame) should be present in
-        the phylogeny, and vice-versa.
+        Names present in the matrix (DataFrame) must be present in the
+        phylogeny. Tips of the phylogeny absent from the matrix are
+        included as species that are absent from every site.
         """
-        # TODO.
+        if int(self.size) != self.size or self.size < 2:
+            raise ToytreeError("size must be an int >= 2.")
+        self.size = int(self.size)
+        self._matrix, self._sites, self._in_matrix = _get_community_matrix(
+            self.tree, self.matrix
+        )
+        self._engine = _CommunityEngine(self.tree)
+        method = _FUNCTION_METRICS.get(self.method, self.method)
+        if isinstance(method, str):
+            if method not in _ENGINE_METRICS:
+                raise ToytreeError(
+                    f"method '{method}' not supported, choose from "
+                    f"{list(_ENGINE_METRICS)} or a Callable."
+                )
+            self._metric = method
+        elif callable(method):
+            self._metric = None
+        else:
+            raise ToytreeError("method must be a str or Callable.")
+
+    def _compute(self, matrix: sparse.csr_matrix) -> np.ndarray:
+        """Return the statistic for each row of a community matrix."""
+        if self._metric is None:
+            values = self.method(self.tree, matrix)
+            return np.asarray(values, dtype=np.float64).ravel()
+        func = getattr(self._engine, _ENGINE_METRICS[self._metric])
+        if self._metric in ("mpd", "mntd"):
+            return func(matrix, abundance_weighted=self.abundance_weighted)
+        return func(matrix)
+
+    def _randomize(self, nreps: int, rng: np.random.Generator) -> sparse.csr_matrix:
+        """Return nreps randomized matrices stacked as (nreps * nsites, ntips)."""
+        raise NotImplementedError("No function, use a child class.")
 
     def _sample_from_null(self):
-        """Child class function will set self._mean and self._std."""
-        raise NotImplementedError("No function, use a child class.")
+        """Set self._mean, self._std and self._rank from null replicates.
 
-    def get_standard_effect_size(self):
-        r"""Return effect size (Z-value).
+        Replicates are randomized and scored in blocks, each as one
+        stacked matrix. Seeds are spawned per block of fixed size so
+        that results are reproducible for a given seed.
+        """
+        nsites = self._matrix.shape[0]
+        nblock = max(1, _MAX_BLOCK_ITEMS // max(self._matrix.nnz, nsites, 1))
+        starts = range(0, self.size, nblock)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(starts))
+        total = np.zeros(nsites)
+        squares = np.zeros(nsites)
+        rank = np.zeros(nsites)
+        count = np.zeros(nsites)
+        for start, seed in zip(starts, seeds):
+            nreps = min(nblock, self.size - start)
+            rng = np.random.default_rng(seed)
+            null = self._compute(self._randomize(nreps, rng)).reshape(nreps, nsites)
+            valid = ~np.isnan(null)
+            total += np.where(valid, null, 0).sum(axis=0)
+            squares += np.where(valid, null**2, 0).sum(axis=0)
+            rank += (null < self._statistic).sum(axis=0)
+            count += valid.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._mean = total / count
+            var = (squares - count * self._mean**2) / (count - 1)
+        self._std = np.sqrt(np.clip(var, 0, None))
+        self._rank = np.where(np.isnan(self._statistic), np.nan, rank)
+
+    def get_standard_effect_size(self) -> pd.Series:
+        r"""Return effect size (Z-value) for each site.
 
         $$ z = \frac{x - \mu}{\sigma} $$
         """
-        return (self._statistic - self._mean) / self._std
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore = (self._statistic - self._mean) / self._std
+        return pd.Series(zscore, index=self._sites, name="effect_size")
+
+    def get_summary(self) -> pd.DataFrame:
+        """Return a DataFrame summarizing the null model for each site.
+
+        Columns are the observed statistic, the null mean and standard
+        deviation, the effect size, the rank of the observed value
+        among null replicates, and its one-sided p-value (rank + 1) /
+        (size + 1) of being lower than expected under the null.
+        """
+        return pd.DataFrame(
+            {
+                "metric": self._statistic,
+                "null_mean": self._mean,
+                "null_std": self._std,
+                "effect_size": self.get_standard_effect_size().to_numpy(),
+                "rank": self._rank,
+                "pvalue": (self._rank + 1) / (self.size + 1),
+            },
+            index=self._sites,
+        )
 
 
 class ShuffleTips(NullModel):
-    """Shuffle tip labels on tree and recompute statistic."""
+    """Shuffle tip labels on tree and recompute statistic.
 
-    def _sample_from_null(self):
-        for rep in range(self.size):
-            pass
+    Each replicate applies one random permutation of the tips to the
+    columns of the community matrix.
+    """
+
+    def _randomize(self, nreps: int, rng: np.random.Generator) -> sparse.csr_matrix:
+        matrix = self._matrix
+        ntips = matrix.shape[1]
+        perms = rng.permuted(np.tile(np.arange(ntips), (nreps, 1)), axis=1)
+        indices = perms[:, matrix.indices].ravel()
+        offsets = np.arange(nreps)[:, None] * matrix.nnz
+        indptr = np.append((offsets + matrix.indptr[:-1]).ravel(), nreps * matrix.nnz)
+        arr = sparse.csr_matrix(
+            (np.tile(matrix.data, nreps), indices, indptr),
+            shape=(nreps * matrix.shape[0], ntips),
+        )
+        arr.sort_indices()
+        return arr
+
+
+class _PoolNullModel(NullModel):
+    """Draw species for each site from a pool, maintaining richness."""
+
+    def _get_pool(self) -> np.ndarray:
+        """Return tip idxs of the species pool."""
+        raise NotImplementedError("No function, use a child class.")
 
+    def _randomize(self, nreps: int, rng: np.random.Generator) -> sparse.csr_matrix:
+        matrix = self._matrix
+        pool = self._get_pool()
+        counts = np.tile(np.diff(matrix.indptr), nreps)
+        indices = pool[_sample_without_replacement(rng, counts, pool.size)]
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        arr = sparse.csr_matrix(
+            (np.tile(matrix.data, nreps), indices, indptr),
+            shape=(nreps * matrix.shape[0], matrix.shape[1]),
+        )
+        arr.sort_indices()
+        return arr
+
+
+class Richness(_PoolNullModel):
+    """Randomize community abundances while maintaining species richness.
+
+    The values in each site are redistributed among the species that
+    are columns of the community matrix.
+    """
 
-class Richness(NullModel):
-    """Randomize community abundances while maintaining species richness"""
+    def _get_pool(self) -> np.ndarray:
+        return np.flatnonzero(self._in_matrix)
 
 
 class Frequency(NullModel):
-    """Randomize community abundances while maintaining species frequencies"""
+    """Randomize community abundances while maintaining species frequencies.
 
+    The values of each species are redistributed among the sites.
+    """
 
-class SamplePool(NullModel):
+    def _randomize(self, nreps: int, rng: np.random.Generator) -> sparse.csr_matrix:
+        matrix = self._matrix.tocsc()
+        nsites, ntips = matrix.shape
+        counts = np.tile(np.diff(matrix.indptr), nreps)
+        rows = _sample_without_replacement(rng, counts, nsites)
+        reps = np.repeat(np.arange(nreps), matrix.nnz)
+        cols = np.tile(np.repeat(np.arange(ntips), np.diff(matrix.indptr)), nreps)
+        return _stack_rows(
+            nreps * nsites,
+            ntips,
+            reps * nsites + rows,
+            cols,
+            np.tile(matrix.data, nreps),
+        )
+
+
+class SamplePool(_PoolNullModel):
     """Randomize community by sampling species from pool of species
     occurring in at least one community (sample pool) with equal
     probability.
     """
 
+    def _get_pool(self) -> np.ndarray:
+        return np.unique(self._matrix.indices)
 
-class PhyloPool(NullModel):
+
+class PhyloPool(_PoolNullModel):
     """Randomize community by sampling species from pool of species
-    occurring in at least one community (sample pool) with equal
-    probability.
+    in the phylogeny (phylogeny pool) with equal probability.
+    """
+
+    def _get_pool(self) -> np.ndarray:
+        return np.arange(self._matrix.shape[1])
+
 
-    Note: this description is same as above, probably a typo.
+@dataclass
+class _SwapNullModel(NullModel):
+    """Randomize presence-absence by swapping checkerboard submatrices.
+
+    Replicates are swapped in blocks stored as dense (nreps, nsites,
+    nspecies) bool arrays of the occupied species, and a random 2x2
+    submatrix is drawn for every replicate at each step. Each block is
+    converted to sparse before the next is drawn. Abundances are
+    converted to presence-absence.
     """
 
+    iterations: int = 1000
+    """: N swaps (IndependentSwap) or swap attempts (TrialSwap) per replicate."""
+
+    def _count_trials(self) -> bool:
+        """Return True if iterations count attempts rather than swaps."""
+        raise NotImplementedError("No function, use a child class.")
 
-class IndependentSwap(NullModel):
+    def _randomize(self, nreps: int, rng: np.random.Generator) -> sparse.csr_matrix:
+        matrix = self._matrix
+        nsites, ntips = matrix.shape
+        pool = np.unique(matrix.indices)
+        npool = pool.size
+        dense = np.zeros((nsites, ntips), dtype=bool)
+        dense[np.repeat(np.arange(nsites), np.diff(matrix.indptr)), matrix.indices] = (
+            True
+        )
+        dense = dense[:, pool]
+
+        blocks = []
+        nblock = max(1, _MAX_BLOCK_ITEMS // max(nsites * npool, 1))
+        for start in range(0, nreps, nblock):
+            size = min(nblock, nreps - start)
+            arr = np.repeat(dense[None], size, axis=0)
+            if nsites > 1 and npool > 1:
+                self._swap(arr, rng)
+            blocks.append(sparse.csr_matrix(arr.reshape(size * nsites, npool)))
+        arr = sparse.vstack(blocks, format="csr")
+        return sparse.csr_matrix(
+            (np.ones(arr.nnz), pool[arr.indices], arr.indptr),
+            shape=(nreps * nsites, ntips),
+        )
+
+    def _swap(self, arr: np.ndarray, rng: np.random.Generator) -> None:
+        """Apply checkerboard swaps in place to a stack of matrices."""
+        nreps, nsites, npool = arr.shape
+        swaps = np.zeros(nreps, dtype=np.int64)
+        active = np.arange(nreps)
+        trials = 0
+        while active.size:
+            rows = rng.choice(nsites, size=(active.size, 2), replace=True)
+            cols = rng.choice(npool, size=(active.size, 2), replace=True)
+            r0, r1 = rows.T
+            c0, c1 = cols.T
+            v00 = arr[active, r0, c0]
+            v01 = arr[active, r0, c1]
+            v10 = arr[active, r1, c0]
+            v11 = arr[active, r1, c1]
+            mask = (v00 == v11) & (v01 == v10) & (v00 != v01)
+            mask &= (r0 != r1) & (c0 != c1)
+            hit = active[mask]
+            arr[hit, r0[mask], c0[mask]] = v01[mask]
+            arr[hit, r0[mask], c1[mask]] = v00[mask]
+            arr[hit, r1[mask], c0[mask]] = v11[mask]
+            arr[hit, r1[mask], c1[mask]] = v10[mask]
+            trials += 1
+            if self._count_trials():
+                if trials >= self.iterations:
+                    break
+            else:
+                swaps[hit] += 1
+                active = active[swaps[active] < self.iterations]
+                # a matrix without checkerboards cannot be swapped
+                if trials >= 1000 * self.iterations:
+                    break
+
+
+@dataclass
+class IndependentSwap(_SwapNullModel):
     """Randomizes community data matrix with the independent swap
     algorithm (Gotelli 2000) maintaining species occurrence frequency
     and sample species richness.
     """
 
+    def _count_trials(self) -> bool:
+        return False
 
-class TrialSwap(NullModel):
+
+@dataclass
+class TrialSwap(_SwapNullModel):
     """Randomizes community data matrix with the trial-swap algorithm
     (Miklos & Podani 2004) maintaining species occurrence frequency
     and sample species richness.
     """
 
+    def _count_trials(self) -> bool:
+        return True
 
-def get_faith_pd() -> float:
-    """..."""
 
+_NULL_MODELS = {
+    "shuffle_tips": ShuffleTips,
+    "richness": Richness,
+    "frequency": Frequency,
+    "sample_pool": SamplePool,
+    "phylo_pool": PhyloPool,
+    "independent_swap": IndependentSwap,
+    "trial_swap": TrialSwap,
+}
 
-def get_mean_pairwise_distance() -> float:
-    """..."""
 
+def _get_null_model(null: Union[str, Type[NullModel]]) -> Type[NullModel]:
+    """Return a NullModel class from its name or the class itself."""
+    if isinstance(null, type) and issubclass(null, NullModel):
+        return null
+    if null not in _NULL_MODELS:
+        raise ToytreeError(
+            f"null model '{null}' not supported, choose from {list(_NULL_MODELS)}."
+        )
+    return _NULL_MODELS[null]
 
-def get_mean_nearest_neighbor_distance() -> float:
-    """..."""
 
+#####################################################################
+# ALPHA DIVERSITY METRICS
+#####################################################################
 
-def get_net_relatedness_index() -> float:
-    """..."""
 
+def get_faith_pd(
+    tree: ToyTree,
+    matrix: ArrayLike,
+    include_root: bool = True,
+) -> pd.Series:
+    """Return Faith's phylogenetic diversity (PD) of each site.
 
-def get_nearest_taxon_index() -> float:
-    """..."""
+    PD is the total length of edges spanned by the species present
+    in a site. It is computed for all sites at once as the product of
+    the sparse community matrix and a tips x edges incidence matrix.
 
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies) where 0 indicates absence
+        and values > 0 indicate presence (or abundance for metrics
+        that use it). A DataFrame is matched to tips by its column
+        names, and tips not in it are absent from every site. Arrays
+        and sparse matrices must have one column per tip in idx order.
+    include_root: bool
+        If True the edges connecting species to the root are included
+        (Faith 1992), else only the edges connecting the species of a
+        site to each other, below their most recent common ancestor.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(20, seed=123)
+    >>> matrix = phylocom.simulate_community_data(tree, size=10, seed=1)
+    >>> phylocom.get_faith_pd(tree, matrix)
+    """
+    arr, sites, _ = _get_community_matrix(tree, matrix)
+    values = _CommunityEngine(tree).get_faith_pd(arr, include_root)
+    return pd.Series(values, index=sites, name="pd")
 
-def get_species_richness() -> float:
-    """..."""
+
+def get_mean_pairwise_distance(
+    tree: ToyTree,
+    matrix: ArrayLike,
+    abundance_weighted: bool = False,
+) -> pd.Series:
+    """Return the mean pairwise distance (MPD) among species in each site.
+
+    MPD is the mean phylogenetic distance between all pairs of
+    species in a site. It is computed from the sums of values below
+    each edge, without a pairwise tip distance matrix. Sites with
+    fewer than two species have value NaN.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
+    abundance_weighted: bool
+        If True distances between pairs of species are weighted by
+        the product of their abundances.
+    """
+    arr, sites, _ = _get_community_matrix(tree, matrix)
+    values = _CommunityEngine(tree).get_mpd(arr, abundance_weighted)
+    return pd.Series(values, index=sites, name="mpd")
+
+
+def get_mean_nearest_neighbor_distance(
+    tree: ToyTree,
+    matrix: ArrayLike,
+    abundance_weighted: bool = False,
+) -> pd.Series:
+    """Return the mean nearest taxon distance (MNTD) in each site.
+
+    MNTD is the mean over species in a site of the phylogenetic
+    distance to the closest other species in the site. Sites with
+    fewer than two species have value NaN.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
+    abundance_weighted: bool
+        If True the mean is weighted by species abundances.
+    """
+    arr, sites, _ = _get_community_matrix(tree, matrix)
+    values = _CommunityEngine(tree).get_mntd(arr, abundance_weighted)
+    return pd.Series(values, index=sites, name="mntd")
+
+
+def get_net_relatedness_index(
+    tree: ToyTree,
+    matrix: ArrayLike,
+    null: Union[str, Type[NullModel]] = "shuffle_tips",
+    size: int = 999,
+    seed: Optional[int] = None,
+    abundance_weighted: bool = False,
+) -> pd.Series:
+    """Return the net relatedness index (NRI) of each site.
+
+    NRI is the negative standardized effect size of MPD relative to
+    a null model (Webb et al. 2002). Positive values indicate species
+    that are more closely related than expected (clustering).
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
+    null: str or NullModel class
+        A null model, one of "shuffle_tips", "richness", "frequency",
+        "sample_pool", "phylo_pool", "independent_swap", "trial_swap".
+    size: int
+        N replicate null communities.
+    seed: int or None
+        Seed for the numpy random number generator.
+    abundance_weighted: bool
+        If True MPD is weighted by species abundances.
+    """
+    model = _get_null_model(null)(tree, matrix, "mpd", size, seed, abundance_weighted)
+    return (-model.get_standard_effect_size()).rename("nri")
 
 
-def get_phylogenetic_sorensen_index() -> float:
+def get_nearest_taxon_index(
+    tree: ToyTree,
+    matrix: ArrayLike,
+    null: Union[str, Type[NullModel]] = "shuffle_tips",
+    size: int = 999,
+    seed: Optional[int] = None,
+    abundance_weighted: bool = False,
+) -> pd.Series:
+    """Return the nearest taxon index (NTI) of each site.
+
+    NTI is the negative standardized effect size of MNTD relative to
+    a null model (Webb et al. 2002). Positive values indicate species
+    that are more closely related than expected (clustering).
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
+    null: str or NullModel class
+        A null model. See `get_net_relatedness_index`.
+    size: int
+        N replicate null communities.
+    seed: int or None
+        Seed for the numpy random number generator.
+    abundance_weighted: bool
+        If True MNTD is weighted by species abundances.
+    """
+    model = _get_null_model(null)(tree, matrix, "mntd", size, seed, abundance_weighted)
+    return (-model.get_standard_effect_size()).rename("nti")
+
+
+def get_species_richness(tree: ToyTree, matrix: ArrayLike) -> pd.Series:
+    """Return the number of species present in each site.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
+    """
+    arr, sites, _ = _get_community_matrix(tree, matrix)
+    return pd.Series(np.diff(arr.indptr), index=sites, name="richness")
+
+
+#####################################################################
+# BETA DIVERSITY METRICS
+#####################################################################
+
+
+def get_phylogenetic_sorensen_index(tree: ToyTree, matrix: ArrayLike) -> pd.DataFrame:
     """Return the Phylogenetic Sørensen Index of PhyloBetaDiversity.
 
     This is a phylogenetic analog of the Sørensen index based on
     the total length of edges shared and unshared between paired
-    communities.
+    communities. It is a similarity from 0 (no shared edges) to 1
+    (identical edges), computed as the length of shared edges
+    divided by the mean PD of the two communities. Values for all
+    pairs of sites are computed from one sparse matrix product.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
 
     References
     ----------
@@ -137,20 +965,48 @@ def get_phylogenetic_sorensen_index() -> float:
     Examples
     --------
     >>> import toyplot, toytree
-    >>> tree = ...
-    >>> matrix = ...
-    >>> sor_index = get_phylo...
+    >>> tree = toytree.rtree.unittree(20, seed=123)
+    >>> matrix = phylocom.simulate_community_data(tree, 3, size=10, seed=1)
+    >>> sor_index = phylocom.get_phylogenetic_sorensen_index(tree, matrix)
     >>>
     >>> # plot a matrix of SorIndex values between pairs of comms.
-    >>> ...
+    >>> toyplot.matrix(sor_index.to_numpy())
     """
+    arr, sites, _ = _get_community_matrix(tree, matrix)
+    pdiv, shared = _CommunityEngine(tree).get_shared_lengths(arr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 2 * shared / (pdiv[:, None] + pdiv[None, :])
+    return pd.DataFrame(values, index=sites, columns=sites)
 
 
-def get_unifrac() -> float:
+def get_unifrac(tree: ToyTree, matrix: ArrayLike) -> pd.DataFrame:
     """Return the Unifrac value of PhyloBetaDiversity.
 
     This measures the unique fraction of the phylogeny that is
     unshared between a pair of communities. This metric is mostly
     sensitive to dissimilarity at the tips of a phylogeny, but not
-    among splits farther back in a tree.
+    among splits farther back in a tree. It is a distance from 0
+    (identical edges) to 1 (no shared edges), computed for all pairs
+    of sites from one sparse matrix product.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        A phylogenetic tree with the global species pool as tips.
+    matrix: DataFrame, ndarray, or scipy.sparse matrix
+        Community matrix (nsites, nspecies). See `get_faith_pd`.
     """
+    arr, sites, _ = _get_community_matrix(tree, matrix)
+    pdiv, shared = _CommunityEngine(tree).get_shared_lengths(arr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        union = pdiv[:, None] + pdiv[None, :] - shared
+        values = 1 - shared / union
+    return pd.DataFrame(values, index=sites, columns=sites)
+
+
+_FUNCTION_METRICS = {
+    get_faith_pd: "pd",
+    get_mean_pairwise_distance: "mpd",
+    get_mean_nearest_neighbor_distance: "mntd",
+    get_species_richness: "richness",
+}
@@ -47,6 +47,21 @@ from numpy.typing import ArrayLike
 import toytree
 from toytree.core import ToyTree
 from toytree.pcm import get_vcv_matrix_from_tree
+from toytree.pcm.src.phylocom.metrics import (
+    _get_null_model,
+    get_faith_pd,
+    get_mean_nearest_neighbor_distance,
+    get_mean_pairwise_distance,
+    get_species_richness,
+)
+from toytree.utils.src.exceptions import ToytreeError
+
+_METRIC_FUNCTIONS = {
+    "pd": get_faith_pd,
+    "mpd": get_mean_pairwise_distance,
+    "mntd": get_mean_nearest_neighbor_distance,
+    "richness": get_species_richness,
+}
 
 
 # TODO: simulate abundances as lognormally distributed?
@@ -102,14 +117,18 @@ def simulate_community_data(
 def get_community_metric(
     tree: ToyTree,
     matrix: ArrayLike,
-    metric="pd",
-    null=None,
-) -> Union[float, np.ndarray]:
+    metric: str = "pd",
+    null: Optional[str] = None,
+    size: int = 999,
+    seed: Optional[int] = None,
+) -> Union[pd.Series, pd.DataFrame]:
     """Return a community metric given a tree and matrix.
 
     Supported metrics are also available in individual functions
     with more detailed documentation in the `toytree.pcm.phylocom`
-    subpackage. These include ...
+    subpackage. These include Faith's phylogenetic diversity ("pd"),
+    mean pairwise distance ("mpd"), mean nearest taxon distance
+    ("mntd"), and species richness ("richness").
 
     Parameters
     ----------
@@ -124,16 +143,29 @@ def get_community_metric(
         A string matching the name of a supported community metric.
         See supported metrics.
     null: None or str
-        A string matching the name of a supported null model. See
-        supported null models.
+        A string matching the name of a supported null model: one of
+        "shuffle_tips", "richness", "frequency", "sample_pool",
+        "phylo_pool", "independent_swap", or "trial_swap". If None
+        only the metric is returned for each site.
+    size: int
+        N replicate null communities, used only if null is not None.
+    seed: int or None
+        Seed for the numpy random number generator of the null model.
 
     Examples
     --------
-    >>> ...
-    >>>    metric    null_mean    null_std   effect_size    name
-    >>> 0    ...         ...          ...        ...        'MPD'
+    >>> get_community_metric(tree, matrix, metric="mpd", null="shuffle_tips")
+    >>>    metric    null_mean    null_std   effect_size   rank   pvalue
+    >>> 0    ...         ...          ...        ...        ...     ...
     """
-    return 0.5
+    if metric not in _METRIC_FUNCTIONS:
+        raise ToytreeError(
+            f"metric '{metric}' not supported, choose from {list(_METRIC_FUNCTIONS)}."
+        )
+    if null is None:
+        return _METRIC_FUNCTIONS[metric](tree, matrix)
+    model = _get_null_model(null)(tree, matrix, metric, size, seed)
+    return model.get_summary()
 
 
 if __name__ == "__main__":
@@ -14,8 +14,10 @@ _MODULE_EXPORTS = {
     ],
     "toytree.pcm.src.phylolinalg.pgls": [
         "PCMPGLSResult",
+        "PCMPGLSManyResult",
         "PCMPGLSPruningModel",
         "pgls",
+        "pgls_many",
     ],
     "toytree.pcm.src.phylolinalg.pgls_infer": [
         "infer_node_states_pgls",
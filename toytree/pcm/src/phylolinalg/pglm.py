@@ -422,14 +422,7 @@ class PCMPGLMPruningModel:
         lambda_: float,
     ) -> tuple[np.ndarray, np.ndarray]:
         """Return normal-equation matrix and RHS under weighted pruning precision."""
-        M = np.zeros((self.ncoef, self.ncoef), dtype=float)
-        rhs = np.zeros(self.ncoef, dtype=float)
-        for i in range(self.ncoef):
-            for j in range(i, self.ncoef):
-                quad, _ = self.engine.bilinear_and_logdet(xw[:, i], xw[:, j], lambda_)
-                M[i, j] = quad
-                M[j, i] = quad
-            rhs[i] = self.engine.bilinear_and_logdet(xw[:, i], zw, lambda_)[0]
+        M, rhs, _, _ = self.engine.cross_products(xw, zw, lambda_)
         return M, rhs
 
     def _firth_adjustment(self, mu: np.ndarray, W: np.ndarray) -> np.ndarray:
@@ -17,17 +17,18 @@ from __future__ import annotations
 
 import html
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
 
 import numpy as np
 import pandas as pd
 from pandas import CategoricalDtype
-from patsy import PatsyError, dmatrices
+from patsy import PatsyError, dmatrices, dmatrix
 from scipy.optimize import minimize_scalar
 from scipy.stats import norm
 
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
 from toytree.data._src.expand_node_mapping import expand_node_mapping
+from toytree.pcm.src.utils import _get_height_levels
 from toytree.utils.src.exceptions import ToytreeError
 
 if TYPE_CHECKING:
@@ -35,10 +36,15 @@ if TYPE_CHECKING:
 
 __all__ = [
     "PCMPGLSResult",
+    "PCMPGLSManyResult",
     "PCMPGLSPruningModel",
     "pgls",
+    "pgls_many",
 ]
 
+# max number of (node x response) values held in pruning messages at once.
+_MAX_BLOCK_ITEMS = 2**22
+
 
 @dataclass
 class PCMPGLSResult:
@@ -180,6 +186,58 @@ class PCMPGLSResult:
         )
 
 
+@dataclass
+class PCMPGLSManyResult:
+    """Container for pruning-based PGLS fits of many responses.
+
+    Each row of the coefficient tables is one response fit against a
+    shared design matrix. The profile log-likelihood of every response
+    at each value of the shared lambda grid is stored in
+    ``lambda_profile``.
+    """
+
+    params: pd.DataFrame
+    bse: pd.DataFrame
+    log_likelihood: pd.Series
+    sigma2: pd.Series
+    lambda_: pd.Series
+    lambda_optimized: bool
+    lambda_grid: np.ndarray
+    lambda_profile: pd.DataFrame
+    nobs: int
+    design_columns: list[str]
+
+    @property
+    def pvalues(self) -> pd.DataFrame:
+        """Return two-sided normal p-values of the coefficients."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zvals = self.params / self.bse.where(self.bse != 0)
+        return pd.DataFrame(
+            2.0 * norm.sf(np.abs(zvals.to_numpy())),
+            index=self.params.index,
+            columns=self.params.columns,
+        )
+
+    def __repr__(self) -> str:
+        """Return a compact text summary."""
+        lam = self.lambda_.to_numpy(dtype=float)
+        lines = ["PCMPGLSManyResult", "-" * 10]
+        lines.append(
+            f"nresponses={self.params.shape[0]}  nobs={self.nobs}  "
+            f"k_params={len(self.design_columns)}"
+        )
+        lines.append(
+            f"lambda_optimized={self.lambda_optimized}  "
+            f"ngrid={len(self.lambda_grid)}  "
+            f"lambda_range=({PCMPGLSResult._fmt(np.nanmin(lam))}, "
+            f"{PCMPGLSResult._fmt(np.nanmax(lam))})"
+        )
+        lines.append("")
+        lines.append("Coefficients")
+        lines.append(self.params.to_string(max_rows=10))
+        return "\n".join(lines)
+
+
 @dataclass
 class _ProfileStats:
     """Internal profiled-Gaussian statistics at a fixed lambda."""
@@ -352,6 +410,17 @@ def _validate_stderr_to_variance(y_stderr: pd.Series) -> np.ndarray:
     return arr**2
 
 
+def _get_work_tree(tree: ToyTree, epsilon: float) -> ToyTree:
+    """Return a copy of the tree rescaled to root height 1 with clamped edges."""
+    # Rescale and clamp the working tree before building pruning recursions.
+    work_tree = tree.mod.edges_scale_to_root_height(1.0)
+    for node in work_tree:
+        if node._dist <= 0:
+            node._dist = float(epsilon)
+    work_tree._update()
+    return work_tree
+
+
 def _prepare_pgls_inputs(
     tree: ToyTree,
     formula: str,
@@ -363,13 +432,7 @@ def _prepare_pgls_inputs(
     if not isinstance(formula, str) or not formula.strip():
         raise ToytreeError("formula must be a non-empty str")
 
-    # Rescale and clamp the working tree before building pruning recursions.
-    work_tree = tree.mod.edges_scale_to_root_height(1.0)
-    for node in work_tree:
-        if node._dist <= 0:
-            node._dist = float(epsilon)
-    work_tree._update()
-
+    work_tree = _get_work_tree(tree, epsilon)
     tip_data = _coerce_tip_dataframe(work_tree, data)
     ymat, xmat = _build_design(formula, tip_data)
     _check_response_is_continuous(formula, tip_data, ymat)
@@ -407,6 +470,84 @@ def _prepare_pgls_inputs(
     return fit_tree, ymat, xmat, y_obs_var
 
 
+def _prepare_pgls_many_inputs(
+    tree: ToyTree,
+    data: pd.DataFrame | None,
+    responses: Sequence[str],
+    predictors: str,
+    epsilon: float,
+) -> tuple[ToyTree, pd.DataFrame, pd.DataFrame]:
+    """Prepare aligned fit-tree, response matrix, and shared design matrix."""
+    if isinstance(responses, str) or not len(responses):
+        raise ToytreeError("responses must be a non-empty sequence of column names")
+    responses = list(responses)
+    if len(set(responses)) != len(responses):
+        raise ToytreeError("responses must be unique column names")
+    if not isinstance(predictors, str) or not predictors.strip():
+        raise ToytreeError("predictors must be a non-empty str")
+
+    work_tree = _get_work_tree(tree, epsilon)
+    tip_data = _coerce_tip_dataframe(work_tree, data)
+    missing = [i for i in responses if i not in tip_data.columns]
+    if missing:
+        raise ToytreeError(f"response columns not found in data: {missing}")
+
+    # the design is shared by all responses, so rows are dropped only for
+    # missing predictor values.
+    rhs = predictors.strip().lstrip("~")
+    try:
+        xmat = dmatrix(rhs, data=tip_data, return_type="dataframe")
+    except PatsyError as exc:
+        raise ToytreeError(f"Invalid predictors or data for pgls_many: {exc}") from exc
+    if xmat.shape[0] < 2:
+        raise ToytreeError("At least two observed tips are required for pgls_many.")
+
+    ymat = tip_data.loc[xmat.index, responses]
+    for name, col in ymat.items():
+        if not pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col):
+            raise ToytreeError(
+                f"pgls_many response {name!r} is not continuous; consider "
+                "phylogenetic logistic regression."
+            )
+    ymat = ymat.astype(float)
+    if not np.all(np.isfinite(ymat.to_numpy())):
+        raise ToytreeError(
+            "responses must be finite on all tips with observed predictors; "
+            "fit responses with missing values separately using pgls."
+        )
+
+    kept_tips = set(xmat.index)
+    dropped = [lab for lab in work_tree.get_tip_labels() if lab not in kept_tips]
+    fit_tree = work_tree if not dropped else work_tree.mod.drop_tips(*dropped)
+    ymat = ymat.loc[fit_tree.get_tip_labels()]
+    xmat = xmat.loc[fit_tree.get_tip_labels()]
+    return fit_tree, ymat, xmat
+
+
+def _get_lambda_grid(
+    upper: float,
+    lambda_: float | None,
+    lambda_grid: int | Sequence[float],
+) -> np.ndarray:
+    """Return validated lambda values to evaluate in pgls_many."""
+    if lambda_ is not None:
+        lambda_grid = [lambda_]
+    elif isinstance(lambda_grid, (int, np.integer)):
+        if lambda_grid < 1:
+            raise ToytreeError("lambda_grid must be an int >= 1 or a sequence.")
+        # match the open bounds used when optimizing lambda in pgls.
+        eps = 1e-12
+        return np.linspace(eps, upper - eps, int(lambda_grid))
+    grid = np.asarray(lambda_grid, dtype=float).ravel()
+    if not grid.size or not np.all(np.isfinite(grid)):
+        raise ToytreeError("lambda values must be finite floats.")
+    if np.any(grid < 0) or np.any(grid > upper):
+        raise ToytreeError(
+            f"lambda values must be between 0 and max_lambda(tree)={upper:.6g}."
+        )
+    return grid
+
+
 class PhyloPruningEngine:
     """Pruning-based linear algebra engine for Gaussian phylogenetic models.
 
@@ -431,7 +572,9 @@ class PhyloPruningEngine:
         self.tip_root_dists = np.zeros(self.ntips, dtype=float)
         self.postorder = []
         self.children = [[] for _ in range(self.nnodes)]
+        self.levels: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
         self._build_topology_arrays()
+        self._build_level_arrays()
 
     def _build_topology_arrays(self) -> None:
         """Cache traversal and edge arrays used in pruning recursions."""
@@ -454,12 +597,37 @@ class PhyloPruningEngine:
 
         self.postorder = [node.idx for node in self.tree.traverse("postorder")]
 
+    def _build_level_arrays(self) -> None:
+        """Cache (parents, children, offsets) arrays grouped by node height.
+
+        See `_get_height_levels`.
+        """
+        self.levels = _get_height_levels(self.tree)
+
     def _leaf_nugget(self, lambda_: float) -> np.ndarray:
         """Return tip-specific residual variances induced by Pagel's lambda."""
         # Lambda scales shared covariance. The diagonal is preserved by adding a
         # tip-specific independent variance term (the "nugget").
         return (1.0 - float(lambda_)) * self.tip_root_dists
 
+    def _leaf_variance(
+        self,
+        lambda_: float,
+        obs_var: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Return the lambda nugget plus any observation variance at tips."""
+        leaf_nugget = self._leaf_nugget(lambda_)
+        if obs_var is not None:
+            obs_var = np.asarray(obs_var, dtype=float)
+            if obs_var.shape != (self.ntips,):
+                raise ToytreeError("obs_var must have length ntips.")
+            if np.any(~np.isfinite(obs_var)) or np.any(obs_var < 0):
+                raise ToytreeError("obs_var must be finite and non-negative.")
+            # Response measurement-error variance contributes only to tip
+            # diagonals, so it enters the recursion as an added leaf nugget.
+            leaf_nugget = leaf_nugget + obs_var
+        return leaf_nugget
+
     def bilinear_and_logdet(
         self,
         a: np.ndarray,
@@ -479,16 +647,7 @@ class PhyloPruningEngine:
         logdet = 0.0
         quad = 0.0
         lam = float(lambda_)
-        leaf_nugget = self._leaf_nugget(lam)
-        if obs_var is not None:
-            obs_var = np.asarray(obs_var, dtype=float)
-            if obs_var.shape != (self.ntips,):
-                raise ToytreeError("obs_var must have length ntips.")
-            if np.any(~np.isfinite(obs_var)) or np.any(obs_var < 0):
-                raise ToytreeError("obs_var must be finite and non-negative.")
-            # Response measurement-error variance contributes only to tip
-            # diagonals, so it enters the recursion as an added leaf nugget.
-            leaf_nugget = leaf_nugget + obs_var
+        leaf_nugget = self._leaf_variance(lam, obs_var)
 
         for idx in self.postorder:
             child_idxs = self.children[idx]
@@ -553,6 +712,251 @@ class PhyloPruningEngine:
             raise np.linalg.LinAlgError("Non-finite pruning result.")
         return float(quad), float(logdet)
 
+    def _prune_levels(
+        self,
+        X: np.ndarray,
+        lengths: np.ndarray,
+        edge_scales: np.ndarray,
+        leaf_var: np.ndarray,
+        nleft: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+        """Run a vectorized pruning recursion in information form.
+
+        This generalizes the recursion in ``bilinear_and_logdet`` to a
+        linear-Gaussian process on edges, where a child's value is its
+        parent's value times ``edge_scales`` plus noise with variance
+        ``lengths`` (both indexed by child node idx), and tips have added
+        variance ``leaf_var``. The root value is fixed at zero. Each node
+        stores the precision ``P`` and precision-weighted payload ``H`` of
+        the message from its descendant tips, combining all children
+        jointly, and nodes at the same height are processed at once.
+        Working in information form keeps messages finite when an edge
+        carries no information about its parent (e.g., OU on long edges).
+
+        If ``nleft`` is given, only the first ``nleft`` rows of the
+        quadratic form are accumulated, and the diagonal of the full form
+        is appended as a last row, which keeps the cost linear in the
+        number of columns when ``X`` holds many response vectors.
+
+        Returns
+        -------
+        tuple
+            ``(P, H, Ptop, Htop, XtVinvX, logdet)`` where ``Ptop`` and
+            ``Htop`` are node messages moved to the top of their edges.
+        """
+
+        def cross(A: np.ndarray, weights: np.ndarray) -> np.ndarray:
+            """Return the weighted (partial) cross product of columns."""
+            if nleft is None:
+                return (A * weights[:, None]).T @ A
+            left = (A[:, :nleft] * weights[:, None]).T @ A
+            return np.vstack([left, np.einsum("ij,ij,i->j", A, A, weights)])
+
+        P = np.zeros(self.nnodes, dtype=float)
+        H = np.zeros((self.nnodes, X.shape[1]), dtype=float)
+        Ptop = np.zeros(self.nnodes, dtype=float)
+        Htop = np.zeros((self.nnodes, X.shape[1]), dtype=float)
+
+        # tip messages are the observed values with variance leaf + edge.
+        w = leaf_var + lengths[: self.ntips]
+        if np.any(~(w > 0)) or np.any(~np.isfinite(w)):
+            raise np.linalg.LinAlgError("Non-positive pruning variance.")
+        scale = edge_scales[: self.ntips]
+        Ptop[: self.ntips] = scale**2 / w
+        Htop[: self.ntips] = X * (scale / w)[:, None]
+        quad = cross(X, 1.0 / w)
+        logdet = float(np.log(w).sum())
+
+        for parents, children, offsets in self.levels:
+            # sum the messages of all children at their parent.
+            P[parents] = np.add.reduceat(Ptop[children], offsets)
+            H[parents] = np.add.reduceat(Htop[children], offsets, axis=0)
+
+            # move messages up the edge above each parent. The log-det and
+            # quadratic terms of a node telescope to these edge terms.
+            den = 1.0 + lengths[parents] * P[parents]
+            Ptop[parents] = edge_scales[parents] ** 2 * P[parents] / den
+            Htop[parents] = H[parents] * (edge_scales[parents] / den)[:, None]
+            mask = parents != self.root_idx
+            hp = H[parents[mask]]
+            quad -= cross(hp, lengths[parents[mask]] / den[mask])
+            logdet += float(np.log(den[mask]).sum())
+
+        if not (np.all(np.isfinite(quad)) and np.isfinite(logdet)):
+            raise np.linalg.LinAlgError("Non-finite pruning result.")
+        return P, H, Ptop, Htop, quad, logdet
+
+    def _check_edge_arrays(
+        self,
+        lengths: np.ndarray,
+        edge_scales: np.ndarray | None,
+        leaf_var: np.ndarray | None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return validated edge-length, edge-scale, and leaf-variance arrays."""
+        lengths = np.asarray(lengths, dtype=float)
+        if lengths.shape != (self.nnodes,):
+            raise ToytreeError("lengths must have length equal to nnodes.")
+        if edge_scales is None:
+            edge_scales = np.ones(self.nnodes, dtype=float)
+        edge_scales = np.asarray(edge_scales, dtype=float)
+        if edge_scales.shape != (self.nnodes,):
+            raise ToytreeError("edge_scales must have length equal to nnodes.")
+        if leaf_var is None:
+            leaf_var = np.zeros(self.ntips, dtype=float)
+        leaf_var = np.asarray(leaf_var, dtype=float)
+        if leaf_var.shape != (self.ntips,):
+            raise ToytreeError("leaf_var must have length ntips.")
+        return lengths, edge_scales, leaf_var
+
+    def three_point(
+        self,
+        X: np.ndarray,
+        lengths: np.ndarray,
+        edge_scales: np.ndarray | None = None,
+        leaf_var: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, float]:
+        """Return ``X.T @ V^-1 @ X`` and ``log|V|`` for edge-wise parameters.
+
+        ``V`` is the covariance among tips of a process that starts at a
+        fixed root value, where each child's value is its parent's value
+        times ``edge_scales`` plus independent noise with variance
+        ``lengths``, and tips have added variance ``leaf_var``. With unit
+        scales this is Brownian motion on edge lengths ``lengths`` (the
+        three-point structure of Ho and Ane 2014). Edge lengths are used
+        as given, without clamping, so that models which transform edges
+        (e.g., OU or EB) are evaluated in linear time.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Array of shape ``(ntips,)`` or ``(ntips, k)`` in tip idx order.
+        lengths : np.ndarray
+            Non-negative edge variances of shape ``(nnodes,)`` by node idx;
+            the root entry is ignored.
+        edge_scales : np.ndarray or None
+            Optional edge scalings of shape ``(nnodes,)``. Default is ones.
+        leaf_var : np.ndarray or None
+            Optional non-negative tip variances of shape ``(ntips,)``.
+        """
+        X = np.asarray(X, dtype=float)
+        X = X[:, None] if X.ndim == 1 else X
+        if X.shape[0] != self.ntips:
+            raise ToytreeError("Pruning vectors must have length equal to ntips.")
+        arrays = self._check_edge_arrays(lengths, edge_scales, leaf_var)
+        quad, logdet = self._prune_levels(X, *arrays)[-2:]
+        return quad, logdet
+
+    def cross_products(
+        self,
+        X: np.ndarray,
+        Y: np.ndarray,
+        lambda_: float,
+        obs_var: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """Return GLS cross products under Pagel's lambda in one traversal.
+
+        This is the matrix form of ``bilinear_and_logdet``: the columns of
+        ``X`` and ``Y`` are pruned together, such that the normal
+        equations of a GLS fit of every column of ``Y`` on ``X`` are
+        obtained from a single vectorized traversal. Only the diagonal
+        of ``Y.T @ V^-1 @ Y`` is computed, so the cost is linear in the
+        number of columns of ``Y``.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Design array of shape ``(ntips, k)`` in tip idx order.
+        Y : np.ndarray
+            Response array of shape ``(ntips,)`` or ``(ntips, m)``.
+        lambda_ : float
+            Pagel's lambda.
+        obs_var : np.ndarray or None
+            Optional observation variances of shape ``(ntips,)``.
+
+        Returns
+        -------
+        tuple
+            ``(X.T @ V^-1 @ X, X.T @ V^-1 @ Y, diag(Y.T @ V^-1 @ Y),
+            log|V|)``, where the ``Y`` terms have shapes ``(k,)`` and
+            ``()`` when ``Y`` is one-dimensional.
+        """
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        if X.ndim != 2 or X.shape[0] != self.ntips or Y.shape[0] != self.ntips:
+            raise ToytreeError("Pruning vectors must have length equal to ntips.")
+        lam = float(lambda_)
+        leaf_var = self._leaf_variance(lam, obs_var)
+        lengths = lam * self.dist_by_child
+        edge_scales = np.ones(self.nnodes, dtype=float)
+        k = X.shape[1]
+        Z = np.column_stack([X, Y])
+        quad, logdet = self._prune_levels(Z, lengths, edge_scales, leaf_var, k)[-2:]
+        xt_vinv_x = quad[:k, :k]
+        if Y.ndim == 1:
+            return xt_vinv_x, quad[:k, k], quad[-1, k], logdet
+        return xt_vinv_x, quad[:k, k:], quad[-1, k:], logdet
+
+    def conditional_node_states(
+        self,
+        y: np.ndarray,
+        lengths: np.ndarray,
+        edge_scales: np.ndarray | None = None,
+        leaf_var: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return node means and variances conditional on tip values.
+
+        The model is that of ``three_point`` with the root fixed at zero.
+        A postorder pass computes each node's message from its descendant
+        tips, and a preorder pass combines it with the message from the
+        rest of the tree, giving the exact Gaussian conditional mean and
+        variance of every internal node in linear time. Tips are returned
+        as observed with zero variance.
+        """
+        y = np.asarray(y, dtype=float)
+        lengths, edge_scales, leaf_var = self._check_edge_arrays(
+            lengths, edge_scales, leaf_var
+        )
+        P, H, Ptop, Htop, _, _ = self._prune_levels(
+            y[:, None], lengths, edge_scales, leaf_var
+        )
+        H = H[:, 0]
+        Htop = Htop[:, 0]
+
+        # (mean, var) of each node given all tips outside of its subtree,
+        # where the root is known exactly.
+        up_mean = np.zeros(self.nnodes, dtype=float)
+        up_var = np.zeros(self.nnodes, dtype=float)
+        for parents, children, offsets in reversed(self.levels):
+            counts = np.diff(np.append(offsets, children.size))
+            pmean = np.repeat(up_mean[parents], counts)
+            pvar = np.repeat(up_var[parents], counts)
+            known = pvar == 0
+
+            # combine the parent's message from above with the messages of
+            # the siblings of each child, then move down the child's edge.
+            with np.errstate(divide="ignore", invalid="ignore"):
+                prec = 1.0 / pvar + np.repeat(P[parents], counts) - Ptop[children]
+                hsum = pmean / pvar + np.repeat(H[parents], counts) - Htop[children]
+                emean = np.where(known, pmean, hsum / prec)
+                evar = np.where(known, 0.0, 1.0 / prec)
+            scale = edge_scales[children]
+            up_mean[children] = scale * emean
+            up_var[children] = scale**2 * evar + lengths[children]
+
+        # combine messages from above and below at each internal node.
+        mean = np.zeros(self.nnodes, dtype=float)
+        var = np.zeros(self.nnodes, dtype=float)
+        mean[: self.ntips] = y
+        ints = np.arange(self.ntips, self.nnodes)
+        uvar = up_var[ints]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prec = 1.0 / uvar + P[ints]
+            mean[ints] = np.where(
+                uvar > 0, (up_mean[ints] / uvar + H[ints]) / prec, up_mean[ints]
+            )
+            var[ints] = np.where(uvar > 0, 1.0 / prec, 0.0)
+        return mean, var
+
 
 class PCMPGLSPruningModel:
     """Gaussian PGLS fitted using pruning-based linear algebra."""
@@ -579,46 +983,27 @@ class PCMPGLSPruningModel:
 
     def _profile_stats(self, lambda_: float) -> _ProfileStats:
         """Return profiled Gaussian statistics at a fixed lambda."""
-        xt_vinv_x = np.zeros((self.ncoef, self.ncoef), dtype=float)
-        xt_vinv_y = np.zeros(self.ncoef, dtype=float)
-        logdet = None
-
-        for i in range(self.ncoef):
-            for j in range(i, self.ncoef):
-                quad, ldet = self.engine.bilinear_and_logdet(
-                    self._X[:, i],
-                    self._X[:, j],
-                    lambda_,
-                    obs_var=self._y_obs_var,
-                )
-                xt_vinv_x[i, j] = quad
-                xt_vinv_x[j, i] = quad
-                if logdet is None:
-                    logdet = ldet
-
-        for i in range(self.ncoef):
-            quad, _ = self.engine.bilinear_and_logdet(
-                self._X[:, i],
-                self._y,
-                lambda_,
-                obs_var=self._y_obs_var,
-            )
-            xt_vinv_y[i] = quad
+        xt_vinv_x, xt_vinv_y, _, logdet = self.engine.cross_products(
+            self._X,
+            self._y,
+            lambda_,
+            obs_var=self._y_obs_var,
+        )
 
         try:
             beta = np.linalg.solve(xt_vinv_x, xt_vinv_y)
         except np.linalg.LinAlgError:
             beta = np.linalg.lstsq(xt_vinv_x, xt_vinv_y, rcond=None)[0]
 
+        # the RSS is taken from the residuals rather than from the cross
+        # products to avoid cancellation when the model fits closely.
         resid = self._y - self._X.dot(beta)
-        rss, ldet2 = self.engine.bilinear_and_logdet(
-            resid,
+        rss = self.engine.cross_products(
+            self._X[:, :0],
             resid,
             lambda_,
             obs_var=self._y_obs_var,
-        )
-        if logdet is None:
-            logdet = ldet2
+        )[2]
         n = float(self.nobs)
         if rss <= 0 or not np.isfinite(rss):
             raise np.linalg.LinAlgError("Invalid residual sum of squares.")
@@ -821,6 +1206,176 @@ def pgls(
     return fit
 
 
+def _fit_pgls_many_block(
+    engine: PhyloPruningEngine,
+    X: np.ndarray,
+    Y: np.ndarray,
+    grid: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return the best-lambda fits of each column of Y on a lambda grid.
+
+    Every grid value takes one traversal for the normal equations of all
+    responses and one for their residual sums of squares. Responses with
+    no finite likelihood on the grid are returned as NaN.
+    """
+    nobs, ncoef = X.shape
+    nresp = Y.shape[1]
+    dof = max(nobs - ncoef, 1)
+    profile = np.full((nresp, grid.size), -np.inf)
+    beta = np.full((ncoef, nresp), np.nan)
+    bse = np.full((ncoef, nresp), np.nan)
+    rss = np.full(nresp, np.nan)
+    best = np.full(nresp, -1)
+    best_llf = np.full(nresp, -np.inf)
+    for gidx, lam in enumerate(grid):
+        try:
+            xt_vinv_x, xt_vinv_y, _, logdet = engine.cross_products(X, Y, lam)
+            xt_vinv_x_inv = np.linalg.pinv(xt_vinv_x)
+            gbeta = xt_vinv_x_inv @ xt_vinv_y
+            grss = engine.cross_products(X[:, :0], Y - X @ gbeta, lam)[2]
+        except np.linalg.LinAlgError:
+            continue
+        with np.errstate(divide="ignore", invalid="ignore"):
+            llf = -0.5 * (
+                nobs * (np.log(2.0 * np.pi) + 1.0 + np.log(grss / nobs)) + logdet
+            )
+        llf[~(grss > 0) | ~np.isfinite(llf)] = -np.inf
+        profile[:, gidx] = llf
+        mask = llf > best_llf
+        if not mask.any():
+            continue
+        best[mask] = gidx
+        best_llf[mask] = llf[mask]
+        beta[:, mask] = gbeta[:, mask]
+        rss[mask] = grss[mask]
+        var = np.clip(np.diag(xt_vinv_x_inv), 0, None)
+        bse[:, mask] = np.sqrt(np.outer(var, grss[mask] / dof))
+    lambdas = np.where(best >= 0, grid[best], np.nan)
+    return beta.T, bse.T, rss / dof, lambdas, profile
+
+
+@add_subpackage_method(PhyloCompAPI)
+def pgls_many(
+    tree: ToyTree,
+    data: pd.DataFrame | None,
+    responses: Sequence[str],
+    predictors: str = "1",
+    lambda_: float | None = None,
+    lambda_grid: int | Sequence[float] = 21,
+    epsilon: float = 1e-12,
+) -> PCMPGLSManyResult:
+    """Fit a PGLS model for each of many responses on shared predictors.
+
+    This is a batched version of ``pgls`` for data sets with many
+    continuous response traits (e.g., gene expression values) that are
+    each regressed on the same predictors. The response columns are
+    pruned together, such that the normal equations, residual sums of
+    squares, and log-determinant of all fits at one value of Pagel's
+    lambda are computed in two linear-time traversals of the tree.
+
+    Parameters
+    ----------
+    tree : ToyTree
+        Rooted phylogeny with branch lengths.
+    data : pandas.DataFrame or None
+        Trait table aligned to tree tips by index, as in ``pgls``. If
+        ``None``, tip data are read from the tree.
+    responses : Sequence[str]
+        Names of continuous response columns in ``data``.
+    predictors : str, default="1"
+        Right-hand side of a Patsy formula shared by all responses, e.g.
+        ``"x"`` or ``"C(group) + x"``. The default fits an intercept only.
+    lambda_ : float or None, default=None
+        A fixed Pagel's lambda for all responses. If ``None`` (default),
+        lambda is fit separately for each response over ``lambda_grid``.
+    lambda_grid : int or Sequence[float], default=21
+        Lambda values at which to evaluate the profile likelihood of every
+        response, or the number of evenly spaced values between 0 and the
+        tree-specific upper bound used by ``pgls``.
+    epsilon : float, default=1e-12
+        Positive floor used to clamp zero or negative branch lengths.
+
+    Returns
+    -------
+    PCMPGLSManyResult
+        Coefficients, standard errors, log-likelihoods, residual variances
+        and lambda estimates with one row per response, and the profile
+        log-likelihood of each response over the lambda grid.
+
+    Raises
+    ------
+    ToytreeError
+        If the predictors are invalid, data cannot be aligned to tree tips,
+        a response is missing, categorical or has missing values on tips
+        with observed predictors, or lambda values are invalid.
+
+    Notes
+    -----
+    The tree is rescaled to root height 1.0 as in ``pgls``, and tips with
+    missing predictor values are dropped for all responses. Because the
+    design is shared, responses must be observed on all remaining tips;
+    responses with other missing values can be fit with ``pgls``. Each
+    response's lambda is the grid value with the highest profile
+    likelihood, so its resolution is set by ``lambda_grid``; use ``pgls``
+    for a continuous optimum of a single response. Responses without a
+    finite likelihood on the grid (e.g., constant values) are NaN.
+
+    See Also
+    --------
+    pgls
+        Fit a single response with a Patsy formula and optimized lambda.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(ntips=20, seed=123)
+    >>> dat = tree.pcm.simulate_multivariate_continuous_trait(
+    ...     model="bm", params=np.eye(3), tips_only=True, seed=123
+    ... )
+    >>> fit = tree.pcm.pgls_many(dat, responses=["X2", "X3"], predictors="X1")
+    >>> fit.params.columns.tolist()
+    ['Intercept', 'X1']
+    """
+    fit_tree, ymat, xmat = _prepare_pgls_many_inputs(
+        tree=tree,
+        data=data,
+        responses=responses,
+        predictors=predictors,
+        epsilon=epsilon,
+    )
+    upper = float(_max_lambda(fit_tree))
+    if not np.isfinite(upper) or upper <= 0:
+        raise ToytreeError("Could not determine a valid upper bound for lambda.")
+    grid = _get_lambda_grid(upper, lambda_, lambda_grid)
+
+    # responses are fit in column blocks to bound the size of messages.
+    engine = PhyloPruningEngine(fit_tree, epsilon=epsilon)
+    X = xmat.to_numpy(dtype=float)
+    Y = ymat.to_numpy(dtype=float)
+    bsize = max(1, _MAX_BLOCK_ITEMS // engine.nnodes - X.shape[1])
+    blocks = [
+        _fit_pgls_many_block(engine, X, Y[:, i : i + bsize], grid)
+        for i in range(0, Y.shape[1], bsize)
+    ]
+    beta, bse, sigma2, lambdas, profile = (np.concatenate(i) for i in zip(*blocks))
+    llf = profile.max(axis=1)
+    llf[~np.isfinite(llf)] = np.nan
+
+    index = pd.Index(ymat.columns, name="response")
+    columns = list(xmat.columns)
+    return PCMPGLSManyResult(
+        params=pd.DataFrame(beta, index=index, columns=columns),
+        bse=pd.DataFrame(bse, index=index, columns=columns),
+        log_likelihood=pd.Series(llf, index=index, name="log_likelihood"),
+        sigma2=pd.Series(sigma2, index=index, name="sigma2"),
+        lambda_=pd.Series(lambdas, index=index, name="lambda"),
+        lambda_optimized=lambda_ is None,
+        lambda_grid=grid,
+        lambda_profile=pd.DataFrame(profile, index=index, columns=grid),
+        nobs=int(X.shape[0]),
+        design_columns=columns,
+    )
+
+
 def _example(
     sigma2: float = 0.5,
     lambda_: float = 0.75,
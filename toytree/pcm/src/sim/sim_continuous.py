@@ -22,6 +22,7 @@ from toytree.pcm.src.sim._continuous_sim_shared import (
     _coerce_regime_labels,
     _get_time_from_root,
 )
+from toytree.pcm.src.utils import _get_depth_levels
 from toytree.utils.src.exceptions import ToytreeError
 
 if TYPE_CHECKING:
@@ -38,6 +39,9 @@ SingleModelParams: TypeAlias = BMParams | OUParams | EBParams
 RegimeModelParams: TypeAlias = Mapping[str, BMParams | OUParams | EBParams]
 ModelParams: TypeAlias = SingleModelParams | RegimeModelParams
 
+# max number of node values per block of simulated replicates.
+_MAX_BLOCK_VALUES = 2**23
+
 
 class ContinuousModelType(Enum):
     """Supported univariate continuous-trait simulation models."""
@@ -151,77 +155,6 @@ def _coerce_root_state(
     return arr
 
 
-def _simulate_increment_univariate(
-    model: ContinuousModel,
-    parent_value: float,
-    branch_length: float,
-    parent_time: float,
-    child_time: float,
-    rng: np.random.Generator,
-) -> float:
-    """Sample child value on a branch for one trait."""
-    t = float(branch_length)
-    if t <= 0:
-        return float(parent_value)
-    if model.mtype == ContinuousModelType.BM:
-        mean = float(parent_value)
-        var = model.sigma2 * t
-    elif model.mtype == ContinuousModelType.OU:
-        e = np.exp(-model.alpha * t)
-        mean = model.optimum + (float(parent_value) - model.optimum) * e
-        if model.alpha == 0.0:
-            var = model.sigma2 * t
-        else:
-            var = (
-                model.sigma2
-                * (1.0 - np.exp(-2.0 * model.alpha * t))
-                / (2.0 * model.alpha)
-            )
-    else:
-        mean = float(parent_value)
-        if model.r == 0.0:
-            var = model.sigma2 * t
-        else:
-            var = (
-                model.sigma2
-                * (np.exp(model.r * child_time) - np.exp(model.r * parent_time))
-                / model.r
-            )
-    var = max(float(var), 0.0)
-    std = float(np.sqrt(var))
-    return float(rng.normal(loc=mean, scale=std))
-
-
-def _simulate_increment_univariate_params(
-    mtype: ContinuousModelType,
-    sigma2: float,
-    alpha: float,
-    r: float,
-    optimum: float,
-    parent_value: float,
-    branch_length: float,
-    parent_time: float,
-    child_time: float,
-    rng: np.random.Generator,
-) -> float:
-    """Sample child value on a branch for one trait from scalar params."""
-    model = ContinuousModel(
-        mtype=mtype,
-        sigma2=sigma2,
-        alpha=alpha,
-        r=r,
-        optimum=optimum,
-    )
-    return _simulate_increment_univariate(
-        model=model,
-        parent_value=parent_value,
-        branch_length=branch_length,
-        parent_time=parent_time,
-        child_time=child_time,
-        rng=rng,
-    )
-
-
 def _coerce_scalar_root_state(root_state: float | None) -> float:
     """Return a scalar root state for univariate simulations."""
     if root_state is None:
@@ -396,7 +329,9 @@ def _simulate_continuous_single_trait(
     tips_only: bool,
     inplace: bool,
     seed: int | np.random.Generator | None,
-) -> pd.Series:
+    nreplicates: int | None = None,
+    block_size: int | None = None,
+) -> pd.Series | pd.DataFrame:
     """Simulate one continuous trait and optionally write it to the tree."""
     simulator = ContinuousTraitRegimeSimulator(
         tree=tree,
@@ -408,6 +343,9 @@ def _simulate_continuous_single_trait(
         root_state=np.asarray([float(root_state)], dtype=float),
         seed=seed,
     )
+    if nreplicates is not None:
+        arr = simulator.run(nreplicates, tips_only, block_size)[:, 0, :]
+        return pd.DataFrame(arr, index=range(arr.shape[0]))
     arr = simulator.run(nreplicates=1)[:, 0, 0]
     series = pd.Series(arr, index=range(tree.nnodes), name=name, dtype=float)
     if tips_only:
@@ -418,9 +356,65 @@ def _simulate_continuous_single_trait(
     return series
 
 
+def _get_edge_coefficients(
+    model_type: ContinuousModelType,
+    sigma2: np.ndarray,
+    alpha: np.ndarray,
+    r: np.ndarray,
+    optimum: np.ndarray,
+    dists: np.ndarray,
+    parent_times: np.ndarray,
+    child_times: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return (decay, offset, std) of the edge above each node and trait.
+
+    A child value is `parent * decay + offset + std * z` for a standard
+    normal draw `z`: a BM step, the exact OU transition toward the
+    optimum, or a BM step with EB variance integrated over the edge.
+    Parameter arrays have shape (nnodes, ntraits) and time arrays have
+    shape (nnodes,).
+    """
+    t = np.broadcast_to(dists[:, None], sigma2.shape)
+    decay = np.ones(sigma2.shape)
+    offset = np.zeros(sigma2.shape)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if model_type == ContinuousModelType.BM:
+            var = sigma2 * t
+        elif model_type == ContinuousModelType.OU:
+            decay = np.exp(-alpha * t)
+            offset = optimum * (1.0 - decay)
+            var = np.where(
+                alpha == 0.0,
+                sigma2 * t,
+                sigma2 * -np.expm1(-2.0 * alpha * t) / (2.0 * alpha),
+            )
+        else:
+            tp = parent_times[:, None]
+            tc = child_times[:, None]
+            var = np.where(
+                r == 0.0,
+                sigma2 * t,
+                sigma2 * (np.exp(r * tc) - np.exp(r * tp)) / r,
+            )
+
+    # edges of zero length copy the parent value.
+    zero = t <= 0
+    decay = np.where(zero, 1.0, decay)
+    offset = np.where(zero, 0.0, offset)
+    std = np.where(zero, 0.0, np.sqrt(np.maximum(var, 0.0)))
+    return decay, offset, std
+
+
 @dataclass
 class ContinuousTraitRegimeSimulator:
-    """Simulator for independent continuous traits with per-edge regimes."""
+    """Simulator for independent continuous traits with per-edge regimes.
+
+    Values are simulated for all traits and replicates at once, one
+    group of nodes at the same depth below the root at a time. Normal
+    draws are taken in replicate-major order, such that replicates can
+    be simulated in blocks to bound memory use without changing the
+    values simulated for a given seed.
+    """
 
     tree: ToyTree
     model_type: ContinuousModelType
@@ -435,38 +429,60 @@ class ContinuousTraitRegimeSimulator:
         self.rng = np.random.default_rng(self.seed)
         self.times = _get_time_from_root(self.tree)
         self.ntraits = int(self.root_state.size)
+        self.parents = self.tree._get_parent_idxs()
+
+        # coefficients use the parameter row of each child node, which
+        # is how regime-painted branches are represented internally.
+        dists = self.tree.get_node_data("dist").to_numpy(dtype=float)
+        dists[-1] = 0.0
+        self.decay, self.offset, self.std = _get_edge_coefficients(
+            self.model_type,
+            self.sigma2_by_node,
+            self.alpha_by_node,
+            self.r_by_node,
+            self.optimum_by_node,
+            dists,
+            self.times[self.parents.clip(min=0)],
+            self.times,
+        )
 
-    def _run_once(self) -> np.ndarray:
-        arr = np.zeros((self.tree.nnodes, self.ntraits), dtype=float)
-        ridx = self.tree.treenode.idx
-        arr[ridx, :] = self.root_state
-        for node in self.tree[::-1][1:]:
-            nidx = node.idx
-            pidx = node.up.idx
-            t = float(node.dist)
-            tp = float(self.times[pidx])
-            tc = float(self.times[nidx])
-            for tidx in range(self.ntraits):
-                # Use the parameter row for this child node, which is how
-                # regime-painted branches are represented internally.
-                arr[nidx, tidx] = _simulate_increment_univariate_params(
-                    mtype=self.model_type,
-                    sigma2=float(self.sigma2_by_node[nidx, tidx]),
-                    alpha=float(self.alpha_by_node[nidx, tidx]),
-                    r=float(self.r_by_node[nidx, tidx]),
-                    optimum=float(self.optimum_by_node[nidx, tidx]),
-                    parent_value=float(arr[pidx, tidx]),
-                    branch_length=t,
-                    parent_time=tp,
-                    child_time=tc,
-                    rng=self.rng,
-                )
+        # groups of non-root nodes at each depth, from the root down.
+        self.levels = _get_depth_levels(self.tree)
+
+    def _run_block(self, nreplicates: int) -> np.ndarray:
+        """Return (nnodes, ntraits, nreplicates) simulated values."""
+        arr = np.empty((self.tree.nnodes, self.ntraits, nreplicates))
+        arr[-1] = self.root_state[:, None]
+        shape = (nreplicates, self.tree.nnodes - 1, self.ntraits)
+        draws = np.moveaxis(self.rng.standard_normal(shape), 0, -1)
+        for nidxs in self.levels:
+            values = draws[nidxs] * self.std[nidxs, :, None]
+            values += self.offset[nidxs, :, None]
+            values += arr[self.parents[nidxs]] * self.decay[nidxs, :, None]
+            arr[nidxs] = values
         return arr
 
-    def run(self, nreplicates: int) -> np.ndarray:
-        out = np.zeros((self.tree.nnodes, self.ntraits, nreplicates), dtype=float)
-        for ridx in range(nreplicates):
-            out[:, :, ridx] = self._run_once()
+    def run(
+        self,
+        nreplicates: int,
+        tips_only: bool = False,
+        block_size: int | None = None,
+    ) -> np.ndarray:
+        """Return (nnodes, ntraits, nreplicates) simulated values.
+
+        Replicates are simulated in blocks of `block_size`, or of a
+        size that bounds memory use if None. If tips_only is True only
+        tip rows are returned, and internal node values are only held
+        in memory for one block at a time.
+        """
+        nrows = self.tree.ntips if tips_only else self.tree.nnodes
+        out = np.empty((nrows, self.ntraits, nreplicates), dtype=float)
+        if block_size is None:
+            block_size = _MAX_BLOCK_VALUES // (self.tree.nnodes * self.ntraits)
+        block = max(1, int(block_size))
+        for start in range(0, nreplicates, block):
+            end = min(start + block, nreplicates)
+            out[:, :, start:end] = self._run_block(end - start)[:nrows]
         return out
 
 
@@ -482,7 +498,9 @@ def simulate_continuous_trait(
     regime: str | pd.Series | None = None,
     inplace: bool = False,
     seed: int | np.random.Generator | None = None,
-) -> pd.Series:
+    nreplicates: int | None = None,
+    block_size: int | None = None,
+) -> pd.Series | pd.DataFrame:
     # fmt: on
     """Simulate one continuous trait under BM, OU, or EB models.
 
@@ -534,18 +552,31 @@ def simulate_continuous_trait(
         return the simulated Series.
     seed : int | numpy.random.Generator | None, default=None
         Seed or random-number generator.
+    nreplicates : int | None, default=None
+        If None a single realization is returned as a Series. If an int,
+        this many independent realizations are simulated at once, with the
+        coefficients of each edge computed once, and returned as the
+        columns of a DataFrame.
+    block_size : int | None, default=None
+        Max number of replicates simulated at once. If None, a size that
+        bounds memory use is chosen. Simulated values for a given seed do
+        not depend on the block size.
 
     Returns
     -------
-    pandas.Series
+    pandas.Series | pandas.DataFrame
         Simulated trait values indexed by node idx (or by tip idx rows only if
-        ``tips_only=True``).
+        ``tips_only=True``). If ``nreplicates`` is an int, a DataFrame of
+        shape (nnodes, nreplicates), or (ntips, nreplicates) if
+        ``tips_only=True``.
 
     Raises
     ------
     ToytreeError
         If ``model`` is invalid, if ``params`` values are incompatible with the
-        selected model, or if regime-specific parameters fail validation.
+        selected model, if regime-specific parameters fail validation, or if
+        ``nreplicates`` or ``block_size`` is not an int >= 1 or
+        ``nreplicates`` is used with ``inplace``.
 
     Examples
     --------
@@ -558,8 +589,19 @@ def simulate_continuous_trait(
     ...     "bm", params={"fast": 2.0, "slow": 0.5}, regime="reg", seed=3
     ... )
     >>> x2 = tre.pcm.simulate_continuous_trait("eb", params=(1.0, -0.5), inplace=True)
+    >>> reps = tre.pcm.simulate_continuous_trait("bm", nreplicates=1000, seed=4)
+    >>> reps.shape
+    (59, 1000)
     """
     mkey = str(model).lower()
+    if nreplicates is not None:
+        if int(nreplicates) != nreplicates or nreplicates < 1:
+            raise ToytreeError("nreplicates must be an int >= 1 or None.")
+        if inplace:
+            raise ToytreeError("inplace=True cannot be used with nreplicates.")
+        nreplicates = int(nreplicates)
+    if block_size is not None and (int(block_size) != block_size or block_size < 1):
+        raise ToytreeError("block_size must be an int >= 1 or None.")
     root = _coerce_scalar_root_state(root_state)
     name = str(name)
     if not name.strip():
@@ -601,4 +643,6 @@ def simulate_continuous_trait(
         tips_only=tips_only,
         inplace=inplace,
         seed=seed,
+        nreplicates=nreplicates,
+        block_size=block_size,
     )
@@ -25,6 +25,7 @@ import pandas as pd
 import scipy.linalg
 
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
+from toytree.pcm.src.utils import _get_depth_levels
 from toytree.utils.src.exceptions import ToytreeError
 
 if TYPE_CHECKING:
@@ -255,6 +256,26 @@ class MarkovModel:
         """
         return scipy.linalg.expm(self.qmatrix * time)
 
+    def get_transition_probability_matrices(self, times: Sequence[float]) -> np.ndarray:
+        """Return a stack of transition probability matrices for many times.
+
+        This returns the same values as calling
+        `get_transition_probability_matrix` for each time, but computes
+        them all from a single eigendecomposition of Q.
+
+        Parameters
+        ----------
+        times: Sequence[float]
+            Lengths of time over which state transitions can occur.
+
+        Examples
+        --------
+        >>> mod = MarkovModel(nstates=3, model="ER")
+        >>> mod.get_transition_probability_matrices([0.1, 1.0]).shape
+        (2, 3, 3)
+        """
+        return _get_transition_matrices(self.qmatrix, times, self.state_frequencies)
+
     # def _repr_html_(self):
     #     """Return a html representation of the Markov model.
     #     TODO: return multiple tables?
@@ -266,6 +287,65 @@ class MarkovModel:
         # Debug repr expansion omitted for readability.
 
 
+# max number of node states sampled per chunk of simulated nodes.
+_MAX_SAMPLE_VALUES = 2**20
+
+# max condition number of the eigenvectors of Q before falling back to expm.
+_MAX_EIGVEC_COND = 1e8
+
+
+def _get_transition_matrices(
+    qmatrix: np.ndarray,
+    times: Sequence[float],
+    freqs: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Return P(t) = expm(Q * t) stacked for an array of times.
+
+    Q is eigendecomposed once, such that every P(t) is built by a single
+    batched product `V @ diag(exp(lambda * t)) @ V^-1`. If Q satisfies
+    detailed balance with positive `freqs` the symmetrized matrix is
+    decomposed with `eigh`, which is exact and stable. Otherwise a
+    general eigendecomposition is used, unless Q is defective or its
+    eigenvectors are ill-conditioned, in which case P(t) is computed
+    by `scipy.linalg.expm` on the stack of matrices.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape `times.shape + (nstates, nstates)`.
+    """
+    qmatrix = np.asarray(qmatrix, dtype=float)
+    times = np.asarray(times, dtype=float)
+    left = right = evals = None
+
+    # reversible Q: D^1/2 Q D^-1/2 is symmetric for D = diag(freqs).
+    if freqs is not None:
+        freqs = np.asarray(freqs, dtype=float)
+        flux = freqs[:, None] * qmatrix
+        if np.all(freqs > 0) and np.allclose(flux, flux.T, rtol=1e-10, atol=1e-14):
+            root = np.sqrt(freqs)
+            sym = root[:, None] * qmatrix / root[None, :]
+            evals, evecs = np.linalg.eigh(0.5 * (sym + sym.T))
+            left = evecs / root[:, None]
+            right = evecs.T * root[None, :]
+
+    if evals is None:
+        evals, evecs = np.linalg.eig(qmatrix)
+        if np.linalg.cond(evecs) < _MAX_EIGVEC_COND:
+            left = evecs
+            right = np.linalg.inv(evecs)
+        else:
+            nstates = qmatrix.shape[0]
+            stack = scipy.linalg.expm(qmatrix[None] * times.reshape(-1, 1, 1))
+            return stack.reshape(times.shape + (nstates, nstates))
+
+    probs = (left * np.exp(times[..., None] * evals)[..., None, :]) @ right
+    if np.iscomplexobj(probs):
+        probs = probs.real
+    # remove round-off below zero so probabilities can be logged safely.
+    return np.clip(probs, 0.0, None)
+
+
 @dataclass
 class DiscreteMarkovSimulator:
     """Simulate a discrete trait on a tree given a Q-matrix.
@@ -294,31 +374,66 @@ class DiscreteMarkovSimulator:
             else np.random.default_rng(self.seed)
         )
 
-    def _edge_sim(self, state: int, time: float) -> int:
-        """Return the state at end of this time given starting state."""
-        prob = scipy.linalg.expm(self.model.qmatrix * time)
-        return self.rng.multinomial(1, prob[state]).argmax()
+    def _get_cumulative_probs(self) -> np.ndarray:
+        """Return the (nnodes, nstates, nstates) cumulative P(t) of each edge.
 
-    def _traversal_sim(self) -> np.ndarray:
-        """Traverse tree from root to tips simulating trait."""
-        arr = np.zeros(self.tree.nnodes, dtype=np.int64)
+        Transition matrices of all edges are computed at once from one
+        eigendecomposition of Q (see `_get_transition_matrices`).
+        """
+        dists = self.tree.get_node_data("dist").to_numpy(dtype=float)
+        dists[-1] = 0.0
+        probs = _get_transition_matrices(
+            self.model.qmatrix, dists, self.model.state_frequencies
+        )
+        cdfs = np.cumsum(probs, axis=-1)
+        cdfs[..., -1] = 1.0
+        return cdfs
+
+    def _traversal_sim(self, nreplicates: int) -> np.ndarray:
+        """Traverse tree from root to tips simulating all replicates.
+
+        Child states are sampled by inverse-CDF from the row of the
+        cached P(t) of their edge given the parent state, for every
+        node at the same depth and every replicate at once.
+        """
+        nstates = self.model.nstates
+        arr = np.zeros((self.tree.nnodes, nreplicates), dtype=np.int64)
 
-        # sample a random root state
+        # sample random root states
         if self.root_state is None:
-            arr[-1] = self.rng.multinomial(1, self.model.state_frequencies).argmax()
+            cdf = np.cumsum(self.model.state_frequencies)
+            arr[-1] = np.searchsorted(cdf, self.rng.random(nreplicates), "right")
+            arr[-1] = np.minimum(arr[-1], nstates - 1)
         else:
             arr[-1] = self.root_state
 
-        # traverse down tree simulating traits
-        for node in self.tree[::-1][1:]:
-            parent_state = arr[node.up._idx]
-            state = self._edge_sim(parent_state, node._dist)
-            arr[node._idx] = state
+        # columns of the CDFs as flat arrays indexed by (node, state) rows
+        cdfs = self._get_cumulative_probs().reshape(-1, nstates)
+        columns = [np.ascontiguousarray(cdfs[:, i]) for i in range(nstates - 1)]
+
+        # traverse down tree simulating traits in chunks of nodes
+        parents = self.tree._get_parent_idxs()
+        chunk = max(1, _MAX_SAMPLE_VALUES // nreplicates)
+        for level in _get_depth_levels(self.tree):
+            for start in range(0, level.size, chunk):
+                nidxs = level[start : start + chunk]
+                rows = nidxs[:, None] * nstates + arr[parents[nidxs]]
+                draws = self.rng.random((nidxs.size, nreplicates))
+                states = np.zeros(draws.shape, dtype=np.int64)
+                for column in columns:
+                    states += column[rows] <= draws
+                arr[nidxs] = states
         return arr
 
-    def run(self) -> np.ndarray:
-        """Return one simulated realization indexed by node idx."""
-        return self._traversal_sim()
+    def run(self, nreplicates: Optional[int] = None) -> np.ndarray:
+        """Return simulated states indexed by node idx.
+
+        Returns a (nnodes,) array for one realization if nreplicates
+        is None, else a (nnodes, nreplicates) array.
+        """
+        if nreplicates is None:
+            return self._traversal_sim(1)[:, 0]
+        return self._traversal_sim(int(nreplicates))
 
 
 def _coerce_trait_name(name: str) -> str:
@@ -434,7 +549,8 @@ def simulate_discrete_trait(
     state_names: Sequence[Any] | None = None,
     seed: int | np.random.Generator | None = None,
     inplace: bool = False,
-) -> pd.Series:
+    nreplicates: Optional[int] = None,
+) -> pd.Series | pd.DataFrame:
     """Return trait values simulated under a discrete Markov model.
 
     The number of states and model type can be entered without any
@@ -486,17 +602,24 @@ def simulate_discrete_trait(
     inplace: bool
         If True, simulated trait data are also written to the input tree as
         node features. The simulated Series is still returned.
+    nreplicates: int | None
+        If None a single realization is returned as a Series. If an int,
+        this many independent realizations are simulated at once, with
+        the transition probability matrix of each edge computed once, and
+        returned as the columns of a DataFrame.
 
     Returns
     -------
-    pandas.Series
+    pandas.Series | pandas.DataFrame
         Simulated trait values indexed by node idx, or by tip idx rows only if
-        ``tips_only=True``.
+        ``tips_only=True``. If ``nreplicates`` is an int, a DataFrame of shape
+        (nnodes, nreplicates), or (ntips, nreplicates) if ``tips_only=True``.
 
     Raises
     ------
     ToytreeError
-        If ``name`` is blank or if ``state_names`` does not match ``nstates``.
+        If ``name`` is blank, if ``state_names`` does not match ``nstates``,
+        or if ``nreplicates`` is not an int >= 1 or is used with ``inplace``.
 
     Examples
     --------
@@ -512,8 +635,16 @@ def simulate_discrete_trait(
     ...     state_names=["A", "B", "C"],
     ...     tips_only=True,
     ... )
+    >>> reps = toytree.pcm.simulate_discrete_trait(tree, 3, "ER", nreplicates=1000)
+    >>> reps.shape
+    (19, 1000)
     """
     name = _coerce_trait_name(name)
+    if nreplicates is not None:
+        if int(nreplicates) != nreplicates or nreplicates < 1:
+            raise ToytreeError("nreplicates must be an int >= 1 or None.")
+        if inplace:
+            raise ToytreeError("inplace=True cannot be used with nreplicates.")
     labels = _coerce_state_names(state_names, nstates)
     model = MarkovModel(
         mtype=str(model).upper(),
@@ -530,6 +661,14 @@ def simulate_discrete_trait(
         seed=seed,
     )
 
+    if nreplicates is not None:
+        states = simulator.run(int(nreplicates))
+        if tips_only:
+            states = states[: tree.ntips]
+        values = np.empty(nstates, dtype=object)
+        values[:] = labels
+        return pd.DataFrame(values[states], index=range(states.shape[0]))
+
     traits = pd.Series(
         simulator.run(), index=range(tree.nnodes), name=name, dtype=object
     )
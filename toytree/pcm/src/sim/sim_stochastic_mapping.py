@@ -8,30 +8,39 @@ default branch-history sampler uses uniformization, which is typically much
 faster than endpoint-conditioned rejection sampling while producing equivalent
 CTMC-conditioned mappings.
 
+Uniformization tables and the transition matrices of all edges are
+computed once per fitted model, and replicate maps are sampled in
+vectorized blocks, optionally across worker processes. Maps are stored
+compactly as node states and branch jumps, from which summary tables
+and (replicate x edge x state) summary arrays are built on request.
+
 A legacy rejection engine is retained for validation and fallback on rare
 numerical corner cases.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 from typing import Literal, Optional, Union
 
 import numpy as np
 import pandas as pd
-from scipy.linalg import expm
 from scipy.special import gammaln
 
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
 from toytree.data._src.expand_node_mapping import expand_node_mapping
+from toytree.pcm.src.sim.sim_discrete import _get_transition_matrices
 from toytree.pcm.src.traits.fit_discrete_ctmc import (
     DiscreteMarkovModelFit,
     PCMDiscreteCTMCFitResult,
 )
 from toytree.utils.src.exceptions import ToytreeError
+from toytree.utils.src.parallel import get_workers, map_chunks
 
 __all__ = ["PCMStochasticMapResult", "simulate_stochastic_map"]
 
+# max number of (replicate, edge) branch histories sampled per block.
+_MAX_BLOCK_ITEMS = 2**18
+
 
 def _coerce_series_to_all_nodes(tree, data: Union[str, pd.Series]) -> pd.Series:
     """Return a Series of length nnodes ordered by node idx."""
@@ -224,7 +233,11 @@ def _sample_branch_history_rejection(
     rng: np.random.Generator,
     max_attempts: int,
 ) -> list[tuple[int, float, float]]:
-    """Sample branch history by endpoint-conditioned rejection sampling."""
+    """Sample branch history by endpoint-conditioned rejection sampling.
+
+    The endpoint transition probability is checked by the caller from
+    the cached P(t) matrix of the edge.
+    """
     if length < 0:
         raise ToytreeError("edge lengths must be non-negative for stochastic mapping")
 
@@ -236,13 +249,6 @@ def _sample_branch_history_rejection(
             )
         return [(int(start_state), 0.0, 0.0)]
 
-    pij = float(expm(qmatrix * length)[int(start_state), int(end_state)])
-    if pij <= 0.0:
-        raise ToytreeError(
-            f"endpoint transition has zero probability for branch length {length}: "
-            f"{start_state} -> {end_state}"
-        )
-
     for _ in range(max_attempts):
         segs, final_state = _simulate_path_unconditioned(
             qmatrix, length, start_state, rng
@@ -273,162 +279,387 @@ def _build_uniformization_matrix(
     return rmat / row_sums
 
 
-def _poisson_logpmf(n: np.ndarray, lam: float) -> np.ndarray:
-    """Return Poisson log PMF values for integer vector n and rate lam."""
+def _poisson_logpmf(n: np.ndarray, lam: np.ndarray) -> np.ndarray:
+    """Return Poisson log PMF values for integers n (columns) and rates lam (rows)."""
     n = np.asarray(n, dtype=float)
-    if lam <= 0.0:
-        out = np.full_like(n, -np.inf, dtype=float)
-        out[n == 0] = 0.0
-        return out
-    return -lam + n * np.log(lam) - gammaln(n + 1.0)
-
-
-def _sample_jump_count_conditioned(
-    i: int,
-    j: int,
-    t: float,
-    omega: float,
-    rmat: np.ndarray,
-    rng: np.random.Generator,
-    max_terms: int,
-    tol: float,
-) -> tuple[int, list[np.ndarray]]:
-    """Sample N from P(N=n | start=i, end=j, t) using truncated conditioning."""
-    lam = omega * t
-    if lam < 0.0 or not np.isfinite(lam):
-        raise ToytreeError("invalid omega*t encountered in uniformization")
-
-    n0 = int(np.floor(lam))
-    nmax = max(n0 + 10 * int(np.sqrt(lam + 1.0)) + 100, 100)
-    nmax = int(min(max_terms, max(nmax, 10)))
-
-    rpowers: list[np.ndarray] = [np.eye(rmat.shape[0], dtype=float)]
-    for _ in range(1, nmax + 1):
-        rpowers.append(rpowers[-1] @ rmat)
-
-    ns = np.arange(nmax + 1, dtype=int)
-    log_pois = _poisson_logpmf(ns, lam)
-    a = np.array([float(rpowers[n][i, j]) for n in ns], dtype=float)
-    mask = a > 0.0
-    if not np.any(mask):
-        raise ToytreeError(
-            f"uniformization conditioning has zero mass for endpoint {i}->{j} at t={t}"
-        )
-
-    log_w = np.full(nmax + 1, -np.inf, dtype=float)
-    log_w[mask] = log_pois[mask] + np.log(a[mask])
-    m = float(np.max(log_w[mask]))
-    w = np.exp(log_w - m)
-    z = float(np.sum(w))
-    if (not np.isfinite(z)) or z <= 0.0:
-        raise ToytreeError(
-            "uniformization conditioning weights are numerically unstable"
-        )
-    probs = w / z
+    lam = np.asarray(lam, dtype=float)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = -lam + n * np.log(lam) - gammaln(n + 1.0)
+    zero = lam[:, 0] <= 0.0
+    out[zero] = np.where(n == 0, 0.0, -np.inf)
+    return out
 
-    if float(np.sum(probs)) < 1.0 - tol:
-        raise ToytreeError(
-            "uniformization truncation too aggressive; increase max_terms"
-        )
 
-    n = int(rng.choice(ns, p=probs))
-    return n, rpowers[: n + 1]
+class _BranchHistorySampler:
+    """Sample endpoint-conditioned CTMC histories on the edges of a tree.
 
+    Everything that depends only on the fitted model and edge lengths is
+    computed once and shared by all replicates: P(t) of every edge from
+    one eigendecomposition of Q, the powers R^n of the uniformized
+    matrix, and for every edge and pair of endpoint states the CDF of
+    the number of uniformized jumps N. Histories of many (replicate,
+    edge) items are then drawn together by inverse-CDF sampling against
+    these tables. Items whose conditioning has no mass under the
+    truncated uniformization, and all items of the rejection engine,
+    are sampled one at a time by rejection.
+    """
 
-def _merge_segments(
-    segs: list[tuple[int, float, float]],
-) -> list[tuple[int, float, float]]:
-    """Merge adjacent segments with identical states."""
-    if not segs:
-        return segs
-    merged: list[tuple[int, float, float]] = [segs[0]]
-    for state, start, end in segs[1:]:
-        pstate, pstart, pend = merged[-1]
-        if int(state) == int(pstate):
-            merged[-1] = (pstate, pstart, float(end))
-        else:
-            merged.append((int(state), float(start), float(end)))
-    return merged
-
-
-def _sample_branch_history_uniformized(
-    qmatrix: np.ndarray,
-    length: float,
-    start_state: int,
-    end_state: int,
-    rng: np.random.Generator,
-    omega_buffer: float,
-    max_terms: int,
-    tol: float,
-) -> list[tuple[int, float, float]]:
-    """Sample a conditioned CTMC branch history using uniformization."""
-    if length < 0:
-        raise ToytreeError("edge lengths must be non-negative for stochastic mapping")
-    if length == 0:
-        if int(start_state) != int(end_state):
+    def __init__(
+        self,
+        qmatrix: np.ndarray,
+        freqs: np.ndarray,
+        lengths: np.ndarray,
+        engine: str,
+        max_attempts: int,
+        omega_buffer: float = 0.05,
+        max_terms: int = 5000,
+        tol: float = 1e-12,
+    ):
+        self.qmatrix = np.asarray(qmatrix, dtype=float)
+        self.lengths = np.asarray(lengths, dtype=float)
+        self.nstates = self.qmatrix.shape[0]
+        self.max_attempts = int(max_attempts)
+        if np.any(self.lengths < 0):
+            raise ToytreeError(
+                "edge lengths must be non-negative for stochastic mapping"
+            )
+        self.pmatrices = _get_transition_matrices(self.qmatrix, self.lengths, freqs)
+        """: P(t) of every edge."""
+        zero = self.lengths[:, None, None] == 0
+        diag = np.eye(self.nstates, dtype=bool)
+        self.possible = np.where(zero, diag, self.pmatrices > 0.0).ravel()
+        """: Whether each (edge, start, end) endpoint pair has probability."""
+        self.rmat: np.ndarray | None = None
+        """: Uniformized transition matrix R = I + Q / omega."""
+        self.rpowers: np.ndarray | None = None
+        """: Stacked powers R^n for n in 0..max(nmax)."""
+        self.jump_cdfs: np.ndarray | None = None
+        """: CDFs of N given (edge, start, end) as rows of a 2-D array."""
+        self.zero_jump_cdf: np.ndarray | None = None
+        """: First column P(N=0) of `jump_cdfs` as a contiguous array."""
+        self.valid: np.ndarray | None = None
+        """: Whether the (edge, start, end) row of `jump_cdfs` has mass."""
+        if engine == "uniformization":
+            self._set_jump_tables(omega_buffer, max_terms, tol)
+
+    def _set_jump_tables(self, omega_buffer: float, max_terms: int, tol: float):
+        """Fill R^n and the CDFs of the number of uniformized jumps."""
+        try:
+            self.rmat = _build_uniformization_matrix(self.qmatrix, omega_buffer)
+        except ToytreeError:
+            return
+        omega = float(np.max(-np.diag(self.qmatrix))) * (1.0 + float(omega_buffer))
+        lam = omega * self.lengths
+        if not np.all(np.isfinite(lam)):
+            raise ToytreeError("invalid omega*t encountered in uniformization")
+        nmax = np.floor(lam).astype(int) + 10 * np.sqrt(lam + 1.0).astype(int) + 100
+        nmax = np.minimum(max_terms, np.maximum(nmax, 100))
+
+        nstates = self.nstates
+        rpowers = np.empty((int(nmax.max()) + 1, nstates, nstates))
+        rpowers[0] = np.eye(nstates)
+        for n in range(1, rpowers.shape[0]):
+            rpowers[n] = rpowers[n - 1] @ self.rmat
+        self.rpowers = rpowers
+        with np.errstate(divide="ignore"):
+            log_a = np.log(rpowers)
+
+        # P(N=n | i, j, t) in log space, for chunks of edges at a time,
+        # with each chunk truncated where all CDFs reach 1 - tol.
+        ns = np.arange(rpowers.shape[0])
+        size = max(1, 2**22 // log_a.size)
+        cdfs, valid = [], []
+        for start in range(0, lam.size, size):
+            log_pois = _poisson_logpmf(ns, lam[start : start + size])
+            log_pois[ns[None, :] > nmax[start : start + size, None]] = -np.inf
+            log_w = log_pois[:, :, None, None] + log_a[None]
+            top = log_w.max(axis=1, keepdims=True)
+            mass = np.isfinite(top)
+            weights = np.exp(log_w - np.where(mass, top, 0.0))
+            cdf = np.cumsum(weights, axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                cdf /= cdf[:, -1:]
+            cdf[~np.isfinite(cdf) | (cdf >= 1.0 - tol)] = 1.0
+            cdf = cdf[:, : int((cdf < 1.0).any(axis=(0, 2, 3)).sum()) + 1]
+            cdfs.append(np.moveaxis(cdf, 1, -1))
+            valid.append(mass[:, 0])
+
+        width = max(i.shape[-1] for i in cdfs)
+        table = np.ones((lam.size, nstates, nstates, width))
+        start = 0
+        for cdf in cdfs:
+            table[start : start + cdf.shape[0], ..., : cdf.shape[-1]] = cdf
+            start += cdf.shape[0]
+        self.jump_cdfs = table.reshape(-1, width)
+        self.zero_jump_cdf = np.ascontiguousarray(self.jump_cdfs[:, 0])
+        self.valid = np.concatenate(valid).ravel()
+
+    def _check_endpoints(
+        self, groups: np.ndarray, start: np.ndarray, end: np.ndarray
+    ) -> None:
+        """Raise ToytreeError if any endpoint pair has zero probability."""
+        possible = self.possible[groups]
+        if possible.all():
+            return
+        idx = np.flatnonzero(~possible)[0]
+        length = self.lengths[groups[idx] // self.nstates**2]
+        if length == 0:
             raise ToytreeError(
                 "cannot satisfy endpoint states on zero-length edge: "
-                f"{start_state} -> {end_state}"
+                f"{start[idx]} -> {end[idx]}"
             )
-        return [(int(start_state), 0.0, 0.0)]
-
-    pmat = expm(qmatrix * float(length))
-    pij = float(pmat[int(start_state), int(end_state)])
-    if pij <= 0.0:
         raise ToytreeError(
-            f"endpoint transition has zero probability for branch length {length}: "
-            f"{start_state} -> {end_state}"
+            "endpoint transition has zero probability for branch length "
+            f"{length}: {start[idx]} -> {end[idx]}"
         )
 
-    omega = float(np.max(-np.diag(qmatrix))) * (1.0 + float(omega_buffer))
-    rmat = _build_uniformization_matrix(qmatrix, omega_buffer=omega_buffer)
-
-    n, rpowers = _sample_jump_count_conditioned(
-        int(start_state),
-        int(end_state),
-        float(length),
-        omega,
-        rmat,
-        rng,
-        max_terms=max_terms,
-        tol=tol,
-    )
+    def sample(
+        self,
+        edge_ids: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        rng: np.random.Generator,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the state-changing jumps of sampled branch histories.
+
+        Item i is a history on edge `edge_ids[i]` from state `start[i]`
+        at the child (t=0) to state `end[i]` at the parent (t=length).
+        Returns the item, time from child, and the childward (before)
+        and parentward (after) states of every jump, sorted by item and
+        time.
+        """
+        groups = (edge_ids * self.nstates + start) * self.nstates + end
+        self._check_endpoints(groups, start, end)
+        if self.jump_cdfs is None:
+            return self._sample_rejection(
+                np.arange(edge_ids.size), edge_ids, start, end, rng
+            )
 
-    if n == 0:
-        return [(int(start_state), 0.0, float(length))]
+        mass = self.valid[groups]
+        if mass.all():
+            return self._sample_uniformized(groups, edge_ids, start, end, rng)
+        items = np.flatnonzero(mass)
+        jumps = self._sample_uniformized(
+            groups[items], edge_ids[items], start[items], end[items], rng
+        )
+        jumps = (items[jumps[0]],) + jumps[1:]
 
-    states = [int(start_state)]
-    curr = int(start_state)
-    for k in range(1, n):
-        rem = n - k
-        weights = rmat[curr] * rpowers[rem][:, int(end_state)]
-        total = float(np.sum(weights))
-        if total <= 0.0 or not np.isfinite(total):
-            raise ToytreeError(
-                "uniformization failed while sampling conditioned intermediate states"
-            )
-        probs = weights / total
-        curr = int(rng.choice(rmat.shape[0], p=probs))
-        states.append(curr)
-    states.append(int(end_state))
+        extra = self._sample_rejection(np.flatnonzero(~mass), edge_ids, start, end, rng)
+        jumps = tuple(np.concatenate(i) for i in zip(jumps, extra))
+        order = np.lexsort((jumps[1], jumps[0]))
+        return tuple(i[order] for i in jumps)
 
-    jumps = np.sort(rng.uniform(0.0, float(length), size=n))
-    bounds = np.concatenate(([0.0], jumps, [float(length)]))
+    def _sample_uniformized(
+        self,
+        groups: np.ndarray,
+        edge_ids: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        rng: np.random.Generator,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return jumps of histories sampled by uniformization."""
+        # number of uniformized jumps N by inverse-CDF on each item's row.
+        draws = rng.random(groups.size)
+        counts = np.zeros(groups.size, dtype=np.int64)
+        active = np.flatnonzero(draws >= self.zero_jump_cdf[groups])
+        while active.size:
+            counts[active] += 1
+            keep = draws[active] >= self.jump_cdfs[groups[active], counts[active]]
+            active = active[keep]
+
+        # states after each of the N jumps of every item with N > 0,
+        # where a jump k < N lands in x with prob. R[s, x] R^(N-k)[x, end].
+        hits = np.flatnonzero(counts)
+        counts = counts[hits]
+        offsets = np.cumsum(counts) - counts
+        before = np.empty(int(counts.sum()), dtype=np.int64)
+        after = np.empty(before.size, dtype=np.int64)
+        curr = start[hits]
+        ends = end[hits]
+        states = np.arange(self.nstates)
+        for step in range(1, int(counts.max(initial=0)) + 1):
+            act = np.flatnonzero(counts >= step)
+            pos = offsets[act] + step - 1
+            before[pos] = curr[act]
+            nxt = ends[act]
+            mid = np.flatnonzero(counts[act] > step)
+            if mid.size:
+                sub = act[mid]
+                rem = counts[sub] - step
+                weights = (
+                    self.rmat[curr[sub]]
+                    * self.rpowers[rem[:, None], states, ends[sub][:, None]]
+                )
+                cumw = np.cumsum(weights, axis=1)
+                total = cumw[:, -1]
+                if not np.all(np.isfinite(total) & (total > 0.0)):
+                    raise ToytreeError(
+                        "uniformization failed while sampling conditioned "
+                        "intermediate states"
+                    )
+                draws = rng.random(sub.size) * total
+                nxt[mid] = (cumw[:, :-1] <= draws[:, None]).sum(axis=1)
+            curr[act] = nxt
+            after[pos] = nxt
+
+        # jump times are sorted uniform draws on each edge, sorted as
+        # rows of a 2-D array for all items with the same number of jumps.
+        owner = np.repeat(hits, counts)
+        times = rng.random(before.size)
+        for njumps in np.unique(counts[counts > 1]):
+            pos = offsets[counts == njumps, None] + np.arange(njumps)
+            times[pos] = np.sort(times[pos], axis=1)
+        times *= self.lengths[edge_ids[owner]]
+        keep = before != after
+        return owner[keep], times[keep], before[keep], after[keep]
+
+    def _sample_rejection(
+        self,
+        items: np.ndarray,
+        edge_ids: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        rng: np.random.Generator,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return jumps of histories sampled one at a time by rejection."""
+        rows = []
+        for item in items.tolist():
+            segs = _sample_branch_history_rejection(
+                qmatrix=self.qmatrix,
+                length=float(self.lengths[edge_ids[item]]),
+                start_state=int(start[item]),
+                end_state=int(end[item]),
+                rng=rng,
+                max_attempts=self.max_attempts,
+            )
+            for (state0, _, _), (state1, time, _) in zip(segs[:-1], segs[1:]):
+                rows.append((item, time, state0, state1))
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, np.zeros(0), empty, empty
+        item, time, before, after = (np.array(i) for i in zip(*rows))
+        return item.astype(np.int64), time.astype(float), before, after
+
+
+def _sample_map_block(
+    sampler: _BranchHistorySampler,
+    edges: np.ndarray,
+    node_cdfs: np.ndarray,
+    fixed_states: np.ndarray,
+    seed: np.random.SeedSequence,
+    nreplicates: int,
+) -> tuple[np.ndarray, ...]:
+    """Return node states and branch jumps for a block of replicates."""
+    rng = np.random.default_rng(seed)
+    states = np.repeat(fixed_states[None, :], nreplicates, axis=0)
+    free = np.flatnonzero(fixed_states < 0)
+    if free.size:
+        draws = rng.random((nreplicates, free.size))
+        sampled = np.zeros(draws.shape, dtype=np.int64)
+        for column in node_cdfs[free, :-1].T:
+            sampled += column <= draws
+        states[:, free] = sampled
+
+    nedges = edges.shape[0]
+    start = states[:, edges[:, 0]].ravel()
+    end = states[:, edges[:, 1]].ravel()
+    edge_ids = np.tile(np.arange(nedges), nreplicates)
+    items, times, before, after = sampler.sample(edge_ids, start, end, rng)
+    return states, items // nedges, items % nedges, times, before, after
+
+
+def _sample_map_chunk(
+    sampler: _BranchHistorySampler,
+    edges: np.ndarray,
+    node_cdfs: np.ndarray,
+    fixed_states: np.ndarray,
+    blocks: list[tuple[np.random.SeedSequence, int]],
+) -> list[tuple[np.ndarray, ...]]:
+    """Return sampled node states and jumps for a chunk of blocks."""
+    return [
+        _sample_map_block(sampler, edges, node_cdfs, fixed_states, seed, nrep)
+        for seed, nrep in blocks
+    ]
+
+
+def _sample_maps_parallel(
+    sampler: _BranchHistorySampler,
+    edges: np.ndarray,
+    node_cdfs: np.ndarray,
+    fixed_states: np.ndarray,
+    blocks: list[tuple[np.random.SeedSequence, int]],
+    workers: int,
+) -> list[tuple[np.ndarray, ...]]:
+    """Return sampled blocks of replicates, optionally in worker processes."""
+    args = (sampler, edges, node_cdfs, fixed_states)
+    chunks = map_chunks(
+        _sample_map_chunk, blocks, workers, args=args, desc="sampling maps"
+    )
+    return [res for chunk in chunks for res in chunk]
+
+
+def _get_arrays_from_frames(
+    segments: pd.DataFrame,
+    node_states: pd.DataFrame,
+    edge_table: pd.DataFrame,
+    nreplicates: int,
+) -> tuple[np.ndarray, ...]:
+    """Return compact map arrays parsed from segment and node-state tables."""
+    nedges = edge_table.shape[0]
+    nodes = node_states["node"].to_numpy(dtype=np.int64)
+    node_state_array = np.full((nreplicates, nodes.max(initial=-1) + 1), -1)
+    node_state_array[node_states["map_id"].to_numpy(dtype=np.int64), nodes] = (
+        node_states["state_idx"].to_numpy(dtype=np.int64)
+    )
 
-    segs = []
-    for idx, state in enumerate(states):
-        segs.append((int(state), float(bounds[idx]), float(bounds[idx + 1])))
-    return _merge_segments(segs)
+    edge_index = pd.Index(edge_table["edge_id"])
+    segs = segments.assign(_edge=edge_index.get_indexer(segments["edge_id"]))
+    segs = segs.sort_values(["map_id", "_edge", "t_start"], kind="stable")
+    maps = segs["map_id"].to_numpy(dtype=np.int64)
+    edges = segs["_edge"].to_numpy(dtype=np.int64)
+    states = segs["state_idx"].to_numpy(dtype=np.int64)
+    t_start = segs["t_start"].to_numpy(dtype=float)
+    first = np.ones(maps.size, dtype=bool)
+    first[1:] = (maps[1:] != maps[:-1]) | (edges[1:] != edges[:-1])
+
+    start_states = np.full((nreplicates, nedges), -1)
+    start_states[maps[first], edges[first]] = states[first]
+    heights = np.zeros(nedges)
+    abs_start = segs["time_abs_start"].to_numpy(dtype=float)
+    heights[edges[first]] = (abs_start - t_start)[first]
+    jump = np.flatnonzero(~first)
+    jump = jump[states[jump] != states[jump - 1]]
+    jumps = (maps[jump], edges[jump], t_start[jump], states[jump - 1], states[jump])
+    return node_state_array, start_states, heights, jumps
+
+
+def _summarize_replicates(values: np.ndarray, value: str) -> dict[str, np.ndarray]:
+    """Return summary statistics over the first (replicate) axis of values."""
+    prefix = "" if value == "count" else f"_{value}"
+    if values.shape[0] > 1:
+        sd = np.std(values, axis=0, ddof=1)
+    else:
+        sd = np.full(values.shape[1:], np.nan)
+    q025, q50, q975 = np.quantile(values, [0.025, 0.5, 0.975], axis=0)
+    return {
+        f"mean{prefix}": values.mean(axis=0),
+        f"sd{prefix}": sd,
+        f"q025{prefix}": q025,
+        f"q50{prefix}": q50,
+        f"q975{prefix}": q975,
+        f"prob_nonzero{prefix}": (values > 0).mean(axis=0),
+    }
 
 
-@dataclass
 class PCMStochasticMapResult:
-    """Container for stochastic-map segments and common summary tables.
+    """Container for stochastic-map histories and common summary tables.
 
-    The object stores the sampled branch-interval table returned by stochastic
-    mapping and lazily computes common summaries such as dwell times,
-    transition counts, edge-specific transition probabilities, and sampled node
-    state frequencies.
+    Sampled maps are stored compactly as the node states of every
+    replicate and the state-changing jumps on each branch. The segment
+    table, summary tables such as dwell times, transition counts,
+    edge-specific transition probabilities, and sampled node state
+    frequencies, and NumPy summary arrays (e.g., replicate x edge x
+    state dwell times) are computed lazily from these.
 
     Parameters
     ----------
@@ -453,133 +684,230 @@ class PCMStochasticMapResult:
 
     Notes
     -----
-    Summary properties return copies of cached tables. The raw ``segments``,
-    ``node_states``, and ``edge_table`` attributes are stored as provided.
+    Summary table properties return copies of cached tables, and summary
+    array properties return read-only cached arrays. The ``segments``
+    and ``node_states`` tables are stored as provided, or are built on
+    first access for results returned by ``simulate_stochastic_map``.
     """
 
-    segments: pd.DataFrame
-    node_states: pd.DataFrame
-    edge_table: pd.DataFrame
-    state_labels: tuple
-    model: str
-    engine: str
-    nreplicates: int
-    _cache: dict[str, pd.DataFrame] = field(default_factory=dict, repr=False)
+    def __init__(
+        self,
+        segments: pd.DataFrame,
+        node_states: pd.DataFrame,
+        edge_table: pd.DataFrame,
+        state_labels: tuple,
+        model: str,
+        engine: str,
+        nreplicates: int,
+    ):
+        self.edge_table = edge_table
+        self.state_labels = tuple(state_labels)
+        self.model = model
+        self.engine = engine
+        self.nreplicates = int(nreplicates)
+        arrays = _get_arrays_from_frames(
+            segments, node_states, edge_table, self.nreplicates
+        )
+        self._set_arrays(*arrays)
+        self._cache["segments"] = segments
+        self._cache["node_states"] = node_states
+
+    @classmethod
+    def _from_arrays(
+        cls,
+        node_state_array: np.ndarray,
+        edge_heights: np.ndarray,
+        jumps: tuple[np.ndarray, ...],
+        edge_table: pd.DataFrame,
+        state_labels: tuple,
+        model: str,
+        engine: str,
+    ) -> PCMStochasticMapResult:
+        """Return a result from sampled node states and branch jumps."""
+        result = cls.__new__(cls)
+        result.edge_table = edge_table
+        result.state_labels = tuple(state_labels)
+        result.model = model
+        result.engine = engine
+        result.nreplicates = node_state_array.shape[0]
+        children = edge_table["child"].to_numpy(dtype=np.int64)
+        start_states = node_state_array[:, children]
+        result._set_arrays(node_state_array, start_states, edge_heights, jumps)
+        return result
+
+    def _set_arrays(
+        self,
+        node_state_array: np.ndarray,
+        start_states: np.ndarray,
+        edge_heights: np.ndarray,
+        jumps: tuple[np.ndarray, ...],
+    ) -> None:
+        """Store the compact arrays from which all summaries are built."""
+        self._cache: dict[str, pd.DataFrame | np.ndarray] = {}
+        self._node_state_array = node_state_array
+        self._start_states = start_states
+        self._edge_heights = edge_heights
+        self._jumps = jumps
+        self._lengths = self.edge_table["length"].to_numpy(dtype=float)
 
     def __repr__(self) -> str:
         """Return a concise text summary of the stochastic-map result."""
+        nsegments = self._start_states.size + self._jumps[0].size
         return (
             "PCMStochasticMapResult("
             f"model={self.model!r}, nreplicates={self.nreplicates}, "
-            f"nsegments={self.segments.shape[0]}, "
+            f"nsegments={nsegments}, "
             f"nedges={self.edge_table.shape[0]}, "
             f"nstates={len(self.state_labels)})"
         )
 
+    def _get_cached(self, key: str, func) -> pd.DataFrame | np.ndarray:
+        """Return a cached table or read-only array, building it if needed."""
+        if key not in self._cache:
+            value = func()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[key] = value
+        value = self._cache[key]
+        return value if isinstance(value, np.ndarray) else value.copy()
+
+    @property
+    def segments(self) -> pd.DataFrame:
+        """Return one row per sampled branch segment."""
+        return self._get_cached("segments", self._get_segments)
+
+    @property
+    def node_states(self) -> pd.DataFrame:
+        """Return sampled node states for each map replicate."""
+        return self._get_cached("node_states", self._get_node_states)
+
     @property
     def events(self) -> pd.DataFrame:
         """Return one row per state transition in parent-to-child direction."""
-        if "events" not in self._cache:
-            self._cache["events"] = self._get_events()
-        return self._cache["events"].copy()
+        return self._get_cached("events", self._get_events)
 
     @property
     def dwell(self) -> pd.DataFrame:
         """Return whole-tree state dwell times for each map replicate."""
-        if "dwell" not in self._cache:
-            self._cache["dwell"] = self._get_dwell()
-        return self._cache["dwell"].copy()
+        return self._get_cached("dwell", self._get_dwell)
 
     @property
     def transitions(self) -> pd.DataFrame:
         """Return whole-tree transition counts for each map replicate."""
-        if "transitions" not in self._cache:
-            self._cache["transitions"] = self._get_transitions()
-        return self._cache["transitions"].copy()
+        return self._get_cached("transitions", self._get_transitions)
 
     @property
     def edge_dwell(self) -> pd.DataFrame:
         """Return state dwell times for every edge and map replicate."""
-        if "edge_dwell" not in self._cache:
-            self._cache["edge_dwell"] = self._get_edge_dwell()
-        return self._cache["edge_dwell"].copy()
+        return self._get_cached("edge_dwell", self._get_edge_dwell)
 
     @property
     def edge_transitions(self) -> pd.DataFrame:
         """Return transition counts for every edge and map replicate."""
-        if "edge_transitions" not in self._cache:
-            self._cache["edge_transitions"] = self._get_edge_transitions()
-        return self._cache["edge_transitions"].copy()
+        return self._get_cached("edge_transitions", self._get_edge_transitions)
+
+    @property
+    def node_state_array(self) -> np.ndarray:
+        """Return sampled node state idxs as a (nreplicates, nnodes) array."""
+        return self._get_cached("node_state_array", self._node_state_array.copy)
+
+    @property
+    def dwell_array(self) -> np.ndarray:
+        """Return whole-tree dwell times as a (nreplicates, nstates) array."""
+        return self._get_cached("dwell_array", lambda: self._get_dwell_array(False))
+
+    @property
+    def transition_array(self) -> np.ndarray:
+        """Return (nreplicates, nstates, nstates) from-to transition counts."""
+        return self._get_cached(
+            "transition_array", lambda: self._get_transition_array(False)
+        )
+
+    @property
+    def edge_dwell_array(self) -> np.ndarray:
+        """Return (nreplicates, nedges, nstates) edge dwell times."""
+        return self._get_cached("edge_dwell_array", lambda: self._get_dwell_array(True))
+
+    @property
+    def edge_transition_array(self) -> np.ndarray:
+        """Return (nreplicates, nedges, nstates, nstates) transition counts."""
+        return self._get_cached(
+            "edge_transition_array", lambda: self._get_transition_array(True)
+        )
 
     @property
     def dwell_stats(self) -> pd.DataFrame:
         """Return replicate summaries of whole-tree dwell times."""
-        if "dwell_stats" not in self._cache:
-            self._cache["dwell_stats"] = _summarize_replicates(
-                self.dwell,
-                ["state_idx", "state"],
-                "total_time",
-            )
-        return self._cache["dwell_stats"].copy()
+        return self._get_cached(
+            "dwell_stats",
+            lambda: pd.DataFrame(
+                {
+                    **self._get_state_columns(),
+                    **_summarize_replicates(self.dwell_array, "total_time"),
+                }
+            ),
+        )
 
     @property
     def transition_stats(self) -> pd.DataFrame:
         """Return replicate summaries of whole-tree transition counts."""
-        if "transition_stats" not in self._cache:
-            self._cache["transition_stats"] = _summarize_replicates(
-                self.transitions,
-                ["from_state_idx", "to_state_idx", "from_state", "to_state"],
-                "count",
+
+        def build():
+            from_idx, to_idx = self._get_transition_pairs()
+            counts = self.transition_array[:, from_idx, to_idx]
+            return pd.DataFrame(
+                {
+                    **self._get_pair_columns(),
+                    **_summarize_replicates(counts, "count"),
+                }
             )
-        return self._cache["transition_stats"].copy()
+
+        return self._get_cached("transition_stats", build)
 
     @property
     def edge_dwell_stats(self) -> pd.DataFrame:
         """Return replicate summaries of edge-specific state dwell times."""
-        if "edge_dwell_stats" not in self._cache:
-            total = _summarize_replicates(
-                self.edge_dwell,
-                ["edge_id", "child", "parent", "state_idx", "state"],
-                "total_time",
-            )
-            prop = _summarize_replicates(
-                self.edge_dwell,
-                ["edge_id", "child", "parent", "state_idx", "state"],
-                "prop_edge_time",
-            )
-            drop = ["prob_nonzero_prop_edge_time"]
-            self._cache["edge_dwell_stats"] = total.merge(
-                prop.drop(columns=[i for i in drop if i in prop.columns]),
-                on=["edge_id", "child", "parent", "state_idx", "state"],
-                how="left",
+
+        def build():
+            nedges = self.edge_table.shape[0]
+            nstates = len(self.state_labels)
+            total = self.edge_dwell_array.reshape(self.nreplicates, -1)
+            prop = _summarize_replicates(self._get_edge_props(total), "prop_edge_time")
+            prop.pop("prob_nonzero_prop_edge_time")
+            return pd.DataFrame(
+                {
+                    **self._get_edge_columns(nstates),
+                    **self._get_state_columns(nedges),
+                    **_summarize_replicates(total, "total_time"),
+                    **prop,
+                }
             )
-        return self._cache["edge_dwell_stats"].copy()
+
+        return self._get_cached("edge_dwell_stats", build)
 
     @property
     def edge_transition_stats(self) -> pd.DataFrame:
         """Return replicate summaries of edge-specific transition counts."""
-        if "edge_transition_stats" not in self._cache:
-            self._cache["edge_transition_stats"] = _summarize_replicates(
-                self.edge_transitions,
-                [
-                    "edge_id",
-                    "child",
-                    "parent",
-                    "from_state_idx",
-                    "to_state_idx",
-                    "from_state",
-                    "to_state",
-                ],
-                "count",
+
+        def build():
+            from_idx, to_idx = self._get_transition_pairs()
+            counts = self.edge_transition_array[:, :, from_idx, to_idx]
+            return pd.DataFrame(
+                {
+                    **self._get_edge_columns(from_idx.size),
+                    **self._get_pair_columns(self.edge_table.shape[0]),
+                    **_summarize_replicates(
+                        counts.reshape(self.nreplicates, -1), "count"
+                    ),
+                }
             )
-        return self._cache["edge_transition_stats"].copy()
+
+        return self._get_cached("edge_transition_stats", build)
 
     @property
     def node_state_probs(self) -> pd.DataFrame:
         """Return sampled state frequencies for every node."""
-        if "node_state_probs" not in self._cache:
-            self._cache["node_state_probs"] = self._get_node_state_probs()
-        return self._cache["node_state_probs"].copy()
+        return self._get_cached("node_state_probs", self._get_node_state_probs)
 
     def transition_probability(
         self,
@@ -604,304 +932,248 @@ class PCMStochasticMapResult:
         float
             Fraction of map replicates with at least one matching transition.
         """
-        table = self.edge_transitions if edge_id is not None else self.transitions
-        mask = table["from_state"].eq(from_state) & table["to_state"].eq(to_state)
-        if edge_id is not None:
-            mask &= table["edge_id"].eq(int(edge_id))
-        subset = table.loc[mask, "count"]
-        if subset.empty:
+        labels = list(self.state_labels)
+        if from_state not in labels or to_state not in labels:
             return 0.0
-        return float(subset.gt(0).mean())
+        from_idx = labels.index(from_state)
+        to_idx = labels.index(to_state)
+        if from_idx == to_idx:
+            return 0.0
+        maps, edges, _, before, after = self._jumps
+        mask = (after == from_idx) & (before == to_idx)
+        if edge_id is not None:
+            edge = pd.Index(self.edge_table["edge_id"]).get_indexer([int(edge_id)])
+            if edge[0] < 0:
+                return 0.0
+            mask &= edges == edge[0]
+        return float(np.unique(maps[mask]).size / self.nreplicates)
+
+    def _get_labels(self, idxs: np.ndarray) -> np.ndarray:
+        """Return an array of state labels for state idxs."""
+        return np.asarray(self.state_labels)[idxs]
+
+    def _get_transition_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the from and to idxs of all ordered off-diagonal pairs."""
+        return np.nonzero(~np.eye(len(self.state_labels), dtype=bool))
+
+    def _get_state_columns(self, nrepeats: int = 1) -> dict[str, np.ndarray]:
+        """Return state idx and label columns tiled nrepeats times."""
+        idxs = np.tile(np.arange(len(self.state_labels)), nrepeats)
+        return {"state_idx": idxs, "state": self._get_labels(idxs)}
+
+    def _get_pair_columns(self, nrepeats: int = 1) -> dict[str, np.ndarray]:
+        """Return transition pair columns tiled nrepeats times."""
+        from_idx, to_idx = (np.tile(i, nrepeats) for i in self._get_transition_pairs())
+        return {
+            "from_state_idx": from_idx,
+            "to_state_idx": to_idx,
+            "from_state": self._get_labels(from_idx),
+            "to_state": self._get_labels(to_idx),
+        }
 
-    @property
-    def _map_ids(self) -> list[int]:
-        """Return map identifiers in stable order."""
-        return list(range(int(self.nreplicates)))
+    def _get_edge_columns(self, nrepeats: int = 1) -> dict[str, np.ndarray]:
+        """Return edge_id, child and parent columns, each row repeated."""
+        return {
+            i: np.repeat(self.edge_table[i].to_numpy(), nrepeats)
+            for i in ("edge_id", "child", "parent")
+        }
 
-    @property
-    def _state_frame(self) -> pd.DataFrame:
-        """Return state labels indexed by state_idx."""
+    def _get_edge_props(self, total: np.ndarray) -> np.ndarray:
+        """Return (nreplicates, nedges * nstates) dwell times / edge lengths."""
+        lengths = np.repeat(self._lengths, len(self.state_labels))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(lengths > 0.0, total / lengths, np.nan)
+
+    def _get_dwell_array(self, by_edge: bool) -> np.ndarray:
+        """Return dwell times accumulated from edge start states and jumps.
+
+        Each edge contributes its length to the state at its child end,
+        and a jump at time t from the child moves the remaining length
+        minus t from the state before the jump to the state after it.
+        """
+        nstates = len(self.state_labels)
+        nreps, nedges = self._start_states.shape
+        shape = (nreps, nedges, nstates) if by_edge else (nreps, nstates)
+        out = np.zeros(shape)
+
+        # edge lengths added to start states in chunks of replicates.
+        size = max(1, _MAX_BLOCK_ITEMS // max(1, nedges))
+        for rep in range(0, nreps, size):
+            start = self._start_states[rep : rep + size]
+            for state in range(nstates):
+                if by_edge:
+                    out[rep : rep + size, :, state] = (start == state) * self._lengths
+                else:
+                    out[rep : rep + size, state] = (start == state) @ self._lengths
+
+        maps, edges, times, before, after = self._jumps
+        rows = maps * nedges + edges if by_edge else maps
+        remain = self._lengths[edges] - times
+        flat = out.reshape(-1)
+        np.add.at(flat, rows * nstates + before, -remain)
+        np.add.at(flat, rows * nstates + after, remain)
+        return out
+
+    def _get_transition_array(self, by_edge: bool) -> np.ndarray:
+        """Return from-to transition counts of each replicate (and edge)."""
+        nstates = len(self.state_labels)
+        nedges = self.edge_table.shape[0]
+        maps, edges, _, before, after = self._jumps
+        rows = maps * nedges + edges if by_edge else maps
+        idxs = (rows * nstates + after) * nstates + before
+        shape = (self.nreplicates,) + ((nedges,) if by_edge else ())
+        shape += (nstates, nstates)
+        size = int(np.prod(shape))
+        return np.bincount(idxs, minlength=size).reshape(shape)
+
+    def _get_segments(self) -> pd.DataFrame:
+        """Build the branch segment table from edge start states and jumps."""
+        nreps, nedges = self._start_states.shape
+        maps, edges, times, _, after = self._jumps
+        pairs = maps * nedges + edges
+        njumps = np.bincount(pairs, minlength=nreps * nedges)
+        nsegs = njumps + 1
+        first = np.cumsum(nsegs) - nsegs
+        states = np.empty(nsegs.sum(), dtype=np.int64)
+        t_start = np.zeros(states.size)
+        states[first] = self._start_states.ravel()
+        rank = np.arange(pairs.size) - (np.cumsum(njumps) - njumps)[pairs]
+        pos = first[pairs] + rank + 1
+        states[pos] = after
+        t_start[pos] = times
+
+        seg_pairs = np.repeat(np.arange(nreps * nedges), nsegs)
+        seg_edges = seg_pairs % nedges
+        t_end = np.empty(states.size)
+        t_end[:-1] = t_start[1:]
+        t_end[first + nsegs - 1] = np.tile(self._lengths, nreps)
+        base = self._edge_heights[seg_edges]
         return pd.DataFrame(
             {
-                "state_idx": np.arange(len(self.state_labels), dtype=int),
-                "state": list(self.state_labels),
+                "map_id": seg_pairs // nedges,
+                "edge_id": self.edge_table["edge_id"].to_numpy()[seg_edges],
+                "child": self.edge_table["child"].to_numpy()[seg_edges],
+                "parent": self.edge_table["parent"].to_numpy()[seg_edges],
+                "state_idx": states,
+                "state": self._get_labels(states),
+                "t_start": t_start,
+                "t_end": t_end,
+                "duration": t_end - t_start,
+                "time_abs_start": base + t_start,
+                "time_abs_end": base + t_end,
             }
         )
 
-    @property
-    def _transition_frame(self) -> pd.DataFrame:
-        """Return all ordered off-diagonal state pairs."""
-        rows = []
-        labels = list(self.state_labels)
-        for i, from_state in enumerate(labels):
-            for j, to_state in enumerate(labels):
-                if i == j:
-                    continue
-                rows.append(
-                    {
-                        "from_state_idx": i,
-                        "to_state_idx": j,
-                        "from_state": from_state,
-                        "to_state": to_state,
-                    }
-                )
+    def _get_node_states(self) -> pd.DataFrame:
+        """Build the long table of sampled node states."""
+        nreps, nnodes = self._node_state_array.shape
+        states = self._node_state_array.ravel().astype(np.int64)
         return pd.DataFrame(
-            rows,
-            columns=[
-                "from_state_idx",
-                "to_state_idx",
-                "from_state",
-                "to_state",
-            ],
+            {
+                "map_id": np.repeat(np.arange(nreps), nnodes),
+                "node": np.tile(np.arange(nnodes), nreps),
+                "state_idx": states,
+                "state": self._get_labels(states),
+            }
         )
 
     def _get_events(self) -> pd.DataFrame:
-        """Build parent-to-child transition events from segment boundaries."""
-        rows: list[dict] = []
-        labels = list(self.state_labels)
-        edge_lengths = self.edge_table.set_index("edge_id")["length"]
-        for (map_id, edge_id), subdf in self.segments.groupby(
-            ["map_id", "edge_id"],
-            sort=True,
-        ):
-            subdf = subdf.sort_values("t_start").reset_index(drop=True)
-            if subdf.shape[0] < 2:
-                continue
-            length = float(edge_lengths.loc[int(edge_id)])
-            for idx in range(1, subdf.shape[0]):
-                childward = subdf.iloc[idx - 1]
-                parentward = subdf.iloc[idx]
-                from_idx = int(parentward["state_idx"])
-                to_idx = int(childward["state_idx"])
-                if from_idx == to_idx:
-                    continue
-                time_from_child = float(parentward["t_start"])
-                rows.append(
-                    {
-                        "map_id": int(map_id),
-                        "edge_id": int(edge_id),
-                        "child": int(parentward["child"]),
-                        "parent": int(parentward["parent"]),
-                        "from_state_idx": from_idx,
-                        "to_state_idx": to_idx,
-                        "from_state": labels[from_idx],
-                        "to_state": labels[to_idx],
-                        "time_from_parent": float(length - time_from_child),
-                        "time_from_child": time_from_child,
-                        "time_abs": float(parentward["time_abs_start"]),
-                    }
-                )
+        """Build parent-to-child transition events from branch jumps."""
+        maps, edges, times, before, after = self._jumps
+        lengths = self._lengths[edges]
         return pd.DataFrame(
-            rows,
-            columns=[
-                "map_id",
-                "edge_id",
-                "child",
-                "parent",
-                "from_state_idx",
-                "to_state_idx",
-                "from_state",
-                "to_state",
-                "time_from_parent",
-                "time_from_child",
-                "time_abs",
-            ],
+            {
+                "map_id": maps,
+                "edge_id": self.edge_table["edge_id"].to_numpy()[edges],
+                "child": self.edge_table["child"].to_numpy()[edges],
+                "parent": self.edge_table["parent"].to_numpy()[edges],
+                "from_state_idx": after,
+                "to_state_idx": before,
+                "from_state": self._get_labels(after),
+                "to_state": self._get_labels(before),
+                "time_from_parent": lengths - times,
+                "time_from_child": times,
+                "time_abs": self._edge_heights[edges] + times,
+            }
         )
 
     def _get_dwell(self) -> pd.DataFrame:
         """Build zero-filled whole-tree dwell times."""
-        grouped = (
-            self.segments.groupby(["map_id", "state_idx"], as_index=False)["duration"]
-            .sum()
-            .rename(columns={"duration": "total_time"})
+        nstates = len(self.state_labels)
+        return pd.DataFrame(
+            {
+                "map_id": np.repeat(np.arange(self.nreplicates), nstates),
+                **self._get_state_columns(self.nreplicates),
+                "total_time": self.dwell_array.ravel(),
+            }
         )
-        base = pd.MultiIndex.from_product(
-            [self._map_ids, self._state_frame["state_idx"]],
-            names=["map_id", "state_idx"],
-        ).to_frame(index=False)
-        out = base.merge(grouped, on=["map_id", "state_idx"], how="left")
-        out["total_time"] = out["total_time"].fillna(0.0)
-        out = out.merge(self._state_frame, on="state_idx", how="left")
-        return out[["map_id", "state_idx", "state", "total_time"]]
 
     def _get_transitions(self) -> pd.DataFrame:
         """Build zero-filled whole-tree transition counts."""
-        pairs = self._transition_frame
-        if pairs.empty:
-            return pd.DataFrame(
-                columns=[
-                    "map_id",
-                    "from_state_idx",
-                    "to_state_idx",
-                    "from_state",
-                    "to_state",
-                    "count",
-                    "any_transition",
-                ]
-            )
-        grouped = (
-            self.events.groupby(
-                ["map_id", "from_state_idx", "to_state_idx"],
-                as_index=False,
-            )
-            .size()
-            .rename(columns={"size": "count"})
-        )
-        base = pd.concat(
-            [pairs.assign(map_id=map_id) for map_id in self._map_ids],
-            ignore_index=True,
-        )
-        out = base.merge(
-            grouped,
-            on=["map_id", "from_state_idx", "to_state_idx"],
-            how="left",
+        from_idx, to_idx = self._get_transition_pairs()
+        counts = self.transition_array[:, from_idx, to_idx].ravel()
+        return pd.DataFrame(
+            {
+                "map_id": np.repeat(np.arange(self.nreplicates), from_idx.size),
+                **self._get_pair_columns(self.nreplicates),
+                "count": counts,
+                "any_transition": counts > 0,
+            }
         )
-        out["count"] = out["count"].fillna(0).astype(int)
-        out["any_transition"] = out["count"].gt(0)
-        return out[
-            [
-                "map_id",
-                "from_state_idx",
-                "to_state_idx",
-                "from_state",
-                "to_state",
-                "count",
-                "any_transition",
-            ]
-        ]
 
     def _get_edge_dwell(self) -> pd.DataFrame:
         """Build zero-filled edge-specific dwell times."""
-        grouped = (
-            self.segments.groupby(
-                ["map_id", "edge_id", "state_idx"],
-                as_index=False,
-            )["duration"]
-            .sum()
-            .rename(columns={"duration": "total_time"})
-        )
-        base = pd.MultiIndex.from_product(
-            [
-                self._map_ids,
-                self.edge_table["edge_id"],
-                self._state_frame["state_idx"],
-            ],
-            names=["map_id", "edge_id", "state_idx"],
-        ).to_frame(index=False)
-        out = base.merge(grouped, on=["map_id", "edge_id", "state_idx"], how="left")
-        out["total_time"] = out["total_time"].fillna(0.0)
-        out = out.merge(self.edge_table, on="edge_id", how="left")
-        out = out.merge(self._state_frame, on="state_idx", how="left")
-        lengths = out["length"].to_numpy(dtype=float)
-        out["prop_edge_time"] = np.where(
-            lengths > 0.0,
-            out["total_time"].to_numpy(dtype=float) / lengths,
-            np.nan,
+        nstates = len(self.state_labels)
+        nedges = self.edge_table.shape[0]
+        nrows = nedges * nstates
+        total = self.edge_dwell_array.reshape(self.nreplicates, -1)
+        return pd.DataFrame(
+            {
+                "map_id": np.repeat(np.arange(self.nreplicates), nrows),
+                **{
+                    key: np.tile(val, self.nreplicates)
+                    for key, val in self._get_edge_columns(nstates).items()
+                },
+                **self._get_state_columns(self.nreplicates * nedges),
+                "total_time": total.ravel(),
+                "prop_edge_time": self._get_edge_props(total).ravel(),
+            }
         )
-        return out[
-            [
-                "map_id",
-                "edge_id",
-                "child",
-                "parent",
-                "state_idx",
-                "state",
-                "total_time",
-                "prop_edge_time",
-            ]
-        ]
 
     def _get_edge_transitions(self) -> pd.DataFrame:
         """Build zero-filled edge-specific transition counts."""
-        pairs = self._transition_frame
-        if pairs.empty:
-            return pd.DataFrame(
-                columns=[
-                    "map_id",
-                    "edge_id",
-                    "child",
-                    "parent",
-                    "from_state_idx",
-                    "to_state_idx",
-                    "from_state",
-                    "to_state",
-                    "count",
-                    "any_transition",
-                ]
-            )
-        grouped = (
-            self.events.groupby(
-                ["map_id", "edge_id", "from_state_idx", "to_state_idx"],
-                as_index=False,
-            )
-            .size()
-            .rename(columns={"size": "count"})
-        )
-        edge_pairs = self.edge_table.merge(pairs, how="cross")
-        base = pd.concat(
-            [edge_pairs.assign(map_id=map_id) for map_id in self._map_ids],
-            ignore_index=True,
-        )
-        out = base.merge(
-            grouped,
-            on=["map_id", "edge_id", "from_state_idx", "to_state_idx"],
-            how="left",
+        from_idx, to_idx = self._get_transition_pairs()
+        nedges = self.edge_table.shape[0]
+        nrows = nedges * from_idx.size
+        counts = self.edge_transition_array[:, :, from_idx, to_idx].ravel()
+        return pd.DataFrame(
+            {
+                "map_id": np.repeat(np.arange(self.nreplicates), nrows),
+                **{
+                    key: np.tile(val, self.nreplicates)
+                    for key, val in self._get_edge_columns(from_idx.size).items()
+                },
+                **self._get_pair_columns(self.nreplicates * nedges),
+                "count": counts,
+                "any_transition": counts > 0,
+            }
         )
-        out["count"] = out["count"].fillna(0).astype(int)
-        out["any_transition"] = out["count"].gt(0)
-        return out[
-            [
-                "map_id",
-                "edge_id",
-                "child",
-                "parent",
-                "from_state_idx",
-                "to_state_idx",
-                "from_state",
-                "to_state",
-                "count",
-                "any_transition",
-            ]
-        ]
 
     def _get_node_state_probs(self) -> pd.DataFrame:
         """Build zero-filled sampled node state probabilities."""
-        grouped = (
-            self.node_states.groupby(["node", "state_idx"], as_index=False)
-            .size()
-            .rename(columns={"size": "count"})
+        nstates = len(self.state_labels)
+        arr = self._node_state_array
+        nodes = np.flatnonzero((arr >= 0).any(axis=0))
+        counts = np.stack([(arr[:, nodes] == i).sum(axis=0) for i in range(nstates)])
+        counts = counts.T.ravel()
+        return pd.DataFrame(
+            {
+                "node": np.repeat(nodes, nstates),
+                **self._get_state_columns(nodes.size),
+                "count": counts,
+                "probability": counts / float(self.nreplicates),
+            }
         )
-        nodes = sorted(self.node_states["node"].unique().tolist())
-        base = pd.MultiIndex.from_product(
-            [nodes, self._state_frame["state_idx"]],
-            names=["node", "state_idx"],
-        ).to_frame(index=False)
-        out = base.merge(grouped, on=["node", "state_idx"], how="left")
-        out["count"] = out["count"].fillna(0).astype(int)
-        out["probability"] = out["count"] / float(self.nreplicates)
-        out = out.merge(self._state_frame, on="state_idx", how="left")
-        return out[["node", "state_idx", "state", "count", "probability"]]
-
-
-def _summarize_replicates(
-    data: pd.DataFrame,
-    keys: list[str],
-    value: str,
-) -> pd.DataFrame:
-    """Return replicate summary statistics for one value column."""
-    prefix = "" if value == "count" else f"_{value}"
-    grouped = data.groupby(keys, dropna=False)[value]
-    out = grouped.agg(
-        **{
-            f"mean{prefix}": "mean",
-            f"sd{prefix}": "std",
-            f"q025{prefix}": lambda x: x.quantile(0.025),
-            f"q50{prefix}": lambda x: x.quantile(0.5),
-            f"q975{prefix}": lambda x: x.quantile(0.975),
-            f"prob_nonzero{prefix}": lambda x: x.gt(0).mean(),
-        }
-    ).reset_index()
-    return out
 
 
 @add_subpackage_method(PhyloCompAPI)
@@ -913,6 +1185,7 @@ def simulate_stochastic_map(
     seed: Optional[int] = None,
     max_branch_attempts: int = 10_000,
     engine: Literal["uniformization", "rejection"] = "uniformization",
+    workers: Optional[int] = 1,
 ) -> PCMStochasticMapResult:
     """Sample stochastic character maps for one discrete trait under MK.
 
@@ -930,6 +1203,12 @@ def simulate_stochastic_map(
     Posterior vectors are input constraints only. The returned object stores
     stochastic-map branch intervals and lazily computed summary tables.
 
+    The transition matrices of all edges and the uniformization tables
+    are computed once from the fitted model and shared by all replicates,
+    which are sampled together in blocks that each draw from their own
+    seeded random stream. Results for a given ``seed`` are therefore
+    identical for any number of ``workers``.
+
     Parameters
     ----------
     tree : ToyTree
@@ -951,12 +1230,15 @@ def simulate_stochastic_map(
     engine : {"uniformization", "rejection"}, default="uniformization"
         Branch-history sampler. Uniformization is typically faster and is the
         default. Rejection is retained for fallback and validation.
+    workers : int | None, default=1
+        Number of worker processes used to sample blocks of replicates.
+        If None, all available CPUs are used.
 
     Returns
     -------
     PCMStochasticMapResult
-        Stochastic-map result object containing the segment table, sampled node
-        states, and cached summary-table properties.
+        Stochastic-map result object containing the sampled maps and cached
+        summary-table and summary-array properties.
 
     Raises
     ------
@@ -982,6 +1264,13 @@ def simulate_stochastic_map(
     >>> result = tree.pcm.simulate_stochastic_map(data=tip_data, model_fit=fit, seed=2)
     >>> result.segments.head()
 
+    Sample many maps and summarize them as (replicate x edge x state) arrays:
+
+    >>> result = tree.pcm.simulate_stochastic_map(
+    ...     data=tip_data, model_fit=fit, nreplicates=1000, seed=2, workers=4
+    ... )
+    >>> result.edge_dwell_array.mean(axis=0)
+
     Use posterior node constraints from ancestral-state inference:
 
     >>> result = tree.pcm.infer_ancestral_states_discrete_ctmc(
@@ -1003,6 +1292,7 @@ def simulate_stochastic_map(
     eng = str(engine).lower()
     if eng not in {"uniformization", "rejection"}:
         raise ToytreeError("engine must be one of: 'uniformization', 'rejection'")
+    workers = get_workers(workers)
 
     series = _coerce_series_to_all_nodes(tree, data)
     mode, fit_data, entered_posteriors, fixed_from_onehot = _coerce_mapping_inputs(
@@ -1027,7 +1317,7 @@ def simulate_stochastic_map(
     )
     posterior = node_probs.to_numpy(dtype=float)
 
-    fixed_states = np.full(tree.nnodes, -1, dtype=int)
+    fixed_states = np.full(tree.nnodes, -1, dtype=np.int64)
     if mode == "state":
         for idx, val in enumerate(fitter.tip_states):
             if not np.isnan(val):
@@ -1035,11 +1325,22 @@ def simulate_stochastic_map(
     else:
         fixed_states[:] = fixed_from_onehot
 
-    edges = tree.get_edges("idx")
+    # sampling probabilities of the states of nodes that are not fixed.
+    if mode == "posterior":
+        entered = np.all(np.isfinite(entered_posteriors), axis=1)
+        posterior = np.where(entered[:, None], entered_posteriors, posterior)
+    free = np.flatnonzero(fixed_states < 0)
+    psums = posterior[free].sum(axis=1)
+    if np.any(~(psums > 0.0)):
+        nidx = free[np.flatnonzero(~(psums > 0.0))[0]]
+        raise ToytreeError(f"invalid posterior probabilities at node {nidx}")
+    node_cdfs = np.ones_like(posterior)
+    node_cdfs[free] = np.cumsum(posterior[free], axis=1) / psums[:, None]
+
+    edges = tree.get_edges("idx").astype(np.int64)
     dists = tree.get_node_data("dist").to_numpy(dtype=float)
     heights = tree.get_node_data("height").to_numpy(dtype=float)
     state_labels = list(node_probs.columns)
-    rng = np.random.default_rng(seed)
 
     edge_table = pd.DataFrame(
         {
@@ -1050,97 +1351,32 @@ def simulate_stochastic_map(
         }
     )
 
-    rows: list[dict] = []
-    node_rows: list[dict] = []
-    for map_id in range(nreplicates):
-        sampled_node_states = np.full(tree.nnodes, -1, dtype=int)
-        for nidx in range(tree.nnodes):
-            if fixed_states[nidx] >= 0:
-                sampled_node_states[nidx] = fixed_states[nidx]
-                continue
-            if mode == "posterior" and np.all(np.isfinite(entered_posteriors[nidx])):
-                probs = entered_posteriors[nidx].astype(float)
-            else:
-                probs = posterior[nidx].astype(float)
-            psum = float(probs.sum())
-            if psum <= 0.0:
-                raise ToytreeError(f"invalid posterior probabilities at node {nidx}")
-            probs /= psum
-            sampled_node_states[nidx] = int(rng.choice(len(probs), p=probs))
-
-        for nidx, state_idx in enumerate(sampled_node_states):
-            state_idx = int(state_idx)
-            node_rows.append(
-                {
-                    "map_id": map_id,
-                    "node": int(nidx),
-                    "state_idx": state_idx,
-                    "state": state_labels[state_idx],
-                }
-            )
-
-        for edge_id, (child, parent) in enumerate(edges):
-            child = int(child)
-            parent = int(parent)
-            length = float(dists[child])
-            start_state = int(sampled_node_states[child])
-            end_state = int(sampled_node_states[parent])
-
-            if eng == "rejection":
-                segs = _sample_branch_history_rejection(
-                    qmatrix=qmatrix,
-                    length=length,
-                    start_state=start_state,
-                    end_state=end_state,
-                    rng=rng,
-                    max_attempts=int(max_branch_attempts),
-                )
-            else:
-                try:
-                    segs = _sample_branch_history_uniformized(
-                        qmatrix=qmatrix,
-                        length=length,
-                        start_state=start_state,
-                        end_state=end_state,
-                        rng=rng,
-                        omega_buffer=0.05,
-                        max_terms=5000,
-                        tol=1e-12,
-                    )
-                except ToytreeError:
-                    segs = _sample_branch_history_rejection(
-                        qmatrix=qmatrix,
-                        length=length,
-                        start_state=start_state,
-                        end_state=end_state,
-                        rng=rng,
-                        max_attempts=int(max_branch_attempts),
-                    )
-
-            base_abs = float(heights[child])
-            for state_idx, t_start, t_end in segs:
-                rows.append(
-                    {
-                        "map_id": map_id,
-                        "edge_id": edge_id,
-                        "child": child,
-                        "parent": parent,
-                        "state_idx": int(state_idx),
-                        "state": state_labels[int(state_idx)],
-                        "t_start": float(t_start),
-                        "t_end": float(t_end),
-                        "duration": float(t_end - t_start),
-                        "time_abs_start": base_abs + float(t_start),
-                        "time_abs_end": base_abs + float(t_end),
-                    }
-                )
+    # replicates are sampled in blocks with independent random streams.
+    sampler = _BranchHistorySampler(
+        qmatrix=qmatrix,
+        freqs=np.asarray(model_fit.state_frequencies, dtype=float),
+        lengths=edge_table["length"].to_numpy(),
+        engine=eng,
+        max_attempts=int(max_branch_attempts),
+    )
+    size = max(1, _MAX_BLOCK_ITEMS // max(1, edges.shape[0]))
+    nreps = [min(size, nreplicates - i) for i in range(0, nreplicates, size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(nreps))
+    blocks = _sample_maps_parallel(
+        sampler, edges, node_cdfs, fixed_states, list(zip(seeds, nreps)), workers
+    )
 
-    return PCMStochasticMapResult(
-        segments=pd.DataFrame(rows),
-        node_states=pd.DataFrame(node_rows),
+    offsets = np.cumsum([0] + nreps[:-1])
+    dtype = np.min_scalar_type(-len(state_labels))
+    node_state_array = np.concatenate([i[0].astype(dtype) for i in blocks])
+    jumps = (np.concatenate([i[1] + off for i, off in zip(blocks, offsets)]),)
+    jumps += tuple(np.concatenate([i[j] for i in blocks]) for j in range(2, 6))
+    return PCMStochasticMapResult._from_arrays(
+        node_state_array=node_state_array,
+        edge_heights=heights[edges[:, 0]],
+        jumps=jumps,
         edge_table=edge_table,
         state_labels=tuple(state_labels),
         model=model_fit.model,
         engine=eng,
-        nreplicates=int(nreplicates),
     )
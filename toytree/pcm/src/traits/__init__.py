@@ -19,6 +19,10 @@ _LAZY_ATTRS = {
         "toytree.pcm.src.traits.fit_discrete_ctmc",
         "fit_discrete_ctmc",
     ),
+    "fit_discrete_ctmc_multi": (
+        "toytree.pcm.src.traits.fit_discrete_ctmc",
+        "fit_discrete_ctmc_multi",
+    ),
     "infer_ancestral_states_discrete_ctmc": (
         "toytree.pcm.src.traits.fit_discrete_ctmc",
         "infer_ancestral_states_discrete_ctmc",
@@ -13,6 +13,11 @@ comparative models on a phylogeny:
 All models profile the intercept (``mu``) and diffusion rate (``sigma2``)
 from a model-specific covariance kernel. OU and EB additionally optimize a
 single scalar parameter (``alpha`` or ``r``) by bounded 1-D search.
+
+Kernels are never built as dense matrices. Each model is expressed by
+edge-wise transformed variances (and, for OU, edge-wise decay of deviations
+from the root value), such that likelihoods and node states are computed in
+linear time by pruning recursions (see ``PhyloPruningEngine.three_point``).
 """
 
 from __future__ import annotations
@@ -26,6 +31,8 @@ from scipy.optimize import minimize_scalar
 
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
 from toytree.data._src.expand_node_mapping import expand_node_mapping
+from toytree.distance._src.nodedist import _get_root_distances
+from toytree.pcm.src.phylolinalg.pgls import PhyloPruningEngine
 from toytree.pcm.src.traits.aic_table import PCMModelResult, aic_table
 from toytree.utils.src.exceptions import ToytreeError
 
@@ -128,17 +135,14 @@ class PCMContinuousMLModelFit:
         self.tip_values = self.series.iloc[: self.tree.ntips].to_numpy(dtype=float)
         self.nobs = int(self.tip_values.size)
 
-        # Precompute times/shared-times once because every model kernel uses them.
+        # Precompute root times and edge lengths once. Every model evaluates
+        # its likelihood by pruning over edge-wise transformed lengths.
         self.root_idx = int(self.tree.treenode.idx)
-        self.dmat = self.tree.distance.get_node_distance_matrix()
-        self.t_all = self.dmat[:, self.root_idx].astype(float)
+        self.engine = PhyloPruningEngine(self.tree)
+        self.dists = np.array([i._dist for i in self.tree], dtype=float)
+        self.dists[self.root_idx] = 0.0
+        self.t_all = _get_root_distances(self.tree)
         self.t_tips = self.t_all[: self.tree.ntips]
-        self.shared_tips = self._compute_shared_time_matrix(
-            list(range(self.tree.ntips))
-        )
-        self.shared_all = self._compute_shared_time_matrix(
-            list(range(self.tree.nnodes))
-        )
 
     def _coerce_model(self, model: Optional[Literal["BM", "OU", "EB"]]) -> str:
         """Validate and normalize a single model name."""
@@ -173,59 +177,46 @@ class PCMContinuousMLModelFit:
             raise ToytreeError("tip trait values cannot be missing for model fitting.")
         return out
 
-    def _compute_shared_time_matrix(self, node_indices: list[int]) -> np.ndarray:
-        """Return root-to-MRCA shared-time matrix for selected node indices."""
-        n = len(node_indices)
-        shared = np.zeros((n, n), dtype=float)
-        for i in range(n):
-            ni = node_indices[i]
-            shared[i, i] = self.t_all[ni]
-            for j in range(i + 1, n):
-                nj = node_indices[j]
-                mrca = self.tree.get_mrca_node(ni, nj)
-                st = float(self.dmat[mrca.idx, self.root_idx])
-                shared[i, j] = st
-                shared[j, i] = st
-        return shared
-
-    def _kernel_bm(self, shared: np.ndarray) -> np.ndarray:
-        """Return BM covariance shape kernel."""
-        return shared.copy()
-
-    def _kernel_ou(
-        self,
-        shared: np.ndarray,
-        times: np.ndarray,
-        alpha: float,
-    ) -> np.ndarray:
-        """Return OU covariance shape kernel with scalar alpha."""
+    def _transform_bm(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return BM edge variances and (unit) edge scales."""
+        return self.dists, np.ones(self.tree.nnodes)
+
+    def _transform_ou(self, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+        """Return OU edge variances and edge scales for scalar alpha.
+
+        Along an edge of length ``t`` the OU deviation from the optimum
+        decays by ``exp(-alpha t)`` and gains variance
+        ``(1 - exp(-2 alpha t)) / (2 alpha)``.
+        """
         if alpha <= 0:
-            return shared.copy()
-        ti = times[:, None]
-        tj = times[None, :]
-        return np.exp(-alpha * (ti + tj - 2.0 * shared)) * (
-            (1.0 - np.exp(-2.0 * alpha * shared)) / (2.0 * alpha)
-        )
+            return self._transform_bm()
+        lengths = -np.expm1(-2.0 * alpha * self.dists) / (2.0 * alpha)
+        return lengths, np.exp(-alpha * self.dists)
 
-    def _kernel_eb(self, shared: np.ndarray, r: float) -> np.ndarray:
-        """Return EB covariance shape kernel with scalar rate trend r."""
+    def _transform_eb(self, r: float) -> tuple[np.ndarray, np.ndarray]:
+        """Return EB edge variances and (unit) edge scales for scalar r."""
         if np.isclose(r, 0.0):
-            return shared.copy()
-        return (np.exp(r * shared) - 1.0) / r
+            return self._transform_bm()
+        lengths = np.exp(r * (self.t_all - self.dists)) * np.expm1(r * self.dists) / r
+        return lengths, np.ones(self.tree.nnodes)
 
     def _stable_profiled_fit(
         self,
         y: np.ndarray,
-        kernel: np.ndarray,
+        lengths: np.ndarray,
+        edge_scales: np.ndarray,
     ) -> dict[str, float]:
-        """Profile ``mu`` and ``sigma2`` from a covariance shape kernel.
+        """Profile ``mu`` and ``sigma2`` from edge-wise model parameters.
 
         Parameters
         ----------
         y : np.ndarray
             Observed tip trait vector.
-        kernel : np.ndarray
-            Positive-semidefinite covariance shape matrix before sigma2 scaling.
+        lengths : np.ndarray
+            Edge variances of the covariance shape (before sigma2 scaling)
+            by node idx.
+        edge_scales : np.ndarray
+            Edge scalings of deviations from the root value by node idx.
 
         Returns
         -------
@@ -235,52 +226,45 @@ class PCMContinuousMLModelFit:
         Raises
         ------
         ToytreeError
-            If covariance factorization is numerically unstable.
+            If the pruning recursion is numerically unstable.
         """
         n = y.size
-        ones = np.ones(n, dtype=float)
-        base = np.array(kernel, dtype=float, copy=True)
-        if np.any(~np.isfinite(base)):
+        if np.any(~np.isfinite(lengths)) or np.any(~np.isfinite(edge_scales)):
             raise ToytreeError("covariance kernel contains non-finite values.")
 
+        # Center y to limit cancellation in the profiled quadratic form.
+        ybar = float(y.mean())
+        X = np.column_stack([np.ones(n), y - ybar])
+
         # Add progressively larger diagonal jitter to stabilize near-singular
         # kernels while preserving the intended covariance shape as much as possible.
-        L = None
+        quad = None
         for jitter in (0.0, 1e-12, 1e-10, 1e-8, 1e-6, 1e-4):
-            cov = base.copy()
-            if jitter > 0:
-                cov.flat[:: cov.shape[0] + 1] += jitter
             try:
-                L = np.linalg.cholesky(cov)
+                quad, logdet_r = self.engine.three_point(
+                    X, lengths, edge_scales, leaf_var=np.full(n, jitter)
+                )
                 break
             except np.linalg.LinAlgError:
                 continue
-        if L is None:
+        if quad is None:
             raise ToytreeError("failed to factor covariance matrix (non-PD).")
 
-        def solve(v: np.ndarray) -> np.ndarray:
-            return np.linalg.solve(L.T, np.linalg.solve(L, v))
-
-        Rinv_y = solve(y)
-        Rinv_1 = solve(ones)
-        den = float(ones @ Rinv_1)
+        den = float(quad[0, 0])
         if den <= 0 or not np.isfinite(den):
             raise ToytreeError("invalid denominator while profiling mu.")
 
-        mu = float((ones @ Rinv_y) / den)
-        res = y - mu
-        quad = float(res @ solve(res))
+        mu = ybar + float(quad[0, 1] / den)
+        quad = float(quad[1, 1] - quad[0, 1] ** 2 / den)
         # Floor very small numerical negatives to keep sigma2/loglik finite.
         quad = max(quad, 1e-15)
         sigma2 = max(quad / n, 1e-15)
-        logdet_r = float(2.0 * np.log(np.diag(L)).sum())
         loglik = -0.5 * (n * np.log(2.0 * np.pi) + n * np.log(sigma2) + logdet_r + n)
         return {"mu": mu, "sigma2": sigma2, "loglik": float(loglik)}
 
     def _fit_bm(self) -> tuple[dict[str, float], bool, str]:
         """Fit BM by direct profiled likelihood evaluation."""
-        kernel = self._kernel_bm(self.shared_tips)
-        fit = self._stable_profiled_fit(self.tip_values, kernel)
+        fit = self._stable_profiled_fit(self.tip_values, *self._transform_bm())
         return fit, True, "closed-form"
 
     def _fit_ou(self) -> tuple[dict[str, float], bool, str, float]:
@@ -289,16 +273,16 @@ class PCMContinuousMLModelFit:
 
         def objective(alpha: float) -> float:
             try:
-                kernel = self._kernel_ou(self.shared_tips, self.t_tips, alpha)
-                return -self._stable_profiled_fit(self.tip_values, kernel)["loglik"]
+                kernel = self._transform_ou(alpha)
+                return -self._stable_profiled_fit(self.tip_values, *kernel)["loglik"]
             except Exception:
                 # Numerical failures at this alpha are treated as invalid space.
                 return np.inf
 
         res = minimize_scalar(objective, bounds=(lo, hi), method="bounded")
         alpha_hat = float(res.x)
-        kernel = self._kernel_ou(self.shared_tips, self.t_tips, alpha_hat)
-        fit = self._stable_profiled_fit(self.tip_values, kernel)
+        kernel = self._transform_ou(alpha_hat)
+        fit = self._stable_profiled_fit(self.tip_values, *kernel)
         return fit, bool(res.success), str(res.message), alpha_hat
 
     def _fit_eb(self) -> tuple[dict[str, float], bool, str, float]:
@@ -307,16 +291,16 @@ class PCMContinuousMLModelFit:
 
         def objective(r: float) -> float:
             try:
-                kernel = self._kernel_eb(self.shared_tips, r)
-                return -self._stable_profiled_fit(self.tip_values, kernel)["loglik"]
+                kernel = self._transform_eb(r)
+                return -self._stable_profiled_fit(self.tip_values, *kernel)["loglik"]
             except Exception:
                 # Numerical failures at this r are treated as invalid space.
                 return np.inf
 
         res = minimize_scalar(objective, bounds=(lo, hi), method="bounded")
         r_hat = float(res.x)
-        kernel = self._kernel_eb(self.shared_tips, r_hat)
-        fit = self._stable_profiled_fit(self.tip_values, kernel)
+        kernel = self._transform_eb(r_hat)
+        fit = self._stable_profiled_fit(self.tip_values, *kernel)
         return fit, bool(res.success), str(res.message), r_hat
 
     def _build_model_result(
@@ -387,64 +371,44 @@ class PCMContinuousMLModelFit:
             ``(anc_mean, anc_var)`` vectors for all nodes in node-index order.
         """
         if model_fit.model == "BM":
-            r_all = self._kernel_bm(self.shared_all)
+            kernel = self._transform_bm()
         elif model_fit.model == "OU":
             alpha = 0.0 if model_fit.alpha is None else float(model_fit.alpha)
-            r_all = self._kernel_ou(self.shared_all, self.t_all, alpha)
+            kernel = self._transform_ou(alpha)
         else:
             rate = 0.0 if model_fit.r is None else float(model_fit.r)
-            r_all = self._kernel_eb(self.shared_all, rate)
-
-        c_all = float(model_fit.sigma2) * r_all
-        tips = np.arange(self.tree.ntips, dtype=int)
-        ints = np.arange(self.tree.ntips, self.tree.nnodes, dtype=int)
-
-        # Partition total covariance into observed tips (tt), internal-vs-tip (it),
-        # and internal-only (ii) blocks for Gaussian conditioning.
-        c_tt = c_all[np.ix_(tips, tips)]
-        c_it = c_all[np.ix_(ints, tips)]
-        c_ii = c_all[np.ix_(ints, ints)]
-
-        # Re-factor the tip block with diagonal jitter. This keeps conditioning
-        # numerically stable when c_tt is near-singular.
-        L = None
-        c_tt_base = np.array(c_tt, copy=True)
+            kernel = self._transform_eb(rate)
+
+        # Deviations of node values from mu follow the edge-wise process with
+        # the root fixed at zero, and so are conditioned on the tips by a
+        # two-pass pruning recursion.
+        sigma2 = float(model_fit.sigma2)
+        mu = float(model_fit.mu)
+        y_t = self.tip_values
+
+        # Add diagonal jitter to the tip covariance if needed. This keeps
+        # conditioning numerically stable when it is near-singular.
+        states = None
         for jitter in (0.0, 1e-12, 1e-10, 1e-8, 1e-6, 1e-4):
-            c_work = c_tt_base.copy()
-            if jitter > 0:
-                c_work.flat[:: c_work.shape[0] + 1] += jitter
             try:
-                L = np.linalg.cholesky(c_work)
+                states = self.engine.conditional_node_states(
+                    y_t - mu,
+                    *kernel,
+                    leaf_var=np.full(self.nobs, jitter / sigma2),
+                )
                 break
             except np.linalg.LinAlgError:
                 continue
-        if L is None:
+        if states is None:
             raise ToytreeError(
                 "failed to condition node states: tip covariance is not PD."
             )
 
-        def solve(v: np.ndarray) -> np.ndarray:
-            return np.linalg.solve(L.T, np.linalg.solve(L, v))
-
-        y_t = self.tip_values
-        mu = float(model_fit.mu)
-        delta = y_t - mu
-
-        # Conditional Gaussian formulas:
-        # E[X_i | X_t] = mu + C_it C_tt^{-1}(y_t - mu)
-        # Var[X_i | X_t] = C_ii - C_it C_tt^{-1} C_ti
-        cond_mean_int = mu + c_it @ solve(delta)
-        cond_cov_int = c_ii - c_it @ solve(c_it.T)
-        cond_var_int = np.clip(np.diag(cond_cov_int), 0.0, np.inf)
-
-        all_mean = np.full(self.tree.nnodes, np.nan, dtype=float)
-        all_var = np.full(self.tree.nnodes, np.nan, dtype=float)
-
         # Tip observations are treated as hard constraints in conditioning.
-        all_mean[tips] = y_t
-        all_var[tips] = 0.0
-        all_mean[ints] = cond_mean_int
-        all_var[ints] = cond_var_int
+        all_mean = mu + states[0]
+        all_var = np.clip(sigma2 * states[1], 0.0, np.inf)
+        all_mean[: self.tree.ntips] = y_t
+        all_var[: self.tree.ntips] = 0.0
 
         return (
             pd.Series(all_mean, index=range(self.tree.nnodes), name="anc_mean"),
@@ -11,6 +11,11 @@ parameterization where off-diagonal rates follow:
 
 with r_ij representing relative rates and pi_j the stationary
 frequencies. Diagonal elements are set so each row sums to zero.
+
+Likelihoods are computed by a `DiscretePruningEngine`, which builds the
+P(t) matrices of all edges from one eigendecomposition of Q, prunes
+groups of nodes at the same height at once, and rescales partial
+likelihoods at every node so that they do not underflow on large trees.
 """
 
 from __future__ import annotations
@@ -21,23 +26,32 @@ from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from scipy.linalg import expm
 from scipy.optimize import minimize
 
 # from loguru import logger
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
 from toytree.data._src.expand_node_mapping import expand_node_mapping
-from toytree.pcm.src.sim.sim_discrete import MarkovModel
+from toytree.pcm.src.sim.sim_discrete import MarkovModel, _get_transition_matrices
 from toytree.pcm.src.traits.aic_table import PCMModelResult
+from toytree.pcm.src.utils import _get_height_levels
 from toytree.utils.src.exceptions import ToytreeError
+from toytree.utils.src.parallel import get_workers, map_chunks
 
 __all__ = [
     "PCMDiscreteCTMCFitResult",
     # "DiscreteMarkovModelFit",
     "fit_discrete_ctmc",
+    "fit_discrete_ctmc_multi",
     "infer_ancestral_states_discrete_ctmc",
 ]
 
+# min log-likelihood per edge of a site pattern seen by the optimizer,
+# i.e., the former clipping of likelihoods at 1e-300 applied per edge
+# such that feasible values on large trees are never clipped.
+_MIN_EDGE_LOGLIK = float(np.log(1e-300))
+# smallest product of child messages computed without log scaling.
+_MIN_SCALE = 1e-250
+
 
 @dataclass
 class PCMDiscreteCTMCFitResult(PCMModelResult):
@@ -102,6 +116,207 @@ class PCMDiscreteCTMCFitResult(PCMModelResult):
         )
 
 
+def _max_states(arr: np.ndarray) -> np.ndarray:
+    """Return the max over the last (states) axis of an array.
+
+    This is several times faster than ``arr.max(axis=-1)`` for the
+    small state axes of discrete models.
+    """
+    out = arr[..., 0].copy()
+    for idx in range(1, arr.shape[-1]):
+        np.maximum(out, arr[..., idx], out=out)
+    return out
+
+
+def _reduce_slots(
+    values: np.ndarray,
+    slots: List[Tuple[np.ndarray, np.ndarray]],
+    ufunc: np.ufunc,
+    transform: Optional[np.ufunc] = None,
+) -> np.ndarray:
+    """Return values of children reduced by parent over (pos, idxs) slots."""
+    transform = transform if transform is not None else np.positive
+    out = transform(values[slots[0][1]])
+    for pos, cidxs in slots[1:]:
+        if pos.size == out.shape[0]:
+            ufunc(out, transform(values[cidxs]), out=out)
+        else:
+            out[pos] = ufunc(out[pos], transform(values[cidxs]))
+    return out
+
+
+class DiscretePruningEngine:
+    """Vectorized pruning of discrete CTMC likelihoods on a fixed tree.
+
+    Topology arrays are cached once per tree, such that each evaluation
+    of the likelihood for a new Q matrix requires one batched build of
+    every edge's P(t) matrix (see `_get_transition_matrices`) and one
+    pass over groups of Nodes at the same height above the tips. Node
+    partial likelihoods are rescaled to a max of 1 at every Node and
+    the log scale factors are accumulated, such that likelihoods do not
+    underflow on large trees.
+
+    Partial likelihoods are stored with a pattern axis, as arrays of
+    shape (nnodes, npatterns, nstates), where each pattern is a set of
+    observations evolving independently on the same tree.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        Tree with branch lengths in the same time units as rates.
+    """
+
+    def __init__(self, tree) -> None:
+        self.nnodes = tree.nnodes
+        self.ntips = tree.ntips
+        self.parents = tree._get_parent_idxs()
+        self.dists = tree.get_node_data("dist").to_numpy(dtype=float)
+        self.dists[-1] = 0.0
+        self.levels: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self.slots: List[List[Tuple[np.ndarray, np.ndarray]]] = []
+        self._build_level_arrays(tree)
+
+    def _build_level_arrays(self, tree) -> None:
+        """Cache height levels and the child slots of each level.
+
+        Levels are (parents, children, offsets) arrays from
+        `_get_height_levels`. For each level the j-th children of its
+        parents are also stored as (parent positions, child idxs) slots,
+        such that products over children of bifurcating parents are a
+        single elementwise product.
+        """
+        self.levels = _get_height_levels(tree)
+        for _, cidxs, offsets in self.levels:
+            counts = np.diff(offsets, append=cidxs.size)
+            slots = []
+            for slot in range(counts.max()):
+                pos = np.flatnonzero(counts > slot)
+                slots.append((pos, cidxs[offsets[pos] + slot]))
+            self.slots.append(slots)
+
+    def get_partials(self, states: np.ndarray, nstates: int) -> np.ndarray:
+        """Return observation partials from integer-coded states.
+
+        Parameters
+        ----------
+        states: np.ndarray
+            Float array of shape (nnodes,) or (nnodes, npatterns) with
+            integer state codes, or NaN where a Node is unobserved.
+        nstates: int
+            Number of states in the model.
+        """
+        states = np.asarray(states, dtype=float)
+        if states.ndim == 1:
+            states = states[:, None]
+        partials = np.ones(states.shape + (nstates,), dtype=float)
+        observed = ~np.isnan(states)
+        partials[observed] = np.eye(nstates)[states[observed].astype(int)]
+        return partials
+
+    def prune(
+        self, probs: np.ndarray, partials: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return scaled conditional likelihoods at every Node.
+
+        Parameters
+        ----------
+        probs: np.ndarray
+            Array of shape (nnodes, nstates, nstates) with the P(t)
+            matrix of the edge above each Node.
+        partials: np.ndarray
+            Array of shape (nnodes, npatterns, nstates) with 1 for the
+            states allowed at each Node and 0 otherwise.
+
+        Returns
+        -------
+        tuple
+            ``(lik, lnorm, msgs)`` where ``lik`` are partials rescaled
+            to a max of 1, ``lnorm`` the log of the scale factors summed
+            over each Node's subtree, and ``msgs`` the partials moved
+            to the top of the edge above each Node.
+        """
+        lik = partials.copy()
+        msgs = np.zeros_like(lik)
+        lnorm = np.zeros(lik.shape[:2], dtype=float)
+        # messages at the top of each edge are batched products L @ P^T.
+        probs_t = probs.transpose(0, 2, 1)
+        msgs[: self.ntips] = lik[: self.ntips] @ probs_t[: self.ntips]
+
+        with np.errstate(divide="ignore", invalid="ignore", under="ignore"):
+            for (parents, children, offsets), slots in zip(self.levels, self.slots):
+                prod = _reduce_slots(msgs, slots, np.multiply)
+                shift = np.zeros(prod.shape[:2])
+                # multiply in log space if the product may have underflowed.
+                if _max_states(prod).min() < _MIN_SCALE:
+                    logm = _reduce_slots(msgs, slots, np.add, np.log)
+                    shift = _max_states(logm)
+                    shift[~np.isfinite(shift)] = 0.0
+                    prod = np.exp(logm - shift[..., None])
+                prod *= lik[parents]
+                scale = _max_states(prod)
+                scale[~(scale > 0)] = 1.0
+                prod /= scale[..., None]
+                lik[parents] = prod
+                lnorm[parents] = (
+                    _reduce_slots(lnorm, slots, np.add) + shift + np.log(scale)
+                )
+                msgs[parents] = prod @ probs_t[parents]
+        return lik, lnorm, msgs
+
+    def log_likelihood(
+        self, probs: np.ndarray, partials: np.ndarray, prior: np.ndarray
+    ) -> np.ndarray:
+        """Return the log-likelihood of each pattern given a root prior."""
+        lik, lnorm, _ = self.prune(probs, partials)
+        with np.errstate(divide="ignore"):
+            return np.log(lik[-1] @ prior) + lnorm[-1]
+
+    def posteriors(
+        self, probs: np.ndarray, partials: np.ndarray, prior: np.ndarray
+    ) -> np.ndarray:
+        """Return marginal posterior state probabilities at every Node.
+
+        The up-pass message of each child is its parent's up-pass
+        message times the product of its siblings' messages, moved down
+        the child's edge. Sibling products exclude the child by
+        subtracting its log from the log product of all children, with
+        zeros counted separately, such that the pass is linear in the
+        number of Nodes also for polytomies. Rows of the returned array
+        of shape (nnodes, npatterns, nstates) sum to 1, or are all 0
+        where an observation is impossible.
+        """
+        lik, _, msgs = self.prune(probs, partials)
+        up = np.zeros_like(lik)
+        up[-1] = prior
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for parents, children, offsets in reversed(self.levels):
+                # position of each child's parent within this level.
+                pos = np.repeat(
+                    np.arange(parents.size), np.diff(offsets, append=children.size)
+                )
+                zero = ~(msgs[children] > 0)
+                logm = np.where(zero, 0.0, np.log(msgs[children]))
+                nzero = np.add.reduceat(zero.astype(int), offsets, axis=0)[pos] - zero
+                logm = np.add.reduceat(logm, offsets, axis=0)[pos] - logm
+                logm[nzero > 0] = -np.inf
+                shift = logm.max(axis=-1)
+                shift[~np.isfinite(shift)] = 0.0
+                sibs = np.exp(logm - shift[..., None])
+
+                pidxs = parents[pos]
+                weight = up[pidxs] * partials[pidxs] * sibs
+                down = np.einsum("nmi,nij->nmj", weight, probs[children])
+                scale = down.max(axis=-1)
+                scale[~(scale > 0)] = 1.0
+                up[children] = down / scale[..., None]
+
+        post = up * lik
+        total = post.sum(axis=-1)
+        total[~(total > 0)] = 1.0
+        return post / total[..., None]
+
+
 class DiscreteMarkovModelFit:
     """Fit a discrete Markov model (ER, SYM, ARD) using ML.
 
@@ -113,9 +328,12 @@ class DiscreteMarkovModelFit:
     ----------
     tree: ToyTree
         Tree with branch lengths in the same time units as rates.
-    data: str or pandas.Series
-        A single trait as a feature name on the tree, or a Series.
-        Values are categorical states or NaN for missing.
+    data: str, pandas.Series, or pandas.DataFrame
+        A single trait as a feature name on the tree, or a Series, or
+        many characters as columns of a DataFrame indexed by Node
+        queries (e.g., tip names). Values are categorical states or NaN
+        for missing. Characters of a DataFrame share one model and are
+        compressed into weighted unique site patterns.
     nstates: int
         Number of discrete states (must be >= the number observed).
     model: str
@@ -137,7 +355,7 @@ class DiscreteMarkovModelFit:
     def __init__(
         self,
         tree,
-        data: Union[str, pd.Series],
+        data: Union[str, pd.Series, pd.DataFrame],
         nstates: int,
         model: str,
         fixed_rates: Optional[np.ndarray] = None,
@@ -170,15 +388,26 @@ class DiscreteMarkovModelFit:
         self.state_names = self._build_state_names()
         self._rate_param_info = self._build_rate_parameterization()
         self._freq_param_info = self._build_frequency_parameterization()
-
-    def _coerce_data(self, data: Union[str, pd.Series]) -> pd.Series:
-        """Ensure data are a single-trait Series in node index order."""
+        self.engine = DiscretePruningEngine(self.tree)
+        self.patterns, self.pattern_weights, self.pattern_index = (
+            self._compress_patterns()
+        )
+        self.partials = self.engine.get_partials(self.patterns, self.nstates)
+
+    def _coerce_data(
+        self, data: Union[str, pd.Series, pd.DataFrame]
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """Ensure data are a Series or DataFrame in node index order."""
+        if isinstance(data, pd.DataFrame):
+            return self._coerce_frame(data)
         if isinstance(data, str):
             series = self.tree.get_node_data(data, missing=float("nan"))
         elif isinstance(data, pd.Series):
             series = data.copy()
         else:
-            raise ToytreeError("data must be a feature name (str) or pandas Series")
+            raise ToytreeError(
+                "data must be a feature name (str), pandas Series, or DataFrame"
+            )
 
         # Accept all-node or tip-only series and expand to all nodes.
         mapping = dict(series.dropna())
@@ -189,9 +418,23 @@ class DiscreteMarkovModelFit:
         name = series.name if series.name is not None else "trait"
         return pd.Series(arr, index=range(self.tree.nnodes), name=name)
 
+    def _coerce_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Expand a (nodes x characters) DataFrame to all nodes."""
+        if not data.index.is_unique:
+            raise ToytreeError("data index must be unique to align rows to nodes")
+        if data.shape[1] == 0:
+            raise ToytreeError("data must contain at least one character column")
+        rows = {key: pos for pos, key in enumerate(data.index)}
+        rows = expand_node_mapping(self.tree, rows)
+        values = data.to_numpy(dtype=object)
+        arr = np.full((self.tree.nnodes, data.shape[1]), np.nan, dtype=object)
+        for node, pos in rows.items():
+            arr[node._idx] = values[pos]
+        return pd.DataFrame(arr, index=range(self.tree.nnodes), columns=data.columns)
+
     def _build_state_map(self) -> Tuple[List[object], Dict[object, int]]:
         """Build a map from observed categorical states to integer indices."""
-        observed = pd.unique(self.data.values)
+        observed = pd.unique(self.data.to_numpy(dtype=object).ravel())
         observed = [val for val in observed if pd.notna(val)]
         state_labels = sorted(observed)
         state_map = {state: idx for idx, state in enumerate(state_labels)}
@@ -278,10 +521,27 @@ class DiscreteMarkovModelFit:
 
     def _encode_tip_states(self) -> np.ndarray:
         """Convert tip data to integer state codes with NaN for missing."""
-        tip_states = self.data.copy()
+        values = self.data.to_numpy(dtype=object)
+        tip_states = np.full(values.shape, np.nan)
         for state, idx in self.state_map.items():
-            tip_states[tip_states == state] = idx
-        return tip_states.astype(float).to_numpy()
+            tip_states[values == state] = idx
+        return tip_states
+
+    def _compress_patterns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return unique site patterns, their counts, and each column's pattern.
+
+        Characters with identical states at every node have identical
+        likelihoods, so each unique pattern is pruned once and its
+        log-likelihood is weighted by the number of characters sharing
+        it. Patterns are returned as a (nnodes, npatterns) array.
+        """
+        codes = np.nan_to_num(self.tip_states.reshape(self.tree.nnodes, -1), nan=-1)
+        patterns, index, counts = np.unique(
+            codes.T, axis=0, return_inverse=True, return_counts=True
+        )
+        patterns = patterns.T.astype(float)
+        patterns[patterns < 0] = np.nan
+        return patterns, counts.astype(float), index.ravel()
 
     def _build_rate_parameterization(self) -> Dict[str, object]:
         """Determine which rate parameters are fixed or free."""
@@ -416,88 +676,49 @@ class DiscreteMarkovModelFit:
         )
         return model.qmatrix, rates, freqs
 
-    def _compute_conditional_likelihoods(
-        self, qmatrix: np.ndarray
-    ) -> Dict[object, np.ndarray]:
-        """Compute conditional likelihoods at every node."""
-        likelihoods: Dict[object, np.ndarray] = {}
-        nstates = self.nstates
-        node_states = self.tip_states
-
-        for node in self.tree.treenode.traverse("postorder"):
-            node_lik = np.ones(nstates)
-            if not node.is_leaf():
-                for child in node.children:
-                    prob = expm(qmatrix * child.dist)
-                    child_lik = prob @ likelihoods[child]
-                    node_lik *= child_lik
-
-            state = node_states[node._idx]
-            if not np.isnan(state):
-                mask = np.zeros(nstates)
-                mask[int(state)] = 1.0
-                node_lik *= mask
-            likelihoods[node] = node_lik
-        return likelihoods
-
-    def _pruning_likelihood(self, qmatrix: np.ndarray, freqs: np.ndarray) -> float:
-        """Compute likelihood with pruning algorithm."""
-        likelihoods = self._compute_conditional_likelihoods(qmatrix)
-
-        root = self.tree.treenode
+    def _transition_matrices(
+        self, qmatrix: np.ndarray, freqs: np.ndarray
+    ) -> np.ndarray:
+        """Return P(t) for the edge above every node in idx order."""
+        return _get_transition_matrices(qmatrix, self.engine.dists, freqs)
+
+    def _pattern_log_likelihoods(
+        self, qmatrix: np.ndarray, freqs: np.ndarray
+    ) -> np.ndarray:
+        """Return log-likelihoods of each site pattern by pruning."""
         prior = self.root_prior if self.root_prior is not None else freqs
-        root_lik = likelihoods[root]
-        return float((root_lik * prior).sum())
+        probs = self._transition_matrices(qmatrix, freqs)
+        return self.engine.log_likelihood(probs, self.partials, prior)
+
+    def _log_likelihood(self, qmatrix: np.ndarray, freqs: np.ndarray) -> float:
+        """Compute the log-likelihood with the pruning algorithm."""
+        logliks = self._pattern_log_likelihoods(qmatrix, freqs)
+        return float(self.pattern_weights @ logliks)
 
     def _compute_node_posteriors(
         self, qmatrix: np.ndarray, freqs: np.ndarray
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Return posterior state probabilities and inferred states per node."""
-        likelihoods = self._compute_conditional_likelihoods(qmatrix)
-        nstates = self.nstates
-
+        if self.data.ndim > 1:
+            raise ToytreeError("node posteriors require data for a single trait")
         prior = self.root_prior if self.root_prior is not None else freqs
-        up: Dict[object, np.ndarray] = {}
-        up[self.tree.treenode] = prior.copy()
-
-        for node in self.tree.treenode.traverse("preorder"):
-            if node.is_leaf():
-                continue
-            for child in node.children:
-                sibling_product = np.ones(nstates)
-                for sibling in node.children:
-                    if sibling is child:
-                        continue
-                    prob_sib = expm(qmatrix * sibling.dist)
-                    sib_lik = prob_sib @ likelihoods[sibling]
-                    sibling_product *= sib_lik
-                prob_child = expm(qmatrix * child.dist)
-                parent_weight = up[node] * sibling_product
-                up[child] = parent_weight @ prob_child
+        probs = self._transition_matrices(qmatrix, freqs)
+        posterior = self.engine.posteriors(probs, self.partials, prior)[:, 0]
+
+        # Zero-mass posteriors indicate incompatible CTMC constraints or
+        # an impossible reconstruction; normalizing would silently emit NaNs.
+        invalid = ~(posterior.sum(axis=1) > 0)
+        if invalid.any():
+            node_idx = int(np.flatnonzero(invalid)[-1])
+            raise ToytreeError(
+                "Ancestral-state inference produced zero or invalid "
+                f"posterior mass at node {node_idx}. This usually means "
+                "the observed states are incompatible with the fitted "
+                "CTMC constraints, such as internal-node observations, "
+                "fixed_rates, fixed_state_frequencies, or root_prior."
+            )
 
         nnodes = self.tree.nnodes
-        posterior = np.zeros((nnodes, nstates))
-        for node in self.tree.treenode.traverse("preorder"):
-            node_idx = node._idx
-            node_post = up[node] * likelihoods[node]
-            total = float(node_post.sum())
-            # Zero-mass posteriors indicate incompatible CTMC constraints or
-            # an impossible reconstruction; normalizing would silently emit NaNs.
-            if (
-                (not np.all(np.isfinite(node_post)))
-                or (not np.isfinite(total))
-                or (total <= 0.0)
-            ):
-                raise ToytreeError(
-                    "Ancestral-state inference produced zero or invalid "
-                    f"posterior mass at node {node_idx}. This usually means "
-                    "the observed states are incompatible with the fitted "
-                    "CTMC constraints, such as internal-node observations, "
-                    "fixed_rates, fixed_state_frequencies, or root_prior."
-                )
-            node_post /= total
-            posterior[node_idx] = node_post
-
         prob_df = pd.DataFrame(
             posterior,
             index=range(nnodes),
@@ -513,8 +734,12 @@ class DiscreteMarkovModelFit:
     def _neg_log_likelihood(self, params: np.ndarray) -> float:
         """Negative log-likelihood for optimizer."""
         qmatrix, _, freqs = self._build_qmatrix(params)
-        lik = np.clip(self._pruning_likelihood(qmatrix, freqs), 1e-300, None)
-        return -float(np.log(lik))
+        logliks = self._pattern_log_likelihoods(qmatrix, freqs)
+        # impossible (or NaN) patterns get a finite penalty on the same
+        # scale as feasible values, so the optimizer sees no cliff.
+        floor = _MIN_EDGE_LOGLIK * max(1, self.tree.nnodes - 1)
+        logliks = np.fmax(logliks, floor)
+        return -float(self.pattern_weights @ logliks)
 
     def fit(self, compute_posteriors: bool = False) -> PCMDiscreteCTMCFitResult:
         """Fit the model parameters with ML and return a result object.
@@ -577,7 +802,13 @@ def fit_discrete_ctmc(
     The internal model scale parameter is intentionally not exposed in this
     user-facing wrapper. For advanced fixed-rate workflows that require direct
     control over the CTMC scale, instantiate `DiscreteMarkovModelFit` directly.
+    To fit many characters at once use `fit_discrete_ctmc_multi`.
     """
+    if isinstance(data, pd.DataFrame):
+        raise ToytreeError(
+            "data must be a single trait; use fit_discrete_ctmc_multi for a "
+            "DataFrame of many characters."
+        )
     fitter = DiscreteMarkovModelFit(
         tree=tree,
         data=data,
@@ -590,6 +821,141 @@ def fit_discrete_ctmc(
     return fitter.fit(compute_posteriors=False)
 
 
+def _fit_discrete_ctmc_chunk(
+    tree, kwargs: Dict[str, object], columns: List[pd.Series]
+) -> List[PCMDiscreteCTMCFitResult]:
+    """Return independent model fits for a chunk of characters."""
+    return [
+        DiscreteMarkovModelFit(tree=tree, data=col, **kwargs).fit() for col in columns
+    ]
+
+
+def _fit_discrete_ctmc_parallel(
+    tree,
+    columns: List[pd.Series],
+    kwargs: Dict[str, object],
+    workers: int,
+) -> List[PCMDiscreteCTMCFitResult]:
+    """Return independent fits of characters, optionally in worker processes."""
+    chunks = map_chunks(
+        _fit_discrete_ctmc_chunk,
+        columns,
+        workers,
+        args=(tree, kwargs),
+        desc="fitting characters",
+    )
+    return [fit for chunk in chunks for fit in chunk]
+
+
+@add_subpackage_method(PhyloCompAPI)
+def fit_discrete_ctmc_multi(
+    tree,
+    data: pd.DataFrame,
+    nstates: int,
+    model: str,
+    fixed_rates: Optional[np.ndarray] = None,
+    fixed_state_frequencies: Optional[np.ndarray] = None,
+    root_prior: Optional[np.ndarray] = None,
+    independent: bool = False,
+    workers: Optional[int] = 1,
+) -> Union[PCMDiscreteCTMCFitResult, Dict[object, PCMDiscreteCTMCFitResult]]:
+    """Fit a discrete Markov model to many characters at once.
+
+    Characters are columns of a DataFrame, e.g., a morphological
+    character matrix. Identical characters are collapsed into unique
+    site patterns that are each evaluated once and weighted by their
+    number of occurrences.
+
+    By default all characters share one model, and the likelihood of
+    every pattern is computed in a single traversal of the tree, with
+    conditional likelihoods stored as a (nnodes, npatterns, nstates)
+    array. The returned log-likelihood is the sum over all characters.
+    If `independent=True`, a separate model is instead fit to each
+    character (as by `fit_discrete_ctmc`), once per unique pattern,
+    and optionally in parallel across worker processes.
+
+    Parameters
+    ----------
+    tree : ToyTree
+        Tree with branch lengths in the same time units as rates.
+    data : pd.DataFrame
+        A (tips x characters) DataFrame indexed by tip names or other
+        Node queries. Values are categorical states or NaN for missing.
+    nstates : int
+        Total number of states in the CTMC model. When characters share
+        a model, states are pooled across all characters.
+    model : str
+        Rate model parameterization. One of "ER", "SYM", or "ARD".
+    fixed_rates : np.ndarray | None
+        Optional ``(nstates, nstates)`` relative-rate matrix with numeric
+        values for fixed entries and ``np.nan`` for free entries.
+    fixed_state_frequencies : np.ndarray | None
+        Optional stationary state frequencies vector of length ``nstates``.
+    root_prior : np.ndarray | None
+        Optional root-state prior probability vector of length ``nstates``.
+        If None, stationary frequencies are used.
+    independent : bool
+        If False (default) fit one model shared by all characters. If
+        True fit a separate model to each character.
+    workers : int | None
+        Number of processes used to fit independent characters. If None,
+        use the number of CPUs. Ignored if `independent=False`.
+
+    Returns
+    -------
+    PCMDiscreteCTMCFitResult or dict
+        A single fit result for a shared model, or a dict mapping each
+        column name to its fit result if `independent=True`.
+
+    Raises
+    ------
+    ToytreeError
+        If data is not a DataFrame with unique index and column labels,
+        if workers is invalid, or if model-fitting inputs are invalid.
+
+    Examples
+    --------
+    >>> tree = toytree.rtree.unittree(20, treeheight=1.0, seed=123)
+    >>> data = pd.DataFrame({
+    ...     f"c{i}": toytree.pcm.simulate_discrete_trait(
+    ...         tree, nstates=2, model="ER", tips_only=True, seed=i)
+    ...     for i in range(100)
+    ... })
+    >>> fit = toytree.pcm.fit_discrete_ctmc_multi(tree, data, 2, "ER")
+    >>> fits = toytree.pcm.fit_discrete_ctmc_multi(
+    ...     tree, data, 2, "ARD", independent=True, workers=4)
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise ToytreeError("data must be a pandas DataFrame of characters")
+    if not data.columns.is_unique:
+        raise ToytreeError("data columns must have unique character names")
+    workers = get_workers(workers)
+
+    kwargs = dict(
+        nstates=nstates,
+        model=model,
+        fixed_rates=fixed_rates,
+        fixed_state_frequencies=fixed_state_frequencies,
+        root_prior=root_prior,
+    )
+    if not independent:
+        return DiscreteMarkovModelFit(tree=tree, data=data, **kwargs).fit()
+
+    # fit each unique character once; NaNs are made comparable as None.
+    uniques: Dict[tuple, int] = {}
+    columns = []
+    index = []
+    for name in data.columns:
+        col = data[name]
+        key = tuple(col.astype(object).where(col.notna(), None))
+        if key not in uniques:
+            uniques[key] = len(columns)
+            columns.append(col)
+        index.append(uniques[key])
+    fits = _fit_discrete_ctmc_parallel(tree, columns, kwargs, workers)
+    return {name: fits[i] for name, i in zip(data.columns, index)}
+
+
 @add_subpackage_method(PhyloCompAPI)
 def infer_ancestral_states_discrete_ctmc(
     tree,
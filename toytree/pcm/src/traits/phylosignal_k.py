@@ -12,7 +12,7 @@ Example
 -------
 >>> tree = toytree.rtree.unittree(ntips=24, seed=123)
 >>> trait = tree.pcm.simulate_continuous_brownian([1.0], tips_only=True, seed=123)
->>> kstat = phylogenetic_signal_k(tree=tree, data=trait, nsims=1000)
+>>> kstat = phylogenetic_signal_k(tree=tree, data=trait, nsims=1000, seed=123)
 >>> # {'K': 0.9857885, 'P-value': 0.002, 'permutations': 1000}
 
 References
@@ -44,14 +44,20 @@ data. Systematic biology, 63(5), 685-697.__
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Sequence, Union
+from typing import TYPE_CHECKING, Optional, Sequence, Union
 
 import numpy as np
 from loguru import logger
+from scipy.linalg import LinAlgError, cho_factor, cho_solve
 from scipy.optimize import minimize_scalar
 
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
-from toytree.pcm.src.utils import _validate_features
+from toytree.pcm.src.utils import (
+    _get_permutation_blocks,
+    _get_permutations,
+    _run_permutations,
+    _validate_features,
+)
 from toytree.pcm.src.vcv import get_vcv_matrix_from_tree
 
 if TYPE_CHECKING:
@@ -67,6 +73,9 @@ def phylogenetic_signal_k(
     data: Union[str, Sequence[float]],
     error: Union[str, Sequence[float]] = None,
     nsims: int = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    chunksize: Optional[int] = None,
 ) -> dict[str, float]:
     """Return Blomberg's K measurement of phylogenetic signal.
 
@@ -76,6 +85,10 @@ def phylogenetic_signal_k(
     (perhaps due to adaptive evolution); whereas K>1 indicates that
     close relatives are more similar than expected under the model.
 
+    Without errors, the VCV is factored once and K is computed for
+    each block of permuted data vectors with a single matrix solve.
+    With errors, sig2 is re-estimated for every permutation.
+
     Parameters
     ----------
     tree: ToyTree
@@ -86,6 +99,15 @@ def phylogenetic_signal_k(
         Optional standard errors measured on trait values.
     nsims: int
         Number of permutations to perform to calculate significance.
+    seed: int | None
+        Seed for the random number generator used for permutations.
+    workers: int | None
+        Number of worker processes used to evaluate blocks of
+        permutations. If None, all available CPUs are used.
+    chunksize: int | None
+        Number of permutations per block, which bounds memory use to
+        an (ntips, chunksize) array. Results are reproducible for a
+        given seed and chunksize regardless of the number of workers.
 
     Returns
     -------
@@ -98,7 +120,7 @@ def phylogenetic_signal_k(
     -------
     >>> tree = toytree.rtree.unittree(ntips=10, seed=123, treeheight=2.0)
     >>> data = tree.pcm.simulate_continuous_trait("bm", params=1.0, tips_only=True)
-    >>> tree.pcm.phylogenetic_signal_k(tree, data)
+    >>> tree.pcm.phylogenetic_signal_k(tree, data, seed=123)
     >>> # {"K": ..., "P-value": ..., ...}
     """
     # [optional] get data as features from the tree
@@ -108,19 +130,25 @@ def phylogenetic_signal_k(
         error = tree.get_node_data(error)[: tree.ntips]
 
     # validate proper trait format returned as float array
-    x = _validate_features(data, max_dim=1, size=tree.ntips)
+    x = _validate_features(data, max_dim=1, size=tree.ntips).astype(float)
     if error is not None:
-        e = _validate_features(error, max_dim=1, size=tree.ntips)
+        e = _validate_features(error, max_dim=1, size=tree.ntips).astype(float)
+
+    # seeded blocks of permutations
+    blocks = _get_permutation_blocks(nsims, x.size, seed, chunksize)
 
     # run func
     if error is None:
-        return _phylogenetic_signal_k(tree, x, nsims)
+        return _phylogenetic_signal_k(tree, x, blocks, workers)
     else:
-        return _phylogenetic_signal_k_with_se(tree, x, e, nsims)
+        return _phylogenetic_signal_k_with_se(tree, x, e, blocks, workers)
 
 
 def _phylogenetic_signal_k(
-    tree: ToyTree, x: np.ndarray, nsims: int
+    tree: ToyTree,
+    x: np.ndarray,
+    blocks: list[tuple[np.random.SeedSequence, int]],
+    workers: Optional[int],
 ) -> dict[str, float]:
     """Return Blomberg's K measurement of phylogenetic signal.
 
@@ -130,11 +158,16 @@ def _phylogenetic_signal_k(
     V = get_vcv_matrix_from_tree(tree)
 
     # calculate K statistic
-    kstat = _calculate_k(x, V)
+    cho = cho_factor(V, lower=True, check_finite=False)
+    kstat = float(_calculate_k(x[:, None], cho, V.trace())[0])
 
     # [optional] permutation test
+    nsims = sum(i[1] for i in blocks)
     if nsims:
-        pval = _permutation_test_k(nsims, x, V, kstat)
+        kstats = _run_permutations(
+            _permute_k_block, (x, cho, V.trace()), blocks, workers
+        )
+        pval = np.sum(kstats >= kstat) / kstats.size
 
     # return as a dict
     return {
@@ -145,7 +178,11 @@ def _phylogenetic_signal_k(
 
 
 def _phylogenetic_signal_k_with_se(
-    tree: ToyTree, x: np.ndarray, e: np.ndarray, nsims: int
+    tree: ToyTree,
+    x: np.ndarray,
+    e: np.ndarray,
+    blocks: list[tuple[np.random.SeedSequence, int]],
+    workers: Optional[int],
 ) -> dict[str, float]:
     """Calculate phylogenetic signal (K) with measurement error.
 
@@ -156,13 +193,16 @@ def _phylogenetic_signal_k_with_se(
 
     # calculate K stat w/ error
     IV = np.linalg.inv(V)
-    E = np.diag(e**2)
-    kstat, sig2, loglik, conv = _calculate_k_with_se(x, V, IV, E)
-    loglik = _likelihood_k(sig2, V, E, x)
+    kstat, sig2, loglik, conv = _calculate_k_with_se(x, V, IV, e**2)
+    loglik = _likelihood_k(sig2, V, e**2, x)
 
     # [optional] permutation test statistic
+    nsims = sum(i[1] for i in blocks)
     if nsims:
-        pval = _permutation_test_k_with_se(nsims, x, V, IV, e, kstat)
+        kstats = _run_permutations(
+            _permute_k_with_se_block, (x, e, V, IV), blocks, workers
+        )
+        pval = np.sum(kstats >= kstat) / kstats.size
 
     # return as a dict
     return {
@@ -175,23 +215,36 @@ def _phylogenetic_signal_k_with_se(
     }
 
 
-def _calculate_k(x: np.ndarray, V: np.ndarray, IV: np.ndarray = None) -> float:
-    """Return K statistic calculated for data x and variance-covariance matrix V."""
-    # compute PGLS mean (root state)
-    n = x.size
-    IV = IV if IV is not None else np.linalg.inv(V)
-    a = np.sum(IV @ x) / np.sum(IV)
+def _calculate_k(x: np.ndarray, cho: tuple, trace: float) -> np.ndarray:
+    """Return K statistics for each column of data x (ntips, m).
+
+    The Cholesky factor of the VCV (from `cho_factor`) is used to
+    solve for all columns at once, and the same solve is reused for
+    the PGLS means (root states) and the residual quadratic forms.
+    """
+    n = x.shape[0]
+    iv1 = cho_solve(cho, np.ones(n), check_finite=False)
+    ivx = cho_solve(cho, x, check_finite=False)
+    sum_iv = iv1.sum()
+
+    # compute PGLS mean (root state) of each column
+    a = (iv1 @ x) / sum_iv
+    resid = x - a
+    iv_resid = ivx - iv1[:, None] * a
 
     # calculate K statistic
-    num = (x - a).T @ (x - a) / ((x - a).T @ IV @ (x - a))
-    dnm = (np.sum(V.diagonal()) - n / np.sum(IV)) / (n - 1)
+    num = (resid**2).sum(axis=0) / (resid * iv_resid).sum(axis=0)
+    dnm = (trace - n / sum_iv) / (n - 1)
     return num / dnm
 
 
 def _calculate_k_with_se(
-    x: np.ndarray, V: np.ndarray, IV: np.ndarray, E: np.ndarray
+    x: np.ndarray, V: np.ndarray, IV: np.ndarray, e2: np.ndarray
 ) -> tuple[float, float]:
-    """Return K statistic and estimated sigma2 when measurement error is used."""
+    """Return K statistic and estimated sigma2 when measurement error is used.
+
+    `e2` are the measurement error variances (squared standard errors).
+    """
     # start using no error vcv
     a = np.sum(IV @ x) / np.sum(IV)
     n = x.size
@@ -203,7 +256,7 @@ def _calculate_k_with_se(
     # maximum likelihood model fitting
     res = minimize_scalar(
         _likelihood_k,
-        args=(V, E, x),
+        args=(V, e2, x),
         bounds=(0, max_sig2),
         method="bounded",
         # options=dict(maxiter=1000, xatol=1e-10, disp=0),
@@ -215,63 +268,66 @@ def _calculate_k_with_se(
     sig2 = res.x * (n / (n - 1))
 
     # get VCV w/ rate scalar
-    Ve = sig2 * V + E
+    Ve = sig2 * V
+    Ve[np.diag_indices(n)] += e2
 
     # calculate K using optimized Ve
-    IVe = np.linalg.inv(Ve)
-    a = np.sum(IVe @ x) / np.sum(IVe)
-    num = (x - a).T @ (x - a) / ((x - a).T @ IVe @ (x - a))
-    dnm = (np.sum(Ve.diagonal()) - n / np.sum(IVe)) / (n - 1)
-    return num / dnm, sig2, res.fun, res.success
-
-
-def _permutation_test_k(size: int, x: np.ndarray, V: np.ndarray, k: float):
-    """Return p-value from permutations as a test statistic."""
-    kstats = np.zeros(size)
-    rng = np.random.default_rng()
-    for i in range(size):
-        _x = rng.choice(x, size=x.size, replace=False)
-        kstats[i] = _calculate_k(_x, V)
-
-    # the proportion of permutations w/ k_ > k
-    return np.sum(kstats >= k) / kstats.size
-
-
-def _permutation_test_k_with_se(
-    size: int, x: np.ndarray, V: np.ndarray, IV: np.ndarray, error: np.ndarray, k: float
-):
-    """Return p-value from permutations as a test statistic."""
-    kstats = np.zeros(size)
-    rng = np.random.default_rng()
-    for i in range(size):
-        order = rng.choice(range(x.size), size=x.size, replace=False)
-        _x = x[order]
-        _e = error[order]
-        _E = np.diag(_e**2)
-        kstats[i], _, _, _ = _calculate_k_with_se(_x, V, IV, _E)
-
-    # the proportion of permutations w/ k_ > k
-    return np.sum(kstats >= k) / kstats.size
-
-
-def _likelihood_k(theta: float, V: np.ndarray, E: np.ndarray, y: np.ndarray) -> float:
+    cho = cho_factor(Ve, lower=True, check_finite=False)
+    kstat = _calculate_k(x[:, None], cho, Ve.trace())[0]
+    return kstat, sig2, res.fun, res.success
+
+
+def _permute_k_block(
+    x: np.ndarray,
+    cho: tuple,
+    trace: float,
+    seed: np.random.SeedSequence,
+    nperms: int,
+) -> np.ndarray:
+    """Return K statistics for a block of permutations of x."""
+    orders = _get_permutations(x.size, seed, nperms)
+    return _calculate_k(x[orders].T, cho, trace)
+
+
+def _permute_k_with_se_block(
+    x: np.ndarray,
+    e: np.ndarray,
+    V: np.ndarray,
+    IV: np.ndarray,
+    seed: np.random.SeedSequence,
+    nperms: int,
+) -> np.ndarray:
+    """Return K statistics for a block of permutations of x and errors."""
+    orders = _get_permutations(x.size, seed, nperms)
+    kstats = np.zeros(nperms)
+    for i, order in enumerate(orders):
+        kstats[i] = _calculate_k_with_se(x[order], V, IV, e[order] ** 2)[0]
+    return kstats
+
+
+def _likelihood_k(theta: float, V: np.ndarray, e2: np.ndarray, y: np.ndarray) -> float:
     """Estimate theta by maximizing the likelihood."""
     # weight variances by theta and add Error variance
-    C = theta * V + E
-
-    # get pgls mean
-    IC = np.linalg.inv(C)
     n = y.size
-    a = np.sum(IC @ y) / np.sum(IC)
+    C = theta * V
+    C[np.diag_indices(n)] += e2
+
+    # log(det(C)) from the Cholesky factor, which fails if C is not
+    # positive definite.
+    try:
+        cho = cho_factor(C, lower=True, check_finite=False)
+    except (LinAlgError, ValueError):
+        return np.nan
+    logdet2 = np.sum(np.log(np.diag(cho[0])))
 
-    # slogdet is more stable than det for large/small values; when sign>0,
-    # Note: log(det(C)) == logdet from slogdet.
-    sign, logdet = np.linalg.slogdet(C)
-    logdet2 = logdet / 2.0 if sign > 0 else np.nan  # np.log(1e-12)
+    # get pgls mean
+    iv1 = cho_solve(cho, np.ones(n), check_finite=False)
+    ivy = cho_solve(cho, y, check_finite=False)
+    a = np.sum(ivy) / np.sum(iv1)
 
     # compute log likelihood
     term = y - a
-    logL = -term.T @ IC @ term / 2.0 - n * np.log(2 * np.pi) / 2.0 - logdet2
+    logL = -term @ (ivy - a * iv1) / 2.0 - n * np.log(2 * np.pi) / 2.0 - logdet2
     return -logL
 
 
@@ -21,7 +21,7 @@ Example
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Sequence, Union
+from typing import TYPE_CHECKING, Optional, Sequence, Union
 
 import numpy as np
 from scipy.linalg import LinAlgError, cho_factor, cho_solve
@@ -29,7 +29,12 @@ from scipy.optimize import minimize, minimize_scalar
 from scipy.stats import chi2
 
 from toytree.core.apis import PhyloCompAPI, add_subpackage_method
-from toytree.pcm.src.utils import _validate_features
+from toytree.pcm.src.utils import (
+    _get_permutation_blocks,
+    _get_permutations,
+    _run_permutations,
+    _validate_features,
+)
 from toytree.pcm.src.vcv import get_vcv_matrix_from_tree
 
 if TYPE_CHECKING:
@@ -41,6 +46,9 @@ __all__ = [
     # "edges_scale_by_lambda"
 ]
 
+_PERMUTATION_GRID = 101
+"""Number of λ values in [0, max_λ] used to maximize permuted LR statistics."""
+
 
 @add_subpackage_method(PhyloCompAPI)
 def phylogenetic_signal_lambda(
@@ -48,6 +56,10 @@ def phylogenetic_signal_lambda(
     data: Union[str, Sequence[float]],
     error: Union[str, Sequence[float]] = None,
     intervals: int = 25,
+    nsims: int = 0,
+    seed: Optional[int] = None,
+    workers: Optional[int] = 1,
+    chunksize: Optional[int] = None,
 ) -> dict[str, float]:
     """Return Pagel's lambda measurement of phylogenetic signal.
 
@@ -55,6 +67,13 @@ def phylogenetic_signal_lambda(
     variance-covariance matrix. By default the search bounds are
     [0, max_λ(tree)], and thus the estimate can be >1 on some trees.
 
+    Significance is tested by a likelihood-ratio test against λ=0,
+    and optionally by permuting the data among tips. Without errors,
+    the permutation statistic is the LR statistic maximized over a
+    grid of λ values, where each transformed VCV is factored once and
+    all permutations in a block are evaluated with one matrix solve.
+    With errors, λ and sig2 are re-estimated for every permutation.
+
     Parameters
     ----------
     tree: ToyTree
@@ -65,6 +84,18 @@ def phylogenetic_signal_lambda(
         Optional standard errors measured on trait values.
     intervals: int
         Number of random start trials to optimize parameters by ML.
+    nsims: int
+        Number of permutations to perform to calculate a permutation
+        p-value of the LR statistic. Default is 0 (no permutations).
+    seed: int | None
+        Seed for the random number generator used for permutations.
+    workers: int | None
+        Number of worker processes used to evaluate blocks of
+        permutations. If None, all available CPUs are used.
+    chunksize: int | None
+        Number of permutations per block, which bounds memory use to
+        an (ntips, chunksize) array. Results are reproducible for a
+        given seed and chunksize regardless of the number of workers.
 
     Returns
     -------
@@ -72,7 +103,8 @@ def phylogenetic_signal_lambda(
         A dict with keys:
         ["lambda", "P-value", "LR_test", "log-likelihood_λ", "log-likelihood_λ0"].
         If standard errors are included then a fitted process variance
-        parameter "sig2" is also returned.
+        parameter "sig2" is also returned. If nsims > 0 the keys
+        "P-value_permutation" and "permutations" are also returned.
 
     Example
     -------
@@ -90,14 +122,32 @@ def phylogenetic_signal_lambda(
         error = tree.get_node_data(error)[: tree.ntips]
 
     # validate proper trait format returned as float array
-    x = _validate_features(data, max_dim=1, size=tree.ntips)
+    x = _validate_features(data, max_dim=1, size=tree.ntips).astype(float)
     if error is not None:
-        e = _validate_features(error, max_dim=1, size=tree.ntips)
+        e = _validate_features(error, max_dim=1, size=tree.ntips).astype(float)
 
     if error is None:
-        return _phylogenetic_signal_λ(tree, x, intervals)
+        res = _phylogenetic_signal_λ(tree, x, intervals)
     else:
-        return _phylogenetic_signal_λ_w_se(tree, x, e, intervals)
+        res = _phylogenetic_signal_λ_w_se(tree, x, e, intervals)
+
+    # [optional] permutation test of the LR statistic
+    if nsims:
+        blocks = _get_permutation_blocks(nsims, x.size, seed, chunksize)
+        V = get_vcv_matrix_from_tree(tree)
+        maxλ = max_λ(tree)
+        if error is None:
+            grid = np.linspace(0, maxλ, _PERMUTATION_GRID)
+            lr_stat = _get_lr_grid(x[:, None], V, grid)[0]
+            args = (x, V, grid)
+            lr_stats = _run_permutations(_permute_λ_block, args, blocks, workers)
+        else:
+            lr_stat = res["LR_test"]
+            args = (x, e, V, maxλ, intervals)
+            lr_stats = _run_permutations(_permute_λ_w_se_block, args, blocks, workers)
+        res["P-value_permutation"] = np.sum(lr_stats >= lr_stat) / lr_stats.size
+        res["permutations"] = nsims
+    return res
 
 
 def _phylogenetic_signal_λ(
@@ -151,8 +201,8 @@ def _phylogenetic_signal_λ_w_se(
     x = _validate_features(x, max_dim=1, size=ntips)
     error = _validate_features(e, max_dim=1, size=ntips)
 
-    #
-    E = np.diag(error**2)
+    # squared errors are added to the diagonal of the covariance.
+    E = error**2
     maxλ = max_λ(tree)
 
     # estimate optimal λ that maximizes loglik with measure error
@@ -194,6 +244,19 @@ def _λ_transform(V: np.ndarray, λ: float) -> np.ndarray:
     return V
 
 
+def _add_error(C: np.ndarray, E: np.ndarray) -> np.ndarray:
+    """Add measurement error to a covariance matrix in place.
+
+    E is either a vector of squared standard errors, which is added to
+    the diagonal without building a dense matrix, or a full matrix.
+    """
+    if E.ndim == 1:
+        C.flat[:: C.shape[0] + 1] += E
+    else:
+        C += E
+    return C
+
+
 def _likelihood_λ(theta: float, V: np.ndarray, y: float) -> float:
     """Return -log likelihood given a test lambda parameter.
 
@@ -225,11 +288,14 @@ def _likelihood_λ_w_se(
         The original variance-covariance matrix.
     y: np.ndarray
         The trait data in idx order.
+    E: np.ndarray
+        The squared standard errors in idx order, or an error
+        covariance matrix.
     """
     theta, sigma = params
     if not np.isfinite(sigma) or sigma <= 0:
         return np.inf
-    C = sigma * _λ_transform(V, theta) + E
+    C = _add_error(sigma * _λ_transform(V, theta), E)
     return _profiled_gaussian_nll(y, C)
 
 
@@ -239,19 +305,13 @@ def _likelihood_sigma2_given_λ(
     """Return NLL with λ fixed and sigma2 free."""
     if not np.isfinite(sigma) or sigma <= 0:
         return np.inf
-    C = sigma * _λ_transform(V, λ) + E
+    C = _add_error(sigma * _λ_transform(V, λ), E)
     return _profiled_gaussian_nll(y, C)
 
 
-def _profiled_gaussian_nll(y: np.ndarray, C: np.ndarray) -> float:
-    """Return profiled Gaussian NLL with GLS mean and sigma2 MLE."""
-    y = np.asarray(y, dtype=float)
-    C = np.asarray(C, dtype=float)
-    n = y.size
-    if C.shape != (n, n):
-        return np.inf
-
-    sigma2_min = 1e-12
+def _cho_factor_with_jitter(C: np.ndarray) -> Optional[tuple[np.ndarray, bool]]:
+    """Return Cholesky factor of C, adding diagonal jitter if needed, or None."""
+    n = C.shape[0]
     jitter = 0.0
     for _ in range(6):
         try:
@@ -259,13 +319,26 @@ def _profiled_gaussian_nll(y: np.ndarray, C: np.ndarray) -> float:
                 Cj = C + np.eye(n) * jitter
             else:
                 Cj = C
-            cho, lower = cho_factor(Cj, lower=True, check_finite=False)
-            break
+            return cho_factor(Cj, lower=True, check_finite=False)
         except (LinAlgError, ValueError):
             jitter = 1e-12 if jitter == 0.0 else jitter * 10.0
-    else:
+    return None
+
+
+def _profiled_gaussian_nll(y: np.ndarray, C: np.ndarray) -> float:
+    """Return profiled Gaussian NLL with GLS mean and sigma2 MLE."""
+    y = np.asarray(y, dtype=float)
+    C = np.asarray(C, dtype=float)
+    n = y.size
+    if C.shape != (n, n):
         return np.inf
 
+    sigma2_min = 1e-12
+    factor = _cho_factor_with_jitter(C)
+    if factor is None:
+        return np.inf
+    cho, lower = factor
+
     ones = np.ones(n, dtype=float)
     ic_y = cho_solve((cho, lower), y, check_finite=False)
     ic_1 = cho_solve((cho, lower), ones, check_finite=False)
@@ -352,6 +425,64 @@ def _estimate_sigma2_given_λ(
     )
 
 
+def _get_lr_grid(x: np.ndarray, V: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Return LR statistics against λ=0 for each column of x (ntips, m).
+
+    The profiled likelihood of every column is evaluated at each λ
+    in the grid (which must start at 0) from one Cholesky factor and
+    one matrix solve, and the LR statistic uses the max over the grid.
+    """
+    n, m = x.shape
+    ones = np.ones(n)
+    nlls = np.full((grid.size, m), np.inf)
+    for gidx, λ in enumerate(grid):
+        cho = _cho_factor_with_jitter(_λ_transform(V, λ))
+        if cho is None:
+            continue
+        ic_1 = cho_solve(cho, ones, check_finite=False)
+        ic_x = cho_solve(cho, x, check_finite=False)
+        mu_hat = (ic_1 @ x) / ic_1.sum()
+        quad = ((x - mu_hat) * (ic_x - ic_1[:, None] * mu_hat)).sum(axis=0)
+        sigma2_hat = np.maximum(quad / n, 1e-12)
+        logdet = 2.0 * np.sum(np.log(np.diag(cho[0])))
+        nlls[gidx] = 0.5 * (
+            n * np.log(2.0 * np.pi) + logdet + n * np.log(sigma2_hat) + n
+        )
+    return np.maximum(0.0, 2.0 * (nlls[0] - nlls.min(axis=0)))
+
+
+def _permute_λ_block(
+    x: np.ndarray,
+    V: np.ndarray,
+    grid: np.ndarray,
+    seed: np.random.SeedSequence,
+    nperms: int,
+) -> np.ndarray:
+    """Return grid LR statistics for a block of permutations of x."""
+    orders = _get_permutations(x.size, seed, nperms)
+    return _get_lr_grid(x[orders].T, V, grid)
+
+
+def _permute_λ_w_se_block(
+    x: np.ndarray,
+    e: np.ndarray,
+    V: np.ndarray,
+    maxλ: float,
+    intervals: int,
+    seed: np.random.SeedSequence,
+    nperms: int,
+) -> np.ndarray:
+    """Return LR statistics for a block of permutations of x and errors."""
+    orders = _get_permutations(x.size, seed, nperms)
+    lr_stats = np.zeros(nperms)
+    e2 = e**2
+    for i, order in enumerate(orders):
+        res = _estimate_λ_and_e(x[order], V, e2[order], maxλ, intervals=intervals)
+        res0 = _estimate_sigma2_given_λ(x[order], V, e2[order], λ=0.0)
+        lr_stats[i] = max(0.0, 2.0 * (float(res0.fun) - float(res.fun)))
+    return lr_stats
+
+
 ####################################################################
 def max_λ(tree: ToyTree) -> float:
     """Return the max lambda for a given tree.
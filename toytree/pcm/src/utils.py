@@ -20,11 +20,14 @@ from __future__ import annotations
 
 import os
 from concurrent.futures import ProcessPoolExecutor
-from typing import TYPE_CHECKING, Callable, Sequence, Union
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
 
+from toytree.utils.src.exceptions import ToytreeError
+from toytree.utils.src.parallel import get_workers, map_chunks
+
 # from toytree.core.apis import add_subpackage_method, PhyloCompAPI
 
 if TYPE_CHECKING:
@@ -33,6 +36,59 @@ if TYPE_CHECKING:
 # Define a feature TypeAlias for type hints
 feature = Union[str, Sequence[float], pd.Series, pd.DataFrame]
 
+_MAX_PERMUTATION_ITEMS = 2**22
+"""Default max number of values in a block of permuted data vectors."""
+
+
+def _get_depth_levels(tree: ToyTree) -> list[np.ndarray]:
+    """Return arrays of non-root node idxs at each depth below the root.
+
+    Levels are ordered from the root down, and nodes within a level in
+    idx order, such that every node is visited after its parent when
+    simulating along the tree one level at a time.
+    """
+    parents = tree._get_parent_idxs().tolist()
+    depths = [0] * tree.nnodes
+    for idx in range(tree.nnodes - 2, -1, -1):
+        depths[idx] = depths[parents[idx]] + 1
+    depths = np.array(depths)
+    order = np.argsort(depths[:-1], kind="stable")
+    return np.split(order, np.flatnonzero(np.diff(depths[order])) + 1)
+
+
+def _get_height_levels(
+    tree: ToyTree,
+) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Return (parents, children, offsets) arrays grouped by node height.
+
+    Internal nodes are grouped by their height in edges above the tips,
+    from the tips up, such that every node in a group depends only on
+    groups visited before it in a postorder recursion (and after it in
+    a preorder recursion). Children are sorted by parent, and by idx
+    within each parent, such that reductions over the children of each
+    parent are contiguous for ``reduceat`` at the parent offsets.
+    """
+    parents = tree._get_parent_idxs()
+    plist = parents.tolist()
+    heights = [0] * tree.nnodes
+    for idx in range(tree.nnodes - 1):
+        pidx = plist[idx]
+        heights[pidx] = max(heights[pidx], heights[idx] + 1)
+    heights = np.array(heights, dtype=int)
+
+    children = np.arange(tree.nnodes - 1)
+    pheights = heights[parents[:-1]]
+    children = children[np.lexsort((parents[:-1], pheights))]
+    bounds = np.searchsorted(
+        pheights[children], np.arange(1, heights[-1] + 2), side="left"
+    )
+    levels = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        cidxs = children[start:end]
+        pidxs, offsets = np.unique(parents[cidxs], return_index=True)
+        levels.append((pidxs, cidxs, offsets))
+    return levels
+
 
 def _validate_features(x: feature, max_dim: int, size: int) -> np.ndarray:
     """Validate data has correct dimensions and size."""
@@ -43,13 +99,74 @@ def _validate_features(x: feature, max_dim: int, size: int) -> np.ndarray:
     # force to array
     x = np.asarray(x)
     # check dimensions and size
-    assert (
-        x.ndim <= max_dim
-    ), f"feature ndim ({x.ndim}) exceeds max allowed ndim ({max_dim})."
+    assert x.ndim <= max_dim, (
+        f"feature ndim ({x.ndim}) exceeds max allowed ndim ({max_dim})."
+    )
     assert x.shape[0] == size, "feature cannot exceed ntips"
     return x
 
 
+def _get_permutation_blocks(
+    nsims: int,
+    size: int,
+    seed: Optional[int],
+    chunksize: Optional[int],
+) -> list[tuple[np.random.SeedSequence, int]]:
+    """Return (seed, nperms) blocks for a seeded permutation test.
+
+    Permutations are drawn in blocks of `chunksize` (by default the
+    number of (size,) vectors held in ~32 MB) each with a seed spawned
+    from `seed`, such that results are reproducible for a given seed
+    and chunksize regardless of the number of worker processes.
+    """
+    if chunksize is None:
+        chunksize = max(1, _MAX_PERMUTATION_ITEMS // max(size, 1))
+    if int(chunksize) != chunksize or chunksize < 1:
+        raise ToytreeError("chunksize must be an int >= 1 or None.")
+    chunksize = int(chunksize)
+    nperms = [min(chunksize, nsims - i) for i in range(0, nsims, chunksize)]
+    seeds = np.random.SeedSequence(seed).spawn(len(nperms))
+    return list(zip(seeds, nperms))
+
+
+def _get_permutations(
+    size: int, seed: np.random.SeedSequence, nperms: int
+) -> np.ndarray:
+    """Return an int array (nperms, size) of random permutations."""
+    rng = np.random.default_rng(seed)
+    return rng.permuted(np.tile(np.arange(size), (nperms, 1)), axis=1)
+
+
+def _run_permutation_chunk(
+    function: Callable,
+    args: tuple,
+    blocks: list[tuple[np.random.SeedSequence, int]],
+) -> np.ndarray:
+    """Return statistics concatenated from `function(*args, seed, nperms)`."""
+    return np.concatenate([function(*args, seed, nperms) for seed, nperms in blocks])
+
+
+def _run_permutations(
+    function: Callable,
+    args: tuple,
+    blocks: list[tuple[np.random.SeedSequence, int]],
+    workers: Optional[int],
+) -> np.ndarray:
+    """Return statistics for all permutation blocks, optionally in parallel.
+
+    `function` must be a module-level function returning an array of
+    nperms statistics from the arguments `(*args, seed, nperms)`.
+    """
+    chunks = map_chunks(
+        _run_permutation_chunk,
+        blocks,
+        get_workers(workers),
+        args=(function, args),
+        desc="running permutations",
+    )
+    return np.concatenate(chunks)
+
+
 def calculate_posterior(
     function: Callable,
     trees: Union[str, ToyTree, MultiTree],
@@ -17,8 +17,8 @@ References
 
 from __future__ import annotations
 
-import itertools
-from typing import TYPE_CHECKING, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Union
 
 import numpy as np
 import pandas as pd
@@ -40,11 +40,61 @@ __all__ = [
 # gls_model_est = sm.GLS(y, X).fit()
 # print(gls_model_est.summary())
 
+# Max number of matrix cells filled per block of rows.
+_MAX_BLOCK_CELLS = 4_000_000
+
+
+def _get_shared_path_matrix(
+    tree: ToyTree,
+    idxs: Optional[Sequence[int]] = None,
+    dtype: Union[str, np.dtype] = np.float64,
+    memmap: Union[str, Path, None] = None,
+) -> np.ndarray:
+    """Return matrix of shared path lengths from the root among Nodes.
+
+    Entry (i, j) is the distance from the root to the MRCA of Nodes i
+    and j, such that the diagonal holds root-to-Node distances. This
+    is filled from root distances indexed by vectorized queries of the
+    cached LCA index (see `ToyTree._get_lca_index`), in blocks of rows
+    that bound the size of temporary arrays, and can be written into a
+    disk-backed np.memmap for very large trees.
+
+    Parameters
+    ----------
+    tree: ToyTree
+        Tree with edge lengths.
+    idxs: Sequence[int] or None
+        Node idx labels of the rows and columns. Default is all tips.
+    dtype: str or np.dtype
+        Float dtype of the returned matrix, e.g., "float32" halves the
+        memory of the default float64.
+    memmap: str, Path, or None
+        Optional file path at which to create the matrix as np.memmap.
+    """
+    from toytree.distance._src.nodedist import _get_root_distances
+
+    idxs = np.arange(tree.ntips) if idxs is None else np.asarray(idxs, dtype=int)
+    nidxs = idxs.size
+    if memmap is None:
+        shared = np.empty((nidxs, nidxs), dtype=dtype)
+    else:
+        shared = np.memmap(memmap, dtype=dtype, mode="w+", shape=(nidxs, nidxs))
+
+    rdist = _get_root_distances(tree)
+    lca = tree._get_lca_index()
+    bsize = max(1, _MAX_BLOCK_CELLS // max(1, nidxs))
+    for start in range(0, nidxs, bsize):
+        rows = idxs[start : start + bsize, None]
+        shared[start : start + bsize] = rdist[lca.query_many(rows, idxs[None, :])]
+    return shared
+
 
 @add_subpackage_method(PhyloCompAPI)
 def get_vcv_matrix_from_tree(
     tree: ToyTree,
     df: bool = False,
+    dtype: Union[str, np.dtype] = np.float64,
+    memmap: Union[str, Path, None] = None,
 ) -> Union[np.ndarray, pd.DataFrame]:
     """Return the Brownian-motion variance-covariance matrix for tree tips.
 
@@ -60,6 +110,12 @@ def get_vcv_matrix_from_tree(
     df : bool, default=False
         If ``True``, return a labeled ``pandas.DataFrame`` with tip labels as
         both index and columns. If ``False``, return a ``numpy.ndarray``.
+    dtype : str or numpy.dtype, default=numpy.float64
+        Float dtype of the matrix. Use ``"float32"`` to halve memory use for
+        very large trees.
+    memmap : str, Path, or None, default=None
+        If a file path is provided, the matrix is written to and returned as a
+        disk-backed ``numpy.memmap`` of shape ``(ntips, ntips)``.
 
     Returns
     -------
@@ -73,27 +129,22 @@ def get_vcv_matrix_from_tree(
         Propagated from tree methods if the tree structure or edge lengths are
         invalid for distance calculations.
 
+    Notes
+    -----
+    Shared path lengths are filled in vectorized blocks of rows from
+    root distances and an O(1) lowest-common-ancestor index, rather
+    than by querying the MRCA of every pair of tips.
+
     Examples
     --------
     >>> tree = toytree.rtree.unittree(ntips=5, seed=123, treeheight=3)
     >>> vcv = tree.pcm.get_vcv_matrix_from_tree(df=True)
     >>> vcv.shape
     (5, 5)
+    >>> vcv32 = tree.pcm.get_vcv_matrix_from_tree(dtype="float32")
     """
-    # get node distance matrix
-    dmat = tree.distance.get_node_distance_matrix()
-
-    # fill vcv array with shared dists (mrca to root)
-    vcv = np.zeros((tree.ntips, tree.ntips))
-    for tip1, tip2 in itertools.combinations(range(tree.ntips), 2):
-        # get mrca node and its dist to root (co-variances)
-        mrca = tree.get_mrca_node(tip1, tip2)
-        vcv[tip1, tip2] = dmat[mrca.idx, tree.treenode.idx]
-        vcv[tip2, tip1] = vcv[tip1, tip2]
-
-    # fill diagonal with each tips dist from the root
-    for node in tree[: tree.ntips]:
-        vcv[node._idx, node._idx] = dmat[node._idx, -1]
+    # fill vcv array with shared dists (mrca to root) and tip dists on diagonal
+    vcv = _get_shared_path_matrix(tree, dtype=dtype, memmap=memmap)
 
     # return as ndarray or dataframe
     if not df:
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""Run independent jobs in chunks across worker processes.
+
+Functions that accept a `workers` argument validate it with
+`get_workers` and distribute their jobs with `map_chunks`, which
+splits an ordered sequence of items into contiguous chunks, calls a
+module-level function on each chunk in a `ProcessPoolExecutor`, and
+returns the chunk results in order. If worker processes cannot be
+started (e.g., in a sandbox) a warning is logged and the jobs are run
+serially instead, such that results do not depend on `workers`.
+
+Examples
+--------
+>>> workers = get_workers(None)
+>>> map_chunks(sum, [1, 2, 3, 4], workers=1)
+[10]
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+from toytree.utils.src.exceptions import ToytreeError
+
+__all__ = ["get_workers", "split_chunks", "map_chunks"]
+
+CHUNKS_PER_WORKER = 4
+"""Number of chunks submitted per worker to balance uneven jobs."""
+
+
+def get_workers(workers: Optional[int]) -> int:
+    """Return a validated number of worker processes.
+
+    Parameters
+    ----------
+    workers: int or None
+        Number of worker processes, or None to use all CPUs.
+
+    Raises
+    ------
+    ToytreeError
+        If workers is not an int >= 1 or None.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if int(workers) != workers or workers < 1:
+        raise ToytreeError("workers must be an int >= 1 or None.")
+    return int(workers)
+
+
+def split_chunks(items: Sequence[Any], nchunks: int) -> list[Sequence[Any]]:
+    """Return `items` split into `nchunks` ordered contiguous chunks."""
+    size, extra = divmod(len(items), nchunks)
+    chunks = []
+    start = 0
+    for idx in range(nchunks):
+        end = start + size + (idx < extra)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def map_chunks(
+    function: Callable,
+    items: Sequence[Any],
+    workers: int,
+    args: tuple = (),
+    desc: str = "running jobs",
+) -> list[Any]:
+    """Return `[function(*args, chunk)]` over ordered chunks of items.
+
+    Parameters
+    ----------
+    function: Callable
+        A module-level (picklable) function called with `*args` and
+        a contiguous chunk of `items` as its last argument.
+    items: Sequence
+        Ordered items to split into chunks.
+    workers: int
+        Number of worker processes (see `get_workers`). If <= 1, or
+        if there is only one item, `function` is called once on all
+        items in this process.
+    args: tuple
+        Leading arguments passed to every call of `function`.
+    desc: str
+        Description of the jobs used in the serial fallback warning.
+
+    Returns
+    -------
+    list
+        The result of each call of `function`, in chunk order.
+    """
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [function(*args, items)]
+    nchunks = min(len(items), workers * CHUNKS_PER_WORKER)
+    chunks = split_chunks(items, nchunks)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(function, *args, i) for i in chunks]
+            return [fut.result() for fut in futures]
+    except (PermissionError, OSError) as exc:
+        from loguru import logger
+
+        logger.warning(f"ProcessPool unavailable; {desc} serially: {exc}")
+        return [function(*args, items)]